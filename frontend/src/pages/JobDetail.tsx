@@ -81,15 +81,23 @@ interface FlowData {
   tier_rationale: string[]
 }
 
+interface VariantStreamUpdate {
+  variant: Variant
+  flow_data?: FlowData
+}
+
 interface JobUpdate {
-  type: 'progress' | 'variant_update' | 'connected'
+  type: 'progress' | 'variant_update' | 'variant_batch' | 'resync' | 'connected'
   job_id: string
+  event_id?: string
+  last_event_id?: string
   status?: string
   progress?: number
   message?: string
   current_step?: string
   variant?: Variant
   flow_data?: FlowData
+  updates?: VariantStreamUpdate[]
   timestamp: string
 }
 
@@ -109,6 +117,9 @@ const JobDetail: React.FC = () => {
   const [detailDialogData, setDetailDialogData] = useState<any>(null)
   const wsRef = useRef<WebSocket | null>(null)
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null)
+  // Last stream event processed; reconnects resume after it
+  const lastEventIdRef = useRef<string>('0')
+  const resyncRef = useRef(false)
 
   // Fetch job details
   const { data: job, isLoading, error, refetch } = useQuery({
@@ -131,7 +142,7 @@ const JobDetail: React.FC = () => {
     }
 
     const connectWebSocket = () => {
-      const wsUrl = `${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${window.location.hostname}:8000/ws/jobs/${jobId}`
+      const wsUrl = `${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${window.location.hostname}:8000/ws/jobs/${jobId}?last_event_id=${lastEventIdRef.current}`
       
       const ws = new WebSocket(wsUrl)
       wsRef.current = ws
@@ -159,9 +170,10 @@ const JobDetail: React.FC = () => {
         setIsConnected(false)
         wsRef.current = null
 
-        // Reconnect after 3 seconds if job is still running
-        if (job?.status === 'running') {
-          reconnectTimeoutRef.current = setTimeout(connectWebSocket, 3000)
+        // Reconnect after 3 seconds if job is still running; a resync reconnects at once
+        if (job?.status === 'running' || resyncRef.current) {
+          reconnectTimeoutRef.current = setTimeout(connectWebSocket, resyncRef.current ? 0 : 3000)
+          resyncRef.current = false
         }
       }
     }
@@ -178,7 +190,34 @@ const JobDetail: React.FC = () => {
     }
   }, [jobId, job?.status])
 
+  const addVariantUpdates = (updates: VariantStreamUpdate[]) => {
+    if (updates.length === 0) {
+      return
+    }
+    setVariants(prev => [...prev, ...updates.map(u => u.variant)])
+    
+    // Store flow data if available
+    setVariantFlows(prev => {
+      const newMap = new Map(prev)
+      updates.forEach(u => {
+        if (u.flow_data && u.variant.variant_id) {
+          newMap.set(u.variant.variant_id, u.flow_data)
+        }
+      })
+      return newMap
+    })
+    
+    // Auto-select first variant in flow view
+    if (variants.length === 0 && viewMode === 'flow') {
+      setSelectedVariant(updates[0].variant.variant_id)
+    }
+  }
+
   const handleUpdate = (update: JobUpdate) => {
+    if (update.event_id) {
+      lastEventIdRef.current = update.event_id
+    }
+    
     switch (update.type) {
       case 'progress':
         setCurrentProgress(update.progress || 0)
@@ -188,24 +227,20 @@ const JobDetail: React.FC = () => {
       
       case 'variant_update':
         if (update.variant) {
-          setVariants(prev => [...prev, update.variant!])
-          
-          // Store flow data if available
-          if (update.flow_data && update.variant.variant_id) {
-            setVariantFlows(prev => {
-              const newMap = new Map(prev)
-              newMap.set(update.variant!.variant_id, update.flow_data!)
-              return newMap
-            })
-          }
-          
-          // Auto-select first variant in flow view
-          if (variants.length === 0 && viewMode === 'flow') {
-            setSelectedVariant(update.variant.variant_id)
-          }
+          addVariantUpdates([{ variant: update.variant, flow_data: update.flow_data }])
         }
         break
       
+      case 'variant_batch':
+        addVariantUpdates(update.updates || [])
+        break
+      
+      case 'resync':
+        // Fell behind the stream: reconnect and replay from the last processed event
+        lastEventIdRef.current = update.last_event_id || lastEventIdRef.current
+        resyncRef.current = true
+        break
+      
       case 'connected':
         console.log('Connected to job progress stream')
         break
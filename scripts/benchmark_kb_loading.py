@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Benchmark knowledge base start-up: vectorized loaders vs. row-by-row parsing
+
+For each KB table, runs its KnowledgeBaseLoader._load_* method in a fresh
+process twice, producing identical structures both times:
+  * vectorized - the kb_ingest readers (usecols, categoricals, column-wise
+                 record building)
+  * iterrows   - kb_ingest swapped for full-width pd.read_csv and one
+                 DataFrame.iterrows() Series per row, i.e. how the loaders
+                 ingested tables previously
+and reports wall time, peak RSS growth during the load, and RSS still held
+once the loaded structure is all that remains.
+
+Runs against a real `.refs` tree (--kb-path) or, by default, a synthetic one
+of --rows rows per table.
+
+Usage:
+    python scripts/benchmark_kb_loading.py --rows 200000
+    python scripts/benchmark_kb_loading.py --kb-path ./.refs
+"""
+
+import argparse
+import gc
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# loader method -> source table (relative to the KB root)
+KB_TABLES = {
+    "_load_oncokb_genes": "clinical_evidence/oncokb/curated_genes.tsv",
+    "_load_oncokb_variants": "clinical_evidence/oncokb/oncokb_biomarker_drug_associations.tsv",
+    "_load_civic_variants": "clinical_evidence/civic/civic_variant_summaries.tsv",
+    "_load_civic_evidence": "clinical_evidence/civic/civic_variants.tsv",
+    "_load_cosmic_cgc": "cancer_genes/cosmic_cgc/cancer_gene_census.tsv.gz",
+    "_load_cosmic_hotspots": "hotspots/msk_hotspots/MSK-SNV-hotspots-v2.tsv.gz",
+    "_load_oncovi_hotspots": "hotspots/oncovi_hotspots/single_residue_hotspots.tsv",
+}
+
+
+def write_synthetic_kb(root: Path, rows: int, seed: int = 0) -> None:
+    """Write KB tables with realistic column sets and gene-symbol cardinality"""
+    rng = np.random.default_rng(seed)
+    genes = np.array([f"GENE{i}" for i in range(20000)])
+
+    def gene_column():
+        return genes[rng.integers(0, len(genes), rows)]
+
+    def text(n=40):
+        return rng.choice([f"free text {i} " * (n // 12) for i in range(1000)], rows)
+
+    tables = {
+        KB_TABLES["_load_oncokb_genes"]: {
+            "hugoSymbol": gene_column(), "oncogene": rng.choice(["TRUE", "FALSE"], rows),
+            "tsg": rng.choice(["TRUE", "FALSE"], rows), "highestSensitiveLevel": rng.choice(["LEVEL_1", "LEVEL_2", ""], rows),
+            "highestResistanceLevel": rng.choice(["LEVEL_R1", ""], rows), "summary": text(200), "background": text(400),
+            "grch38Isoform": "ENST00000288602", "grch38RefSeq": "NM_004333.4", "entrezGeneId": rng.integers(1, 10**5, rows),
+        },
+        KB_TABLES["_load_oncokb_variants"]: {
+            "Level": rng.choice(["1", "2", "3A", "3B", "4", "R1"], rows), "Gene": gene_column(),
+            "Alterations": rng.choice([f"V{i}E" for i in range(5000)], rows),
+            "Cancer Types": rng.choice(["Melanoma", "Non-Small Cell Lung Cancer", "Colorectal Cancer"], rows),
+            "Drugs (for therapeutic implications only)": rng.choice(["Dabrafenib", "Trametinib", "Osimertinib"], rows),
+        },
+        KB_TABLES["_load_civic_variants"]: {
+            "variant_id": np.arange(1, rows + 1), "gene": gene_column(), "variant": rng.choice(["V600E", "G12D"], rows),
+            "variant_summary": text(120), "civic_score": rng.random(rows) * 100, "chromosome": rng.integers(1, 23, rows),
+        },
+        KB_TABLES["_load_civic_evidence"]: {
+            "evidence_id": np.arange(1, rows + 1), "variant_id": rng.integers(1, rows, rows),
+            "evidence_level": rng.choice(list("ABCDE"), rows), "evidence_type": rng.choice(["Predictive", "Prognostic"], rows),
+            "significance": rng.choice(["Sensitivity", "Resistance"], rows), "disease": rng.choice(["Melanoma", "NSCLC"], rows),
+            "drugs": rng.choice(["Dabrafenib", ""], rows), "rating": rng.integers(1, 6, rows), "evidence_statement": text(300),
+        },
+        KB_TABLES["_load_cosmic_cgc"]: {
+            "GENE_SYMBOL": gene_column(), "ROLE_IN_CANCER": rng.choice(["oncogene", "TSG", "oncogene, TSG", "fusion"], rows),
+            "MUTATION_TYPES": rng.choice(["Mis", "N, F", "T"], rows), "TUMOUR_TYPES_SOMATIC": rng.choice(["melanoma", "NSCLC"], rows),
+            "TUMOUR_TYPES_GERMLINE": "", "SYNONYMS": text(80),
+        },
+        KB_TABLES["_load_cosmic_hotspots"]: {
+            "Hugo_Symbol": gene_column(), "Chromosome": rng.choice([str(c) for c in range(1, 23)] + ["X"], rows),
+            "Start_Position": rng.integers(1, 2 * 10**8, rows), "Reference_Allele": rng.choice(list("ACGT"), rows),
+            "Tumor_Seq_Allele2": rng.choice(list("ACGT"), rows), "Mutation_Count": rng.integers(1, 500, rows),
+            "HGVSp_Short": rng.choice(["p.V600E", "p.G12D"], rows),
+        },
+        KB_TABLES["_load_oncovi_hotspots"]: {
+            "gene": gene_column(), "residue": rng.choice([f"R{i}" for i in range(2000)], rows),
+            "samples": rng.integers(0, 300, rows), "cancer_types": rng.choice(["melanoma,nsclc", "crc"], rows),
+        },
+    }
+    for rel_path, columns in tables.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(columns).to_csv(path, sep="\t", index=False)
+
+
+def _current_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def _peak_rss_mb() -> float:
+    # Prefer VmHWM: ru_maxrss survives exec, so a spawned child would inherit
+    # the parent's high-water mark (e.g. from writing the synthetic KB)
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _rowwise_read(path, columns=None, categorical=(), **kwargs):
+    """Full-width read with default dtypes, as the loaders did before kb_ingest"""
+    kwargs.pop("usecols", None)
+    return pd.read_csv(path, sep="\t", low_memory=False, **kwargs)
+
+
+def _rowwise_records(df, fields):
+    """kb_ingest.build_records via DataFrame.iterrows(), one Series per row"""
+    precomputed = {name: list(spec) for name, spec in fields.items() if not isinstance(spec, (str, tuple))}
+    records = []
+    for i, (_, row) in enumerate(df.iterrows()):
+        record = {}
+        for name, spec in fields.items():
+            if isinstance(spec, str):
+                record[name] = row.get(spec)
+            elif isinstance(spec, tuple):
+                record[name] = row.get(*spec)
+            else:
+                record[name] = precomputed[name][i]
+        records.append(record)
+    return records
+
+
+def _rowwise_records_by_key(df, key, fields):
+    keys = list(df[key] if isinstance(key, str) else key)
+    return dict(zip(keys, _rowwise_records(df, fields)))
+
+
+def _rowwise_grouped_records(df, key_columns, fields):
+    grouped = {}
+    for (_, row), record in zip(df.iterrows(), _rowwise_records(df, fields)):
+        grouped.setdefault(tuple(row[c] for c in key_columns), []).append(record)
+    return grouped
+
+
+def _run_loader(kb_path: str, method: str, rowwise: bool, results) -> None:
+    from annotation_engine import evidence_aggregator
+    from annotation_engine.evidence_aggregator import KnowledgeBaseLoader
+
+    if rowwise:
+        evidence_aggregator.read_kb_table = _rowwise_read
+        evidence_aggregator.build_records = _rowwise_records
+        evidence_aggregator.records_by_key = _rowwise_records_by_key
+        evidence_aggregator.grouped_records = _rowwise_grouped_records
+
+    loader = KnowledgeBaseLoader(kb_path)
+    gc.collect()
+    baseline, baseline_peak = _current_rss_mb(), _peak_rss_mb()
+    start = time.perf_counter()
+    loaded = getattr(loader, method)()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    results.put((elapsed, _peak_rss_mb() - baseline_peak, _current_rss_mb() - baseline, len(loaded)))
+
+
+def _measure(kb_path: Path, method: str, rowwise: bool):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run_loader, args=(str(kb_path), method, rowwise, results))
+    process.start()
+    outcome = results.get()
+    process.join()
+    return outcome
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--kb-path", type=Path, help="Existing KB tree (default: synthetic)")
+    parser.add_argument("--rows", type=int, default=100000, help="Rows per synthetic table")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb_path = args.kb_path
+        if kb_path is None:
+            kb_path = Path(tmp)
+            print(f"Writing synthetic KB ({args.rows:,} rows per table)...")
+            write_synthetic_kb(kb_path, args.rows)
+
+        print(f"\n{'':<36}{'seconds':^28}{'peak RSS MB':^20}{'held RSS MB':^20}")
+        print(f"{'KB loader':<26}{'entries':>10}{'iterrows':>10}{'vector':>9}{'speedup':>9}"
+              f"{'iterrows':>10}{'vector':>10}{'iterrows':>10}{'vector':>10}")
+        for method, rel_path in KB_TABLES.items():
+            if not (kb_path / rel_path).exists():
+                continue
+            old_s, old_peak, old_held, entries = _measure(kb_path, method, rowwise=True)
+            new_s, new_peak, new_held, _ = _measure(kb_path, method, rowwise=False)
+            print(f"{method:<26}{entries:>10,}{old_s:>10.2f}{new_s:>9.2f}{old_s / max(new_s, 1e-9):>8.1f}x"
+                  f"{old_peak:>10.1f}{new_peak:>10.1f}{old_held:>10.1f}{new_held:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,32 @@
 """
 AlphaMissense Pathogenicity Prediction Integration
 
-Provides lookup functionality for AlphaMissense pathogenicity scores
-using flat file TSV format for fast variant annotation.
+Provides lookup functionality for AlphaMissense pathogenicity scores.
+Uses a bgzip + tabix indexed copy of the TSV for random access when one is
+available (built by `annotation-engine --build-alphamissense-index`, see
+AlphaMissenseLoader.build_tabix_index), and otherwise falls back to a single
+sequential sweep of the gzip file per batch of queries.
 """
 
 import gzip
 import logging
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Any
-import pandas as pd
+from typing import Dict, List, Optional, Tuple, Any, Sequence
 from functools import lru_cache
 
+try:
+    import pysam
+except ImportError:
+    pysam = None
+
 logger = logging.getLogger(__name__)
 
+# Queries closer than this on a chromosome are resolved with one tabix fetch
+TABIX_WINDOW_GAP = 10000
+
+VariantQuery = Tuple[str, int, str, str]
+
 
 class AlphaMissenseLoader:
     """Load and query AlphaMissense pathogenicity predictions"""
@@ -25,75 +38,186 @@ class AlphaMissenseLoader:
         self.refs_dir = Path(refs_dir)
         self.alphamissense_dir = self.refs_dir / "alphamissense"
         self.data_file = self.alphamissense_dir / "AlphaMissense_hg38.tsv.gz"
+        self.indexed_file = self.alphamissense_dir / "AlphaMissense_hg38.tsv.bgz"
+        
+        # Tabix handle (opened lazily)
+        self._tabix_handle = None
+        self._tabix_checked = False
+    
+    @staticmethod
+    def _normalize_chrom(chromosome: str) -> str:
+        return chromosome if chromosome.startswith('chr') else f'chr{chromosome}'
+    
+    @staticmethod
+    def _parse_record(fields: List[str]) -> Dict[str, Any]:
+        return {
+            'pathogenicity_score': float(fields[8]),
+            'classification': fields[9],
+            'transcript_id': fields[6],
+            'protein_variant': fields[7],
+            'uniprot_id': fields[5],
+            'source': 'AlphaMissense'
+        }
+    
+    def _get_tabix_handle(self):
+        """Get tabix handle for the indexed TSV, opening if necessary"""
+        if self._tabix_checked:
+            return self._tabix_handle
+        self._tabix_checked = True
         
-        # Cache for loaded data
-        self._data_cache = None
-        self._index_cache = None
+        if pysam is None:
+            return None
         
-    def _scan_for_variant(self, chromosome: str, position: int, 
-                         reference: str, alternate: str) -> Optional[Dict[str, Any]]:
-        """Scan AlphaMissense file for specific variant (memory efficient)"""
-        if not self.data_file.exists():
+        index_file = Path(str(self.indexed_file) + ".tbi")
+        if not (self.indexed_file.exists() and index_file.exists()):
+            logger.debug(f"No tabix-indexed AlphaMissense file at {self.indexed_file}; using linear scans")
             return None
         
-        # Clean chromosome name
-        chrom = chromosome if chromosome.startswith('chr') else f'chr{chromosome}'
+        try:
+            self._tabix_handle = pysam.TabixFile(str(self.indexed_file))
+            logger.info(f"Opened tabix-indexed AlphaMissense file: {self.indexed_file}")
+        except Exception as e:
+            logger.warning(f"Failed to open tabix-indexed AlphaMissense file: {e}")
+            self._tabix_handle = None
+        
+        return self._tabix_handle
+    
+    def build_tabix_index(self) -> Path:
+        """
+        Recompress the AlphaMissense TSV with bgzip and build a tabix index
+        
+        One-off preparation step; afterwards lookups are random-access.
+        
+        Returns:
+            Path to the indexed .bgz file
+        """
+        if pysam is None:
+            raise RuntimeError("pysam is required to build the AlphaMissense tabix index")
+        if not self.data_file.exists():
+            raise FileNotFoundError(f"AlphaMissense file not found: {self.data_file}")
+        
+        plain_file = self.indexed_file.with_suffix(".tmp.tsv")
+        with gzip.open(self.data_file, 'rt') as src, open(plain_file, 'w') as dst:
+            for line in src:
+                dst.write(line)
+        
+        try:
+            pysam.tabix_compress(str(plain_file), str(self.indexed_file), force=True)
+            pysam.tabix_index(str(self.indexed_file), seq_col=0, start_col=1, end_col=1,
+                              meta_char='#', zerobased=False, force=True)
+        finally:
+            plain_file.unlink(missing_ok=True)
+        
+        # Reopen with the new index on next lookup
+        self._tabix_checked = False
+        self._tabix_handle = None
+        logger.info(f"Built tabix-indexed AlphaMissense file: {self.indexed_file}")
+        return self.indexed_file
+    
+    def _fetch_tabix(self, tabix, chrom: str, start: int, end: int,
+                     wanted: Dict[Tuple[int, str, str], List[int]],
+                     results: List[Optional[Dict[str, Any]]]) -> None:
+        """Resolve queries in [start, end] on chrom with one tabix fetch (first matching row wins)"""
+        try:
+            rows = tabix.fetch(chrom, start - 1, end)
+        except ValueError:
+            # Contig absent from the index
+            return
+        for line in rows:
+            fields = line.split('\t')
+            if len(fields) < 10:
+                continue
+            slots = wanted.get((int(fields[1]), fields[2], fields[3]))
+            if slots and results[slots[0]] is None:
+                record = self._parse_record(fields)
+                for slot in slots:
+                    results[slot] = record
+    
+    def _lookup_batch_tabix(self, tabix, queries: Dict[str, Dict[Tuple[int, str, str], List[int]]],
+                            results: List[Optional[Dict[str, Any]]]) -> None:
+        """Sorted per-chromosome sweep: nearby queries share a fetch window"""
+        for chrom, wanted in queries.items():
+            positions = sorted({pos for pos, _, _ in wanted})
+            window_start = window_end = positions[0]
+            for pos in positions[1:]:
+                if pos - window_end > TABIX_WINDOW_GAP:
+                    self._fetch_tabix(tabix, chrom, window_start, window_end, wanted, results)
+                    window_start = pos
+                window_end = pos
+            self._fetch_tabix(tabix, chrom, window_start, window_end, wanted, results)
+    
+    def _lookup_batch_scan(self, queries: Dict[str, Dict[Tuple[int, str, str], List[int]]],
+                           results: List[Optional[Dict[str, Any]]]) -> None:
+        """One sequential pass over the gzip TSV resolving every query (first matching row wins)"""
+        remaining = sum(len(wanted) for wanted in queries.values())
+        max_position = {chrom: max(pos for pos, _, _ in wanted) for chrom, wanted in queries.items()}
         
         try:
             with gzip.open(self.data_file, 'rt') as f:
-                header_found = False
-                
                 for line_num, line in enumerate(f):
-                    # Skip copyright lines
-                    if line.startswith('#') and not line.startswith('#CHROM'):
-                        continue
-                    
-                    # Parse header
-                    if line.startswith('#CHROM'):
-                        header_found = True
+                    # Skip copyright lines and header
+                    if line.startswith('#'):
                         continue
                     
-                    if not header_found:
+                    fields = line.split('\t', 4)
+                    wanted = queries.get(fields[0])
+                    if wanted is None:
                         continue
                     
-                    # Parse data line
-                    fields = line.strip().split('\t')
-                    if len(fields) < 10:
+                    position = int(fields[1])
+                    # Past the last query on this chromosome (file is position-sorted)
+                    if position > max_position[fields[0]]:
                         continue
                     
-                    file_chrom = fields[0]
-                    file_pos = int(fields[1])
-                    file_ref = fields[2]
-                    file_alt = fields[3]
-                    
-                    # Check for match
-                    if (file_chrom == chrom and 
-                        file_pos == position and 
-                        file_ref == reference and 
-                        file_alt == alternate):
-                        
-                        return {
-                            'pathogenicity_score': float(fields[8]),
-                            'classification': fields[9],
-                            'transcript_id': fields[6],
-                            'protein_variant': fields[7],
-                            'uniprot_id': fields[5],
-                            'source': 'AlphaMissense'
-                        }
-                    
-                    # Early termination if we've passed the position (assuming sorted)
-                    if file_chrom == chrom and file_pos > position:
-                        break
+                    slots = wanted.get((position, fields[2], fields[3]))
+                    if slots and results[slots[0]] is None:
+                        full_fields = line.rstrip('\n').split('\t')
+                        if len(full_fields) < 10:
+                            continue
+                        record = self._parse_record(full_fields)
+                        for slot in slots:
+                            results[slot] = record
+                        # Counted once per distinct key; repeated rows are skipped above
+                        remaining -= 1
+                        if remaining == 0:
+                            break
                     
                     # Progress logging for large files
                     if line_num % 1000000 == 0:
                         logger.debug(f"Scanned {line_num} AlphaMissense lines...")
-                        
-            return None
-            
+        
         except Exception as e:
             logger.debug(f"AlphaMissense scan failed: {e}")
-            return None
+    
+    def lookup_batch(self, variants: Sequence[VariantQuery]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up AlphaMissense predictions for many variants at once
+        
+        Queries are grouped by chromosome and sorted by position, then resolved
+        with one tabix sweep per chromosome (or a single pass over the gzip
+        file when no index is available).
+        
+        Args:
+            variants: (chromosome, position, reference, alternate) tuples
+            
+        Returns:
+            Prediction dictionaries (or None) in input order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(variants)
+        if not variants or not (self.indexed_file.exists() or self.data_file.exists()):
+            return results
+        
+        queries: Dict[str, Dict[Tuple[int, str, str], List[int]]] = defaultdict(lambda: defaultdict(list))
+        for slot, (chromosome, position, reference, alternate) in enumerate(variants):
+            queries[self._normalize_chrom(chromosome)][(int(position), reference, alternate)].append(slot)
+        
+        tabix = self._get_tabix_handle()
+        if tabix is not None:
+            self._lookup_batch_tabix(tabix, queries, results)
+        elif self.data_file.exists():
+            self._lookup_batch_scan(queries, results)
+        
+        return results
     
     @lru_cache(maxsize=1000)
     def lookup_variant(self, chromosome: str, position: int, 
@@ -110,18 +234,20 @@ class AlphaMissenseLoader:
         Returns:
             Dictionary with pathogenicity score and classification, or None
         """
-        return self._scan_for_variant(chromosome, position, reference, alternate)
+        return self.lookup_batch([(chromosome, position, reference, alternate)])[0]
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about AlphaMissense data availability"""
-        if not self.data_file.exists():
+        data_file = self.indexed_file if self.indexed_file.exists() else self.data_file
+        if not data_file.exists():
             return {"total_variants": 0, "available": False}
         
         # Basic file stats without loading everything
         stats = {
             "available": True,
-            "file_path": str(self.data_file),
-            "file_size_mb": round(self.data_file.stat().st_size / (1024*1024), 1)
+            "file_path": str(data_file),
+            "file_size_mb": round(data_file.stat().st_size / (1024*1024), 1),
+            "indexed": self._get_tabix_handle() is not None
         }
         
         return stats
@@ -0,0 +1,292 @@
+"""
+Persistent Variant Annotation Cache
+
+Content-addressed, on-disk cache of VEP-derived VariantAnnotation objects so
+recurrent variants (BRAF V600E, KRAS G12, TP53 R248...) are annotated once
+rather than on every case.
+
+Entries are keyed by the normalized allele (chrom, pos, ref, alt) within a
+namespace derived from the assembly, VEP release, active plugin set and KB
+source fingerprint, so upgrading any of them silently starts a fresh
+namespace. Storage is a single SQLite file (WAL mode, safe for concurrent
+readers and shared between processes); the database size is bounded and
+least-recently-used entries are evicted.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from .models import VariantAnnotation
+
+logger = logging.getLogger(__name__)
+
+ANNOTATION_CACHE_ENV = "ANNOTATION_ENGINE_ANNOTATION_CACHE"
+DEFAULT_MAX_CACHE_SIZE_MB = 512
+
+# Evict down to this fraction of the size bound so eviction isn't run on every write
+_EVICTION_TARGET = 0.9
+# SQLite's default host-parameter limit is 999
+_QUERY_BATCH_SIZE = 500
+
+# Per-sample fields that must never be served from another case's annotation
+SAMPLE_SPECIFIC_FIELDS = {
+    "quality_score": None,
+    "filter_status": [],
+    "total_depth": None,
+    "vaf": None,
+    "tumor_vaf": None,
+    "normal_vaf": None,
+    "tumor_purity": None,
+}
+
+VariantKey = Tuple[str, int, str, str]
+
+
+def normalize_allele(chromosome: Any, position: int, reference: str, alternate: str) -> VariantKey:
+    """
+    Normalize a variant for cache keying
+
+    Strips any chr prefix, upper-cases alleles and trims bases shared by
+    REF and ALT (suffix first, then prefix, keeping at least one base each)
+    so that equivalent VCF representations share a key.
+    """
+    chrom = str(chromosome).strip()
+    if chrom.lower().startswith("chr"):
+        chrom = chrom[3:]
+    chrom = chrom.upper()
+    if chrom == "M":
+        chrom = "MT"
+
+    ref, alt, pos = reference.upper(), alternate.upper(), int(position)
+    while len(ref) > 1 and len(alt) > 1 and ref[-1] == alt[-1]:
+        ref, alt = ref[:-1], alt[:-1]
+    while len(ref) > 1 and len(alt) > 1 and ref[0] == alt[0]:
+        ref, alt, pos = ref[1:], alt[1:], pos + 1
+    return chrom, pos, ref, alt
+
+
+def cache_namespace(assembly: str, vep_release: str, plugins: Iterable[str],
+                    kb_fingerprint: str) -> str:
+    """
+    Digest of everything besides the allele that determines an annotation
+
+    kb_fingerprint must describe the KB sources themselves (see
+    evidence_aggregator.get_kb_fingerprint), not how or whether they have
+    been loaded, so a process uses the same namespace for its whole lifetime.
+    """
+    payload = json.dumps({
+        "assembly": assembly,
+        "vep_release": vep_release,
+        "plugins": sorted(plugins),
+        "kb": kb_fingerprint,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+@dataclass
+class AnnotationCacheStats:
+    """Annotation cache performance statistics"""
+    lookups: int = 0
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_mb: float = 0.0
+    hit_rate: float = 0.0
+
+
+class VariantAnnotationCache:
+    """SQLite-backed, size-bounded cache of VariantAnnotation objects"""
+
+    def __init__(self, path: Path, max_cache_size_mb: int = DEFAULT_MAX_CACHE_SIZE_MB):
+        """
+        Open (or create) an annotation cache
+
+        Args:
+            path: SQLite database file
+            max_cache_size_mb: Upper bound on the database size
+        """
+        self.path = Path(path)
+        self.max_cache_size_bytes = int(max_cache_size_mb * 1024 * 1024)
+        self.stats = AnnotationCacheStats()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS annotations ("
+            " namespace TEXT NOT NULL,"
+            " variant_key TEXT NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " PRIMARY KEY (namespace, variant_key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS annotations_lru ON annotations (last_access)")
+
+    @staticmethod
+    def variant_key(chromosome: Any, position: int, reference: str, alternate: str) -> str:
+        return "{}:{}:{}>{}".format(*normalize_allele(chromosome, position, reference, alternate))
+
+    def get_many(self, namespace: str,
+                 variants: Sequence[VariantKey]) -> Dict[str, VariantAnnotation]:
+        """
+        Look up many variants at once
+
+        Args:
+            namespace: Value from cache_namespace()
+            variants: (chrom, pos, ref, alt) tuples
+
+        Returns:
+            Cached annotations by variant_key(); misses are absent
+        """
+        keys = list(dict.fromkeys(self.variant_key(*v) for v in variants))
+        found: Dict[str, VariantAnnotation] = {}
+
+        with self._lock:
+            for start in range(0, len(keys), _QUERY_BATCH_SIZE):
+                batch = keys[start:start + _QUERY_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT variant_key, payload FROM annotations "
+                    f"WHERE namespace = ? AND variant_key IN ({placeholders})",
+                    [namespace, *batch],
+                ).fetchall()
+                for key, payload in rows:
+                    try:
+                        found[key] = VariantAnnotation.model_validate_json(gzip.decompress(payload))
+                    except Exception as e:
+                        logger.warning(f"Dropping unreadable annotation cache entry {key}: {e}")
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE annotations SET last_access = ? WHERE namespace = ? AND variant_key = ?",
+                    [(now, namespace, key) for key in found],
+                )
+
+            self.stats.lookups += len(variants)
+            hits = sum(1 for v in variants if self.variant_key(*v) in found)
+            self.stats.hits += hits
+            self.stats.misses += len(variants) - hits
+
+        logger.debug(f"Annotation cache: {hits}/{len(variants)} hits")
+        return found
+
+    def put_many(self, namespace: str, annotations: Iterable[VariantAnnotation]) -> int:
+        """
+        Store VEP-derived annotations, stripped of per-sample fields
+
+        Returns:
+            Number of entries written
+        """
+        now = time.time()
+        rows = []
+        for annotation in annotations:
+            key = self.variant_key(annotation.chromosome, annotation.position,
+                                   annotation.reference, annotation.alternate)
+            shared = annotation.model_copy(update=SAMPLE_SPECIFIC_FIELDS)
+            payload = gzip.compress(shared.model_dump_json().encode(), compresslevel=6)
+            rows.append((namespace, key, payload, len(payload), now))
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO annotations VALUES (?, ?, ?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self.stats.writes += len(rows)
+            if self._database_size_bytes() > self.max_cache_size_bytes:
+                self._evict_locked()
+
+        return len(rows)
+
+    def _database_size_bytes(self) -> int:
+        """
+        Bytes in use by the database, as seen by every connection
+
+        Read from SQLite rather than tracked per process, since several
+        workers share one WAL database. Free-list pages are excluded because
+        deleted rows are reused before the file grows.
+        """
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def _evict_locked(self) -> None:
+        """Drop least-recently-used entries until under the eviction target"""
+        excess = self._database_size_bytes() - self.max_cache_size_bytes * _EVICTION_TARGET
+        cursor = self._conn.execute(
+            "SELECT namespace, variant_key, size FROM annotations ORDER BY last_access"
+        )
+        doomed = []
+        for namespace, key, entry_size in cursor:
+            if excess <= 0:
+                break
+            doomed.append((namespace, key))
+            excess -= entry_size
+        cursor.close()
+
+        if doomed:
+            self._conn.executemany(
+                "DELETE FROM annotations WHERE namespace = ? AND variant_key = ?", doomed
+            )
+            self.stats.evictions += len(doomed)
+            logger.info(f"Annotation cache evicted {len(doomed)} entries "
+                        f"({self._database_size_bytes() / 1e6:.1f} MB retained)")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM annotations")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Hit-rate and size metrics"""
+        with self._lock:
+            self.stats.entries = self._conn.execute("SELECT COUNT(*) FROM annotations").fetchone()[0]
+            self.stats.size_mb = round(self._database_size_bytes() / (1024 * 1024), 3)
+        self.stats.hit_rate = self.stats.hits / self.stats.lookups if self.stats.lookups else 0.0
+        return asdict(self.stats)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Global cache instance, opened on first use when configured
+_annotation_cache: Optional[VariantAnnotationCache] = None
+
+
+def get_annotation_cache() -> Optional[VariantAnnotationCache]:
+    """
+    Shared annotation cache at $ANNOTATION_ENGINE_ANNOTATION_CACHE, if set
+
+    Caching is opt-in so test runs and one-off invocations never populate a
+    cache with annotations from mocked or ad-hoc VEP configurations.
+    """
+    global _annotation_cache
+
+    cache_path = os.environ.get(ANNOTATION_CACHE_ENV)
+    if not cache_path:
+        return None
+    if _annotation_cache is None or _annotation_cache.path != Path(cache_path):
+        _annotation_cache = VariantAnnotationCache(Path(cache_path))
+    return _annotation_cache
@@ -51,6 +51,9 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
     
+    # Technical filtering settings
+    TECH_FILTER_MAX_CONCURRENT_JOBS: int = 2  # bcftools pipelines running at once
+    
     # Email settings (for notifications)
     SMTP_HOST: Optional[str] = None
     SMTP_PORT: int = 587
@@ -17,6 +17,7 @@ from contextlib import asynccontextmanager
 from .routers import auth, variants, cases, interpretations, evidence, search, analytics, users, jobs, tech_filtering
 from .core.config import get_settings
 from .core.database import init_database
+from ..db.audit_trail import close_audit_writer
 from .core.security import get_current_user
 from .middleware.audit import AuditMiddleware
 from .middleware.rate_limit import RateLimitMiddleware
@@ -44,6 +45,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Annotation Engine API...")
+    
+    # Write queued audit events before exiting
+    close_audit_writer()
 
 
 # Create FastAPI application
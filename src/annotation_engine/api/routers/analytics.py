@@ -2,7 +2,8 @@
 Analytics and dashboard endpoints
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Dict, Any, Optional
 import time
@@ -10,6 +11,7 @@ from datetime import datetime, timedelta
 
 from ..core.database import get_db, check_db_health
 from ..core.security import get_current_user, require_read_cases
+from ...db.audit_trail import get_audit_manager
 
 router = APIRouter()
 
@@ -121,6 +123,35 @@ async def get_audit_trail(
     }
 
 
+@router.get("/audit/trail/export")
+async def export_audit_trail(
+    format: str = Query("ndjson", description="Export format (ndjson, csv)"),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD, inclusive)"),
+    user_id: Optional[str] = Query(None),
+    case_uid: Optional[str] = Query(None),
+    current_user: Dict[str, Any] = Depends(require_read_cases)
+):
+    """Stream the audit trail as NDJSON or CSV without loading it into memory"""
+    
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
+        end = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1, microseconds=-1) if end_date else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    
+    events = get_audit_manager().iter_audit_export(
+        format, start_date=start, end_date=end, user_id=user_id, case_uid=case_uid
+    )
+    return StreamingResponse(
+        events,
+        media_type="application/x-ndjson" if format == "ndjson" else "text/csv",
+        headers={"Content-Disposition": f'attachment; filename="audit_trail.{format}"'}
+    )
+
+
 @router.post("/audit/compliance")
 async def generate_compliance_report(
     framework: str = Query(..., description="Compliance framework (HIPAA, CLIA, CAP)"),
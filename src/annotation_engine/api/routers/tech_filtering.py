@@ -2,18 +2,24 @@
 Technical filtering API endpoints for pre-processing VCF files
 """
 
+import asyncio
+import gzip
 import os
-import subprocess
+import signal
+import struct
 import tempfile
+import time
 import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import yaml
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
-from ..core.config import settings
+from ..core.config import get_settings
 from ..validators.vcf_validator import VCFValidator, MetadataValidator, AnalysisMode, VCFValidationError
 
 
@@ -23,6 +29,7 @@ router = APIRouter(prefix="/api/v1/tech-filtering", tags=["technical-filtering"]
 class SampleMetadata(BaseModel):
     patient_uid: Optional[str] = None
     case_id: Optional[str] = None
+    cancer_type: Optional[str] = None  # OncoTree code, required by MetadataValidator
     oncotree_code: Optional[str] = None
     tumor_purity: Optional[float] = None
     specimen_type: Optional[str] = None
@@ -32,7 +39,7 @@ class FilteringRequest(BaseModel):
     mode: str  # 'tumor-only' or 'tumor-normal'
     assay: str = "default_assay"
     input_vcf: str  # Can be single file or comma-separated list for TN
-    filters: Dict[str, any]
+    filters: Dict[str, Any]
     metadata: Optional[SampleMetadata] = None
     tumor_sample_name: Optional[str] = None  # For multi-sample VCF
     normal_sample_name: Optional[str] = None  # For multi-sample VCF
@@ -42,18 +49,106 @@ class FilteringResponse(BaseModel):
     success: bool
     output_vcf: Optional[str] = None
     variant_counts: Optional[Dict[str, int]] = None
+    step_counts: Optional[Dict[str, int]] = None  # Survivors after each filter step, in order
     processing_time: Optional[float] = None
     error: Optional[str] = None
 
 
+class FilterJobStatus(BaseModel):
+    job_id: str
+    status: str  # queued, running, completed, failed, cancelled
+    progress: float  # Fraction of input bytes consumed
+    bytes_read: int
+    bytes_total: int
+    output_vcf: Optional[str] = None
+    variant_counts: Optional[Dict[str, int]] = None
+    step_counts: Optional[Dict[str, int]] = None
+    processing_time: Optional[float] = None
+    error: Optional[str] = None
+
+
+# Uncompressed BCF: "BCF\2\2" magic, uint32 header length, then records
+# each prefixed by uint32 l_shared and l_indiv
+_BCF_MAGIC = b"BCF\x02"
+_RELAY_CHUNK = 1 << 20
+
+
+class BCFRecordCounter:
+    """Counts records in an uncompressed BCF stream fed in arbitrary chunks"""
+    
+    def __init__(self):
+        self.records = 0
+        self._in_header = True
+        self._skip = 0
+        self._partial = b""
+    
+    def feed(self, data: bytes):
+        pos, end = 0, len(data)
+        while pos < end:
+            if self._skip:
+                step = min(self._skip, end - pos)
+                pos += step
+                self._skip -= step
+                continue
+            
+            need = 9 if self._in_header else 8
+            take = need - len(self._partial)
+            prefix = self._partial + data[pos:pos + take]
+            pos += take
+            if len(prefix) < need:
+                self._partial = prefix
+                return
+            self._partial = b""
+            
+            if self._in_header:
+                if prefix[:4] != _BCF_MAGIC:
+                    raise ValueError("Not an uncompressed BCF stream")
+                self._skip = struct.unpack_from("<I", prefix, 5)[0]
+                self._in_header = False
+            else:
+                l_shared, l_indiv = struct.unpack_from("<II", prefix)
+                self._skip = l_shared + l_indiv
+                self.records += 1
+
+
+@dataclass
+class FilterStage:
+    """One bcftools invocation of the filter pipeline, reading BCF/VCF on stdin"""
+    filter_id: str
+    args: List[str]  # bcftools subcommand and its options
+    plugin_args: List[str] = field(default_factory=list)  # Options after "--" for +plugins
+    
+    def argv(self) -> List[str]:
+        argv = ["bcftools", *self.args, "-Ou", "-"]
+        if self.plugin_args:
+            argv += ["--", *self.plugin_args]
+        return argv
+
+
+@dataclass
+class FilterRunResult:
+    """Record counts collected while the pipeline streamed"""
+    input_count: int
+    output_count: int
+    step_counts: Dict[str, int]
+
+
 class BCFtoolsFilterBuilder:
-    """Build sequential bcftools commands based on filter selections"""
+    """
+    Compile filter selections into one streamed bcftools pipeline
+    
+    The input is decoded once into uncompressed BCF, piped through one
+    process per enabled filter and bgzipped once at the end; no
+    intermediate files are written.  Relays between the processes count
+    records as they pass, so per-step survivor counts come from the same
+    pass.  Region filters use -T (streamed targets) rather than -R or isec,
+    which need an indexed, seekable input.
+    """
     
     def __init__(self, mode: str, assay: str):
         self.mode = mode
         self.assay = assay
-        self.commands = []
-        self.temp_files = []
+        self.stages: List[FilterStage] = []
         
         # Load assay configuration
         config_path = Path(__file__).parent.parent.parent.parent.parent / f"resources/assay/{assay}/config.yaml"
@@ -91,119 +186,345 @@ class BCFtoolsFilterBuilder:
         
         return Path("")  # Return empty path if not found
     
+    def _add(self, filter_id: str, *args: str, plugin_args: Optional[List[str]] = None):
+        self.stages.append(FilterStage(filter_id, list(args), plugin_args or []))
+    
     def add_filter(self, filter_id: str, params: any, enabled: bool = True):
-        """Add appropriate bcftools command based on filter type"""
+        """Add the pipeline stage for a filter selection"""
         if not enabled:
             return
             
         if filter_id == "FILTER_PASS" and params:
-            self.commands.append("bcftools view -f PASS")
+            self._add(filter_id, "view", "-f", "PASS")
             
         elif filter_id == "MIN_QUAL":
-            self.commands.append(f"bcftools filter -e 'QUAL<{params}'")
+            self._add(filter_id, "filter", "-e", f"QUAL<{params}")
             
         elif filter_id == "MIN_GQ":
-            self.commands.append(f"bcftools filter -S . -e 'FMT/GQ<{params}'")
+            self._add(filter_id, "filter", "-S", ".", "-e", f"FMT/GQ<{params}")
             
         elif filter_id == "MIN_DP":
-            self.commands.append(f"bcftools filter -S . -e 'FMT/DP<{params}'")
+            self._add(filter_id, "filter", "-S", ".", "-e", f"FMT/DP<{params}")
             
         elif filter_id == "MIN_ALT_COUNT":
-            self.commands.append(f"bcftools filter -S . -e 'FMT/AD[1]<{params}'")
+            self._add(filter_id, "filter", "-S", ".", "-e", f"FMT/AD[1]<{params}")
             
         elif filter_id == "MIN_VAF":
-            # For tumor-normal, check tumor VAF
-            if self.mode == "tumor-normal":
-                self.commands.append(f"bcftools filter -e 'INFO/AF<{params}'")
-            else:
-                self.commands.append(f"bcftools filter -e 'INFO/AF<{params}'")
+            # For tumor-normal this is the tumor (INFO) AF as well
+            self._add(filter_id, "filter", "-e", f"INFO/AF<{params}")
                 
         elif filter_id == "HET_AB_RANGE" and isinstance(params, list):
             min_ab, max_ab = params
-            self.commands.append(
-                f"bcftools +setGT -n . -e 'FMT/AD[1]/(FMT/AD[0]+FMT/AD[1])<{min_ab} || "
-                f"FMT/AD[1]/(FMT/AD[0]+FMT/AD[1])>{max_ab}'"
-            )
+            self._add(filter_id, "+setGT", plugin_args=[
+                "-t", "q", "-n", ".", "-e",
+                f"FMT/AD[1]/(FMT/AD[0]+FMT/AD[1])<{min_ab} || "
+                f"FMT/AD[1]/(FMT/AD[0]+FMT/AD[1])>{max_ab}"
+            ])
             
         elif filter_id == "STRAND_BIAS" and isinstance(params, list):
             fs_max, sor_max = params
-            self.commands.append(f"bcftools filter -e 'INFO/FS>{fs_max} || INFO/SOR>{sor_max}'")
+            self._add(filter_id, "filter", "-e", f"INFO/FS>{fs_max} || INFO/SOR>{sor_max}")
             
         elif filter_id == "MIN_MQ":
-            self.commands.append(f"bcftools filter -e 'INFO/MQ<{params}'")
+            self._add(filter_id, "filter", "-e", f"INFO/MQ<{params}")
             
         elif filter_id == "ROI_ONLY" and params:
             panel_bed = self._get_ref_file_path("panel_bed")
             if panel_bed.exists():
-                self.commands.append(f"bcftools view -R {panel_bed}")
+                self._add(filter_id, "view", "-T", str(panel_bed))
                 
         elif filter_id == "MAX_POP_AF":
             # This would require gnomAD annotation first
-            self.commands.append(f"bcftools filter -e 'INFO/AF_popmax>{params}'")
+            self._add(filter_id, "filter", "-e", f"INFO/AF_popmax>{params}")
             
         elif filter_id == "EFFECT_IMPACT" and isinstance(params, list):
             # Build VEP impact filter
             impact_expr = " && ".join([f'INFO/IMPACT!="{impact}"' for impact in params])
-            self.commands.append(f"bcftools filter -e '{impact_expr}'")
+            self._add(filter_id, "filter", "-e", impact_expr)
             
         elif filter_id == "BLACKLIST" and params:
             blacklist_ref = self._get_ref_file_path("blacklist_ref")
             if blacklist_ref.exists():
-                self.commands.append(f"bcftools isec -C -w1 -o - - {blacklist_ref}")
+                self._add(filter_id, "view", "-T", f"^{blacklist_ref}")
                 
         # Tumor-normal specific filters
         elif filter_id == "NORMAL_VAF_MAX" and self.mode == "tumor-normal":
             # Filter variants with high VAF in normal
-            self.commands.append(f"bcftools filter -e 'NORMAL_AF>{params}'")
+            self._add(filter_id, "filter", "-e", f"NORMAL_AF>{params}")
             
         elif filter_id == "TUMOR_NORMAL_VAF_RATIO" and self.mode == "tumor-normal":
             # Ensure tumor VAF is significantly higher than normal
-            self.commands.append(f"bcftools filter -e 'TUMOR_AF/NORMAL_AF<{params}'")
+            self._add(filter_id, "filter", "-e", f"TUMOR_AF/NORMAL_AF<{params}")
     
-    def build_pipeline(self, input_vcf: str, output_vcf: str) -> List[str]:
-        """Build the complete pipeline of commands"""
-        if not self.commands:
+    def build_pipeline(self, input_vcf: str, output_vcf: str) -> List[List[str]]:
+        """
+        Commands of the streamed pipeline, in order
+        
+        Decode → one stage per filter → bgzip writer; every process but the
+        first reads the previous one's uncompressed BCF on stdin.
+        """
+        if not self.stages:
             return []
-            
-        # Create pipeline with intermediate files
-        pipeline = []
-        current_input = input_vcf
         
-        for i, cmd in enumerate(self.commands):
-            if i == len(self.commands) - 1:
-                # Last command outputs to final file
-                full_cmd = f"{cmd} {current_input} -Oz -o {output_vcf}"
-            else:
-                # Intermediate commands use temp files
-                temp_file = tempfile.mktemp(suffix=".vcf.gz")
-                self.temp_files.append(temp_file)
-                full_cmd = f"{cmd} {current_input} -Oz -o {temp_file}"
-                current_input = temp_file
-                
-            pipeline.append(full_cmd)
+        return ([["bcftools", "view", "-Ou", input_vcf]]
+                + [stage.argv() for stage in self.stages]
+                + [["bcftools", "view", "-Oz", "-o", output_vcf, "-"]])
+    
+    async def run(self, input_vcf: str, output_vcf: str,
+                  on_progress: Optional[Callable[[int, int], None]] = None) -> FilterRunResult:
+        """
+        Stream input_vcf through the pipeline into a bgzipped, indexed output_vcf
+        
+        The input file is fed to the first process from here, so
+        on_progress(bytes_read, bytes_total) tracks how much of it has been
+        consumed.  Each process runs in its own process group; if the run
+        fails or is cancelled, every group still alive is killed.
+        
+        Raises:
+            RuntimeError: If any pipeline process fails
+        """
+        commands = self.build_pipeline("-", output_vcf)
+        if not commands:
+            raise ValueError("No filters selected")
+        
+        bytes_total = os.path.getsize(input_vcf)
+        counters = [BCFRecordCounter() for _ in commands[:-1]]
+        processes: List[asyncio.subprocess.Process] = []
+        stderr_files = [tempfile.TemporaryFile() for _ in commands]
+        try:
+            for i, cmd in enumerate(commands):
+                processes.append(await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE if i < len(commands) - 1 else asyncio.subprocess.DEVNULL,
+                    stderr=stderr_files[i],
+                    start_new_session=True
+                ))
+            relays = [_feed_input(input_vcf, processes[0].stdin, bytes_total, on_progress)]
+            relays += [_relay_counting(processes[i].stdout, processes[i + 1].stdin, counter)
+                       for i, counter in enumerate(counters)]
+            relay_errors = [r for r in await asyncio.gather(*relays, return_exceptions=True)
+                            if isinstance(r, Exception)]
+            if relay_errors:
+                _kill_process_groups(processes)
             
-        # Add indexing command
-        pipeline.append(f"tabix -p vcf {output_vcf}")
+            failures = []
+            for cmd, process, stderr_file in zip(commands, processes, stderr_files):
+                if await process.wait() != 0:
+                    stderr_file.seek(0)
+                    failures.append(f"{' '.join(cmd)}: {stderr_file.read().decode(errors='replace').strip()}")
+            if failures or relay_errors:
+                raise RuntimeError("Filter pipeline failed: " + "; ".join(failures + [str(e) for e in relay_errors]))
+        finally:
+            _kill_process_groups(processes)
+            await _reap_processes(processes)
+            for stderr_file in stderr_files:
+                stderr_file.close()
+        
+        index = await asyncio.create_subprocess_exec(
+            "tabix", "-p", "vcf", output_vcf,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        _, index_stderr = await index.communicate()
+        if index.returncode != 0:
+            raise RuntimeError(f"Indexing failed: {index_stderr.decode(errors='replace')}")
         
-        return pipeline
+        return FilterRunResult(
+            input_count=counters[0].records,
+            output_count=counters[-1].records,
+            step_counts={stage.filter_id: counter.records
+                         for stage, counter in zip(self.stages, counters[1:])}
+        )
+
+
+async def _feed_input(path: str, sink: asyncio.StreamWriter, bytes_total: int,
+                      on_progress: Optional[Callable[[int, int], None]]):
+    """Write the input file to the first pipeline process, reporting bytes consumed"""
+    loop = asyncio.get_running_loop()
+    bytes_read = 0
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = await loop.run_in_executor(None, f.read, _RELAY_CHUNK)
+                if not chunk:
+                    break
+                sink.write(chunk)
+                await sink.drain()
+                bytes_read += len(chunk)
+                if on_progress:
+                    on_progress(bytes_read, bytes_total)
+    except (BrokenPipeError, ConnectionResetError):
+        pass  # The decoder exited; its return code reports why
+    finally:
+        sink.close()
+
+
+async def _relay_counting(source: asyncio.StreamReader, sink: asyncio.StreamWriter,
+                          counter: BCFRecordCounter):
+    """Copy one pipeline process's stdout to the next one's stdin, counting BCF records"""
+    try:
+        while True:
+            chunk = await source.read(_RELAY_CHUNK)
+            if not chunk:
+                break
+            counter.feed(chunk)
+            if sink is not None:
+                try:
+                    sink.write(chunk)
+                    await sink.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    # Downstream exited; drain upstream so it can finish
+                    sink.close()
+                    sink = None
+    finally:
+        if sink is not None:
+            sink.close()
+
+
+def _kill_process_groups(processes: List[asyncio.subprocess.Process]):
+    for process in processes:
+        if process.returncode is None:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+
+async def _reap_processes(processes: List[asyncio.subprocess.Process]):
+    """Wait for pipeline processes, closing their pipes so wait() can return"""
+    for process in processes:
+        if process.stdin is not None:
+            process.stdin.close()
+        if process.stdout is not None:
+            # Reading may be paused by flow control; drain to see EOF
+            while await process.stdout.read(_RELAY_CHUNK):
+                pass
+        await process.wait()
+
+
+@dataclass
+class FilterJob:
+    """Handle of one filter run tracked by FilterJobManager"""
+    job_id: str
+    output_vcf: str
+    bytes_total: int
+    status: str = "queued"
+    bytes_read: int = 0
+    result: Optional[FilterRunResult] = None
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    task: Optional[asyncio.Task] = None
+    
+    def update_progress(self, bytes_read: int, bytes_total: int):
+        self.bytes_read = bytes_read
+        self.bytes_total = bytes_total
+    
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
     
-    def cleanup(self):
-        """Remove temporary files"""
-        for temp_file in self.temp_files:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+    def to_status(self) -> FilterJobStatus:
+        return FilterJobStatus(
+            job_id=self.job_id,
+            status=self.status,
+            progress=self.bytes_read / self.bytes_total if self.bytes_total else float(self.done),
+            bytes_read=self.bytes_read,
+            bytes_total=self.bytes_total,
+            output_vcf=self.output_vcf if self.status == "completed" else None,
+            variant_counts={
+                "input": self.result.input_count,
+                "filtered": self.result.output_count
+            } if self.result else None,
+            step_counts=self.result.step_counts if self.result else None,
+            processing_time=(self.finished_at or time.time()) - self.submitted_at,
+            error=self.error
+        )
 
 
-@router.post("/apply")
-async def apply_technical_filters(
-    request: FilteringRequest,
-    background_tasks: BackgroundTasks
-) -> FilteringResponse:
-    """Apply technical filters to VCF file"""
+class FilterJobManager:
+    """
+    Runs filter pipelines as background jobs on the event loop
+    
+    At most max_concurrent pipelines run at once; later submissions wait
+    as "queued".  Finished jobs are kept for status queries until more
+    than max_retained have accumulated.
+    """
+    
+    def __init__(self, max_concurrent: int = 2, max_retained: int = 200):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_retained = max_retained
+        self.jobs: Dict[str, FilterJob] = {}
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+    
+    def submit(self, builder: BCFtoolsFilterBuilder, input_vcf: str, output_vcf: str) -> FilterJob:
+        job = FilterJob(
+            job_id=uuid.uuid4().hex,
+            output_vcf=output_vcf,
+            bytes_total=os.path.getsize(input_vcf)
+        )
+        self._prune()
+        self.jobs[job.job_id] = job
+        job.task = asyncio.create_task(self._run(job, builder, input_vcf))
+        return job
     
-    import time
-    start_time = time.time()
+    def get(self, job_id: str) -> Optional[FilterJob]:
+        return self.jobs.get(job_id)
     
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job, killing its processes"""
+        job = self.jobs.get(job_id)
+        if job is None or job.done or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+    
+    async def _run(self, job: FilterJob, builder: BCFtoolsFilterBuilder, input_vcf: str):
+        try:
+            async with self._slots:
+                job.status = "running"
+                job.started_at = time.time()
+                job.result = await builder.run(input_vcf, job.output_vcf, on_progress=job.update_progress)
+                job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+    
+    def _prune(self):
+        excess = len(self.jobs) + 1 - self.max_retained
+        if excess <= 0:
+            return
+        finished = sorted((job for job in self.jobs.values() if job.done), key=lambda j: j.finished_at)
+        for job in finished[:excess]:
+            del self.jobs[job.job_id]
+
+
+@lru_cache()
+def get_filter_jobs() -> FilterJobManager:
+    """Process-wide filter job manager, created on first request"""
+    return FilterJobManager(max_concurrent=get_settings().TECH_FILTER_MAX_CONCURRENT_JOBS)
+
+
+class FilterRequestError(Exception):
+    """A filtering request that cannot be run"""
+
+
+async def _prepare_filter_run(request: FilteringRequest) -> Tuple[BCFtoolsFilterBuilder, str, Path]:
+    """
+    Validate a filtering request and build its pipeline
+    
+    Returns:
+        (builder, input VCF path, output VCF path)
+    
+    Raises:
+        FilterRequestError: If validation fails or no filter is enabled
+    """
     # Parse input VCF paths (single or comma-separated)
     vcf_paths = [p.strip() for p in request.input_vcf.split(',')]
     
@@ -218,25 +539,20 @@ async def apply_technical_filters(
             
             MetadataValidator.validate(metadata_dict)
     except VCFValidationError as e:
-        return FilteringResponse(
-            success=False,
-            error=f"Metadata validation failed: {str(e)}"
-        )
+        raise FilterRequestError(f"Metadata validation failed: {str(e)}")
     
-    # Validate VCF files against mode
+    # Validate VCF files against mode (reads the files, so off the event loop)
     validator = VCFValidator()
     try:
         analysis_mode = AnalysisMode.TUMOR_ONLY if request.mode == "tumor-only" else AnalysisMode.TUMOR_NORMAL
-        validation_result = validator.validate_vcf_for_mode(
+        validation_result = await asyncio.to_thread(
+            validator.validate_vcf_for_mode,
             vcf_paths, 
             analysis_mode,
             metadata_dict if request.metadata else None
         )
     except VCFValidationError as e:
-        return FilteringResponse(
-            success=False,
-            error=f"VCF validation failed: {str(e)}"
-        )
+        raise FilterRequestError(f"VCF validation failed: {str(e)}")
     
     # For multi-sample VCFs in TN mode, we need to split samples
     if validation_result.get('multi_sample') and len(vcf_paths) == 1:
@@ -264,94 +580,139 @@ async def apply_technical_filters(
             
         builder.add_filter(filter_id, value, enabled)
     
-    # Get pipeline commands
-    commands = builder.build_pipeline(request.input_vcf, str(output_path))
+    if not builder.stages:
+        raise FilterRequestError("No filters selected")
     
-    if not commands:
-        return FilteringResponse(
-            success=False,
-            error="No filters selected"
-        )
+    # The (tumor) VCF is streamed through all filters in one pass
+    return builder, vcf_paths[0], output_path
+
+
+@router.post("/apply")
+async def apply_technical_filters(
+    request: FilteringRequest,
+    filter_jobs: FilterJobManager = Depends(get_filter_jobs)
+) -> FilteringResponse:
+    """Apply technical filters to VCF file and wait for the result"""
     
     try:
-        # Execute commands sequentially
-        for cmd in commands:
-            print(f"Executing: {cmd}")
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                raise Exception(f"Command failed: {result.stderr}")
-        
-        # Get variant counts
-        input_count = get_variant_count(request.input_vcf)
-        output_count = get_variant_count(str(output_path))
-        
-        # Clean up temp files in background
-        background_tasks.add_task(builder.cleanup)
-        
-        processing_time = time.time() - start_time
-        
+        builder, input_vcf, output_path = await _prepare_filter_run(request)
+        job = filter_jobs.submit(builder, input_vcf, str(output_path))
+    except FilterRequestError as e:
         return FilteringResponse(
-            success=True,
-            output_vcf=str(output_path),
-            variant_counts={
-                "input": input_count,
-                "filtered": output_count
-            },
-            processing_time=processing_time
+            success=False,
+            error=str(e)
         )
-        
-    except Exception as e:
-        builder.cleanup()
+    
+    # Waiting does not block the event loop; the job runs under the concurrency cap
+    await asyncio.wait({job.task})
+    status = job.to_status()
+    
+    if job.status != "completed":
         return FilteringResponse(
             success=False,
-            error=str(e)
+            error=job.error or f"Filtering {job.status}"
         )
+    
+    return FilteringResponse(
+        success=True,
+        output_vcf=status.output_vcf,
+        variant_counts=status.variant_counts,
+        step_counts=status.step_counts,
+        processing_time=status.processing_time
+    )
+
+
+@router.post("/jobs", status_code=202)
+async def submit_filter_job(
+    request: FilteringRequest,
+    filter_jobs: FilterJobManager = Depends(get_filter_jobs)
+) -> FilterJobStatus:
+    """Start a filter run in the background and return its job handle"""
+    try:
+        builder, input_vcf, output_path = await _prepare_filter_run(request)
+    except FilterRequestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return filter_jobs.submit(builder, input_vcf, str(output_path)).to_status()
+
+
+@router.get("/jobs/{job_id}")
+async def get_filter_job(
+    job_id: str,
+    filter_jobs: FilterJobManager = Depends(get_filter_jobs)
+) -> FilterJobStatus:
+    """Status and progress (fraction of input bytes consumed) of a filter job"""
+    job = filter_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Filter job {job_id} not found")
+    return job.to_status()
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_filter_job(
+    job_id: str,
+    filter_jobs: FilterJobManager = Depends(get_filter_jobs)
+) -> FilterJobStatus:
+    """Cancel a queued or running filter job, killing its bcftools processes"""
+    job = filter_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Filter job {job_id} not found")
+    if filter_jobs.cancel(job_id):
+        await asyncio.wait({job.task})
+    return job.to_status()
 
 
 @router.get("/variant-count")
 async def get_variant_count_endpoint(vcf_path: str) -> Dict[str, int]:
     """Get number of variants in a VCF file"""
     try:
-        count = get_variant_count(vcf_path)
+        count = await get_variant_count(vcf_path)
         return {"count": count}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-def get_variant_count(vcf_path: str) -> int:
-    """Count variants in VCF file using bcftools"""
+async def get_variant_count(vcf_path: str) -> int:
+    """Count variants in VCF file using bcftools, streaming its output"""
     try:
-        # Use bcftools to count variants
-        cmd = f"bcftools view -H {vcf_path} | wc -l"
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True
+        process = await asyncio.create_subprocess_exec(
+            "bcftools", "view", "-H", vcf_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True
         )
+    except FileNotFoundError:
+        process = None
+    
+    try:
+        if process is not None:
+            count = 0
+            try:
+                while True:
+                    chunk = await process.stdout.read(_RELAY_CHUNK)
+                    if not chunk:
+                        break
+                    count += chunk.count(b"\n")
+            except BaseException:
+                _kill_process_groups([process])
+                raise
+            
+            if await process.wait() == 0:
+                return count
         
-        if result.returncode == 0:
-            return int(result.stdout.strip())
-        else:
-            # Fallback: try without bcftools
-            if vcf_path.endswith(".gz"):
-                cmd = f"zgrep -v '^#' {vcf_path} | wc -l"
-            else:
-                cmd = f"grep -v '^#' {vcf_path} | wc -l"
-                
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            return int(result.stdout.strip())
+        # Fallback: count without bcftools
+        return await asyncio.to_thread(_count_vcf_records, vcf_path)
             
     except Exception:
         return 0
 
 
+def _count_vcf_records(vcf_path: str) -> int:
+    opener = gzip.open if vcf_path.endswith(".gz") else open
+    with opener(vcf_path, "rb") as f:
+        return sum(1 for line in f if not line.startswith(b"#"))
+
+
 @router.get("/download")
 async def download_filtered_vcf(file: str):
     """Download filtered VCF file"""
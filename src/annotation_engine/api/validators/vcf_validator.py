@@ -72,6 +72,8 @@ class VCFValidator:
     
     def _validate_tumor_only(self, vcf_path: str, metadata: Optional[Dict]) -> Dict:
         """Validate tumor-only VCF"""
+        # Check for required columns before reading samples from them
+        self._validate_vcf_structure(vcf_path)
         samples = self._extract_samples(vcf_path)
         
         if len(samples) == 0:
@@ -86,9 +88,6 @@ class VCFValidator:
         if not version:
             raise VCFValidationError("Invalid VCF format: missing ##fileformat header")
         
-        # Check for required fields
-        self._validate_vcf_structure(vcf_path)
-        
         return {
             "valid": True,
             "mode": "tumor_only",
@@ -9,23 +9,46 @@ Based on: https://pubmed.ncbi.nlm.nih.gov/36063163/
 and subsequent expansions for general cancer variant classification.
 
 This implementation leverages all available knowledge bases in .refs/ directory.
+
+Knowledge-base joins (OncoKB same-alteration matches, hotspot residues) are
+memoized per (gene, alteration/residue) on the classifier, and
+classify_variants() resolves them for a whole batch against tables grouped
+by gene once, so cohort classification does not rescan the KB DataFrames
+per variant.
 """
 
 from typing import Dict, List, Optional, Tuple, Set
 from enum import Enum
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 import pandas as pd
 import json
 import logging
+import re
 
 from .models import (
     VariantAnnotation, Evidence, PopulationFrequency, 
-    HotspotEvidence, FunctionalEvidence
+    HotspotEvidence
 )
+from .interval_index import IntervalIndex, residue_index, load_domain_index
+from .kb_ingest import read_kb_table
 
 logger = logging.getLogger(__name__)
 
+_HGVS_P_POSITION = re.compile(r'p\.[A-Za-z]+(\d+)')
+_ONCOGENIC_LABELS = ['Oncogenic', 'Likely Oncogenic']
+
+# Sentinel for "join not resolved yet" (None is a valid resolved value)
+_NOT_RESOLVED = object()
+
+
+@lru_cache(maxsize=65536)
+def _protein_position(hgvs_p: str) -> Optional[int]:
+    """Amino acid position from HGVS protein notation (p.V600E, p.Val600Glu)"""
+    match = _HGVS_P_POSITION.search(hgvs_p)
+    return int(match.group(1)) if match else None
+
 
 class OncogenicityCriteria(str, Enum):
     """CGC/VICC oncogenicity criteria codes"""
@@ -92,12 +115,21 @@ class CGCVICCClassifier:
         self.kb_path = kb_path
         self._load_knowledge_bases()
         
+        # Memoized KB joins, keyed by (gene, alteration) and (source, gene, residue)
+        self._oncokb_oncogenic_by_gene: Optional[Dict[str, pd.DataFrame]] = None
+        self._os1_matches: Dict[Tuple[str, str], Optional[str]] = {}
+        self._hotspot_matches: Dict[Tuple[str, str, int], Optional[Dict]] = {}
+        
     def _load_knowledge_bases(self):
         """Load all relevant knowledge bases for classification"""
         logger.info("Loading knowledge bases for CGC/VICC classification")
         
         # Cancer hotspots
         self.hotspots = self._load_hotspots()
+        self.hotspot_index = self._build_hotspot_index(self.hotspots)
+        self.protein_domains = load_domain_index(
+            self.kb_path / "functional_predictions/plugin_data/protein_domains/oncovi_domains.tsv"
+        )
         
         # Population frequencies
         self.population_dbs = self._load_population_frequencies()
@@ -118,25 +150,77 @@ class CGCVICCClassifier:
         # MSK Cancer Hotspots
         msk_path = self.kb_path / "hotspots/msk_hotspots/cancer_hotspots_v2.5.tsv"
         if msk_path.exists():
-            hotspots['msk'] = pd.read_csv(msk_path, sep='\t')
+            hotspots['msk'] = read_kb_table(
+                msk_path, columns=['Hugo_Symbol', 'Amino_Acid_Position', 'qvalue', 'Variant_Count'],
+                categorical=['Hugo_Symbol']
+            )
             logger.info(f"Loaded MSK hotspots: {len(hotspots['msk'])} entries")
         
         # OncoVI hotspots
         oncovi_single = self.kb_path / "hotspots/oncovi_hotspots/single_residue_hotspots.tsv"
         if oncovi_single.exists():
-            hotspots['oncovi_single'] = pd.read_csv(oncovi_single, sep='\t')
+            hotspots['oncovi_single'] = read_kb_table(
+                oncovi_single, columns=['gene', 'position', 'cancer_types', 'frequency'],
+                categorical=['gene', 'cancer_types']
+            )
             
         oncovi_indel = self.kb_path / "hotspots/oncovi_hotspots/indel_hotspots.tsv"
         if oncovi_indel.exists():
-            hotspots['oncovi_indel'] = pd.read_csv(oncovi_indel, sep='\t')
+            hotspots['oncovi_indel'] = read_kb_table(oncovi_indel, categorical=['gene'])
             
         # COSMIC hotspots (if available)
         cosmic_path = self.kb_path / "cosmic/cosmic_hotspots.tsv"
         if cosmic_path.exists():
-            hotspots['cosmic'] = pd.read_csv(cosmic_path, sep='\t')
+            hotspots['cosmic'] = read_kb_table(cosmic_path)
             
         return hotspots
     
+    def _build_hotspot_index(self, hotspots: Dict) -> Dict[str, IntervalIndex]:
+        """Per-gene residue indexes over the hotspot tables used by OS3/OM3"""
+        index = {}
+        if 'msk' in hotspots:
+            index['msk'] = residue_index(hotspots['msk'], 'Hugo_Symbol', 'Amino_Acid_Position')
+        if 'oncovi_single' in hotspots:
+            index['oncovi_single'] = residue_index(hotspots['oncovi_single'], 'gene', 'position')
+        return index
+    
+    def _first_hotspot(self, source: str, variant: VariantAnnotation) -> Optional[Dict]:
+        """First hotspot row (in file order) at the variant's residue, if any"""
+        index = self.hotspot_index.get(source)
+        position = self._extract_position(variant.hgvs_p)
+        if index is None or position is None:
+            return None
+        key = (source, variant.gene_symbol, position)
+        if key not in self._hotspot_matches:
+            matches = index.overlapping(variant.gene_symbol, position)
+            self._hotspot_matches[key] = matches[0] if matches else None
+        return self._hotspot_matches[key]
+    
+    def _oncokb_oncogenic_table(self) -> Dict[str, pd.DataFrame]:
+        """Oncogenic/Likely Oncogenic OncoKB rows grouped by gene (built once)"""
+        if self._oncokb_oncogenic_by_gene is None:
+            oncokb_df = self.clinical_evidence['oncokb']
+            oncogenic = oncokb_df[oncokb_df['oncogenicity'].isin(_ONCOGENIC_LABELS)]
+            self._oncokb_oncogenic_by_gene = {
+                str(gene): rows[['alteration', 'oncogenicity']]
+                for gene, rows in oncogenic.groupby('gene', observed=True, sort=False)
+            }
+        return self._oncokb_oncogenic_by_gene
+    
+    def _oncokb_oncogenic_match(self, gene: str, aa_change: str) -> Optional[str]:
+        """Oncogenicity of the first oncogenic OncoKB alteration containing aa_change"""
+        key = (gene, aa_change)
+        match = self._os1_matches.get(key, _NOT_RESOLVED)
+        if match is _NOT_RESOLVED:
+            rows = self._oncokb_oncogenic_table().get(gene)
+            match = None
+            if rows is not None:
+                hits = rows['oncogenicity'][rows['alteration'].str.contains(aa_change, na=False)]
+                if not hits.empty:
+                    match = hits.iloc[0]
+            self._os1_matches[key] = match
+        return match
+    
     def _load_population_frequencies(self) -> Dict:
         """Load population frequency databases"""
         pop_dbs = {}
@@ -156,17 +240,20 @@ class CGCVICCClassifier:
         # OncoKB
         oncokb_path = self.kb_path / "clinical_evidence/oncokb/oncokb_data/oncokb_all_annotated_variants.tsv"
         if oncokb_path.exists():
-            clinical['oncokb'] = pd.read_csv(oncokb_path, sep='\t')
+            clinical['oncokb'] = read_kb_table(
+                oncokb_path, columns=['gene', 'alteration', 'oncogenicity'],
+                categorical=['gene', 'oncogenicity']
+            )
             
         # CIViC
         civic_path = self.kb_path / "clinical_evidence/civic/civic_variants.tsv"
         if civic_path.exists():
-            clinical['civic'] = pd.read_csv(civic_path, sep='\t')
+            clinical['civic'] = read_kb_table(civic_path, categorical=['gene'])
             
         # ClinVar (somatic)
         clinvar_path = self.kb_path / "clinical_evidence/clinvar/clinvar_filtered_variants.tsv"
         if clinvar_path.exists():
-            clinical['clinvar'] = pd.read_csv(clinvar_path, sep='\t')
+            clinical['clinvar'] = read_kb_table(clinvar_path)
             
         return clinical
     
@@ -245,6 +332,68 @@ class CGCVICCClassifier:
             }
         )
     
+    def classify_variants(self, variants: List[VariantAnnotation],
+                          cancer_type: Optional[str] = None) -> List[OncogenicityResult]:
+        """
+        Classify many variants at once
+        
+        Produces the same results as classify_variant() per variant.  The
+        OncoKB and hotspot joins are resolved up front for each distinct
+        (gene, alteration) and (gene, residue) in the batch, against tables
+        grouped by gene once, so the per-variant criteria only hit memoized
+        lookups.
+        
+        Args:
+            variants: Variant annotations
+            cancer_type: Specific cancer type for context
+            
+        Returns:
+            OncogenicityResult per variant, in input order
+        """
+        self._resolve_kb_joins(variants)
+        return [self.classify_variant(variant, cancer_type) for variant in variants]
+    
+    def _resolve_kb_joins(self, variants: List[VariantAnnotation]) -> None:
+        """Populate the OncoKB/hotspot memo for every distinct key in a batch"""
+        alterations_by_gene: Dict[str, Set[str]] = {}
+        residues_by_gene: Dict[str, Set[int]] = {}
+        for variant in variants:
+            if not variant.hgvs_p:
+                continue
+            aa_change = variant.hgvs_p.replace('p.', '')
+            if aa_change and (variant.gene_symbol, aa_change) not in self._os1_matches:
+                alterations_by_gene.setdefault(variant.gene_symbol, set()).add(aa_change)
+            position = self._extract_position(variant.hgvs_p)
+            if position is not None:
+                residues_by_gene.setdefault(variant.gene_symbol, set()).add(position)
+        
+        if 'oncokb' in self.clinical_evidence:
+            oncogenic = self._oncokb_oncogenic_table()
+            for gene, aa_changes in alterations_by_gene.items():
+                self._join_oncokb_gene(gene, aa_changes, oncogenic.get(gene))
+        
+        for source, index in self.hotspot_index.items():
+            for gene, positions in residues_by_gene.items():
+                positions = [p for p in positions if (source, gene, p) not in self._hotspot_matches]
+                for position, matches in zip(positions, index.overlapping_points(gene, positions)):
+                    self._hotspot_matches[(source, gene, position)] = matches[0] if matches else None
+    
+    def _join_oncokb_gene(self, gene: str, aa_changes: Set[str], rows: Optional[pd.DataFrame]) -> None:
+        """Resolve every alteration of one gene in a single pass over its oncogenic rows"""
+        unresolved = set(aa_changes)
+        if rows is not None:
+            for alteration, oncogenicity in zip(rows['alteration'].tolist(), rows['oncogenicity'].tolist()):
+                if not unresolved:
+                    break
+                if not isinstance(alteration, str):
+                    continue
+                # First row in file order wins, as in _oncokb_oncogenic_match
+                for aa_change in [c for c in unresolved if c in alteration]:
+                    self._os1_matches[(gene, aa_change)] = oncogenicity
+                    unresolved.discard(aa_change)
+        for aa_change in unresolved:
+            self._os1_matches[(gene, aa_change)] = None
+    
     def _evaluate_all_criteria(self, 
                               variant: VariantAnnotation,
                               cancer_type: Optional[str]) -> List[CriterionEvidence]:
@@ -309,29 +458,20 @@ class CGCVICCClassifier:
         """
         # Check OncoKB for same amino acid change
         if 'oncokb' in self.clinical_evidence and variant.hgvs_p:
-            oncokb_df = self.clinical_evidence['oncokb']
-            
             # Extract amino acid change (e.g., p.V600E -> V600E)
             aa_change = variant.hgvs_p.replace('p.', '') if variant.hgvs_p else None
             
             if aa_change:
-                matches = oncokb_df[
-                    (oncokb_df['gene'] == variant.gene_symbol) &
-                    (oncokb_df['alteration'].str.contains(aa_change, na=False))
-                ]
+                oncogenicity = self._oncokb_oncogenic_match(variant.gene_symbol, aa_change)
                 
-                oncogenic_matches = matches[
-                    matches['oncogenicity'].isin(['Oncogenic', 'Likely Oncogenic'])
-                ]
-                
-                if not oncogenic_matches.empty:
+                if oncogenicity is not None:
                     return CriterionEvidence(
                         criterion=OncogenicityCriteria.OS1,
                         is_met=True,
                         strength="Strong",
                         evidence_sources=[{
                             "source": "OncoKB",
-                            "oncogenicity": oncogenic_matches.iloc[0]['oncogenicity'],
+                            "oncogenicity": oncogenicity,
                             "variant": f"{variant.gene_symbol} {aa_change}"
                         }],
                         confidence=0.9
@@ -380,34 +520,22 @@ class CGCVICCClassifier:
         hotspot_evidence = []
         
         # Check MSK hotspots
-        if 'msk' in self.hotspots:
-            msk_df = self.hotspots['msk']
-            matches = msk_df[
-                (msk_df['Hugo_Symbol'] == variant.gene_symbol) &
-                (msk_df['Amino_Acid_Position'] == self._extract_position(variant.hgvs_p))
-            ]
-            
-            if not matches.empty and matches.iloc[0].get('qvalue', 1.0) < 0.01:
-                hotspot_evidence.append({
-                    "source": "MSK Cancer Hotspots",
-                    "q_value": matches.iloc[0]['qvalue'],
-                    "samples": matches.iloc[0].get('Variant_Count', 'N/A')
-                })
+        match = self._first_hotspot('msk', variant)
+        if match is not None and match.get('qvalue', 1.0) < 0.01:
+            hotspot_evidence.append({
+                "source": "MSK Cancer Hotspots",
+                "q_value": match['qvalue'],
+                "samples": match.get('Variant_Count', 'N/A')
+            })
         
         # Check OncoVI hotspots
-        if 'oncovi_single' in self.hotspots:
-            oncovi_df = self.hotspots['oncovi_single']
-            matches = oncovi_df[
-                (oncovi_df['gene'] == variant.gene_symbol) &
-                (oncovi_df['position'] == self._extract_position(variant.hgvs_p))
-            ]
-            
-            if not matches.empty:
-                hotspot_evidence.append({
-                    "source": "OncoVI Hotspots",
-                    "cancer_types": matches.iloc[0].get('cancer_types', 'N/A'),
-                    "frequency": matches.iloc[0].get('frequency', 'N/A')
-                })
+        match = self._first_hotspot('oncovi_single', variant)
+        if match is not None:
+            hotspot_evidence.append({
+                "source": "OncoVI Hotspots",
+                "cancer_types": match.get('cancer_types', 'N/A'),
+                "frequency": match.get('frequency', 'N/A')
+            })
         
         # Check variant's own hotspot evidence
         if variant.hotspot_evidence:
@@ -460,6 +588,23 @@ class CGCVICCClassifier:
                 confidence=0.8
             )
         
+        # Otherwise, missense within a critical functional domain
+        position = self._extract_position(variant.hgvs_p)
+        if is_missense and position is not None:
+            for domain in self.protein_domains.overlapping(variant.gene_symbol, position):
+                if domain.get('importance') == 'critical':
+                    return CriterionEvidence(
+                        criterion=OncogenicityCriteria.OM1,
+                        is_met=True,
+                        strength="Moderate",
+                        evidence_sources=[{
+                            "source": "OncoVI Domains",
+                            "domain": domain['domain'],
+                            "position": position
+                        }],
+                        confidence=0.7
+                    )
+        
         return CriterionEvidence(
             criterion=OncogenicityCriteria.OM1,
             is_met=False,
@@ -501,18 +646,12 @@ class CGCVICCClassifier:
         hotspot_evidence = []
         
         # Similar to OS3 but with lower thresholds
-        if 'msk' in self.hotspots:
-            msk_df = self.hotspots['msk']
-            matches = msk_df[
-                (msk_df['Hugo_Symbol'] == variant.gene_symbol) &
-                (msk_df['Amino_Acid_Position'] == self._extract_position(variant.hgvs_p))
-            ]
-            
-            if not matches.empty and matches.iloc[0].get('qvalue', 1.0) < 0.1:  # Less stringent
-                hotspot_evidence.append({
-                    "source": "MSK Cancer Hotspots",
-                    "q_value": matches.iloc[0]['qvalue']
-                })
+        match = self._first_hotspot('msk', variant)
+        if match is not None and match.get('qvalue', 1.0) < 0.1:  # Less stringent
+            hotspot_evidence.append({
+                "source": "MSK Cancer Hotspots",
+                "q_value": match['qvalue']
+            })
         
         # Check for moderate hotspot evidence
         if variant.hotspot_evidence:
@@ -612,8 +751,9 @@ class CGCVICCClassifier:
         """
         OP2: Somatic variant in tumor with oncogenic signature
         """
-        # Check if variant has somatic evidence
-        if variant.somatic_status == "Somatic" and variant.tumor_vaf > 0.1:
+        # Somatic evidence: clonal-range tumor VAF, absent from the matched normal when there is one
+        is_somatic = variant.normal_vaf is None or variant.normal_vaf < 0.05
+        if is_somatic and variant.tumor_vaf is not None and variant.tumor_vaf > 0.1:
             # Check for oncogenic mutational signatures
             signature_evidence = []
             
@@ -989,14 +1129,7 @@ class CGCVICCClassifier:
         """Extract amino acid position from HGVS protein notation"""
         if not hgvs_p:
             return None
-        
-        import re
-        # Match patterns like p.V600E, p.Val600Glu
-        match = re.search(r'p\.[A-Za-z]+(\d+)', hgvs_p)
-        if match:
-            return int(match.group(1))
-        
-        return None
+        return _protein_position(hgvs_p)
 
 
 def create_cgc_vicc_evidence(classifier_result: OncogenicityResult) -> List[Evidence]:
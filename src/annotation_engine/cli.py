@@ -11,15 +11,16 @@ Usage:
 
 import argparse
 import sys
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import json
 from datetime import datetime
 
 from .validation.vcf_validator import VCFValidator
 from .validation.input_schemas import CLIInputSchema, AnalysisRequest
 from .validation.error_handler import ValidationError, CLIErrorHandler
-from .models import AnalysisType
+from .models import AnalysisType, AnnotationConfig
 from .input_validator import InputValidator
 from .patient_context import PatientContextManager
 
@@ -242,6 +243,20 @@ class AnnotationEngineCLI:
             help='Scope of pertinent negative findings (default: comprehensive)'
         )
         
+        # Performance
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Worker processes for tier assignment (default: 1, serial)'
+        )
+        parser.add_argument(
+            '--vep-shards',
+            type=int,
+            default=1,
+            help='Concurrent VEP processes over chromosome-region shards (default: 1, unsharded)'
+        )
+        
         # Logging and debugging
         parser.add_argument(
             '--verbose', '-v',
@@ -279,6 +294,47 @@ class AnnotationEngineCLI:
             action='store_true',
             help='Check VEP plugin status and available data files'
         )
+        parser.add_argument(
+            '--compile-kb',
+            action='store_true',
+            help='Compile knowledge bases (from --kb-bundle, default: .refs) into a memory-mapped snapshot'
+        )
+        parser.add_argument(
+            '--kb-snapshot',
+            type=Path,
+            help='Compiled KB snapshot path (default: <kb-bundle>/kb_snapshot.aekb)'
+        )
+        parser.add_argument(
+            '--build-pon-index',
+            type=Path,
+            metavar='PON_VCF',
+            help='Build a memory-mapped panel-of-normals index from PON_VCF and exit'
+        )
+        parser.add_argument(
+            '--pon-index',
+            type=Path,
+            help='PoN index output path (default: <PON_VCF>.aepon)'
+        )
+        parser.add_argument(
+            '--build-gnomad-store',
+            type=Path,
+            nargs='+',
+            metavar='AF_TSV',
+            help='Build the local gnomAD allele-frequency store from AF extract TSVs '
+                 '(scripts/stream_gnomad_v4_afs.py output) and exit'
+        )
+        parser.add_argument(
+            '--gnomad-store',
+            type=Path,
+            help='gnomAD AF store output path '
+                 '(default: <kb-bundle>/population_frequencies/gnomad/gnomad_af.aegaf)'
+        )
+        parser.add_argument(
+            '--build-alphamissense-index',
+            action='store_true',
+            help='Bgzip and tabix-index <kb-bundle>/alphamissense/AlphaMissense_hg38.tsv.gz '
+                 'for random-access lookups and exit'
+        )
         
         return parser
     
@@ -494,6 +550,22 @@ class AnnotationEngineCLI:
                 print("🔍 Checking VEP plugin status...")
                 return self._check_plugin_status()
             
+            if args.compile_kb:
+                print("📦 Compiling knowledge base snapshot...")
+                return self._compile_kb_snapshot(args)
+            
+            if args.build_pon_index:
+                print("📦 Building panel-of-normals index...")
+                return self._build_pon_index(args)
+            
+            if args.build_gnomad_store:
+                print("📦 Building gnomAD allele-frequency store...")
+                return self._build_gnomad_store(args)
+            
+            if args.build_alphamissense_index:
+                print("📦 Building AlphaMissense tabix index...")
+                return self._build_alphamissense_index(args)
+            
             # Validate required arguments for normal mode
             if not args.input and not args.tumor_vcf:
                 print("❌ One of --input or --tumor-vcf is required")
@@ -504,6 +576,12 @@ class AnnotationEngineCLI:
             if not args.cancer_type:
                 print("❌ --cancer-type is required")
                 return 1
+            if args.workers < 1:
+                print("❌ --workers must be at least 1")
+                return 1
+            if args.vep_shards < 1:
+                print("❌ --vep-shards must be at least 1")
+                return 1
             
             # Process enhanced text options
             use_enhanced_text = args.enable_enhanced_text and not args.disable_enhanced_text
@@ -540,7 +618,8 @@ class AnnotationEngineCLI:
             
             # Execute annotation pipeline
             print("\n🔄 Starting annotation pipeline...")
-            results = self._execute_annotation_pipeline(analysis_request)
+            results = self._execute_annotation_pipeline(analysis_request, workers=args.workers,
+                                                        vep_shards=args.vep_shards)
             
             print(f"✅ Annotation complete: {len(results)} variants processed")
             
@@ -571,8 +650,19 @@ class AnnotationEngineCLI:
             self.error_handler.handle_unexpected_error(e, verbose=args.verbose if 'args' in locals() else 0)
             return 1
     
-    def _execute_annotation_pipeline(self, analysis_request) -> List[Dict[str, Any]]:
-        """Execute the complete annotation pipeline"""
+    def _execute_annotation_pipeline(self, analysis_request, workers: int = 1,
+                                     vep_shards: int = 1) -> List[Dict[str, Any]]:
+        """
+        Execute the complete annotation pipeline
+        
+        Args:
+            analysis_request: Validated analysis request
+            workers: Worker processes for tier assignment (1 = serial)
+            vep_shards: Concurrent VEP processes over chromosome-region shards (1 = unsharded)
+            
+        Returns:
+            JSON-serializable result per successfully tiered variant, in input order
+        """
         from .vcf_parser import VCFFieldExtractor
         from .models import VariantAnnotation
         from .evidence_aggregator import EvidenceAggregator
@@ -611,18 +701,21 @@ class AnnotationEngineCLI:
             tumor_type=patient_context.oncotree_code or patient_context.cancer_type
         )
         
+        stage_timings: Dict[str, Tuple[int, float]] = {}
+        
+        # Knowledge bases for evidence and tiering, in this process and in any workers
+        kb_base_path = analysis_request.kb_bundle or ".refs"
+        
         # Step 2: Run VEP annotation first
         print("  🧬 Running VEP annotation...")
+        stage_start = time.perf_counter()
         try:
             # Configure VEP
-            vep_config = VEPConfiguration(use_docker=True)
+            vep_config = VEPConfiguration(use_docker=True, shard_workers=vep_shards)
             vep_runner = VEPRunner(vep_config)
             
-            # Run VEP and get annotated variants
-            annotations = vep_runner.annotate_vcf(
-                input_vcf=vcf_path,
-                output_format="annotations"  # Get VariantAnnotation objects directly
-            )
+            # Run VEP, decoding its JSON record by record as it is written
+            annotations = list(vep_runner.iter_annotations(vcf_path))
             print(f"  ✅ VEP annotation complete: {len(annotations)} variants annotated")
             
         except Exception as e:
@@ -690,18 +783,30 @@ class AnnotationEngineCLI:
                 else:
                     print(f"    ⚠️  Skipping unknown variant at {var_key} in fallback mode")
         
+        stage_timings["annotation"] = (len(annotations), time.perf_counter() - stage_start)
+        
         # Step 4: Evidence Aggregation with workflow routing
         print(f"  🔍 Aggregating evidence for {len(annotations)} variants...")
-        aggregator = EvidenceAggregator(workflow_router=workflow_router)
+        stage_start = time.perf_counter()
+        aggregator = EvidenceAggregator(kb_base_path, workflow_router=workflow_router)
         
         all_evidence = []
-        for annotation in annotations:
-            try:
-                evidence = aggregator.aggregate_evidence(annotation)
-                all_evidence.extend(evidence)
-                print(f"    📚 {annotation.gene_symbol}: {len(evidence)} evidence items")
-            except Exception as e:
-                print(f"    ❌ Evidence aggregation failed for {annotation.gene_symbol}: {e}")
+        try:
+            evidence_lists = aggregator.aggregate_evidence_batch(annotations)
+        except Exception as e:
+            print(f"    ❌ Batched evidence aggregation failed ({e}); aggregating per variant")
+            evidence_lists = []
+            for annotation in annotations:
+                try:
+                    evidence_lists.append(aggregator.aggregate_evidence(annotation))
+                except Exception as e:
+                    print(f"    ❌ Evidence aggregation failed for {annotation.gene_symbol}: {e}")
+                    evidence_lists.append([])
+        
+        for annotation, evidence in zip(annotations, evidence_lists):
+            all_evidence.extend(evidence)
+            print(f"    📚 {annotation.gene_symbol}: {len(evidence)} evidence items")
+        stage_timings["evidence"] = (len(annotations), time.perf_counter() - stage_start)
         
         # Step 5: Display pathway configuration
         print(f"  🔀 Using {workflow_router.pathway.name} pathway")
@@ -710,63 +815,126 @@ class AnnotationEngineCLI:
             print(f"     - Normal filtering: ≤{workflow_router.get_vaf_threshold('max_normal_vaf'):.0%}")
         
         # Step 6: Tier Assignment with workflow routing
-        print(f"  🎯 Assigning tiers for {len(annotations)} variants...")
-        tiering_engine = TieringEngine(workflow_router=workflow_router)
+        # Convert analysis type if needed
+        analysis_type_obj = analysis_request.analysis_type if hasattr(analysis_request.analysis_type, 'value') else AnalysisType(analysis_request.analysis_type)
+        tumor_type = patient_context.oncotree_code or patient_context.cancer_type
+        workers = min(workers, len(annotations)) or 1
+        
+        print(f"  🎯 Assigning tiers for {len(annotations)} variants"
+              + (f" with {workers} worker processes..." if workers > 1 else "..."))
+        stage_start = time.perf_counter()
+        
+        if workers > 1:
+            tier_outcomes = self._assign_tiers_parallel(
+                annotations, analysis_request.cancer_type, analysis_type_obj, tumor_type, workers,
+                kb_base_path=kb_base_path
+            )
+        else:
+            tiering_engine = TieringEngine(AnnotationConfig(kb_base_path=kb_base_path),
+                                           workflow_router=workflow_router)
+            tier_outcomes = [
+                _assign_tier_safely(tiering_engine, annotation, analysis_request.cancer_type, analysis_type_obj)
+                for annotation in annotations
+            ]
         
         results = []
-        for annotation in annotations:
-            try:
-                # Convert analysis type if needed
-                analysis_type_obj = analysis_request.analysis_type if hasattr(analysis_request.analysis_type, 'value') else AnalysisType(analysis_request.analysis_type)
-                tier_result = tiering_engine.assign_tier(annotation, analysis_request.cancer_type, analysis_type_obj)
-                
-                # Convert to JSON-serializable format
-                result_dict = {
-                    "variant_id": f"{annotation.chromosome}_{annotation.position}_{annotation.reference}_{annotation.alternate}",
-                    "genomic_location": {
-                        "chromosome": annotation.chromosome,
-                        "position": annotation.position,
-                        "reference": annotation.reference,
-                        "alternate": str(annotation.alternate)
-                    },
-                    "gene_annotation": {
-                        "gene_symbol": annotation.gene_symbol,
-                        "transcript_id": annotation.transcript_id,
-                        "hgvs_c": annotation.hgvs_c,
-                        "hgvs_p": annotation.hgvs_p,
-                        "consequence": annotation.consequence
-                    },
-                    "quality_metrics": {
-                        "vaf": annotation.vaf,
-                        "total_depth": annotation.total_depth
-                    },
-                    "clinical_classification": {
-                        "amp_tier": tier_result.amp_scoring.get_primary_tier() if tier_result.amp_scoring else None,
-                        "vicc_oncogenicity": tier_result.vicc_scoring.classification.value if (tier_result.vicc_scoring and tier_result.vicc_scoring.classification) else None,
-                        "oncokb_level": tier_result.oncokb_scoring.therapeutic_level.value if (tier_result.oncokb_scoring and tier_result.oncokb_scoring.therapeutic_level) else None,
-                        "confidence_score": tier_result.confidence_score
-                    },
-                    "metadata": {
-                        "analysis_type": analysis_request.analysis_type if isinstance(analysis_request.analysis_type, str) else analysis_request.analysis_type.value,
-                        "cancer_type": analysis_request.cancer_type,
-                        "case_uid": analysis_request.case_uid,
-                        "genome_build": analysis_request.genome_build,
-                        "processing_date": datetime.utcnow().isoformat()
-                    }
-                }
-                
-                results.append(result_dict)
-                
-                amp_tier = tier_result.amp_scoring.get_primary_tier() if tier_result.amp_scoring else "Unknown"
-                vicc_class = tier_result.vicc_scoring.classification.value if (tier_result.vicc_scoring and tier_result.vicc_scoring.classification) else "Unknown"
-                print(f"    🏷️  {annotation.gene_symbol}: {amp_tier}, {vicc_class} (confidence: {tier_result.confidence_score:.2f})")
-                
-            except Exception as e:
-                print(f"    ❌ Tier assignment failed for {annotation.gene_symbol}: {e}")
+        for annotation, (tier_result, error) in zip(annotations, tier_outcomes):
+            if error is not None:
+                print(f"    ❌ Tier assignment failed for {annotation.gene_symbol}: {error}")
+                continue
+            
+            results.append(self._build_result_dict(annotation, tier_result, analysis_request))
+            
+            amp_tier = tier_result.amp_scoring.get_primary_tier() if tier_result.amp_scoring else "Unknown"
+            vicc_class = tier_result.vicc_scoring.classification.value if (tier_result.vicc_scoring and tier_result.vicc_scoring.classification) else "Unknown"
+            print(f"    🏷️  {annotation.gene_symbol}: {amp_tier}, {vicc_class} (confidence: {tier_result.confidence_score:.2f})")
+        stage_timings["tiering"] = (len(annotations), time.perf_counter() - stage_start)
         
         print(f"  ✅ Pipeline completed: {len(results)} variants successfully processed")
+        self._print_throughput_report(stage_timings)
+        self.last_stage_timings = stage_timings
         return results
     
+    def _assign_tiers_parallel(self, annotations, cancer_type: str, analysis_type: AnalysisType,
+                               tumor_type: Optional[str], workers: int,
+                               kb_base_path: str = ".refs") -> List[Tuple[Any, Optional[str]]]:
+        """
+        Fan tier assignment out over a process pool
+        
+        Knowledge bases are loaded before the pool starts, so forked workers
+        share the parent's KB cache copy-on-write; spawned workers attach to
+        the memory-mapped KB snapshot under kb_base_path instead of re-parsing.
+        Results come back in input order regardless of completion order.
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from .evidence_aggregator import KnowledgeBaseLoader
+        
+        # Warm the KB cache in the parent so forked children inherit it
+        KnowledgeBaseLoader(kb_base_path).load_all_kbs()
+        
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        
+        indexed = list(enumerate(annotations))
+        chunk_size = max(1, -(-len(indexed) // (workers * 4)))
+        chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+        
+        outcomes: List[Tuple[Any, Optional[str]]] = [(None, "not processed")] * len(annotations)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_tiering_worker,
+                                 initargs=(analysis_type, tumor_type, kb_base_path)) as executor:
+            # map() yields chunk results in submission order
+            for chunk_outcomes in executor.map(_assign_tier_chunk, chunks,
+                                               [cancer_type] * len(chunks), [analysis_type] * len(chunks)):
+                for index, tier_result, error in chunk_outcomes:
+                    outcomes[index] = (tier_result, error)
+        
+        return outcomes
+    
+    def _build_result_dict(self, annotation, tier_result, analysis_request) -> Dict[str, Any]:
+        """Convert a tiered variant to the JSON-serializable result format"""
+        return {
+            "variant_id": f"{annotation.chromosome}_{annotation.position}_{annotation.reference}_{annotation.alternate}",
+            "genomic_location": {
+                "chromosome": annotation.chromosome,
+                "position": annotation.position,
+                "reference": annotation.reference,
+                "alternate": str(annotation.alternate)
+            },
+            "gene_annotation": {
+                "gene_symbol": annotation.gene_symbol,
+                "transcript_id": annotation.transcript_id,
+                "hgvs_c": annotation.hgvs_c,
+                "hgvs_p": annotation.hgvs_p,
+                "consequence": annotation.consequence
+            },
+            "quality_metrics": {
+                "vaf": annotation.vaf,
+                "total_depth": annotation.total_depth
+            },
+            "clinical_classification": {
+                "amp_tier": tier_result.amp_scoring.get_primary_tier() if tier_result.amp_scoring else None,
+                "vicc_oncogenicity": tier_result.vicc_scoring.classification.value if (tier_result.vicc_scoring and tier_result.vicc_scoring.classification) else None,
+                "oncokb_level": tier_result.oncokb_scoring.therapeutic_level.value if (tier_result.oncokb_scoring and tier_result.oncokb_scoring.therapeutic_level) else None,
+                "confidence_score": tier_result.confidence_score
+            },
+            "metadata": {
+                "analysis_type": analysis_request.analysis_type if isinstance(analysis_request.analysis_type, str) else analysis_request.analysis_type.value,
+                "cancer_type": analysis_request.cancer_type,
+                "case_uid": analysis_request.case_uid,
+                "genome_build": analysis_request.genome_build,
+                "processing_date": datetime.utcnow().isoformat()
+            }
+        }
+    
+    def _print_throughput_report(self, stage_timings: Dict[str, Tuple[int, float]]) -> None:
+        """Print variants/s for each pipeline stage"""
+        print("  ⏱️  Throughput:")
+        for stage, (count, elapsed) in stage_timings.items():
+            rate = count / elapsed if elapsed > 0 else float("inf")
+            print(f"     - {stage}: {count} variants in {elapsed:.2f}s ({rate:.1f} variants/s)")
+    
     def _save_results(self, results: List[Dict[str, Any]], analysis_request):
         """Save annotation results to output files"""
         output_dir = Path(analysis_request.output_directory)
@@ -982,6 +1150,111 @@ class AnnotationEngineCLI:
             print(f"❌ Error checking plugin status: {str(e)}")
             return 1
     
+    def _compile_kb_snapshot(self, args) -> int:
+        """Build the versioned, checksummed KB snapshot used for fast cold starts"""
+        from .evidence_aggregator import KnowledgeBaseLoader
+        
+        kb_path = args.kb_bundle or Path(".refs")
+        if not kb_path.exists():
+            print(f"❌ Knowledge base directory not found: {kb_path}")
+            return 1
+        
+        try:
+            start_time = time.time()
+            loader = KnowledgeBaseLoader(str(kb_path), snapshot_path=args.kb_snapshot)
+            manifest = loader.compile_snapshot()
+            elapsed = time.time() - start_time
+            
+            print(f"✅ Snapshot written: {loader.snapshot_path}")
+            print(f"   Snapshot ID: {manifest['snapshot_id'][:12]}")
+            print(f"   Sections: {len(manifest['sections'])}")
+            print(f"   Source files: {len(manifest['sources'])}")
+            print(f"   Compile time: {elapsed:.1f}s")
+            return 0
+            
+        except Exception as e:
+            print(f"❌ Failed to compile KB snapshot: {e}")
+            return 1
+    
+    def _build_pon_index(self, args) -> int:
+        """Pack a panel-of-normals VCF into the mmap-able index TumorOnlyFilter opens"""
+        from .pon_index import build_pon_index, default_pon_index_path
+        
+        pon_vcf = args.build_pon_index
+        if not pon_vcf.exists():
+            print(f"❌ Panel-of-normals VCF not found: {pon_vcf}")
+            return 1
+        
+        try:
+            start_time = time.time()
+            output_path = args.pon_index or default_pon_index_path(pon_vcf)
+            manifest = build_pon_index(pon_vcf, output_path)
+            elapsed = time.time() - start_time
+            
+            sections = manifest['sections']
+            index_bytes = sum(meta['length'] for meta in sections.values())
+            sites = sections['panel_of_normals/loci']['length'] // 8
+            print(f"✅ PoN index written: {output_path}")
+            print(f"   Sites: {sites:,}")
+            print(f"   Size: {index_bytes / 1e6:.1f} MB")
+            print(f"   Build time: {elapsed:.1f}s")
+            return 0
+            
+        except Exception as e:
+            print(f"❌ Failed to build PoN index: {e}")
+            return 1
+    
+    def _build_gnomad_store(self, args) -> int:
+        """Pack gnomAD AF extracts into the mmap-able store used for germline filtering"""
+        from .gnomad_store import build_gnomad_store, default_gnomad_store_path
+        
+        missing = [str(path) for path in args.build_gnomad_store if not path.exists()]
+        if missing:
+            print(f"❌ gnomAD AF extract(s) not found: {', '.join(missing)}")
+            return 1
+        
+        try:
+            start_time = time.time()
+            output_path = args.gnomad_store or default_gnomad_store_path(args.kb_bundle or Path(".refs"))
+            manifest = build_gnomad_store(args.build_gnomad_store, output_path)
+            elapsed = time.time() - start_time
+            
+            sections = manifest['sections']
+            store_bytes = sum(meta['length'] for meta in sections.values())
+            sites = sections['gnomad_af/loci']['length'] // 8
+            print(f"✅ gnomAD AF store written: {output_path}")
+            print(f"   Sites: {sites:,}")
+            print(f"   Size: {store_bytes / 1e6:.1f} MB")
+            print(f"   Build time: {elapsed:.1f}s")
+            return 0
+            
+        except Exception as e:
+            print(f"❌ Failed to build gnomAD AF store: {e}")
+            return 1
+    
+    def _build_alphamissense_index(self, args) -> int:
+        """Recompress the AlphaMissense TSV with bgzip and tabix-index it for batch lookups"""
+        from .alpha_missense import AlphaMissenseLoader
+        
+        loader = AlphaMissenseLoader(args.kb_bundle or Path(".refs"))
+        if not loader.data_file.exists():
+            print(f"❌ AlphaMissense file not found: {loader.data_file}")
+            return 1
+        
+        try:
+            start_time = time.time()
+            indexed_file = loader.build_tabix_index()
+            elapsed = time.time() - start_time
+            
+            print(f"✅ AlphaMissense index written: {indexed_file}")
+            print(f"   Size: {indexed_file.stat().st_size / 1e6:.1f} MB")
+            print(f"   Build time: {elapsed:.1f}s")
+            return 0
+            
+        except Exception as e:
+            print(f"❌ Failed to build AlphaMissense index: {e}")
+            return 1
+    
     def _run_test_mode(self, args) -> int:
         """Run quick test with example data"""
         import time
@@ -1043,7 +1316,8 @@ class AnnotationEngineCLI:
             )
             
             # Execute annotation pipeline
-            results = self._execute_annotation_pipeline(analysis_request)
+            results = self._execute_annotation_pipeline(analysis_request, workers=args.workers,
+                                                        vep_shards=args.vep_shards)
             self._save_results(results, analysis_request)
             
             end_time = time.time()
@@ -1071,6 +1345,41 @@ class AnnotationEngineCLI:
             return 1
 
 
+# Per-process state for --workers tier assignment
+_WORKER_TIERING_ENGINE = None
+
+
+def _init_tiering_worker(analysis_type: AnalysisType, tumor_type: Optional[str], kb_base_path: str) -> None:
+    """Process-pool initializer: one TieringEngine per worker"""
+    global _WORKER_TIERING_ENGINE
+    from .evidence_aggregator import KnowledgeBaseLoader
+    from .tiering import TieringEngine
+    from .workflow_router import create_workflow_router
+    
+    # No-op when forked after the parent loaded KBs; otherwise attaches to the snapshot
+    KnowledgeBaseLoader(kb_base_path).load_all_kbs()
+    
+    workflow_router = create_workflow_router(analysis_type=analysis_type, tumor_type=tumor_type)
+    _WORKER_TIERING_ENGINE = TieringEngine(AnnotationConfig(kb_base_path=kb_base_path),
+                                           workflow_router=workflow_router)
+
+
+def _assign_tier_chunk(chunk, cancer_type: str, analysis_type: AnalysisType):
+    """Tier one chunk of (index, annotation) pairs inside a worker"""
+    return [
+        (index, *_assign_tier_safely(_WORKER_TIERING_ENGINE, annotation, cancer_type, analysis_type))
+        for index, annotation in chunk
+    ]
+
+
+def _assign_tier_safely(tiering_engine, annotation, cancer_type: str, analysis_type: AnalysisType):
+    """(tier_result, None) on success, (None, error message) on failure"""
+    try:
+        return tiering_engine.assign_tier(annotation, cancer_type, analysis_type), None
+    except Exception as e:
+        return None, str(e)
+
+
 def main() -> int:
     """CLI entry point"""
     cli = AnnotationEngineCLI()
@@ -0,0 +1,145 @@
+"""
+Position-Indexed ClinVar Store
+
+Replaces the per-gene lists of ClinVar row dictionaries with a compact
+PackedVariantIndex keyed by (chrom, pos, ref, alt).  Clinical significance
+and review status are stored as small categorical codes, and per-gene
+pathogenic/benign aggregates are precomputed at build time, so gene-level
+evidence and exact-variant lookups never touch row dictionaries.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .variant_index import PackedVariantIndex
+
+logger = logging.getLogger(__name__)
+
+# Significance classes (same substring rules as the original gene lists)
+CLINVAR_OTHER = 0
+CLINVAR_PATHOGENIC = 1
+CLINVAR_BENIGN = 2
+
+_CLINVAR_COLUMNS = [
+    'VariationID', 'GeneSymbol', 'ClinicalSignificance', 'ReviewStatus', 'Assembly',
+    'Chromosome', 'Start', 'ReferenceAllele', 'AlternateAllele',
+    'PositionVCF', 'ReferenceAlleleVCF', 'AlternateAlleleVCF',
+]
+
+
+class ClinVarIndex(PackedVariantIndex):
+    """Exact-variant ClinVar lookups plus precomputed gene aggregates"""
+
+    @classmethod
+    def from_variant_summary(cls, path: Path, assembly: str = "GRCh38") -> "ClinVarIndex":
+        """Build the index from ClinVar's variant_summary.txt.gz"""
+        df = pd.read_csv(
+            path, sep='\t', compression='gzip', low_memory=False,
+            usecols=lambda column: column in _CLINVAR_COLUMNS,
+            dtype={'GeneSymbol': 'category', 'ClinicalSignificance': 'category',
+                   'ReviewStatus': 'category', 'Assembly': 'category', 'Chromosome': 'category'},
+        )
+        return cls.from_dataframe(df[df['Assembly'] == assembly])
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "ClinVarIndex":
+        """Build the index from a (single-assembly) variant_summary DataFrame"""
+        total_variants = len(df)
+
+        significance = df['ClinicalSignificance'].astype(str).str.lower()
+        is_pathogenic = significance.str.contains('pathogenic', regex=False)
+        is_benign = ~is_pathogenic & significance.str.contains('benign', regex=False)
+        sig_class = np.where(is_pathogenic, CLINVAR_PATHOGENIC,
+                             np.where(is_benign, CLINVAR_BENIGN, CLINVAR_OTHER)).astype(np.int8)
+
+        # Gene aggregates over the same rows the old per-gene lists kept
+        genes = df['GeneSymbol'].astype(object)
+        has_gene = genes.notna() & (genes != '-')
+        counts = (
+            pd.DataFrame({'gene': genes[has_gene], 'cls': sig_class[has_gene.to_numpy()]})
+            .groupby(['gene', 'cls']).size().unstack(fill_value=0)
+            .reindex(columns=[CLINVAR_PATHOGENIC, CLINVAR_BENIGN], fill_value=0)
+        )
+        gene_counts = {
+            gene: (int(pathogenic), int(benign))
+            for gene, pathogenic, benign in zip(counts.index, counts[CLINVAR_PATHOGENIC], counts[CLINVAR_BENIGN])
+        }
+
+        # Prefer VCF-style coordinates; older dumps only carry Start/Ref/Alt
+        if {'PositionVCF', 'ReferenceAlleleVCF', 'AlternateAlleleVCF'}.issubset(df.columns):
+            positions = pd.to_numeric(df['PositionVCF'], errors='coerce')
+            refs, alts = df['ReferenceAlleleVCF'], df['AlternateAlleleVCF']
+        else:
+            positions = pd.to_numeric(df['Start'], errors='coerce')
+            refs, alts = df['ReferenceAllele'], df['AlternateAllele']
+
+        located = (positions > 0) & refs.notna() & alts.notna() & (refs != 'na') & (alts != 'na')
+        located = located.to_numpy()
+
+        significance_cat = df['ClinicalSignificance'].astype('category')
+        review_cat = df['ReviewStatus'].astype('category')
+        gene_cat = df['GeneSymbol'].astype('category')
+
+        variation_ids = (pd.to_numeric(df['VariationID'], errors='coerce').fillna(-1).astype(np.int64)
+                         if 'VariationID' in df.columns else pd.Series(-1, index=df.index))
+
+        index = cls.build(
+            chromosomes=df['Chromosome'].astype(str).to_numpy()[located],
+            positions=positions.to_numpy()[located].astype(np.int64),
+            references=refs.astype(str).to_numpy()[located],
+            alternates=alts.astype(str).to_numpy()[located],
+            columns={
+                'significance_class': sig_class[located],
+                'significance': significance_cat.cat.codes.to_numpy()[located].astype(np.int16),
+                'review_status': review_cat.cat.codes.to_numpy()[located].astype(np.int16),
+                'gene': gene_cat.cat.codes.to_numpy()[located].astype(np.int32),
+                'variation_id': variation_ids.to_numpy()[located].astype(np.int64),
+            },
+            meta={
+                'significance_labels': [str(c) for c in significance_cat.cat.categories],
+                'review_status_labels': [str(c) for c in review_cat.cat.categories],
+                'gene_labels': [str(c) for c in gene_cat.cat.categories],
+                'gene_counts': gene_counts,
+                'total_variants': total_variants,
+            },
+        )
+
+        logger.info(f"Built ClinVar index: {len(index)} located variants, {len(gene_counts)} genes "
+                    f"({index.nbytes / 1e6:.1f} MB)")
+        return index
+
+    @property
+    def total_variants(self) -> int:
+        return self.meta.get('total_variants', 0)
+
+    def gene_counts(self, gene_symbol: str) -> Tuple[int, int]:
+        """(pathogenic, benign) ClinVar variant counts for a gene"""
+        return self.meta.get('gene_counts', {}).get(gene_symbol, (0, 0))
+
+    def lookup(self, chromosome: str, position: int, reference: str, alternate: str) -> Optional[Dict[str, Any]]:
+        """Exact ClinVar record for a variant, or None"""
+        row = self.find(chromosome, position, reference, alternate)
+        return self._decode(row) if row >= 0 else None
+
+    def lookup_batch(self, variants: List[Tuple[str, int, str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """Exact ClinVar records for many variants, in input order"""
+        return [self._decode(int(row)) if row >= 0 else None for row in self.find_batch(variants)]
+
+    def _decode(self, row: int) -> Dict[str, Any]:
+        values = self.row(row)
+        return {
+            'significance': _label(self.meta['significance_labels'], values['significance']),
+            'significance_class': {CLINVAR_PATHOGENIC: 'pathogenic',
+                                   CLINVAR_BENIGN: 'benign'}.get(values['significance_class'], 'other'),
+            'review_status': _label(self.meta['review_status_labels'], values['review_status']),
+            'gene': _label(self.meta['gene_labels'], values['gene']),
+            'variation_id': values['variation_id'] if values['variation_id'] >= 0 else None,
+        }
+
+
+def _label(labels: List[str], code: int) -> Optional[str]:
+    return labels[code] if 0 <= code < len(labels) else None
@@ -11,16 +11,39 @@ Key features:
 4. Regulatory compliance reporting
 5. Security event monitoring
 6. Clinical decision audit trails
+
+Events are written by a shared AuditEventWriter: log_event() only queues the
+row, and a background thread inserts queued rows in bulk transactions.  Each
+transaction is recorded as an AuditBatch whose hash chains the batch's row
+checksums onto the previous batch, so integrity is verified per batch.
 """
 
+import atexit
+import base64
+import csv
+import io
 import logging
+import os
+import pickle
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
+from dataclasses import dataclass, field
 from enum import Enum
 import json
 import hashlib
-from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, Boolean, ForeignKey, Index, BigInteger
+from sqlalchemy import (
+    Column, String, Integer, DateTime, Text, JSON, Boolean, ForeignKey, Index, BigInteger,
+    and_, func, insert, or_, select
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import relationship, Session
 from sqlalchemy.types import Enum as SQLEnum
 
@@ -99,12 +122,16 @@ class AuditContext:
     department: Optional[str] = None
 
 
+# SQLite only autoincrements INTEGER primary keys
+AuditPrimaryKey = BigInteger().with_variant(Integer, "sqlite")
+
+
 class ClinicalAuditLog(Base):
     """Immutable audit log for all clinical system activities"""
     __tablename__ = "clinical_audit_log"
     
     # Primary identification
-    audit_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    audit_id = Column(AuditPrimaryKey, primary_key=True, autoincrement=True)
     event_uuid = Column(String(36), unique=True, nullable=False)  # UUID for external references
     
     # Event classification
@@ -152,10 +179,12 @@ class ClinicalAuditLog(Base):
     # Security and integrity
     checksum = Column(String(64))  # SHA-256 hash for integrity
     digital_signature = Column(Text)
+    batch_id = Column(BigInteger, ForeignKey("clinical_audit_batches.batch_id"))  # Write batch (hash chain)
     
     # Indexes for performance
     __table_args__ = (
         Index("idx_audit_timestamp", "event_timestamp"),
+        Index("idx_audit_timestamp_id", "event_timestamp", "audit_id"),  # Keyset pagination
         Index("idx_audit_date", "event_date"),
         Index("idx_audit_user", "user_id"),
         Index("idx_audit_event_type", "event_type"),
@@ -164,9 +193,133 @@ class ClinicalAuditLog(Base):
         Index("idx_audit_severity", "severity"),
         Index("idx_audit_table", "table_affected"),
         Index("idx_audit_uuid", "event_uuid"),
+        Index("idx_audit_batch", "batch_id"),
+    )
+
+
+class AuditBatch(Base):
+    """One bulk write of audit events, hash-chained to the previous batch"""
+    __tablename__ = "clinical_audit_batches"
+    
+    batch_id = Column(AuditPrimaryKey, primary_key=True, autoincrement=True)
+    
+    # Chain link; unique so concurrent writers cannot both extend the same batch
+    previous_batch_id = Column(BigInteger, unique=True, nullable=False)  # 0 for the first batch
+    previous_hash = Column(String(64), nullable=False)
+    batch_hash = Column(String(64), nullable=False)  # SHA-256 over previous_hash and row checksums
+    
+    # Batch contents
+    event_count = Column(Integer, nullable=False)
+    first_event_timestamp = Column(DateTime, nullable=False)
+    last_event_timestamp = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    hostname = Column(String(255))
+    
+    __table_args__ = (
+        Index("idx_audit_batch_created", "created_at"),
     )
 
 
+GENESIS_HASH = "0" * 64
+
+
+def audit_checksum(event_uuid: str, event_type: AuditEventType, event_timestamp: datetime,
+                   user_id: str, event_description: str) -> str:
+    """SHA-256 checksum of an audit event's key fields"""
+    checksum_data = f"{event_uuid}|{event_type.value}|{event_timestamp}|{user_id}|{event_description}"
+    return hashlib.sha256(checksum_data.encode()).hexdigest()
+
+
+def chain_batch_hash(previous_hash: str, checksums: List[str]) -> str:
+    """
+    Hash of a batch: the previous batch's hash, the event count and the row
+    checksums (sorted, so it does not depend on insert order within the batch)
+    """
+    digest = hashlib.sha256(f"{previous_hash}|{len(checksums)}".encode())
+    for checksum in sorted(checksums):
+        digest.update(b"|" + checksum.encode())
+    return digest.hexdigest()
+
+
+def encode_audit_cursor(event_timestamp: datetime, audit_id: int) -> str:
+    """Opaque keyset cursor for the (event_timestamp, audit_id) position of an event"""
+    return base64.urlsafe_b64encode(f"{event_timestamp.isoformat()}|{audit_id}".encode()).decode()
+
+
+def decode_audit_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        timestamp, _, audit_id = base64.urlsafe_b64decode(cursor.encode()).decode().rpartition("|")
+        return datetime.fromisoformat(timestamp), int(audit_id)
+    except ValueError:
+        raise ValueError(f"Invalid audit trail cursor: {cursor}")
+
+
+# Columns returned by audit trail queries and exports
+AUDIT_TRAIL_COLUMNS = (
+    ClinicalAuditLog.audit_id, ClinicalAuditLog.event_uuid, ClinicalAuditLog.event_timestamp,
+    ClinicalAuditLog.event_type, ClinicalAuditLog.severity, ClinicalAuditLog.user_id,
+    ClinicalAuditLog.event_description, ClinicalAuditLog.event_details, ClinicalAuditLog.patient_id,
+    ClinicalAuditLog.case_uid, ClinicalAuditLog.compliance_frameworks
+)
+AUDIT_EXPORT_FIELDS = ["audit_id", "event_uuid", "timestamp", "event_type", "severity", "user_id",
+                       "description", "details", "patient_id", "case_uid", "compliance_frameworks"]
+
+# Columns a row checksum is computed from
+_CHECKSUM_COLUMNS = (
+    ClinicalAuditLog.event_uuid, ClinicalAuditLog.event_type, ClinicalAuditLog.event_timestamp,
+    ClinicalAuditLog.user_id, ClinicalAuditLog.event_description, ClinicalAuditLog.checksum
+)
+
+
+@dataclass
+class AuditVerificationReport:
+    """Outcome of a (possibly resumed) full audit trail verification"""
+    batches_verified: int = 0
+    events_verified: int = 0
+    failed_batch_ids: List[int] = field(default_factory=list)
+    failed_audit_ids: List[int] = field(default_factory=list)  # Rows written before batching
+    verified_through_batch_id: int = 0
+    verified_through_audit_id: int = 0  # Unbatched rows
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def ok(self) -> bool:
+        return not self.failed_batch_ids and not self.failed_audit_ids
+    
+    def save(self, path: Path):
+        """Write the report as a resumable checkpoint (atomically)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.__dict__))
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: Path) -> "AuditVerificationReport":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        return cls(**json.loads(path.read_text()))
+
+
+class _RangeWatermark:
+    """Highest id below which every submitted range has completed"""
+    
+    def __init__(self, start: int, ranges: List[Tuple[int, int]]):
+        self.value = start
+        self._pending = sorted(ranges)
+        self._done = set()
+    
+    def complete(self, range_: Tuple[int, int]) -> bool:
+        """Mark a range done; True if the watermark advanced"""
+        self._done.add(range_)
+        advanced = False
+        while self._pending and self._pending[0] in self._done:
+            self.value = self._pending.pop(0)[1]
+            advanced = True
+        return advanced
+
+
 class UserSession(Base):
     """Active user session tracking for audit purposes"""
     __tablename__ = "user_sessions"
@@ -242,11 +395,233 @@ class ComplianceReport(Base):
     )
 
 
+class AuditEventWriter:
+    """
+    Queues audit rows in memory and inserts them in bulk, one AuditBatch per flush
+    
+    submit() is cheap: it appends the row and wakes the background writer
+    once max_batch rows are queued; otherwise rows are written every
+    max_interval_seconds.  durable=True submissions flush before returning.
+    If more than max_pending rows are queued (e.g. the database is down) the
+    submitting caller flushes synchronously, so a failing database surfaces
+    as an error instead of unbounded memory growth.
+    
+    close() (also run at interpreter exit) flushes what is left; rows that
+    still cannot be written are spooled to spool_dir and re-queued by the
+    next writer that starts with the same spool_dir.  With background=False
+    no writer thread is started and rows are only written by flush(),
+    durable submissions and close().
+    """
+    
+    def __init__(self, max_batch: int = 500, max_interval_seconds: float = 1.0,
+                 max_pending: int = 50000, spool_dir: Optional[Path] = None,
+                 session_factory=get_db_session, max_chain_retries: int = 5,
+                 background: bool = True):
+        self.max_batch = max(1, max_batch)
+        self.max_interval_seconds = max_interval_seconds
+        self.max_pending = max(self.max_batch, max_pending)
+        self.spool_dir = Path(spool_dir) if spool_dir else None
+        self.session_factory = session_factory
+        self.max_chain_retries = max_chain_retries
+        self.logger = logging.getLogger(__name__)
+        
+        self.events_written = 0
+        self.batches_written = 0
+        self.flush_failures = 0
+        
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # One flush (one chain link) at a time
+        self._wakeup = threading.Event()
+        self._closed = False
+        
+        self._load_spool()
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+    
+    @property
+    def pending_events(self) -> int:
+        return len(self._pending)
+    
+    def submit(self, row: Dict[str, Any], durable: bool = False):
+        """Queue a ClinicalAuditLog row (column values, checksum included)"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Audit writer is closed")
+            self._pending.append(row)
+            pending = len(self._pending)
+        
+        if durable or pending > self.max_pending:
+            self.flush()
+        elif pending >= self.max_batch:
+            self._wakeup.set()
+    
+    def flush(self) -> int:
+        """
+        Write everything queued so far
+        
+        Returns:
+            Number of events written
+            
+        Raises:
+            Exception: The database error if a batch could not be written;
+                its rows stay queued
+        """
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    rows = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+                if not rows:
+                    return written
+                try:
+                    self._write_batch(rows)
+                except Exception:
+                    self.flush_failures += 1
+                    with self._lock:
+                        self._pending.extendleft(reversed(rows))
+                    raise
+                written += len(rows)
+    
+    def close(self, timeout: float = 10.0):
+        """Stop the background writer and flush (or spool) remaining events"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        try:
+            self.flush()
+        except Exception as e:
+            self.logger.error(f"Final audit flush failed, spooling {len(self._pending)} events: {e}")
+            self._spool()
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.max_interval_seconds)
+            self._wakeup.clear()
+            if self._closed:
+                return  # close() does the final flush
+            if not self._pending:
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Error writing audit batch ({len(self._pending)} events queued): {e}")
+                self._wakeup.wait(min(self.max_interval_seconds * 5, 30))  # Back off; close() interrupts
+    
+    def _write_batch(self, rows: List[Dict[str, Any]]):
+        """Insert rows as one AuditBatch chained onto the latest batch"""
+        checksums = [row["checksum"] for row in rows]
+        timestamps = [row["event_timestamp"] for row in rows]
+        
+        for attempt in range(self.max_chain_retries):
+            try:
+                with self.session_factory() as session:
+                    last = session.query(AuditBatch.batch_id, AuditBatch.batch_hash).order_by(
+                        AuditBatch.batch_id.desc()
+                    ).first()
+                    previous_batch_id, previous_hash = last if last else (0, GENESIS_HASH)
+                    
+                    batch = AuditBatch(
+                        previous_batch_id=previous_batch_id,
+                        previous_hash=previous_hash,
+                        batch_hash=chain_batch_hash(previous_hash, checksums),
+                        event_count=len(rows),
+                        first_event_timestamp=min(timestamps),
+                        last_event_timestamp=max(timestamps),
+                        created_at=datetime.utcnow(),
+                        hostname=_HOSTNAME
+                    )
+                    session.add(batch)
+                    session.flush()  # Raises IntegrityError if another writer took this link
+                    
+                    session.execute(insert(ClinicalAuditLog),
+                                    [dict(row, batch_id=batch.batch_id) for row in rows])
+                    session.commit()
+                break
+            except IntegrityError:
+                if attempt == self.max_chain_retries - 1:
+                    raise
+        
+        self.events_written += len(rows)
+        self.batches_written += 1
+    
+    def _spool(self):
+        with self._lock:
+            rows, self._pending = list(self._pending), deque()
+        if not rows:
+            return
+        if self.spool_dir is None:
+            self.logger.critical(f"Lost {len(rows)} audit events: no spool directory configured")
+            return
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spool_dir / f"audit-spool-{os.getpid()}-{time.time_ns()}.pkl"
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(rows, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    
+    def _load_spool(self):
+        """Re-queue events spooled by writers that could not flush at exit"""
+        if self.spool_dir is None or not self.spool_dir.is_dir():
+            return
+        for path in sorted(self.spool_dir.glob("audit-spool-*.pkl")):
+            claimed = path.with_suffix(f".claimed-{os.getpid()}")
+            try:
+                os.rename(path, claimed)  # Another process may be loading it
+            except OSError:
+                continue
+            with open(claimed, "rb") as f:
+                rows = pickle.load(f)
+            self._pending.extend(rows)
+            claimed.unlink()
+            self.logger.info(f"Re-queued {len(rows)} spooled audit events from {path.name}")
+
+
+try:
+    _HOSTNAME = socket.gethostname()
+except OSError:
+    _HOSTNAME = "unknown"
+
+_audit_writer: Optional[AuditEventWriter] = None
+_audit_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditEventWriter:
+    """The process-wide audit writer, started on first use"""
+    global _audit_writer
+    with _audit_writer_lock:
+        if _audit_writer is None:
+            repo_root = Path(__file__).parent.parent.parent.parent
+            spool_dir = os.getenv("ANNOTATION_ENGINE_AUDIT_SPOOL_DIR",
+                                  str(repo_root / ".refs" / "database" / "audit_spool"))
+            _audit_writer = AuditEventWriter(spool_dir=Path(spool_dir))
+            atexit.register(close_audit_writer)
+        return _audit_writer
+
+
+def close_audit_writer():
+    """Flush and stop the process-wide audit writer"""
+    global _audit_writer
+    with _audit_writer_lock:
+        writer, _audit_writer = _audit_writer, None
+    if writer is not None:
+        writer.close()
+
+
 class AuditTrailManager:
     """Service class for managing clinical audit trails"""
     
-    def __init__(self):
+    def __init__(self, writer: Optional[AuditEventWriter] = None):
         self.logger = logging.getLogger(__name__)
+        self.writer = writer or get_audit_writer()
     
     def log_event(self,
                   event_type: AuditEventType,
@@ -257,6 +632,9 @@ class AuditTrailManager:
         """
         Log an auditable event
         
+        Events are queued for the background writer; CRITICAL events are
+        written before this returns.
+        
         Args:
             event_type: Type of event being logged
             description: Human-readable description
@@ -267,65 +645,42 @@ class AuditTrailManager:
         Returns:
             event_uuid of the logged event
         """
+        event_uuid = str(uuid.uuid4())
+        event_timestamp = datetime.utcnow()
         
-        with get_db_session() as session:
-            try:
-                import uuid
-                event_uuid = str(uuid.uuid4())
-                
-                # Determine compliance frameworks
-                frameworks = self._determine_compliance_frameworks(event_type, kwargs)
-                
-                # Create audit log entry
-                audit_entry = ClinicalAuditLog(
-                    event_uuid=event_uuid,
-                    event_type=event_type,
-                    event_category=self._categorize_event(event_type),
-                    severity=severity,
-                    event_date=datetime.utcnow().strftime("%Y-%m-%d"),
-                    user_id=audit_context.user_id,
-                    session_id=audit_context.session_id,
-                    ip_address=audit_context.ip_address,
-                    user_agent=audit_context.user_agent,
-                    event_description=description,
-                    event_details=kwargs,
-                    compliance_frameworks=frameworks,
-                    hostname=self._get_hostname()
-                )
-                
-                # Add clinical context if provided
-                if "patient_id" in kwargs:
-                    audit_entry.patient_id = kwargs["patient_id"]
-                if "case_uid" in kwargs:
-                    audit_entry.case_uid = kwargs["case_uid"]
-                if "variant_id" in kwargs:
-                    audit_entry.variant_id = kwargs["variant_id"]
-                if "interpretation_id" in kwargs:
-                    audit_entry.interpretation_id = kwargs["interpretation_id"]
-                
-                # Add data context if provided
-                if "table_affected" in kwargs:
-                    audit_entry.table_affected = kwargs["table_affected"]
-                if "record_id" in kwargs:
-                    audit_entry.record_id = kwargs["record_id"]
-                if "data_before" in kwargs:
-                    audit_entry.data_before = kwargs["data_before"]
-                if "data_after" in kwargs:
-                    audit_entry.data_after = kwargs["data_after"]
-                
-                # Calculate integrity checksum
-                audit_entry.checksum = self._calculate_checksum(audit_entry)
-                
-                session.add(audit_entry)
-                session.commit()
-                
-                self.logger.info(f"Logged audit event: {event_type.value} ({event_uuid})")
-                return event_uuid
-                
-            except Exception as e:
-                session.rollback()
-                self.logger.error(f"Error logging audit event: {e}")
-                raise
+        # Create audit log row
+        row = {
+            "event_uuid": event_uuid,
+            "event_type": event_type,
+            "event_category": self._categorize_event(event_type),
+            "severity": severity,
+            "event_timestamp": event_timestamp,
+            "event_date": event_timestamp.strftime("%Y-%m-%d"),
+            "user_id": audit_context.user_id,
+            "session_id": audit_context.session_id,
+            "ip_address": audit_context.ip_address,
+            "user_agent": audit_context.user_agent,
+            "event_description": description,
+            "event_details": kwargs,
+            "compliance_frameworks": self._determine_compliance_frameworks(event_type, kwargs),
+            "hostname": _HOSTNAME,
+            "retention_period_years": 7,
+            "legal_hold": False
+        }
+        
+        # Add clinical and data context if provided
+        for field_name in ("patient_id", "case_uid", "variant_id", "interpretation_id",
+                           "table_affected", "record_id", "data_before", "data_after"):
+            row[field_name] = kwargs.get(field_name)
+        
+        # Calculate integrity checksum
+        row["checksum"] = audit_checksum(event_uuid, event_type, event_timestamp,
+                                         audit_context.user_id, description)
+        
+        self.writer.submit(row, durable=severity == AuditSeverity.CRITICAL)
+        
+        self.logger.debug(f"Queued audit event: {event_type.value} ({event_uuid})")
+        return event_uuid
     
     def log_user_login(self, 
                       user_id: str,
@@ -429,6 +784,7 @@ class AuditTrailManager:
         Returns:
             report_id of the generated report
         """
+        self.writer.flush()
         
         with get_db_session() as session:
             try:
@@ -478,65 +834,158 @@ class AuditTrailManager:
                        user_id: Optional[str] = None,
                        start_date: Optional[datetime] = None,
                        end_date: Optional[datetime] = None,
-                       event_types: Optional[List[AuditEventType]] = None) -> List[Dict[str, Any]]:
+                       event_types: Optional[List[AuditEventType]] = None,
+                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Retrieve audit trail with filtering options
         
+        For large result sets use get_audit_trail_page() or iter_audit_trail().
+        
+        Returns:
+            List of audit events matching the criteria (most recent first)
+        """
+        try:
+            return list(islice(self.iter_audit_trail(
+                patient_id=patient_id, case_uid=case_uid, user_id=user_id,
+                start_date=start_date, end_date=end_date, event_types=event_types
+            ), limit))
+        except Exception as e:
+            self.logger.error(f"Error retrieving audit trail: {e}")
+            return []
+    
+    def get_audit_trail_page(self,
+                             limit: int = 100,
+                             cursor: Optional[str] = None,
+                             **filters) -> Dict[str, Any]:
+        """
+        One page of the audit trail, most recent first, by keyset pagination
+        
+        Args:
+            limit: Maximum events in the page
+            cursor: next_cursor of the previous page (None for the first)
+            **filters: As for get_audit_trail()
+            
         Returns:
-            List of audit events matching the criteria
+            {"events": [...], "next_cursor": cursor of the next page or None}
         """
+        self.writer.flush()
+        
+        query = self._audit_trail_query(**filters)
+        if cursor:
+            timestamp, audit_id = decode_audit_cursor(cursor)
+            query = query.where(or_(
+                ClinicalAuditLog.event_timestamp < timestamp,
+                and_(ClinicalAuditLog.event_timestamp == timestamp, ClinicalAuditLog.audit_id < audit_id)
+            ))
         
         with get_db_session() as session:
-            try:
-                query = session.query(ClinicalAuditLog)
-                
-                # Apply filters
-                if patient_id:
-                    query = query.filter(ClinicalAuditLog.patient_id == patient_id)
-                
-                if case_uid:
-                    query = query.filter(ClinicalAuditLog.case_uid == case_uid)
-                
-                if user_id:
-                    query = query.filter(ClinicalAuditLog.user_id == user_id)
-                
-                if start_date:
-                    query = query.filter(ClinicalAuditLog.event_timestamp >= start_date)
-                
-                if end_date:
-                    query = query.filter(ClinicalAuditLog.event_timestamp <= end_date)
-                
-                if event_types:
-                    query = query.filter(ClinicalAuditLog.event_type.in_(event_types))
-                
-                # Order by timestamp (most recent first)
-                events = query.order_by(ClinicalAuditLog.event_timestamp.desc()).all()
-                
-                # Convert to dictionaries
-                audit_trail = []
-                for event in events:
-                    audit_trail.append({
-                        "audit_id": event.audit_id,
-                        "event_uuid": event.event_uuid,
-                        "timestamp": event.event_timestamp.isoformat(),
-                        "event_type": event.event_type.value,
-                        "severity": event.severity.value,
-                        "user_id": event.user_id,
-                        "description": event.event_description,
-                        "details": event.event_details,
-                        "patient_id": event.patient_id,
-                        "case_uid": event.case_uid,
-                        "compliance_frameworks": event.compliance_frameworks
-                    })
-                
-                return audit_trail
-                
-            except Exception as e:
-                self.logger.error(f"Error retrieving audit trail: {e}")
-                return []
+            rows = session.execute(query.limit(limit + 1)).all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_audit_cursor(rows[-1].event_timestamp, rows[-1].audit_id)
+        
+        return {
+            "events": [self._audit_row_to_dict(row) for row in rows],
+            "next_cursor": next_cursor
+        }
+    
+    def iter_audit_trail(self, chunk_size: int = 1000, **filters) -> Iterator[Dict[str, Any]]:
+        """
+        Stream audit events matching the filters, most recent first
+        
+        Rows are fetched chunk_size at a time through a server-side cursor
+        (where the database supports one), so memory stays bounded however
+        large the result.
+        """
+        self.writer.flush()
+        
+        query = self._audit_trail_query(**filters).execution_options(yield_per=chunk_size)
+        with get_db_session() as session:
+            for row in session.execute(query):
+                yield self._audit_row_to_dict(row)
+    
+    def iter_audit_export(self, format: str = "ndjson", **filters) -> Iterator[str]:
+        """
+        Stream the audit trail as NDJSON lines or CSV text
+        
+        Args:
+            format: "ndjson" or "csv"
+            **filters: As for get_audit_trail()
+        """
+        if format not in ("ndjson", "csv"):
+            raise ValueError(f"Unsupported audit export format: {format}")
+        
+        if format == "ndjson":
+            for event in self.iter_audit_trail(**filters):
+                yield json.dumps(event, default=str) + "\n"
+            return
+        
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=AUDIT_EXPORT_FIELDS)
+        writer.writeheader()
+        for event in self.iter_audit_trail(**filters):
+            writer.writerow({
+                **event,
+                "details": json.dumps(event["details"], default=str),
+                "compliance_frameworks": json.dumps(event["compliance_frameworks"])
+            })
+            if buffer.tell() >= 65536:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    
+    def _audit_trail_query(self,
+                           patient_id: Optional[str] = None,
+                           case_uid: Optional[str] = None,
+                           user_id: Optional[str] = None,
+                           start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None,
+                           event_types: Optional[List[AuditEventType]] = None):
+        """Filtered audit trail select, ordered by (event_timestamp, audit_id) descending"""
+        query = select(*AUDIT_TRAIL_COLUMNS)
+        
+        # Apply filters
+        if patient_id:
+            query = query.where(ClinicalAuditLog.patient_id == patient_id)
+        
+        if case_uid:
+            query = query.where(ClinicalAuditLog.case_uid == case_uid)
+        
+        if user_id:
+            query = query.where(ClinicalAuditLog.user_id == user_id)
+        
+        if start_date:
+            query = query.where(ClinicalAuditLog.event_timestamp >= start_date)
+        
+        if end_date:
+            query = query.where(ClinicalAuditLog.event_timestamp <= end_date)
+        
+        if event_types:
+            query = query.where(ClinicalAuditLog.event_type.in_(event_types))
+        
+        return query.order_by(ClinicalAuditLog.event_timestamp.desc(), ClinicalAuditLog.audit_id.desc())
+    
+    def _audit_row_to_dict(self, event) -> Dict[str, Any]:
+        return {
+            "audit_id": event.audit_id,
+            "event_uuid": event.event_uuid,
+            "timestamp": event.event_timestamp.isoformat(),
+            "event_type": event.event_type.value,
+            "severity": event.severity.value,
+            "user_id": event.user_id,
+            "description": event.event_description,
+            "details": event.event_details,
+            "patient_id": event.patient_id,
+            "case_uid": event.case_uid,
+            "compliance_frameworks": event.compliance_frameworks
+        }
     
     def verify_audit_integrity(self, audit_id: int) -> bool:
         """Verify the integrity of an audit log entry"""
+        self.writer.flush()
         
         with get_db_session() as session:
             try:
@@ -556,6 +1005,161 @@ class AuditTrailManager:
                 self.logger.error(f"Error verifying audit integrity: {e}")
                 return False
     
+    def verify_batch_integrity(self, batch_id: int) -> bool:
+        """
+        Verify an audit batch: every row's checksum, the batch hash over
+        them and the batch's link to the previous batch's hash
+        """
+        self.writer.flush()
+        
+        try:
+            verified, _, failed = self._verify_batch_range(batch_id, batch_id)
+            return verified == 1 and not failed
+        except Exception as e:
+            self.logger.error(f"Error verifying audit batch integrity: {e}")
+            return False
+    
+    def verify_audit_trail(self,
+                           workers: int = 4,
+                           batches_per_chunk: int = 200,
+                           rows_per_chunk: int = 10000,
+                           checkpoint_path: Optional[Path] = None) -> AuditVerificationReport:
+        """
+        Verify the whole audit trail in chunks, in parallel
+        
+        Batch-id ranges of batches_per_chunk batches (and, for rows written
+        before batching, audit-id ranges of rows_per_chunk rows) are checked
+        by a pool of workers, each streaming only its own range.  With a
+        checkpoint_path, progress is saved whenever every range below a
+        point has completed, and a later call resumes after that point.
+        """
+        self.writer.flush()
+        started = time.monotonic()
+        
+        report = AuditVerificationReport.load(checkpoint_path) if checkpoint_path else AuditVerificationReport()
+        
+        with get_db_session() as session:
+            max_batch_id = session.scalar(select(func.max(AuditBatch.batch_id))) or 0
+            max_legacy_id = session.scalar(
+                select(func.max(ClinicalAuditLog.audit_id)).where(ClinicalAuditLog.batch_id.is_(None))
+            ) or 0
+        
+        batch_ranges = _split_range(report.verified_through_batch_id + 1, max_batch_id, batches_per_chunk)
+        legacy_ranges = _split_range(report.verified_through_audit_id + 1, max_legacy_id, rows_per_chunk)
+        batch_watermark = _RangeWatermark(report.verified_through_batch_id, batch_ranges)
+        legacy_watermark = _RangeWatermark(report.verified_through_audit_id, legacy_ranges)
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(self._verify_batch_range, lo, hi): ("batch", (lo, hi))
+                       for lo, hi in batch_ranges}
+            futures.update({pool.submit(self._verify_legacy_range, lo, hi): ("legacy", (lo, hi))
+                            for lo, hi in legacy_ranges})
+            
+            for future in as_completed(futures):
+                kind, range_ = futures[future]
+                if kind == "batch":
+                    batches, events, failed = future.result()
+                    report.batches_verified += batches
+                    report.events_verified += events
+                    report.failed_batch_ids.extend(failed)
+                    advanced = batch_watermark.complete(range_)
+                    report.verified_through_batch_id = batch_watermark.value
+                else:
+                    events, failed = future.result()
+                    report.events_verified += events
+                    report.failed_audit_ids.extend(failed)
+                    advanced = legacy_watermark.complete(range_)
+                    report.verified_through_audit_id = legacy_watermark.value
+                if advanced and checkpoint_path:
+                    report.save(checkpoint_path)
+        
+        report.failed_batch_ids.sort()
+        report.failed_audit_ids.sort()
+        report.elapsed_seconds += time.monotonic() - started
+        if checkpoint_path:
+            report.save(checkpoint_path)
+        
+        if not report.ok:
+            self.logger.error(f"Audit verification found {len(report.failed_batch_ids)} bad batches "
+                              f"and {len(report.failed_audit_ids)} bad unbatched events")
+        return report
+    
+    def _verify_batch_range(self, first_batch_id: int, last_batch_id: int) -> Tuple[int, int, List[int]]:
+        """
+        Verify the batches with ids in [first_batch_id, last_batch_id]
+        
+        Returns:
+            (batches verified, events verified, ids of batches that failed)
+        """
+        with get_db_session() as session:
+            batches = session.execute(
+                select(AuditBatch.batch_id, AuditBatch.previous_batch_id, AuditBatch.previous_hash,
+                       AuditBatch.batch_hash, AuditBatch.event_count)
+                .where(AuditBatch.batch_id.between(first_batch_id, last_batch_id))
+                .order_by(AuditBatch.batch_id)
+            ).all()
+            if not batches:
+                return 0, 0, []
+            
+            # Hashes of the batches each one links to (some may precede the range)
+            known_hashes = {batch.batch_id: batch.batch_hash for batch in batches}
+            outside = {batch.previous_batch_id for batch in batches
+                       if batch.previous_batch_id and batch.previous_batch_id not in known_hashes}
+            if outside:
+                known_hashes.update(session.execute(
+                    select(AuditBatch.batch_id, AuditBatch.batch_hash).where(AuditBatch.batch_id.in_(outside))
+                ).tuples().all())
+            
+            checksums: Dict[int, List[str]] = {batch.batch_id: [] for batch in batches}
+            bad_rows = set()
+            events = 0
+            rows = session.execute(
+                select(ClinicalAuditLog.batch_id, *_CHECKSUM_COLUMNS)
+                .where(ClinicalAuditLog.batch_id.between(first_batch_id, last_batch_id))
+                .execution_options(yield_per=5000)
+            )
+            for row in rows:
+                events += 1
+                if audit_checksum(row.event_uuid, row.event_type, row.event_timestamp,
+                                  row.user_id, row.event_description) != row.checksum:
+                    bad_rows.add(row.batch_id)
+                checksums.setdefault(row.batch_id, []).append(row.checksum)
+        
+        failed = []
+        for batch in batches:
+            if batch.previous_batch_id:
+                linked = known_hashes.get(batch.previous_batch_id) == batch.previous_hash
+            else:
+                linked = batch.previous_hash == GENESIS_HASH
+            batch_checksums = checksums[batch.batch_id]
+            if (not linked or batch.batch_id in bad_rows
+                    or len(batch_checksums) != batch.event_count
+                    or chain_batch_hash(batch.previous_hash, batch_checksums) != batch.batch_hash):
+                failed.append(batch.batch_id)
+        return len(batches), events, failed
+    
+    def _verify_legacy_range(self, first_audit_id: int, last_audit_id: int) -> Tuple[int, List[int]]:
+        """
+        Verify row checksums of unbatched events with ids in [first_audit_id, last_audit_id]
+        
+        Returns:
+            (number of events verified, audit ids that failed)
+        """
+        verified, failed = 0, []
+        with get_db_session() as session:
+            rows = session.execute(
+                select(ClinicalAuditLog.audit_id, *_CHECKSUM_COLUMNS)
+                .where(ClinicalAuditLog.batch_id.is_(None),
+                       ClinicalAuditLog.audit_id.between(first_audit_id, last_audit_id))
+                .execution_options(yield_per=5000)
+            )
+            for row in rows:
+                verified += 1
+                if audit_checksum(row.event_uuid, row.event_type, row.event_timestamp,
+                                  row.user_id, row.event_description) != row.checksum:
+                    failed.append(row.audit_id)
+        return verified, failed
+    
     def _categorize_event(self, event_type: AuditEventType) -> str:
         """Categorize event type for reporting"""
         category_map = {
@@ -597,17 +1201,12 @@ class AuditTrailManager:
     
     def _calculate_checksum(self, audit_entry: ClinicalAuditLog) -> str:
         """Calculate SHA-256 checksum for audit entry integrity"""
-        # Create a string representation of key fields
-        checksum_data = f"{audit_entry.event_uuid}|{audit_entry.event_type.value}|{audit_entry.event_timestamp}|{audit_entry.user_id}|{audit_entry.event_description}"
-        return hashlib.sha256(checksum_data.encode()).hexdigest()
+        return audit_checksum(audit_entry.event_uuid, audit_entry.event_type, audit_entry.event_timestamp,
+                              audit_entry.user_id, audit_entry.event_description)
     
     def _get_hostname(self) -> str:
         """Get current hostname"""
-        import socket
-        try:
-            return socket.gethostname()
-        except:
-            return "unknown"
+        return _HOSTNAME
     
     def _analyze_compliance_events(self, events: List[ClinicalAuditLog], framework: ComplianceFramework) -> Dict[str, Any]:
         """Analyze events for compliance summary"""
@@ -646,6 +1245,12 @@ class AuditTrailManager:
 
 
 # Utility functions
+def _split_range(first: int, last: int, size: int) -> List[Tuple[int, int]]:
+    """Inclusive [lo, hi] ranges of at most size ids covering first..last"""
+    size = max(1, size)
+    return [(lo, min(lo + size - 1, last)) for lo in range(first, last + 1, size)]
+
+
 def get_audit_manager() -> AuditTrailManager:
     """Get a configured audit trail manager instance"""
     return AuditTrailManager()
@@ -14,21 +14,30 @@ Features:
 - Compression for large results
 - Cache warming strategies
 - Performance monitoring
+
+Reads go through a per-process L1 (a byte-bounded LRU of decoded results)
+before the database tier.  Access statistics are aggregated in memory and
+written in bulk, together with expiry/size cleanup, by a background janitor
+thread, so a read-heavy workload does not turn into database writes.
 """
 
+import atexit
 import json
 import gzip
 import hashlib
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, text
+from sqlalchemy import and_, bindparam, or_, text, update
 
 from .base import get_db_session
 from .expanded_models import KnowledgeBaseCache
 from ..models import Evidence
+from ..step_cache import MemoryCache, value_size_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +49,7 @@ class CacheStats:
     cache_hits: int = 0
     cache_misses: int = 0
     cache_evictions: int = 0
+    l1_hits: int = 0
     avg_query_time_ms: float = 0.0
     cache_size_mb: float = 0.0
     hit_rate: float = 0.0
@@ -54,12 +64,21 @@ class KnowledgeBaseCacheManager:
     - Size-based LRU eviction  
     - Compression for large results
     - Query pattern optimization
+    - In-process L1 of decoded results in front of the database
+    
+    Results returned from the L1 are shared between callers and must be
+    treated as read-only.  Other processes' writes and invalidations reach
+    this process's L1 within l1_ttl_seconds.
     """
     
     def __init__(self, 
                  max_cache_size_mb: int = 500,
                  default_ttl_hours: int = 24,
-                 compression_threshold_kb: int = 10):
+                 compression_threshold_kb: int = 10,
+                 l1_max_size_mb: float = 64,
+                 l1_ttl_seconds: int = 300,
+                 access_flush_seconds: float = 30.0,
+                 cleanup_interval_seconds: float = 600.0):
         """
         Initialize cache manager
         
@@ -67,14 +86,34 @@ class KnowledgeBaseCacheManager:
             max_cache_size_mb: Maximum cache size in MB
             default_ttl_hours: Default TTL for cached items
             compression_threshold_kb: Compress results larger than this
+            l1_max_size_mb: Size bound of the in-process L1 (0 disables it)
+            l1_ttl_seconds: Longest an entry is served from L1 without
+                going back to the database
+            access_flush_seconds: How often aggregated access statistics
+                are written to the database
+            cleanup_interval_seconds: How often expired and excess
+                entries are removed
         """
         self.max_cache_size_mb = max_cache_size_mb
         self.default_ttl_hours = default_ttl_hours
         self.compression_threshold_kb = compression_threshold_kb
+        self.l1_ttl_seconds = l1_ttl_seconds
+        self.access_flush_seconds = access_flush_seconds
+        self.cleanup_interval_seconds = cleanup_interval_seconds
         
         # Performance tracking
         self.stats = CacheStats()
         
+        self.l1 = MemoryCache(max_size_mb=l1_max_size_mb) if l1_max_size_mb > 0 else None
+        
+        # (cache_key, kb_source, query_type) -> [hits since last flush, last access]
+        self._pending_access: Dict[Tuple[str, str, str], List[Any]] = {}
+        self._access_lock = threading.Lock()
+        self._janitor: Optional[threading.Thread] = None
+        self._janitor_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._last_cleanup = time.monotonic()
+        
         # KB-specific TTL settings
         self.ttl_settings = {
             "oncokb": 12,      # OncoKB: 12 hours (updated frequently)
@@ -102,10 +141,21 @@ class KnowledgeBaseCacheManager:
             Cached result or None if not found/expired
         """
         self.stats.total_queries += 1
+        self._ensure_janitor()
+        l1_key = self._l1_key(cache_key, kb_source, query_type)
+        
+        if self.l1 is not None:
+            result = self.l1.get(l1_key)
+            if result is not None:
+                self._record_access(cache_key, kb_source, query_type)
+                self.stats.cache_hits += 1
+                self.stats.l1_hits += 1
+                return result
         
         with get_db_session() as session:
             try:
                 # Look up cache entry
+                now = datetime.utcnow()
                 cache_entry = session.query(KnowledgeBaseCache).filter(
                     and_(
                         KnowledgeBaseCache.cache_key == cache_key,
@@ -113,21 +163,24 @@ class KnowledgeBaseCacheManager:
                         KnowledgeBaseCache.query_type == query_type,
                         or_(
                             KnowledgeBaseCache.expires_at.is_(None),
-                            KnowledgeBaseCache.expires_at > datetime.utcnow()
+                            KnowledgeBaseCache.expires_at > now
                         )
                     )
                 ).first()
                 
                 if cache_entry:
-                    # Update access statistics
-                    cache_entry.access_count += 1
-                    cache_entry.last_accessed = datetime.utcnow()
-                    session.commit()
+                    # Access statistics are flushed by the janitor
+                    self._record_access(cache_key, kb_source, query_type)
                     
                     # Decompress if needed and return result
                     result = self._decompress_result(cache_entry.cached_result)
                     self.stats.cache_hits += 1
                     
+                    metadata = cache_entry.result_metadata or {}
+                    size_bytes = (int(metadata["original_size_kb"] * 1024) if "original_size_kb" in metadata
+                                  else value_size_bytes(result))
+                    self._l1_put(l1_key, result, size_bytes, cache_entry.expires_at, now)
+                    
                     logger.debug(f"Cache HIT: {kb_source}:{query_type}:{cache_key[:16]}...")
                     return result
                     
@@ -187,8 +240,11 @@ class KnowledgeBaseCacheManager:
                 
                 logger.debug(f"Cached: {kb_source}:{query_type}:{cache_key[:16]}... (TTL: {ttl_hours}h)")
                 
-                # Trigger cleanup if cache is getting large
-                self._cleanup_if_needed(session)
+                # L1 is filled by the next read (with the stored, decoded form);
+                # cleanup runs in the janitor rather than on every write
+                if self.l1 is not None:
+                    self.l1.invalidate(self._l1_key(cache_key, kb_source, query_type))
+                self._ensure_janitor()
                 
                 return True
                 
@@ -234,6 +290,8 @@ class KnowledgeBaseCacheManager:
         Returns:
             Number of entries invalidated
         """
+        self._invalidate_l1(kb_source, query_type, cache_key)
+        
         with get_db_session() as session:
             try:
                 query = session.query(KnowledgeBaseCache)
@@ -300,6 +358,7 @@ class KnowledgeBaseCacheManager:
                         "current_size_mb": self.stats.cache_size_mb
                     },
                     "by_kb_source": kb_stats,
+                    "l1": dict(self.l1.get_stats(), l1_hits=self.stats.l1_hits) if self.l1 else None,
                     "ttl_settings": self.ttl_settings
                 }
                 
@@ -341,6 +400,116 @@ class KnowledgeBaseCacheManager:
         logger.info(f"Warmed {warmed_count} cache entries for {kb_source}")
         return warmed_count
     
+    def flush_access_stats(self) -> int:
+        """
+        Write aggregated access counts and times in one bulk UPDATE
+        
+        Returns:
+            Number of cache entries updated
+        """
+        with self._access_lock:
+            pending, self._pending_access = self._pending_access, {}
+        if not pending:
+            return 0
+        
+        rows = [{"key": key, "source": source, "qtype": qtype, "hits": hits, "accessed": accessed}
+                for (key, source, qtype), (hits, accessed) in pending.items()]
+        statement = update(KnowledgeBaseCache).where(
+            KnowledgeBaseCache.cache_key == bindparam("key"),
+            KnowledgeBaseCache.kb_source == bindparam("source"),
+            KnowledgeBaseCache.query_type == bindparam("qtype")
+        ).values(
+            access_count=KnowledgeBaseCache.access_count + bindparam("hits"),
+            last_accessed=bindparam("accessed")
+        ).execution_options(synchronize_session=False)
+        
+        try:
+            with get_db_session() as session:
+                session.connection().execute(statement, rows)
+                session.commit()
+        except Exception as e:
+            logger.error(f"Error flushing cache access statistics: {e}")
+            with self._access_lock:
+                for access_key, (hits, accessed) in pending.items():
+                    entry = self._pending_access.setdefault(access_key, [0, accessed])
+                    entry[0] += hits
+                    entry[1] = max(entry[1], accessed)
+            return 0
+        return len(rows)
+    
+    def run_maintenance(self, force_cleanup: bool = False):
+        """Flush access statistics and, when due, clean up expired and excess entries"""
+        self.flush_access_stats()
+        if force_cleanup or time.monotonic() - self._last_cleanup >= self.cleanup_interval_seconds:
+            self._last_cleanup = time.monotonic()
+            with get_db_session() as session:
+                self._cleanup_if_needed(session)
+    
+    def close(self):
+        """Stop the janitor and flush pending access statistics"""
+        self._stop.set()
+        janitor = self._janitor
+        if janitor is not None and janitor is not threading.current_thread():
+            janitor.join(timeout=10)
+        self.flush_access_stats()
+    
+    def _ensure_janitor(self):
+        if self._janitor is not None or self._stop.is_set():
+            return
+        with self._janitor_lock:
+            if self._janitor is None:
+                self._janitor = threading.Thread(target=self._janitor_loop, name="kb-cache-janitor", daemon=True)
+                self._janitor.start()
+                atexit.register(self.close)
+    
+    def _janitor_loop(self):
+        while not self._stop.wait(self.access_flush_seconds):
+            try:
+                self.run_maintenance()
+            except Exception as e:
+                logger.error(f"KB cache maintenance failed: {e}")
+    
+    def _record_access(self, cache_key: str, kb_source: str, query_type: str):
+        now = datetime.utcnow()
+        with self._access_lock:
+            entry = self._pending_access.get((cache_key, kb_source, query_type))
+            if entry is None:
+                self._pending_access[(cache_key, kb_source, query_type)] = [1, now]
+            else:
+                entry[0] += 1
+                entry[1] = now
+    
+    @staticmethod
+    def _l1_key(cache_key: str, kb_source: str, query_type: str) -> str:
+        return f"{kb_source}:{query_type}:{cache_key}"
+    
+    def _l1_put(self, l1_key: str, result: Any, size_bytes: int,
+                expires_at: Optional[datetime], now: datetime):
+        """Hold a decoded result in L1 no longer than the entry's remaining database TTL"""
+        if self.l1 is None or result is None:
+            return
+        ttl_seconds = self.l1_ttl_seconds
+        if expires_at is not None:
+            ttl_seconds = min(ttl_seconds, (expires_at - now).total_seconds())
+        if ttl_seconds > 0:
+            self.l1.set_sized(l1_key, result, size_bytes, ttl_seconds)
+    
+    def _invalidate_l1(self, kb_source: Optional[str], query_type: Optional[str], cache_key: Optional[str]):
+        if self.l1 is None:
+            return
+        if kb_source and query_type and cache_key:
+            self.l1.invalidate(self._l1_key(cache_key, kb_source, query_type))
+        elif not (kb_source or query_type or cache_key):
+            self.l1.clear()
+        else:
+            with self.l1.lock:
+                for l1_key in list(self.l1.cache):
+                    source, qtype, key = l1_key.split(":", 2)
+                    if ((kb_source is None or source == kb_source)
+                            and (query_type is None or qtype == query_type)
+                            and (cache_key is None or key == cache_key)):
+                        self.l1.invalidate(l1_key)
+    
     def _compress_result(self, result: Any) -> Tuple[Any, Dict[str, Any]]:
         """Compress large results to save space"""
         
@@ -440,6 +609,19 @@ class KnowledgeBaseCacheManager:
             logger.error(f"Error during cache cleanup: {e}")
 
 
+_default_manager: Optional[KnowledgeBaseCacheManager] = None
+_default_manager_lock = threading.Lock()
+
+
+def get_kb_cache_manager() -> KnowledgeBaseCacheManager:
+    """The process-wide cache manager, so decorated queries share one L1"""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = KnowledgeBaseCacheManager()
+        return _default_manager
+
+
 # ============================================================================
 # SPECIALIZED CACHE DECORATORS
 # ============================================================================
@@ -456,7 +638,7 @@ def cached_kb_query(kb_source: str, query_type: str, ttl_hours: Optional[int] =
     """
     def decorator(func):
         def wrapper(*args, **kwargs):
-            cache_manager = KnowledgeBaseCacheManager()
+            cache_manager = get_kb_cache_manager()
             
             # Generate cache key from function arguments
             cache_key = cache_manager.generate_cache_key(
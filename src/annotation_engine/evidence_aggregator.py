@@ -13,7 +13,9 @@ Key responsibilities:
 
 import os
 import json
+import numpy as np
 import pandas as pd
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Set
 import logging
@@ -27,59 +29,191 @@ from .models import (
     DynamicSomaticConfidence
 )
 from .purity_estimation import estimate_tumor_purity, PurityEstimate
+from .clinvar_index import ClinVarIndex
+from .gnomad_store import GnomadAFIndex, default_gnomad_store_path, load_gnomad_store
+from .interval_index import IntervalIndex, genomic_key, load_domain_index
+from .kb_ingest import (
+    read_kb_table, require_columns, column_values, text_column, intern_keys,
+    build_records, records_by_key, grouped_records
+)
+from .kb_snapshot import (
+    KnowledgeBaseSnapshot, SnapshotError, write_snapshot, default_snapshot_path, source_fingerprint
+)
 
 logger = logging.getLogger(__name__)
 
 # Global caches for knowledge bases
 _KB_CACHE: Dict[str, Any] = {}
 _KB_LOADED = False
+_KB_SNAPSHOT: Optional[KnowledgeBaseSnapshot] = None
+
+# Sentinels for "not pre-resolved by a batch" (None is a valid resolved value)
+_CLINVAR_NOT_LOOKED_UP = object()
+_GNOMAD_NOT_LOOKED_UP = object()
+_ONCOKB_GENE_LEVEL_UNSET = object()
+
+
+def get_kb_snapshot_id() -> Optional[str]:
+    """Identifier of the compiled KB snapshot backing _KB_CACHE, if any"""
+    return _KB_SNAPSHOT.snapshot_id if _KB_SNAPSHOT is not None else None
+
+
+def get_kb_fingerprint(kb_base_path: str = ".refs") -> str:
+    """
+    Fingerprint of the KB source files under kb_base_path
+    
+    Unlike get_kb_snapshot_id() this does not depend on whether the KBs have
+    been loaded yet or were parsed rather than read from a snapshot, so it is
+    safe to use in cache keys.
+    """
+    return KnowledgeBaseLoader(kb_base_path).source_fingerprint()
 
 
 class KnowledgeBaseLoader:
     """Handles loading and caching of knowledge bases"""
     
-    def __init__(self, kb_base_path: str = ".refs"):
+    # KB files (relative to kb_base_path) fingerprinted into compiled snapshots
+    SOURCE_FILES = (
+        "clinical_evidence/oncokb/curated_genes.tsv",
+        "clinical_evidence/oncokb/oncokb_genes.txt",
+        "clinical_evidence/oncokb/oncokb_biomarker_drug_associations.tsv",
+        "clinical_evidence/oncokb/levels_of_evidence.tsv",
+        "clinical_evidence/civic/civic_variant_summaries.tsv",
+        "clinical_evidence/civic/civic_variants.tsv",
+        "cancer_genes/cosmic_cgc/cancer_gene_census.tsv.gz",
+        "hotspots/msk_hotspots/MSK-SNV-hotspots-v2.tsv.gz",
+        "hotspots/msk_hotspots/MSK-INDEL-hotspots-v2.tsv.gz",
+        "cancer_genes/oncovi_lists/tumor_suppressors.txt",
+        "cancer_genes/oncovi_lists/oncogenes.txt",
+        "hotspots/oncovi_hotspots/single_residue_hotspots.tsv",
+        "hotspots/oncovi_hotspots/indel_hotspots.tsv",
+        "functional_predictions/plugin_data/protein_domains/oncovi_domains.tsv",
+        "functional_predictions/plugin_data/amino_acid_matrices/grantham_distance.txt",
+        "clinical_context/oncotree/oncotree.tsv",
+        "clinical_evidence/clinvar/variant_summary.txt.gz",
+    )
+    
+    def __init__(self, kb_base_path: str = ".refs", snapshot_path: Optional[str] = None,
+                 gnomad_store_path: Optional[str] = None):
         self.kb_base_path = Path(kb_base_path)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else default_snapshot_path(self.kb_base_path)
+        self.gnomad_store_path = (Path(gnomad_store_path) if gnomad_store_path
+                                  else default_gnomad_store_path(self.kb_base_path))
         
     def load_all_kbs(self) -> None:
         """Load all required knowledge bases into global cache"""
-        global _KB_CACHE, _KB_LOADED
+        global _KB_CACHE, _KB_LOADED, _KB_SNAPSHOT
         
         if _KB_LOADED:
             return
+        
+        # Population frequencies come from the separately built gnomAD AF
+        # store, which is already memory-mapped and not part of the snapshot
+        _KB_CACHE['gnomad_af'] = self._open_gnomad_store()
+        
+        # Prefer the compiled, memory-mapped snapshot when it is up to date
+        snapshot = self._open_snapshot()
+        if snapshot is not None:
+            try:
+                sections = snapshot.load_sections()
+            except SnapshotError as e:
+                logger.warning(f"Ignoring unreadable KB snapshot {self.snapshot_path}: {e}; "
+                               f"re-parsing sources")
+                snapshot.close()
+            else:
+                _KB_CACHE.update(sections)
+                _KB_SNAPSHOT = snapshot
+                _KB_LOADED = True
+                logger.info(f"Knowledge bases loaded from snapshot {snapshot.snapshot_id[:12]}")
+                return
             
         logger.info("Loading knowledge bases...")
+        _KB_CACHE.update(self.parse_all_kbs())
+        
+        _KB_LOADED = True
+        logger.info("Knowledge bases loaded successfully")
+    
+    def parse_all_kbs(self) -> Dict[str, Any]:
+        """Parse every knowledge base from its source files under kb_base_path"""
+        kbs: Dict[str, Any] = {}
         
         # Load OncoKB data
-        _KB_CACHE['oncokb_genes'] = self._load_oncokb_genes()
-        _KB_CACHE['oncokb_variants'] = self._load_oncokb_variants()
-        _KB_CACHE['oncokb_evidence_levels'] = self._load_oncokb_evidence_levels()
+        kbs['oncokb_genes'] = self._load_oncokb_genes()
+        kbs['oncokb_variants'] = self._load_oncokb_variants()
+        kbs['oncokb_evidence_levels'] = self._load_oncokb_evidence_levels()
         
         # Load CIViC data
-        _KB_CACHE['civic_variants'] = self._load_civic_variants()
-        _KB_CACHE['civic_evidence'] = self._load_civic_evidence()
+        kbs['civic_variants'] = self._load_civic_variants()
+        kbs['civic_evidence'] = self._load_civic_evidence()
         
         # Load COSMIC data
-        _KB_CACHE['cosmic_cgc'] = self._load_cosmic_cgc()
-        _KB_CACHE['cosmic_hotspots'] = self._load_cosmic_hotspots()
+        kbs['cosmic_cgc'] = self._load_cosmic_cgc()
+        kbs['cosmic_hotspots'] = self._load_cosmic_hotspots()
         
         # Load OncoVI curated resources
-        _KB_CACHE['oncovi_tsg'] = self._load_oncovi_tumor_suppressors()
-        _KB_CACHE['oncovi_oncogenes'] = self._load_oncovi_oncogenes()
-        _KB_CACHE['oncovi_hotspots'] = self._load_oncovi_hotspots()
-        _KB_CACHE['oncovi_domains'] = self._load_oncovi_domains()
+        kbs['oncovi_tsg'] = self._load_oncovi_tumor_suppressors()
+        kbs['oncovi_oncogenes'] = self._load_oncovi_oncogenes()
+        kbs['oncovi_hotspots'] = self._load_oncovi_hotspots()
+        kbs['oncovi_domains'] = self._load_oncovi_domains()
         
         # Load functional prediction data
-        _KB_CACHE['grantham_matrix'] = self._load_grantham_matrix()
+        kbs['grantham_matrix'] = self._load_grantham_matrix()
         
         # Load OncoTree and ClinVar data
-        _KB_CACHE['oncotree_data'] = self._load_oncotree_data()
-        _KB_CACHE['clinvar_data'] = self._load_clinvar_data()
+        kbs['oncotree_data'] = self._load_oncotree_data()
+        kbs['clinvar_data'] = self._load_clinvar_data()
         
-        # Load population frequency sources (handled by API clients)
+        return kbs
+    
+    def source_fingerprint(self) -> str:
+        """Size/mtime digest of SOURCE_FILES (see kb_snapshot.source_fingerprint)"""
+        return source_fingerprint(self.kb_base_path, self.SOURCE_FILES)
+    
+    def compile_snapshot(self, output_path: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Parse all knowledge bases once and write them as a compiled snapshot
         
-        _KB_LOADED = True
-        logger.info("Knowledge bases loaded successfully")
+        Args:
+            output_path: Snapshot destination (default: self.snapshot_path)
+            
+        Returns:
+            Manifest of the written snapshot
+        """
+        output_path = Path(output_path) if output_path else self.snapshot_path
+        return write_snapshot(output_path, self.parse_all_kbs(), self.kb_base_path, self.SOURCE_FILES)
+    
+    def _open_snapshot(self) -> Optional[KnowledgeBaseSnapshot]:
+        """Open the compiled snapshot if present, intact and built from the current KB files"""
+        if not self.snapshot_path.exists():
+            return None
+        
+        try:
+            snapshot = KnowledgeBaseSnapshot(self.snapshot_path, verify=True)
+        except (SnapshotError, OSError) as e:
+            logger.warning(f"Ignoring unusable KB snapshot: {e}")
+            return None
+        
+        if not snapshot.is_current(self.kb_base_path):
+            logger.warning(f"KB snapshot {self.snapshot_path} is stale; re-parsing sources "
+                           f"(rebuild with --compile-kb)")
+            snapshot.close()
+            return None
+        
+        return snapshot
+    
+    def _open_gnomad_store(self) -> Optional[GnomadAFIndex]:
+        """Open the local gnomAD AF store if one has been built (see --build-gnomad-store)"""
+        if not self.gnomad_store_path.exists():
+            logger.debug(f"No gnomAD AF store at {self.gnomad_store_path}")
+            return None
+        
+        try:
+            store = load_gnomad_store(self.gnomad_store_path)
+            logger.info(f"Opened gnomAD AF store: {len(store)} sites")
+            return store
+        except (SnapshotError, OSError) as e:
+            logger.warning(f"Ignoring unusable gnomAD AF store: {e}")
+            return None
     
     def _load_oncokb_genes(self) -> Dict[str, Any]:
         """Load OncoKB gene annotations from comprehensive curated genes file"""
@@ -90,20 +224,24 @@ class KnowledgeBaseLoader:
         # Load from comprehensive curated_genes.tsv first (priority)
         if (oncokb_path / "curated_genes.tsv").exists():
             try:
-                df = pd.read_csv(oncokb_path / "curated_genes.tsv", sep='\t')
-                for _, row in df.iterrows():
-                    gene = row['hugoSymbol']
-                    genes[gene] = {
-                        'is_oncogene': str(row.get('oncogene', '')).upper() == 'TRUE',
-                        'is_tsg': str(row.get('tsg', '')).upper() == 'TRUE',
-                        'oncokb_annotated': True,
-                        'highest_sensitive_level': row.get('highestSensitiveLevel', ''),
-                        'highest_resistance_level': row.get('highestResistanceLevel', ''),
-                        'summary': row.get('summary', ''),
-                        'background': row.get('background', ''),
-                        'grch38_transcript': row.get('grch38Isoform', ''),
-                        'grch38_refseq': row.get('grch38RefSeq', '')
-                    }
+                df = read_kb_table(
+                    oncokb_path / "curated_genes.tsv",
+                    columns=['hugoSymbol', 'oncogene', 'tsg', 'highestSensitiveLevel',
+                             'highestResistanceLevel', 'summary', 'background',
+                             'grch38Isoform', 'grch38RefSeq'],
+                    categorical=['highestSensitiveLevel', 'highestResistanceLevel']
+                )
+                genes = records_by_key(df, 'hugoSymbol', {
+                    'is_oncogene': text_column(df, 'oncogene').str.upper() == 'TRUE',
+                    'is_tsg': text_column(df, 'tsg').str.upper() == 'TRUE',
+                    'oncokb_annotated': [True] * len(df),
+                    'highest_sensitive_level': ('highestSensitiveLevel', ''),
+                    'highest_resistance_level': ('highestResistanceLevel', ''),
+                    'summary': ('summary', ''),
+                    'background': ('background', ''),
+                    'grch38_transcript': ('grch38Isoform', ''),
+                    'grch38_refseq': ('grch38RefSeq', '')
+                })
                 logger.info(f"Loaded {len(genes)} OncoKB curated genes")
             except Exception as e:
                 logger.warning(f"Failed to load OncoKB curated genes: {e}")
@@ -111,14 +249,13 @@ class KnowledgeBaseLoader:
         # Fallback to basic oncokb_genes.txt if curated file not available
         elif (oncokb_path / "oncokb_genes.txt").exists():
             try:
-                df = pd.read_csv(oncokb_path / "oncokb_genes.txt", sep='\t')
-                for _, row in df.iterrows():
-                    gene = row['Hugo Symbol']
-                    genes[gene] = {
-                        'is_oncogene': 'Oncogene' in str(row.get('Oncogene', '')),
-                        'is_tsg': 'TSG' in str(row.get('TSG', '')),
-                        'oncokb_annotated': True
-                    }
+                df = read_kb_table(oncokb_path / "oncokb_genes.txt",
+                                   columns=['Hugo Symbol', 'Oncogene', 'TSG'])
+                genes = records_by_key(df, 'Hugo Symbol', {
+                    'is_oncogene': text_column(df, 'Oncogene').str.contains('Oncogene', regex=False),
+                    'is_tsg': text_column(df, 'TSG').str.contains('TSG', regex=False),
+                    'oncokb_annotated': [True] * len(df)
+                })
                 logger.info(f"Loaded {len(genes)} OncoKB basic genes (fallback)")
             except Exception as e:
                 logger.warning(f"Failed to load OncoKB basic genes: {e}")
@@ -134,34 +271,26 @@ class KnowledgeBaseLoader:
         # Load biomarker drug associations
         if (oncokb_path / "oncokb_biomarker_drug_associations.tsv").exists():
             try:
-                df = pd.read_csv(oncokb_path / "oncokb_biomarker_drug_associations.tsv", sep='\t')
+                drugs_column = 'Drugs (for therapeutic implications only)'
+                df = read_kb_table(
+                    oncokb_path / "oncokb_biomarker_drug_associations.tsv",
+                    columns=['Gene', 'Alterations', 'Cancer Types', drugs_column, 'Level'],
+                    categorical=['Gene', 'Cancer Types', 'Level']
+                )
+                require_columns(df, 'Gene', 'Alterations', 'Cancer Types', drugs_column, 'Level')
                 
-                for _, row in df.iterrows():
-                    gene = row['Gene']
-                    alteration = row['Alterations']
-                    cancer_types = row['Cancer Types']
-                    drugs = row['Drugs (for therapeutic implications only)']
-                    level = row['Level']
-                    
-                    # Create variant key
-                    variant_key = f"{gene}:{alteration}"
-                    
-                    if variant_key not in variants:
-                        variants[variant_key] = {
-                            'gene': gene,
-                            'alteration': alteration,
-                            'evidence_items': []
-                        }
-                    
-                    # Add evidence item
-                    evidence_item = {
-                        'level': level,
-                        'cancer_type': cancer_types,
-                        'drugs': drugs,
-                        'therapeutic_level': f"LEVEL_{level}" if level in ['1', '2', '3A', '3B', '4'] else f"LEVEL_{level}"
+                groups = grouped_records(df, ['Gene', 'Alterations'], {
+                    'level': 'Level',
+                    'cancer_type': 'Cancer Types',
+                    'drugs': drugs_column,
+                    'therapeutic_level': 'LEVEL_' + text_column(df, 'Level')
+                })
+                for (gene, alteration), evidence_items in groups.items():
+                    variants[f"{gene}:{alteration}"] = {
+                        'gene': gene,
+                        'alteration': alteration,
+                        'evidence_items': evidence_items
                     }
-                    
-                    variants[variant_key]['evidence_items'].append(evidence_item)
                 
                 logger.info(f"Loaded {len(variants)} OncoKB variant-drug associations")
                 
@@ -178,16 +307,16 @@ class KnowledgeBaseLoader:
         
         if (oncokb_path / "levels_of_evidence.tsv").exists():
             try:
-                df = pd.read_csv(oncokb_path / "levels_of_evidence.tsv", sep='\t')
+                df = read_kb_table(oncokb_path / "levels_of_evidence.tsv",
+                                   columns=['levelOfEvidence', 'description', 'htmlDescription', 'colorHex'])
+                require_columns(df, 'levelOfEvidence', 'description')
                 
-                for _, row in df.iterrows():
-                    level = row['levelOfEvidence']
-                    levels[level] = {
-                        'description': row['description'],
-                        'html_description': row.get('htmlDescription', ''),
-                        'color': row.get('colorHex', ''),
-                        'therapeutic_significance': self._categorize_oncokb_level(level)
-                    }
+                levels = records_by_key(df, 'levelOfEvidence', {
+                    'description': 'description',
+                    'html_description': ('htmlDescription', ''),
+                    'color': ('colorHex', ''),
+                    'therapeutic_significance': df['levelOfEvidence'].map(self._categorize_oncokb_level)
+                })
                 
                 logger.info(f"Loaded {len(levels)} OncoKB evidence levels")
                 
@@ -217,16 +346,17 @@ class KnowledgeBaseLoader:
         variants = {}
         
         if (civic_path / "civic_variant_summaries.tsv").exists():
-            df = pd.read_csv(civic_path / "civic_variant_summaries.tsv", sep='\t')
-            for _, row in df.iterrows():
-                variant_id = row.get('variant_id')
-                if variant_id:
-                    variants[variant_id] = {
-                        'gene': row.get('gene'),
-                        'variant': row.get('variant'),
-                        'summary': row.get('variant_summary', ''),
-                        'civic_score': row.get('civic_score', 0)
-                    }
+            df = read_kb_table(civic_path / "civic_variant_summaries.tsv",
+                               columns=['variant_id', 'gene', 'variant', 'variant_summary', 'civic_score'],
+                               categorical=['gene'])
+            if 'variant_id' in df.columns:
+                df = df[df['variant_id'].fillna(0).astype(bool)]
+                variants = records_by_key(df, 'variant_id', {
+                    'gene': 'gene',
+                    'variant': 'variant',
+                    'summary': ('variant_summary', ''),
+                    'civic_score': ('civic_score', 0)
+                })
         
         return variants
     
@@ -236,19 +366,21 @@ class KnowledgeBaseLoader:
         evidence = {}
         
         if (civic_path / "civic_variants.tsv").exists():
-            df = pd.read_csv(civic_path / "civic_variants.tsv", sep='\t')
-            for _, row in df.iterrows():
-                evidence_id = row.get('evidence_id')
-                if evidence_id:
-                    evidence[evidence_id] = {
-                        'variant_id': row.get('variant_id'),
-                        'evidence_level': row.get('evidence_level'),
-                        'evidence_type': row.get('evidence_type'),
-                        'significance': row.get('significance'),
-                        'disease': row.get('disease'),
-                        'drugs': row.get('drugs', ''),
-                        'rating': row.get('rating', 0)
-                    }
+            df = read_kb_table(civic_path / "civic_variants.tsv",
+                               columns=['evidence_id', 'variant_id', 'evidence_level', 'evidence_type',
+                                        'significance', 'disease', 'drugs', 'rating'],
+                               categorical=['evidence_level', 'evidence_type', 'significance', 'disease'])
+            if 'evidence_id' in df.columns:
+                df = df[df['evidence_id'].fillna(0).astype(bool)]
+                evidence = records_by_key(df, 'evidence_id', {
+                    'variant_id': 'variant_id',
+                    'evidence_level': 'evidence_level',
+                    'evidence_type': 'evidence_type',
+                    'significance': 'significance',
+                    'disease': 'disease',
+                    'drugs': ('drugs', ''),
+                    'rating': ('rating', 0)
+                })
         
         return evidence
     
@@ -259,27 +391,31 @@ class KnowledgeBaseLoader:
         
         if (cosmic_path / "cancer_gene_census.tsv.gz").exists():
             try:
-                df = pd.read_csv(cosmic_path / "cancer_gene_census.tsv.gz", sep='\t', compression='gzip')
+                df = read_kb_table(
+                    cosmic_path / "cancer_gene_census.tsv.gz",
+                    columns=['GENE_SYMBOL', 'ROLE_IN_CANCER', 'MUTATION_TYPES',
+                             'TUMOUR_TYPES_SOMATIC', 'TUMOUR_TYPES_GERMLINE'],
+                    categorical=['ROLE_IN_CANCER', 'MUTATION_TYPES']
+                )
             except Exception as e:
                 logger.warning(f"Failed to load COSMIC CGC file: {e}")
                 return genes
-            for _, row in df.iterrows():
-                gene = row['GENE_SYMBOL']
-                genes[gene] = {
-                    'role_in_cancer': row.get('ROLE_IN_CANCER', ''),
-                    'mutation_types': row.get('MUTATION_TYPES', ''),
-                    'tumour_types_somatic': row.get('TUMOUR_TYPES_SOMATIC', ''),
-                    'tumour_types_germline': row.get('TUMOUR_TYPES_GERMLINE', ''),
-                    'is_oncogene': 'oncogene' in str(row.get('ROLE_IN_CANCER', '')).lower(),
-                    'is_tsg': 'tsg' in str(row.get('ROLE_IN_CANCER', '')).lower()
-                }
+            role = text_column(df, 'ROLE_IN_CANCER').str.lower()
+            genes = records_by_key(df, 'GENE_SYMBOL', {
+                'role_in_cancer': ('ROLE_IN_CANCER', ''),
+                'mutation_types': ('MUTATION_TYPES', ''),
+                'tumour_types_somatic': ('TUMOUR_TYPES_SOMATIC', ''),
+                'tumour_types_germline': ('TUMOUR_TYPES_GERMLINE', ''),
+                'is_oncogene': role.str.contains('oncogene', regex=False),
+                'is_tsg': role.str.contains('tsg', regex=False)
+            })
         
         return genes
     
-    def _load_cosmic_hotspots(self) -> List[Dict[str, Any]]:
-        """Load COSMIC hotspots data"""
+    def _load_cosmic_hotspots(self) -> IntervalIndex:
+        """Load COSMIC hotspots data as a genomic interval index keyed by chromosome"""
         cosmic_path = self.kb_base_path / "hotspots" / "msk_hotspots"
-        hotspots = []
+        frames = []
         
         # Load from multiple hotspot sources
         hotspot_files = [
@@ -291,21 +427,41 @@ class KnowledgeBaseLoader:
             filepath = cosmic_path / filename
             if filepath.exists():
                 try:
-                    df = pd.read_csv(filepath, sep='\t', compression='gzip')
-                    for _, row in df.iterrows():
-                        hotspots.append({
-                            'gene': row.get('Hugo_Symbol'),
-                            'chromosome': row.get('Chromosome'),
-                            'position': row.get('Start_Position'),
-                            'reference': row.get('Reference_Allele'),
-                            'variant': row.get('Tumor_Seq_Allele2'),
-                            'samples': row.get('Mutation_Count', 0),
-                            'source': 'MSK_hotspots'
-                        })
+                    frames.append(read_kb_table(
+                        filepath,
+                        columns=['Hugo_Symbol', 'Chromosome', 'Start_Position', 'End_Position',
+                                 'Reference_Allele', 'Tumor_Seq_Allele2', 'Mutation_Count'],
+                        categorical=['Hugo_Symbol', 'Chromosome']
+                    ))
                 except Exception as e:
                     logger.warning(f"Could not load {filename}: {e}")
         
-        return hotspots
+        if not frames:
+            return IntervalIndex.build([])
+        
+        df = pd.concat(frames, ignore_index=True)
+        if 'Start_Position' not in df.columns or 'Chromosome' not in df.columns:
+            return IntervalIndex.build([])
+        
+        start = pd.to_numeric(df['Start_Position'], errors='coerce')
+        ref_length = text_column(df, 'Reference_Allele').str.len().clip(lower=1)
+        end = pd.to_numeric(df['End_Position'], errors='coerce') if 'End_Position' in df.columns \
+            else pd.Series(np.nan, index=df.index)
+        end = end.fillna(start + ref_length - 1)
+        valid = start.notna() & df['Chromosome'].notna()
+        df = df[valid]
+        
+        records = build_records(df, {
+            'gene': 'Hugo_Symbol',
+            'chromosome': 'Chromosome',
+            'position': 'Start_Position',
+            'reference': 'Reference_Allele',
+            'variant': 'Tumor_Seq_Allele2',
+            'samples': ('Mutation_Count', 0),
+            'source': ['MSK_hotspots'] * len(df)
+        })
+        chromosomes = df['Chromosome'].astype(object).map(genomic_key)
+        return IntervalIndex.build(zip(chromosomes, start[valid], end[valid], records))
     
     def _load_oncovi_tumor_suppressors(self) -> Set[str]:
         """Load OncoVI tumor suppressor gene list"""
@@ -342,50 +498,39 @@ class KnowledgeBaseLoader:
         
         # Load single residue hotspots
         if (oncovi_path / "single_residue_hotspots.tsv").exists():
-            df = pd.read_csv(oncovi_path / "single_residue_hotspots.tsv", sep='\t')
-            for _, row in df.iterrows():
-                key = f"{row['gene']}:{row['residue']}"
-                hotspots[key] = {
-                    'gene': row['gene'],
-                    'residue': row['residue'],
-                    'samples': row.get('samples', 0),
-                    'cancer_types': row.get('cancer_types', '').split(','),
-                    'type': 'single_residue'
-                }
+            df = read_kb_table(oncovi_path / "single_residue_hotspots.tsv",
+                               columns=['gene', 'residue', 'samples', 'cancer_types'],
+                               categorical=['gene'])
+            require_columns(df, 'gene', 'residue')
+            cancer_types = (df['cancer_types'].fillna('').astype(str) if 'cancer_types' in df.columns
+                            else text_column(df, 'cancer_types'))
+            hotspots.update(records_by_key(df, text_column(df, 'gene') + ':' + text_column(df, 'residue'), {
+                'gene': 'gene',
+                'residue': 'residue',
+                'samples': ('samples', 0),
+                'cancer_types': cancer_types.str.split(','),
+                'type': ['single_residue'] * len(df)
+            }))
         
         # Load indel hotspots
         if (oncovi_path / "indel_hotspots.tsv").exists():
-            df = pd.read_csv(oncovi_path / "indel_hotspots.tsv", sep='\t')
-            for _, row in df.iterrows():
-                key = f"{row['gene']}:{row['position']}"
-                hotspots[key] = {
-                    'gene': row['gene'],
-                    'position': row['position'],
-                    'samples': row.get('samples', 0),
-                    'type': 'indel'
-                }
+            df = read_kb_table(oncovi_path / "indel_hotspots.tsv",
+                               columns=['gene', 'position', 'samples'],
+                               categorical=['gene'])
+            require_columns(df, 'gene', 'position')
+            hotspots.update(records_by_key(df, text_column(df, 'gene') + ':' + text_column(df, 'position'), {
+                'gene': 'gene',
+                'position': 'position',
+                'samples': ('samples', 0),
+                'type': ['indel'] * len(df)
+            }))
         
         return hotspots
     
-    def _load_oncovi_domains(self) -> Dict[str, Any]:
-        """Load OncoVI protein domain annotations"""
+    def _load_oncovi_domains(self) -> IntervalIndex:
+        """Load OncoVI protein domain annotations as a per-gene interval index"""
         oncovi_path = self.kb_base_path / "functional_predictions" / "plugin_data" / "protein_domains"
-        domains = {}
-        
-        if (oncovi_path / "oncovi_domains.tsv").exists():
-            df = pd.read_csv(oncovi_path / "oncovi_domains.tsv", sep='\t')
-            for _, row in df.iterrows():
-                gene = row['gene']
-                if gene not in domains:
-                    domains[gene] = []
-                domains[gene].append({
-                    'domain': row['domain'],
-                    'start': row['start'],
-                    'end': row['end'],
-                    'importance': row.get('importance', 'unknown')
-                })
-        
-        return domains
+        return load_domain_index(oncovi_path / "oncovi_domains.tsv")
     
     def _load_grantham_matrix(self) -> Dict[Tuple[str, str], float]:
         """Load Grantham distance matrix"""
@@ -411,40 +556,44 @@ class KnowledgeBaseLoader:
             return {}
         
         try:
-            import pandas as pd
-            
             # Load main OncoTree TSV file
-            df = pd.read_csv(oncotree_tsv, sep='\t')
+            df = read_kb_table(oncotree_tsv, categorical=['mainType', 'tissue'])
+            require_columns(df, 'code', 'parent', 'tissue', 'name', 'mainType', 'level')
             
             # Create lookup maps for efficient cancer type validation and hierarchy
             code_map = {}
             hierarchy_map = {}
             tissue_map = {}
             
-            for _, row in df.iterrows():
-                code = row['code']
-                parent = row['parent'] if pd.notna(row['parent']) and row['parent'] != '' else None
-                tissue = row['tissue']
-                
+            parents = df['parent'].astype(object)
+            parents = parents.where(parents.notna() & (parents != ''), None)
+            rows = zip(
+                intern_keys(column_values(df, 'code')),
+                column_values(df, 'name'),
+                column_values(df, 'mainType'),
+                column_values(df, 'tissue'),
+                column_values(df, 'level'),
+                parents.tolist(),
+                column_values(df, 'external_references', ''),
+            )
+            for code, name, main_type, tissue, level, parent, external_references in rows:
                 code_map[code] = {
-                    'name': row['name'],
-                    'main_type': row['mainType'],
+                    'name': name,
+                    'main_type': main_type,
                     'tissue': tissue,
-                    'level': row['level'],
+                    'level': level,
                     'parent': parent,
-                    'external_references': row.get('external_references', '')
+                    'external_references': external_references
                 }
                 
-                # Build hierarchy chain
+                # Build hierarchy chain (parents precede children in the file)
                 if parent and parent in code_map:
                     hierarchy_map[code] = hierarchy_map.get(parent, []) + [parent]
                 else:
                     hierarchy_map[code] = []
                 
                 # Group by tissue for efficient tissue-specific lookups
-                if tissue not in tissue_map:
-                    tissue_map[tissue] = []
-                tissue_map[tissue].append(code)
+                tissue_map.setdefault(tissue, []).append(code)
             
             # Load tissue-specific files for enhanced lookup (optional)
             tissue_files = {}
@@ -467,77 +616,26 @@ class KnowledgeBaseLoader:
             logger.warning(f"Failed to load OncoTree TSV data: {e}")
             return {}
     
-    def _load_clinvar_data(self) -> Dict[str, Any]:
+    def _load_clinvar_data(self) -> Optional[ClinVarIndex]:
         """Load ClinVar pathogenicity data for germline filtering and evidence"""
         clinvar_path = self.kb_base_path / "clinical_evidence" / "clinvar" / "variant_summary.txt.gz"
         
         if not clinvar_path.exists():
             logger.warning(f"ClinVar file not found: {clinvar_path}")
-            return {}
+            return None
         
         try:
-            import pandas as pd
-            
-            # Load variant summary data
-            df = pd.read_csv(clinvar_path, sep='\t', compression='gzip', 
-                           usecols=['GeneSymbol', 'ClinicalSignificance', 'ReviewStatus', 
-                                   'PhenotypeList', 'Assembly', 'Chromosome', 'Start', 'Stop',
-                                   'ReferenceAllele', 'AlternateAllele', 'Type', 'Name'])
-            
-            # Filter for GRCh38 and pathogenic variants
-            df_grch38 = df[df['Assembly'] == 'GRCh38']
+            # Position-indexed store keyed by (chrom, pos, ref, alt) with
+            # per-gene pathogenic/benign counts precomputed
+            clinvar_index = ClinVarIndex.from_variant_summary(clinvar_path, assembly="GRCh38")
             
-            # Create pathogenic variant lookup
-            pathogenic_variants = {}
-            benign_variants = {}
-            
-            for _, row in df_grch38.iterrows():
-                gene = row.get('GeneSymbol')
-                if pd.isna(gene) or gene == '-':
-                    continue
-                
-                significance = str(row.get('ClinicalSignificance', '')).lower()
-                
-                # Map ClinVar significance to evidence codes
-                if any(term in significance for term in ['pathogenic', 'likely_pathogenic']):
-                    if gene not in pathogenic_variants:
-                        pathogenic_variants[gene] = []
-                    pathogenic_variants[gene].append({
-                        'significance': significance,
-                        'review_status': row.get('ReviewStatus', ''),
-                        'phenotype': row.get('PhenotypeList', ''),
-                        'chromosome': row.get('Chromosome', ''),
-                        'position': row.get('Start', ''),
-                        'ref': row.get('ReferenceAllele', ''),
-                        'alt': row.get('AlternateAllele', ''),
-                        'variant_type': row.get('Type', ''),
-                        'name': row.get('Name', '')
-                    })
-                
-                elif any(term in significance for term in ['benign', 'likely_benign']):
-                    if gene not in benign_variants:
-                        benign_variants[gene] = []
-                    benign_variants[gene].append({
-                        'significance': significance,
-                        'review_status': row.get('ReviewStatus', ''),
-                        'chromosome': row.get('Chromosome', ''),
-                        'position': row.get('Start', ''),
-                        'ref': row.get('ReferenceAllele', ''),
-                        'alt': row.get('AlternateAllele', '')
-                    })
-            
-            logger.info(f"Loaded ClinVar data: {len(pathogenic_variants)} genes with pathogenic variants, "
-                       f"{len(benign_variants)} genes with benign variants")
-            
-            return {
-                'pathogenic_variants': pathogenic_variants,
-                'benign_variants': benign_variants,
-                'total_variants': len(df_grch38)
-            }
+            logger.info(f"Loaded ClinVar data: {clinvar_index.total_variants} GRCh38 variants, "
+                       f"{len(clinvar_index)} position-indexed")
+            return clinvar_index
             
         except Exception as e:
             logger.warning(f"Failed to load ClinVar data: {e}")
-            return {}
+            return None
 
 
 class DynamicSomaticConfidenceCalculator:
@@ -856,18 +954,101 @@ class EvidenceAggregator:
         Returns:
             List of evidence items supporting classification
         """
-        # Load knowledge bases on first use
-        global _KB_LOADED
+        self._ensure_kbs_loaded()
+        
+        oncokb_matches = self._match_oncokb_variants(variant_annotation.gene_symbol, variant_annotation.hgvs_p or "")
+        evidence_list = self._collect_evidence(variant_annotation, cancer_type, analysis_type, oncokb_matches)
+        
+        # Apply workflow-specific evidence adjustments if router is available
+        if self.workflow_router:
+            return self._apply_pathway_weights([evidence_list])[0]
+        
+        return evidence_list
+    
+    def aggregate_evidence_batch(self, variants: List[VariantAnnotation], cancer_type: str = "unknown",
+                                 analysis_type: AnalysisType = AnalysisType.TUMOR_ONLY) -> List[List[Evidence]]:
+        """
+        Aggregate evidence for many variants at once
+        
+        Produces the same evidence as aggregate_evidence() per variant, but
+        KB loading is checked once, ClinVar exact matches and gnomAD AFs are
+        each resolved in one batched index search, OncoKB gene- and alteration-level matches are
+        computed once per gene/alteration group, and pathway weights are
+        resolved once per evidence source.
+        
+        Args:
+            variants: VEP-annotated variants
+            cancer_type: Cancer type context
+            analysis_type: Analysis workflow type for confidence modulation
+            
+        Returns:
+            Evidence lists in the same order as variants
+        """
+        self._ensure_kbs_loaded()
+        
+        if not variants:
+            return []
+        
+        clinvar_index = _KB_CACHE.get('clinvar_data')
+        if clinvar_index:
+            clinvar_records = clinvar_index.lookup_batch(
+                [(v.chromosome, v.position, v.reference, v.alternate) for v in variants]
+            )
+        else:
+            clinvar_records = [None] * len(variants)
+        
+        gnomad_store = _KB_CACHE.get('gnomad_af')
+        if gnomad_store is not None:
+            gnomad_records = gnomad_store.lookup_batch(
+                [(v.chromosome, v.position, v.reference, v.alternate) for v in variants]
+            )
+        else:
+            gnomad_records = [None] * len(variants)
+        
+        # Group by gene so per-gene KB joins run once per group
+        gene_groups: Dict[str, List[int]] = defaultdict(list)
+        for i, variant in enumerate(variants):
+            gene_groups[variant.gene_symbol].append(i)
+        
+        results: List[List[Evidence]] = [[] for _ in variants]
+        for gene, indices in gene_groups.items():
+            gene_level_match = self._match_oncokb_gene_level(gene)
+            alteration_matches: Dict[str, List[Tuple[str, Dict[str, Any], str]]] = {}
+            
+            for i in indices:
+                variant = variants[i]
+                hgvs_p = variant.hgvs_p or ""
+                if hgvs_p not in alteration_matches:
+                    alteration_matches[hgvs_p] = self._match_oncokb_variants(gene, hgvs_p, gene_level_match)
+                
+                results[i] = self._collect_evidence(variant, cancer_type, analysis_type,
+                                                    alteration_matches[hgvs_p], clinvar_records[i],
+                                                    gnomad_records[i])
+        
+        if self.workflow_router:
+            return self._apply_pathway_weights(results)
+        
+        return results
+    
+    def _ensure_kbs_loaded(self) -> None:
+        """Load knowledge bases on first use"""
         if not _KB_LOADED:
             try:
                 self.loader.load_all_kbs()
             except Exception as e:
                 logger.warning(f"Some knowledge bases failed to load: {e}")
-        
+    
+    def _collect_evidence(self, variant_annotation: VariantAnnotation, cancer_type: str,
+                          analysis_type: AnalysisType,
+                          oncokb_matches: List[Tuple[str, Dict[str, Any], str]],
+                          clinvar_record: Any = _CLINVAR_NOT_LOOKED_UP,
+                          gnomad_record: Any = _GNOMAD_NOT_LOOKED_UP) -> List[Evidence]:
+        """Evidence from every source for one variant, before pathway weighting"""
         evidence_list = []
         
         # Population frequency evidence (critical for TO, contextual for TN)
-        evidence_list.extend(self._get_population_frequency_evidence(variant_annotation, analysis_type))
+        evidence_list.extend(self._get_population_frequency_evidence(variant_annotation, analysis_type,
+                                                                     gnomad_record))
         
         # Hotspot evidence
         evidence_list.extend(self._get_hotspot_evidence(variant_annotation, analysis_type))
@@ -879,66 +1060,75 @@ class EvidenceAggregator:
         evidence_list.extend(self._get_functional_prediction_evidence(variant_annotation, analysis_type))
         
         # Clinical evidence (ambiguous interpretation for TO)
-        evidence_list.extend(self._get_clinical_evidence(variant_annotation, cancer_type, analysis_type))
+        evidence_list.extend(self._get_clinical_evidence(variant_annotation, cancer_type, analysis_type,
+                                                         oncokb_matches))
         
         # Domain evidence
         evidence_list.extend(self._get_domain_evidence(variant_annotation, analysis_type))
         
         # ClinVar evidence for germline filtering and pathogenicity
-        evidence_list.extend(self._get_clinvar_evidence(variant_annotation, analysis_type))
+        evidence_list.extend(self._get_clinvar_evidence(variant_annotation, analysis_type, clinvar_record))
         
-        # Apply workflow-specific evidence adjustments if router is available
-        if self.workflow_router:
-            # Convert evidence to dict format for adjustment
-            evidence_dicts = []
-            for evidence in evidence_list:
-                evidence_dict = {
-                    "source_kb": evidence.source_kb,
-                    "score": evidence.score,
-                    "code": evidence.code,
-                    "guideline": evidence.guideline,
-                    "description": evidence.description,
-                    "data": evidence.data,
-                    "confidence": evidence.confidence
-                }
-                evidence_dicts.append(evidence_dict)
-            
-            # Adjust scores based on workflow
-            adjusted_dicts = self.workflow_router.adjust_evidence_scores(evidence_dicts)
-            
-            # Convert back to Evidence objects with adjusted scores
-            adjusted_evidence = []
-            for i, adj_dict in enumerate(adjusted_dicts):
-                original_evidence = evidence_list[i]
-                # Create new Evidence with adjusted confidence if weight was applied
-                if "pathway_weight" in adj_dict:
-                    adjusted_confidence = original_evidence.confidence * adj_dict["pathway_weight"]
-                    adjusted_evidence.append(Evidence(
+        return evidence_list
+    
+    def _apply_pathway_weights(self, evidence_lists: List[List[Evidence]]) -> List[List[Evidence]]:
+        """
+        Scale evidence confidence by the workflow router's per-source weights
+        
+        The router is consulted once per distinct source_kb rather than once
+        per evidence item; weighted items are rebuilt with "pathway_weight" in
+        their data, exactly as per-item adjustment did.
+        """
+        sources = list(dict.fromkeys(e.source_kb for evidence_list in evidence_lists for e in evidence_list))
+        if not sources:
+            return evidence_lists
+        
+        probes = [{"source_kb": source, "score": 1} for source in sources]
+        adjusted = self.workflow_router.adjust_evidence_scores(probes)
+        weights = {source: adj.get("pathway_weight") for source, adj in zip(sources, adjusted)}
+        
+        flat = [e for evidence_list in evidence_lists for e in evidence_list]
+        weight_array = np.array([weights[e.source_kb] if weights[e.source_kb] is not None else np.nan
+                                 for e in flat], dtype=float)
+        confidence_array = np.array([e.confidence if e.confidence is not None else np.nan
+                                     for e in flat], dtype=float)
+        adjusted_confidence = confidence_array * weight_array
+        
+        weighted_lists = []
+        position = 0
+        for evidence_list in evidence_lists:
+            weighted = []
+            for original_evidence in evidence_list:
+                weight = weights[original_evidence.source_kb]
+                if weight is not None:
+                    confidence = adjusted_confidence[position]
+                    weighted.append(Evidence(
                         code=original_evidence.code,
                         score=original_evidence.score,
                         guideline=original_evidence.guideline,
                         source_kb=original_evidence.source_kb,
                         description=original_evidence.description,
-                        data={**original_evidence.data, "pathway_weight": adj_dict["pathway_weight"]},
-                        confidence=adjusted_confidence
+                        data={**original_evidence.data, "pathway_weight": weight},
+                        confidence=None if np.isnan(confidence) else float(confidence)
                     ))
                 else:
-                    adjusted_evidence.append(original_evidence)
-            
-            return adjusted_evidence
+                    weighted.append(original_evidence)
+                position += 1
+            weighted_lists.append(weighted)
         
-        return evidence_list
+        return weighted_lists
     
     def calculate_dsc_score(self, variant: VariantAnnotation, evidence_list: List[Evidence], 
                            tumor_purity: Optional[float] = None) -> DynamicSomaticConfidence:
         """Calculate Dynamic Somatic Confidence score for tumor-only analysis"""
         return self.dsc_calculator.calculate_dsc_score(variant, evidence_list, tumor_purity)
     
-    def _get_population_frequency_evidence(self, variant: VariantAnnotation, analysis_type: AnalysisType) -> List[Evidence]:
+    def _get_population_frequency_evidence(self, variant: VariantAnnotation, analysis_type: AnalysisType,
+                                           gnomad_record: Any = _GNOMAD_NOT_LOOKED_UP) -> List[Evidence]:
         """Generate population frequency evidence"""
         evidence = []
         
-        for pop_freq in variant.population_frequencies:
+        for pop_freq in self._population_frequencies(variant, gnomad_record):
             if pop_freq.allele_frequency is not None:
                 # Base confidence modulated by analysis type
                 base_confidence_high = 0.9 if analysis_type == AnalysisType.TUMOR_NORMAL else 0.95  # Higher for TO (critical filter)
@@ -995,49 +1185,108 @@ class EvidenceAggregator:
         
         return evidence
     
+    def _population_frequencies(self, variant: VariantAnnotation,
+                                gnomad_record: Any = _GNOMAD_NOT_LOOKED_UP) -> List[PopulationFrequency]:
+        """
+        The variant's population frequencies, completed from the local gnomAD store
+        
+        When the annotation carries no gnomAD frequency, the store's
+        max(AF, AF_grpmax) is added as a single entry so evidence is not
+        double-counted across the two columns.
+        """
+        frequencies = list(variant.population_frequencies)
+        gnomad_store = _KB_CACHE.get('gnomad_af')
+        if gnomad_store is None or any(pf.database.lower().startswith('gnomad') for pf in frequencies):
+            return frequencies
+        
+        if gnomad_record is _GNOMAD_NOT_LOOKED_UP:
+            gnomad_record = gnomad_store.lookup(variant.chromosome, variant.position,
+                                                variant.reference, variant.alternate)
+        if gnomad_record is None:
+            return frequencies
+        
+        af, af_grpmax = gnomad_record['af'], gnomad_record['af_grpmax']
+        if af_grpmax is not None and (af is None or af_grpmax > af):
+            frequencies.append(PopulationFrequency(database=gnomad_record['dataset'], population='grpmax',
+                                                   allele_frequency=af_grpmax))
+        elif af is not None:
+            frequencies.append(PopulationFrequency(database=gnomad_record['dataset'], population='global',
+                                                   allele_frequency=af))
+        return frequencies
+    
     def _get_hotspot_evidence(self, variant: VariantAnnotation, analysis_type: AnalysisType) -> List[Evidence]:
-        """Generate hotspot evidence"""
+        """Generate hotspot evidence from annotated hotspots and the MSK hotspot interval index"""
         evidence = []
         
-        for hotspot in variant.hotspot_evidence:
+        observations = [(hotspot.source, hotspot.samples_observed, hotspot.cancer_types)
+                        for hotspot in variant.hotspot_evidence]
+        if not any(source.startswith("MSK") for source, _, _ in observations):
+            msk_hotspot = self._match_msk_hotspot(variant)
+            if msk_hotspot is not None:
+                observations.append((msk_hotspot['source'], msk_hotspot['samples'], []))
+        
+        for source, samples_observed, cancer_types in observations:
             # VICC OS3: Well-established hotspot (>20 samples)
-            if hotspot.samples_observed >= 20:
+            if samples_observed >= 20:
                 evidence.append(Evidence(
                     code="OS3",
                     score=4,
                     guideline="VICC_2022",
-                    source_kb=hotspot.source,
-                    description=f"Well-established hotspot ({hotspot.samples_observed} samples)",
-                    data={"samples": hotspot.samples_observed, "cancer_types": hotspot.cancer_types},
+                    source_kb=source,
+                    description=f"Well-established hotspot ({samples_observed} samples)",
+                    data={"samples": samples_observed, "cancer_types": cancer_types},
                     confidence=0.9
                 ))
             
             # VICC OM3: Moderate hotspot evidence (10-20 samples)
-            elif hotspot.samples_observed >= 10:
+            elif samples_observed >= 10:
                 evidence.append(Evidence(
                     code="OM3",
                     score=2,
                     guideline="VICC_2022",
-                    source_kb=hotspot.source,
-                    description=f"Moderate hotspot evidence ({hotspot.samples_observed} samples)",
-                    data={"samples": hotspot.samples_observed},
+                    source_kb=source,
+                    description=f"Moderate hotspot evidence ({samples_observed} samples)",
+                    data={"samples": samples_observed},
                     confidence=0.8
                 ))
             
             # VICC OP3: Located in hotspot region (3-10 samples)
-            elif hotspot.samples_observed >= 3:
+            elif samples_observed >= 3:
                 evidence.append(Evidence(
                     code="OP3",
                     score=1,
                     guideline="VICC_2022",
-                    source_kb=hotspot.source,
-                    description=f"Located in hotspot region ({hotspot.samples_observed} samples)",
-                    data={"samples": hotspot.samples_observed},
+                    source_kb=source,
+                    description=f"Located in hotspot region ({samples_observed} samples)",
+                    data={"samples": samples_observed},
                     confidence=0.7
                 ))
         
         return evidence
     
+    def _match_msk_hotspot(self, variant: VariantAnnotation) -> Optional[Dict[str, Any]]:
+        """
+        Most recurrent MSK hotspot overlapping the variant's reference span
+        
+        Hotspots annotated to a different gene are ignored; the record's
+        sample count is returned as an int.
+        """
+        index = _KB_CACHE.get('cosmic_hotspots')
+        if not isinstance(index, IntervalIndex) or not variant.chromosome:
+            return None
+        
+        start = int(variant.position)
+        end = start + max(len(variant.reference or ""), 1) - 1
+        best = None
+        for record in index.overlapping(genomic_key(variant.chromosome), start, end):
+            if variant.gene_symbol and record.get('gene') and record['gene'] != variant.gene_symbol:
+                continue
+            samples = pd.to_numeric(record.get('samples'), errors='coerce')
+            samples = 0 if pd.isna(samples) else int(samples)
+            if best is None or samples > best['samples']:
+                best = {**record, 'samples': samples}
+        return best
+    
     def _get_gene_context_evidence(self, variant: VariantAnnotation, analysis_type: AnalysisType) -> List[Evidence]:
         """Generate gene context evidence"""
         evidence = []
@@ -1330,7 +1579,8 @@ class EvidenceAggregator:
                 
         return evidence
     
-    def _get_clinical_evidence(self, variant: VariantAnnotation, cancer_type: str, analysis_type: AnalysisType) -> List[Evidence]:
+    def _get_clinical_evidence(self, variant: VariantAnnotation, cancer_type: str, analysis_type: AnalysisType,
+                               oncokb_matches: Optional[List[Tuple[str, Dict[str, Any], str]]] = None) -> List[Evidence]:
         """Generate clinical evidence from CIViC and OncoKB with comprehensive variant matching"""
         evidence = []
         
@@ -1361,54 +1611,19 @@ class EvidenceAggregator:
                 ))
         
         # Enhanced OncoKB evidence using new variant-drug-cancer associations
-        oncokb_evidence = self._get_oncokb_variant_evidence(variant, cancer_type)
+        oncokb_evidence = self._get_oncokb_variant_evidence(variant, cancer_type, oncokb_matches)
         evidence.extend(oncokb_evidence)
         
         return evidence
     
-    def _get_oncokb_variant_evidence(self, variant: VariantAnnotation, cancer_type: str) -> List[Evidence]:
+    def _get_oncokb_variant_evidence(self, variant: VariantAnnotation, cancer_type: str,
+                                     matched_variants: Optional[List[Tuple[str, Dict[str, Any], str]]] = None) -> List[Evidence]:
         """Generate comprehensive OncoKB evidence using variant-drug-cancer associations"""
         evidence = []
         
-        # Get OncoKB variant data from cache
-        oncokb_variants = _KB_CACHE.get('oncokb_variants', {})
-        oncokb_levels = _KB_CACHE.get('oncokb_evidence_levels', {})
-        
         gene = variant.gene_symbol
-        hgvs_p = variant.hgvs_p or ""
-        
-        # Try to match variant using different strategies
-        matched_variants = []
-        
-        # Strategy 1: Direct HGVS protein match
-        if hgvs_p:
-            # Extract change from HGVS (e.g., p.Val600Glu -> V600E)
-            hgvs_simplified = self._simplify_hgvs(hgvs_p)
-            variant_key = f"{gene}:{hgvs_simplified}"
-            if variant_key in oncokb_variants:
-                matched_variants.append((variant_key, oncokb_variants[variant_key], "exact_hgvs"))
-        
-        # Strategy 2: Common variant name patterns  
-        if hgvs_p:
-            # Try V600E style notation
-            alt_notation = self._hgvs_to_short_form(hgvs_p)
-            if alt_notation:
-                variant_key = f"{gene}:{alt_notation}"
-                if variant_key in oncokb_variants:
-                    matched_variants.append((variant_key, oncokb_variants[variant_key], "short_form"))
-        
-        # Strategy 3: Gene-level mutations (broader matching)
-        gene_patterns = [
-            f"{gene}:Activating Mutations",
-            f"{gene}:Oncogenic Mutations", 
-            f"{gene}:Mutation",
-            f"{gene}:Any"
-        ]
-        
-        for pattern in gene_patterns:
-            if pattern in oncokb_variants:
-                matched_variants.append((pattern, oncokb_variants[pattern], "gene_level"))
-                break  # Take first match to avoid duplicates
+        if matched_variants is None:
+            matched_variants = self._match_oncokb_variants(gene, variant.hgvs_p or "")
         
         # Generate evidence for each match
         for variant_key, variant_data, match_type in matched_variants:
@@ -1497,6 +1712,54 @@ class EvidenceAggregator:
         
         return evidence
     
+    def _match_oncokb_variants(self, gene: str, hgvs_p: str,
+                               gene_level_match: Any = _ONCOKB_GENE_LEVEL_UNSET) -> List[Tuple[str, Dict[str, Any], str]]:
+        """OncoKB alterations matching a variant as (key, data, match_type) tuples"""
+        oncokb_variants = _KB_CACHE.get('oncokb_variants', {})
+        
+        # Try to match variant using different strategies
+        matched_variants = []
+        
+        # Strategy 1: Direct HGVS protein match
+        if hgvs_p:
+            # Extract change from HGVS (e.g., p.Val600Glu -> V600E)
+            hgvs_simplified = self._simplify_hgvs(hgvs_p)
+            variant_key = f"{gene}:{hgvs_simplified}"
+            if variant_key in oncokb_variants:
+                matched_variants.append((variant_key, oncokb_variants[variant_key], "exact_hgvs"))
+        
+        # Strategy 2: Common variant name patterns  
+        if hgvs_p:
+            # Try V600E style notation
+            alt_notation = self._hgvs_to_short_form(hgvs_p)
+            if alt_notation:
+                variant_key = f"{gene}:{alt_notation}"
+                if variant_key in oncokb_variants:
+                    matched_variants.append((variant_key, oncokb_variants[variant_key], "short_form"))
+        
+        # Strategy 3: Gene-level mutations (broader matching)
+        if gene_level_match is _ONCOKB_GENE_LEVEL_UNSET:
+            gene_level_match = self._match_oncokb_gene_level(gene)
+        if gene_level_match:
+            matched_variants.append(gene_level_match)
+        
+        return matched_variants
+    
+    def _match_oncokb_gene_level(self, gene: str) -> Optional[Tuple[str, Dict[str, Any], str]]:
+        """First gene-level OncoKB alteration (e.g. "Oncogenic Mutations") for a gene"""
+        oncokb_variants = _KB_CACHE.get('oncokb_variants', {})
+        gene_patterns = [
+            f"{gene}:Activating Mutations",
+            f"{gene}:Oncogenic Mutations", 
+            f"{gene}:Mutation",
+            f"{gene}:Any"
+        ]
+        
+        for pattern in gene_patterns:
+            if pattern in oncokb_variants:
+                return (pattern, oncokb_variants[pattern], "gene_level")  # Take first match to avoid duplicates
+        return None
+    
     def _simplify_hgvs(self, hgvs_p: str) -> str:
         """Simplify HGVS protein notation for matching"""
         if not hgvs_p:
@@ -1543,9 +1806,9 @@ class EvidenceAggregator:
         evidence = []
         
         gene = variant.gene_symbol
-        domains = _KB_CACHE.get('oncovi_domains', {}).get(gene, [])
+        domains = _KB_CACHE.get('oncovi_domains')
         
-        if variant.hgvs_p and domains:
+        if variant.hgvs_p and domains is not None and gene in domains:
             # Extract amino acid position from HGVS
             # This is a simplified extraction - would need more robust parsing
             try:
@@ -1554,21 +1817,22 @@ class EvidenceAggregator:
                 if pos_match:
                     aa_position = int(pos_match.group(1))
                     
-                    for domain in domains:
-                        if domain['start'] <= aa_position <= domain['end']:
-                            importance = domain.get('importance', 'unknown')
-                            
-                            if importance == 'critical':
-                                evidence.append(Evidence(
-                                    code="OM1",
-                                    score=2,
-                                    guideline="VICC_2022",
-                                    source_kb="OncoVI_Domains",
-                                    description=f"Variant in critical functional domain: {domain['domain']}",
-                                    data={"domain": domain['domain'], "position": aa_position},
-                                    confidence=0.8
-                                ))
-                            break
+                    # Only the first containing domain (in file order) is considered
+                    hits = domains.overlapping(gene, aa_position)
+                    if hits:
+                        domain = hits[0]
+                        importance = domain.get('importance', 'unknown')
+                        
+                        if importance == 'critical':
+                            evidence.append(Evidence(
+                                code="OM1",
+                                score=2,
+                                guideline="VICC_2022",
+                                source_kb="OncoVI_Domains",
+                                description=f"Variant in critical functional domain: {domain['domain']}",
+                                data={"domain": domain['domain'], "position": aa_position},
+                                confidence=0.8
+                            ))
             except Exception:
                 pass  # Skip domain analysis if parsing fails
         
@@ -2040,25 +2304,28 @@ class EvidenceAggregator:
             'count': sum(len(t['cancer_types']) for t in matching_tissues)
         }
     
-    def _get_clinvar_evidence(self, variant: VariantAnnotation, analysis_type: AnalysisType) -> List[Evidence]:
+    def _get_clinvar_evidence(self, variant: VariantAnnotation, analysis_type: AnalysisType,
+                              exact_match: Any = _CLINVAR_NOT_LOOKED_UP) -> List[Evidence]:
         """Generate ClinVar clinical significance evidence for tumor-only germline filtering"""
         evidence = []
         
-        clinvar_data = _KB_CACHE.get('clinvar_data', {})
-        if not clinvar_data:
+        clinvar_index = _KB_CACHE.get('clinvar_data')
+        if not clinvar_index:
             return evidence
         
         gene_symbol = variant.gene_symbol
         if not gene_symbol:
             return evidence
         
-        pathogenic_variants = clinvar_data.get('pathogenic_variants', {})
-        benign_variants = clinvar_data.get('benign_variants', {})
+        pathogenic_count, benign_count = clinvar_index.gene_counts(gene_symbol)
+        
+        # Exact-variant record (O(log n) lookup, or pre-resolved in batch) attached for downstream review
+        if exact_match is _CLINVAR_NOT_LOOKED_UP:
+            exact_match = clinvar_index.lookup(variant.chromosome, variant.position,
+                                               variant.reference, variant.alternate)
         
         # Check for pathogenic variants in this gene
-        if gene_symbol in pathogenic_variants:
-            pathogenic_count = len(pathogenic_variants[gene_symbol])
-            
+        if pathogenic_count:
             # For tumor-only analysis, flag potential germline pathogenic variants
             if analysis_type == AnalysisType.TUMOR_ONLY:
                 evidence.append(Evidence(
@@ -2071,7 +2338,8 @@ class EvidenceAggregator:
                     data={
                         "pathogenic_variant_count": pathogenic_count,
                         "analysis_type": "tumor_only",
-                        "germline_risk": True
+                        "germline_risk": True,
+                        "exact_match": exact_match
                     },
                     confidence=0.6  # Lower confidence due to tumor-only limitations
                 ))
@@ -2085,21 +2353,21 @@ class EvidenceAggregator:
                     description=f"Gene {gene_symbol} has known pathogenic variants in ClinVar",
                     data={
                         "pathogenic_variant_count": pathogenic_count,
-                        "analysis_type": "matched_normal"
+                        "analysis_type": "matched_normal",
+                        "exact_match": exact_match
                     },
                     confidence=0.8
                 ))
         
         # Check for benign variants (generally supportive of variant tolerance)
-        if gene_symbol in benign_variants:
-            benign_count = len(benign_variants[gene_symbol])
+        if benign_count:
             evidence.append(Evidence(
                 code="SBP1",  # Supporting benign
                 score=-1,
                 guideline="AMP_2017",
                 source_kb="ClinVar",
                 description=f"Gene {gene_symbol} has {benign_count} benign variants in ClinVar",
-                data={"benign_variant_count": benign_count},
+                data={"benign_variant_count": benign_count, "exact_match": exact_match},
                 confidence=0.5
             ))
         
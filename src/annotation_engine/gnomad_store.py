@@ -0,0 +1,198 @@
+"""
+Local gnomAD Allele-Frequency Store
+
+Offline, memory-mapped population allele frequencies built from the
+per-chromosome gnomAD extracts that scripts/stream_gnomad_v4_afs.py and
+scripts/gnomad_v4_bcftools.py produce (tab-separated, with a header row of
+CHROM, POS, REF, ALT, AF and optionally AF_grpmax; "." marks a missing
+value).  Sites are stored as a PackedVariantIndex with float16 AF and
+AF_grpmax columns inside a KB snapshot file, so opening the store maps it
+rather than parsing it and every lookup is a binary search.
+
+This replaces per-variant gnomAD GraphQL queries (api_clients) for
+tumor-only germline filtering and population-frequency evidence.  The
+gnomAD sites VCFs are split biallelic, so extracts are expected to carry
+one ALT allele per row.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .kb_ingest import read_kb_table, require_columns
+from .kb_snapshot import KnowledgeBaseSnapshot, SnapshotError, write_snapshot
+from .variant_index import PackedVariantIndex, pack_variants
+
+logger = logging.getLogger(__name__)
+
+GNOMAD_SECTION = "gnomad_af"
+DEFAULT_GNOMAD_STORE_NAME = "gnomad_af.aegaf"
+READ_CHUNK_SIZE = 2_000_000
+
+_EXTRACT_COLUMNS = ["CHROM", "POS", "REF", "ALT", "AF", "AF_grpmax"]
+
+VariantQuery = Tuple[Any, int, str, str]
+
+
+class GnomadAFIndex(PackedVariantIndex):
+    """Exact-variant gnomAD AF / AF_grpmax lookups over float16 columns"""
+
+    @classmethod
+    def from_extracts(cls, paths: Sequence[Path], dataset: str = "gnomAD") -> "GnomadAFIndex":
+        """
+        Build the index from one or more gnomAD AF extract TSVs
+
+        Extracts are read in chunks with only the columns used here.  Sites
+        on contigs outside 1-22/X/Y/MT are dropped, and a site present in
+        several extracts keeps its highest AF.
+        """
+        loci_chunks, allele_chunks, af_chunks, grpmax_chunks = [], [], [], []
+        total_rows = 0
+        for path in paths:
+            reader = read_kb_table(path, columns=_EXTRACT_COLUMNS, chunksize=READ_CHUNK_SIZE,
+                                   dtype={"CHROM": str, "REF": str, "ALT": str}, keep_default_na=False)
+            for chunk in reader:
+                require_columns(chunk, "CHROM", "POS", "REF", "ALT", "AF")
+                total_rows += len(chunk)
+                positions = pd.to_numeric(chunk["POS"], errors="coerce")
+                located = ((positions > 0) & (chunk["REF"] != ".") & (chunk["ALT"] != ".")).to_numpy()
+                if not located.any():
+                    continue
+
+                loci, alleles = pack_variants(
+                    chunk["CHROM"].to_numpy()[located],
+                    positions.to_numpy()[located].astype(np.int64),
+                    chunk["REF"].to_numpy()[located],
+                    chunk["ALT"].to_numpy()[located],
+                )
+                loci_chunks.append(loci)
+                allele_chunks.append(alleles)
+                af_chunks.append(_frequency_column(chunk, "AF")[located])
+                grpmax_chunks.append(_frequency_column(chunk, "AF_grpmax")[located])
+
+        if loci_chunks:
+            loci, alleles = np.concatenate(loci_chunks), np.concatenate(allele_chunks)
+            af, af_grpmax = np.concatenate(af_chunks), np.concatenate(grpmax_chunks)
+        else:
+            loci = alleles = np.zeros(0, dtype=np.uint64)
+            af = af_grpmax = np.zeros(0, dtype=np.float32)
+
+        keep = (loci >> np.uint64(32)) > 0
+        loci, alleles, af, af_grpmax = loci[keep], alleles[keep], af[keep], af_grpmax[keep]
+
+        # Highest AF first within a site (NaN sorts last), then keep the first row
+        order = np.lexsort((-af, alleles, loci))
+        loci, alleles, af, af_grpmax = loci[order], alleles[order], af[order], af_grpmax[order]
+        if len(loci):
+            unique = np.ones(len(loci), dtype=bool)
+            unique[1:] = (loci[1:] != loci[:-1]) | (alleles[1:] != alleles[:-1])
+            loci, alleles, af, af_grpmax = loci[unique], alleles[unique], af[unique], af_grpmax[unique]
+
+        index = cls(
+            loci, alleles,
+            columns={"af": af.astype(np.float16), "af_grpmax": af_grpmax.astype(np.float16)},
+            meta={"dataset": dataset, "total_rows": total_rows},
+        )
+        logger.info(f"Built gnomAD AF index: {len(index)} sites from {total_rows} extract rows "
+                    f"({index.nbytes / 1e6:.1f} MB)")
+        return index
+
+    @property
+    def dataset(self) -> str:
+        return self.meta.get("dataset", "gnomAD")
+
+    def lookup(self, chromosome: Any, position: int, reference: str, alternate: str) -> Optional[Dict[str, Any]]:
+        """AF record for a variant, or None when it is absent from gnomAD"""
+        row = self.find(chromosome, position, reference, alternate)
+        return self._decode(row) if row >= 0 else None
+
+    def lookup_batch(self, variants: Sequence[VariantQuery]) -> List[Optional[Dict[str, Any]]]:
+        """AF records for many variants, in input order"""
+        return [self._decode(int(row)) if row >= 0 else None for row in self.find_batch(variants)]
+
+    def max_af_batch(self, variants: Sequence[VariantQuery]) -> np.ndarray:
+        """
+        max(AF, AF_grpmax) per variant as float32
+
+        NaN where the variant is absent from gnomAD or has no AF.  This is
+        the value germline filters compare against their threshold.
+        """
+        result = np.full(len(variants), np.nan, dtype=np.float32)
+        rows = self.find_batch(variants)
+        found = rows >= 0
+        if found.any():
+            af = self.columns["af"][rows[found]].astype(np.float32)
+            grpmax = self.columns["af_grpmax"][rows[found]].astype(np.float32)
+            result[found] = np.fmax(af, grpmax)
+        return result
+
+    def _decode(self, row: int) -> Dict[str, Any]:
+        values = self.row(row)
+        return {
+            "af": _optional_float(values["af"]),
+            "af_grpmax": _optional_float(values["af_grpmax"]),
+            "dataset": self.dataset,
+        }
+
+
+def _frequency_column(chunk: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in chunk.columns:
+        return np.full(len(chunk), np.nan, dtype=np.float32)
+    return pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype=np.float32)
+
+
+def _optional_float(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def default_gnomad_store_path(kb_base_path: Path) -> Path:
+    """Store location: <kb_base_path>/population_frequencies/gnomad/gnomad_af.aegaf"""
+    return Path(kb_base_path) / "population_frequencies" / "gnomad" / DEFAULT_GNOMAD_STORE_NAME
+
+
+def build_gnomad_store(extract_paths: Sequence[Path], output_path: Path,
+                       dataset: str = "gnomAD") -> Dict[str, Any]:
+    """
+    Build the local gnomAD AF store from AF extracts
+
+    Args:
+        extract_paths: Extract TSVs (plain or gzipped), e.g. one per chromosome
+        output_path: Store file to write
+        dataset: Label reported as the population-frequency database
+
+    Returns:
+        The snapshot manifest written to the store header
+    """
+    extract_paths = [Path(p).resolve() for p in extract_paths]
+    base_path = Path(os.path.commonpath([p.parent for p in extract_paths])) if extract_paths else Path(".")
+
+    index = GnomadAFIndex.from_extracts(extract_paths, dataset=dataset)
+    return write_snapshot(Path(output_path), {GNOMAD_SECTION: index}, kb_base_path=base_path,
+                          source_files=[str(p.relative_to(base_path)) for p in extract_paths])
+
+
+_OPEN_STORES: Dict[Path, GnomadAFIndex] = {}
+_OPEN_STORES_LOCK = threading.Lock()
+
+
+def load_gnomad_store(store_path: Path) -> GnomadAFIndex:
+    """
+    Open a gnomAD AF store, reusing the mapping already open in this process
+
+    Raises:
+        SnapshotError: If the file is not a gnomAD AF store
+    """
+    store_path = Path(store_path).resolve()
+    with _OPEN_STORES_LOCK:
+        if store_path not in _OPEN_STORES:
+            snapshot = KnowledgeBaseSnapshot(store_path)
+            if GNOMAD_SECTION not in snapshot.section_names:
+                snapshot.close()
+                raise SnapshotError(f"Not a gnomAD AF store: {store_path}")
+            _OPEN_STORES[store_path] = snapshot.get(GNOMAD_SECTION)
+        return _OPEN_STORES[store_path]
@@ -7,7 +7,6 @@ all VCF files meet quality requirements and contain necessary fields.
 """
 
 import re
-import gzip
 import json
 import logging
 from typing import Optional, List, Dict, Any, Tuple, Set
@@ -15,6 +14,8 @@ from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+import numpy as np
+
 from .interfaces.validation_interfaces import (
     ValidatedInput,
     ValidatedVCF,
@@ -25,6 +26,7 @@ from .interfaces.validation_interfaces import (
     SampleType,
     InputValidatorProtocol
 )
+from .vcf_ingest import VariantBatch, ingest_vcf
 
 logger = logging.getLogger(__name__)
 
@@ -246,67 +248,33 @@ class InputValidatorV2(InputValidatorProtocol):
             ))
             return None, errors, warnings
         
-        # Check if gzipped
-        is_gzipped = vcf_path.suffix == ".gz"
-        open_func = gzip.open if is_gzipped else open
-        mode = "rt" if is_gzipped else "r"
-        
         try:
-            # Parse VCF headers and collect metadata
-            headers = []
-            info_fields = {}
-            format_fields = set()
-            sample_names = []
+            # Single decode of the file, shared with parsing and filtering
+            batch = ingest_vcf(vcf_path)
+            
+            # Collect header metadata
+            header = batch.header
+            info_fields = header.info
+            format_fields = set(header.format)
+            sample_names = list(header.sample_names)
             genome_version = "Unknown"
-            has_standard_headers = False
-            
-            with open_func(vcf_path, mode) as f:
-                line_count = 0
-                for line in f:
-                    line_count += 1
-                    line = line.strip()
-                    
-                    if line.startswith("##"):
-                        headers.append(line)
-                        
-                        # Parse INFO fields
-                        if line.startswith("##INFO="):
-                            info_match = re.match(r'##INFO=<ID=([^,]+),.*>', line)
-                            if info_match:
-                                info_fields[info_match.group(1)] = line
-                        
-                        # Parse FORMAT fields
-                        elif line.startswith("##FORMAT="):
-                            format_match = re.match(r'##FORMAT=<ID=([^,]+),.*>', line)
-                            if format_match:
-                                format_fields.add(format_match.group(1))
-                        
-                        # Detect genome version
-                        if "reference" in line.lower() or "assembly" in line.lower():
-                            if any(ref in line for ref in ["GRCh37", "hg19", "b37"]):
-                                genome_version = "GRCh37"
-                            elif any(ref in line for ref in ["GRCh38", "hg38"]):
-                                genome_version = "GRCh38"
-                        
-                        # Check for required headers
-                        if line.startswith("##fileformat=VCF"):
-                            has_standard_headers = True
-                            
-                    elif line.startswith("#CHROM"):
-                        # Parse sample names
-                        columns = line.split("\t")
-                        if len(columns) >= 9:
-                            sample_names = columns[9:]
-                        break
-                    
-                    # Prevent reading entire file in header parsing
-                    if line_count > 10000:
-                        errors.append(ValidationError(
-                            field=f"{sample_type.value}_vcf",
-                            message="VCF header exceeds 10000 lines",
-                            severity="error"
-                        ))
-                        return None, errors, warnings
+            has_standard_headers = header.fileformat is not None and header.fileformat.startswith("VCF")
+            
+            if len(header.lines) > 10000:
+                errors.append(ValidationError(
+                    field=f"{sample_type.value}_vcf",
+                    message="VCF header exceeds 10000 lines",
+                    severity="error"
+                ))
+                return None, errors, warnings
+            
+            for line in header.lines:
+                # Detect genome version
+                if "reference" in line.lower() or "assembly" in line.lower():
+                    if any(ref in line for ref in ["GRCh37", "hg19", "b37"]):
+                        genome_version = "GRCh37"
+                    elif any(ref in line for ref in ["GRCh38", "hg38"]):
+                        genome_version = "GRCh38"
             
             # Validate headers
             if not has_standard_headers:
@@ -367,9 +335,7 @@ class InputValidatorV2(InputValidatorProtocol):
                 ))
             
             # Now scan variants for quality metrics
-            variant_stats = self._analyze_variant_quality(
-                vcf_path, open_func, mode, sample_type
-            )
+            variant_stats = self._analyze_variant_quality(batch, sample_type)
             
             # Add warnings based on variant analysis
             if variant_stats["variant_count"] == 0:
@@ -448,127 +414,42 @@ class InputValidatorV2(InputValidatorProtocol):
             return None, errors, warnings
     
     def _analyze_variant_quality(self, 
-                               vcf_path: Path,
-                               open_func,
-                               mode: str,
+                               batch: VariantBatch,
                                sample_type: SampleType) -> Dict[str, Any]:
         """
-        Analyze variant quality metrics from VCF
+        Analyze variant quality metrics from the decoded VCF
+        
+        Depth is INFO/DP where present, otherwise the first sample's
+        FORMAT/DP. All records contribute to the statistics.
         
         Returns statistics about depth, quality, and other metrics
         """
-        variant_count = 0
-        depths = []
-        quals = []
-        normalized_chromosomes = None
-        has_af_info = False
-        has_depth_info = False
-        low_depth_count = 0
-        
-        with open_func(vcf_path, mode) as f:
-            for line in f:
-                if line.startswith("#"):
-                    continue
-                    
-                variant_count += 1
-                fields = line.strip().split("\t")
-                
-                if len(fields) < 8:
-                    continue
-                
-                # Check chromosome format on first variant
-                if variant_count == 1:
-                    chrom = fields[0]
-                    normalized_chromosomes = chrom.startswith("chr")
-                
-                # Parse QUAL
-                try:
-                    qual = float(fields[5]) if fields[5] != "." else None
-                    if qual is not None:
-                        quals.append(qual)
-                except:
-                    pass
-                
-                # Parse INFO for depth and AF
-                info = fields[7]
-                info_dict = self._parse_info_field(info)
-                
-                # Check for depth in INFO
-                if "DP" in info_dict:
-                    has_depth_info = True
-                    try:
-                        depth = int(info_dict["DP"])
-                        depths.append(depth)
-                        if depth < self.MIN_DEPTH_WARNING:
-                            low_depth_count += 1
-                    except:
-                        pass
-                
-                # Also check FORMAT field for sample depth if available
-                if len(fields) > 9 and not has_depth_info:
-                    format_field = fields[8]
-                    if "DP" in format_field:
-                        format_values = fields[9].split(":")
-                        format_keys = format_field.split(":")
-                        if "DP" in format_keys:
-                            dp_index = format_keys.index("DP")
-                            if dp_index < len(format_values):
-                                try:
-                                    depth = int(format_values[dp_index])
-                                    depths.append(depth)
-                                    has_depth_info = True
-                                    if depth < self.MIN_DEPTH_WARNING:
-                                        low_depth_count += 1
-                                except:
-                                    pass
-                
-                # Check for AF fields
-                if any(af in info_dict for af in ["AF", "VAF", "FREQ"]):
-                    has_af_info = True
-                
-                # Sample first 1000 variants for statistics
-                if variant_count >= 1000:
-                    break
+        variant_count = len(batch)
+        depths = batch.depth()
+        depths = np.sort(depths[~np.isnan(depths)])
+        quals = np.sort(batch.qual[~np.isnan(batch.qual)])
         
-        # Calculate statistics
         median_depth = None
         median_qual = None
         low_depth_fraction = 0
         
-        if depths:
-            depths.sort()
-            median_depth = depths[len(depths) // 2]
-            low_depth_fraction = low_depth_count / len(depths)
+        if len(depths):
+            median_depth = int(depths[len(depths) // 2])
+            low_depth_fraction = float(np.count_nonzero(depths < self.MIN_DEPTH_WARNING) / len(depths))
             
-        if quals:
-            quals.sort()
-            median_qual = quals[len(quals) // 2]
+        if len(quals):
+            median_qual = float(quals[len(quals) // 2])
         
         return {
             "variant_count": variant_count,
             "median_depth": median_depth,
             "median_qual": median_qual,
-            "normalized_chromosomes": normalized_chromosomes,
-            "has_af_info": has_af_info,
-            "has_depth_info": has_depth_info,
+            "normalized_chromosomes": batch.chromosomes[0].startswith("chr") if variant_count else None,
+            "has_af_info": bool(batch.has_info_af.any()),
+            "has_depth_info": bool(len(depths)),
             "low_depth_fraction": low_depth_fraction
         }
     
-    def _parse_info_field(self, info_str: str) -> Dict[str, str]:
-        """Parse VCF INFO field into dictionary"""
-        info_dict = {}
-        if info_str == ".":
-            return info_dict
-            
-        for item in info_str.split(";"):
-            if "=" in item:
-                key, value = item.split("=", 1)
-                info_dict[key] = value
-            else:
-                info_dict[item] = "true"
-                
-        return info_dict
-    
     def _validate_vcf_pairing(self, 
                             tumor_vcf: ValidatedVCF,
                             normal_vcf: ValidatedVCF) -> List[ValidationError]:
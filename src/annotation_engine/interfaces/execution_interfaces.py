@@ -4,7 +4,7 @@ Workflow Execution Interfaces
 Defines the contract for workflow execution that Person C will implement.
 """
 
-from typing import Protocol, Dict, List, Optional, Any, Callable
+from typing import Protocol, Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -29,6 +29,33 @@ class CacheStatus(str, Enum):
     DISABLED = "disabled"
 
 
+class StepExecutorKind(str, Enum):
+    """Pool a processing step runs on"""
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+@dataclass(frozen=True)
+class StepSpec:
+    """
+    Declared data flow and resource hints for a processing step
+    
+    The executor derives the step DAG from inputs/outputs: a step depends on
+    whichever earlier route steps produce its inputs.
+    """
+    name: str
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    executor: StepExecutorKind = StepExecutorKind.THREAD
+    cpu_slots: int = 1
+    exclusive: bool = False  # Runs alone, holding every worker slot
+    
+    @property
+    def produces(self) -> Tuple[str, ...]:
+        """Result keys this step produces (defaults to its own name)"""
+        return self.outputs or (self.name,)
+
+
 @dataclass
 class StepResult:
     """Result of executing a single processing step"""
@@ -89,6 +116,10 @@ class PerformanceMetrics:
     disk_io_mb: Optional[float] = None
     network_io_mb: Optional[float] = None
     
+    # DAG scheduling metrics
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_seconds: float = 0.0
+    
     def add_step_result(self, step_result: StepResult):
         """Add a step result to metrics"""
         self.step_metrics[step_result.step_name] = step_result
@@ -112,6 +143,11 @@ class PerformanceMetrics:
             return 0.0
         return (self.cache_hits / total_cache_ops) * 100
     
+    @property
+    def total_step_seconds(self) -> float:
+        """Sum of step durations (sequential-equivalent runtime)"""
+        return sum(step.duration_seconds or 0.0 for step in self.step_metrics.values())
+    
     @property
     def success_rate_percent(self) -> float:
         """Calculate step success rate as percentage"""
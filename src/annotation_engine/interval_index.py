@@ -0,0 +1,190 @@
+"""
+Interval Indexes for Hotspots and Protein Domains
+
+Answers "which hotspots/domains overlap this variant" in logarithmic time.
+Intervals are grouped by a key (chromosome for genomic coordinates, gene
+symbol for protein coordinates) and stored as one contiguous block of
+start-sorted numpy arrays per key.  A running maximum of interval ends lets
+a query binary-search both the first interval that can still reach the
+query start and the last interval that begins before the query end, so only
+that window is inspected.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def genomic_key(chromosome: Any) -> str:
+    """Chromosome key shared by "chr7"/"7" style names"""
+    chrom = str(chromosome).strip()
+    if chrom.lower().startswith("chr"):
+        chrom = chrom[3:]
+    chrom = chrom.upper()
+    return "MT" if chrom == "M" else chrom
+
+
+class IntervalIndex:
+    """Keyed, closed [start, end] intervals with O(log n + k) overlap queries"""
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, max_ends: np.ndarray,
+                 order: np.ndarray, records: List[Dict[str, Any]],
+                 key_ranges: Dict[str, Tuple[int, int]]):
+        self.starts = starts
+        self.ends = ends
+        self.max_ends = max_ends
+        self.order = order
+        self.records = records
+        self.key_ranges = key_ranges
+
+    @classmethod
+    def build(cls, intervals: Iterable[Tuple[str, int, int, Dict[str, Any]]]) -> "IntervalIndex":
+        """
+        Build an index from (key, start, end, record) tuples
+
+        Insertion order is remembered so overlapping records are returned in
+        the order they were supplied (i.e. source file order).
+        """
+        rows = [(key, int(start), int(end), i, record)
+                for i, (key, start, end, record) in enumerate(intervals)]
+        rows.sort(key=lambda row: (row[0], row[1], row[2]))
+
+        starts = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+        ends = np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows))
+        order = np.fromiter((row[3] for row in rows), dtype=np.int64, count=len(rows))
+        records = [row[4] for row in rows]
+
+        key_ranges: Dict[str, Tuple[int, int]] = {}
+        max_ends = np.empty_like(ends)
+        lo = 0
+        while lo < len(rows):
+            key = rows[lo][0]
+            hi = lo
+            while hi < len(rows) and rows[hi][0] == key:
+                hi += 1
+            key_ranges[key] = (lo, hi)
+            max_ends[lo:hi] = np.maximum.accumulate(ends[lo:hi])
+            lo = hi
+
+        return cls(starts, ends, max_ends, order, records, key_ranges)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.key_ranges
+
+    def keys(self) -> List[str]:
+        return list(self.key_ranges)
+
+    def get(self, key: str, default: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """All records for a key in insertion order"""
+        if key not in self.key_ranges:
+            return default if default is not None else []
+        lo, hi = self.key_ranges[key]
+        return [self.records[i] for i in lo + np.argsort(self.order[lo:hi], kind="stable")]
+
+    def overlapping(self, key: str, start: int, end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Records whose interval overlaps [start, end] (a point if end is None)
+
+        Returns:
+            Matching records in insertion order
+        """
+        if key not in self.key_ranges:
+            return []
+        end = start if end is None else end
+        lo, hi = self.key_ranges[key]
+
+        # Intervals that begin after the query end can't overlap...
+        last = lo + int(np.searchsorted(self.starts[lo:hi], end, side="right"))
+        # ...nor can any whose running max end is before the query start
+        first = lo + int(np.searchsorted(self.max_ends[lo:last], start, side="left"))
+        if first >= last:
+            return []
+
+        window = np.arange(first, last)
+        hits = window[self.ends[first:last] >= start]
+        hits = hits[np.argsort(self.order[hits], kind="stable")]
+        return [self.records[i] for i in hits]
+
+    def overlapping_points(self, key: str, points: Iterable[int]) -> List[List[Dict[str, Any]]]:
+        """
+        overlapping(key, point) for many points, with one binary search per array
+
+        Returns:
+            Matching records in insertion order, per point
+        """
+        points = np.asarray(list(points), dtype=np.int64)
+        if key not in self.key_ranges:
+            return [[] for _ in points]
+        lo, hi = self.key_ranges[key]
+
+        lasts = lo + np.searchsorted(self.starts[lo:hi], points, side="right")
+        firsts = lo + np.searchsorted(self.max_ends[lo:hi], points, side="left")
+        results = []
+        for point, first, last in zip(points.tolist(), firsts.tolist(), lasts.tolist()):
+            if first >= last:
+                results.append([])
+                continue
+            window = np.arange(first, last)
+            hits = window[self.ends[first:last] >= point]
+            hits = hits[np.argsort(self.order[hits], kind="stable")]
+            results.append([self.records[i] for i in hits])
+        return results
+
+    # Compiled snapshot support (see kb_snapshot.write_snapshot)
+
+    def to_snapshot_sections(self) -> Dict[str, Any]:
+        return {
+            "starts": self.starts,
+            "ends": self.ends,
+            "max_ends": self.max_ends,
+            "order": self.order,
+            "records": self.records,
+            "key_ranges": self.key_ranges,
+        }
+
+    @classmethod
+    def from_snapshot_sections(cls, sections: Dict[str, Any]) -> "IntervalIndex":
+        return cls(sections["starts"], sections["ends"], sections["max_ends"],
+                   sections["order"], sections["records"], sections["key_ranges"])
+
+
+def residue_index(df: pd.DataFrame, gene_column: str, position_column: str,
+                  end_column: Optional[str] = None) -> IntervalIndex:
+    """
+    Index a protein-coordinate table by gene
+
+    Rows without a numeric position are dropped (they could never match).
+    Each record is the row as a dict, so callers see the original columns.
+
+    Args:
+        df: Hotspot or domain table
+        gene_column: Gene symbol column (index key)
+        position_column: Residue / domain start column
+        end_column: Domain end column; single residues when None
+    """
+    starts = pd.to_numeric(df[position_column], errors="coerce")
+    ends = pd.to_numeric(df[end_column], errors="coerce") if end_column else starts
+    valid = starts.notna() & ends.notna() & df[gene_column].notna()
+
+    records = df[valid].to_dict("records")
+    return IntervalIndex.build(zip(
+        df.loc[valid, gene_column].astype(str),
+        starts[valid].astype(np.int64),
+        ends[valid].astype(np.int64),
+        records,
+    ))
+
+
+def load_domain_index(path: Path) -> IntervalIndex:
+    """OncoVI protein domain table indexed by gene (empty if the file is absent)"""
+    if not Path(path).exists():
+        return IntervalIndex.build([])
+    df = pd.read_csv(path, sep="\t")
+    if "importance" not in df.columns:
+        df["importance"] = "unknown"
+    return residue_index(df[["gene", "domain", "start", "end", "importance"]], "gene", "start", "end")
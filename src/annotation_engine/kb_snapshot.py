@@ -0,0 +1,337 @@
+"""
+Compiled Knowledge Base Snapshots
+
+Builds and reads a single versioned, checksummed binary snapshot of the
+knowledge bases that KnowledgeBaseLoader otherwise re-parses from TSV/gzip
+in every process.
+
+Snapshot layout (little-endian):
+    magic (8 bytes) | header length (uint64) | header JSON | aligned sections
+
+Each section is either a pickled Python object (gene/variant dictionaries)
+or a raw numpy array.  The file is opened with mmap, so array sections are
+zero-copy views over the page cache and are shared by every process that
+opens the same snapshot, including forked RQ/CLI workers.
+
+Objects exposing `to_snapshot_sections()` / `from_snapshot_sections()`
+(e.g. variant_index.PackedVariantIndex) are stored as composites: one
+section per part, so their arrays stay mmap-able.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import mmap
+import os
+import pickle
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"AEKBSNP1"
+# Bump whenever a section encoding changes (3: packed ClinVar index) so that
+# snapshots written by older code are rejected and rebuilt from source.
+SNAPSHOT_FORMAT_VERSION = 3
+DEFAULT_SNAPSHOT_NAME = "kb_snapshot.aekb"
+SECTION_ALIGNMENT = 64
+
+_HEADER_STRUCT = struct.Struct("<8sQ")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, corrupt or incompatible"""
+    pass
+
+
+def _file_fingerprint(path: Path, with_digest: bool = True) -> Dict[str, Any]:
+    """Size/mtime fingerprint (and optional sha256) of a KB source file"""
+    stat = path.stat()
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_digest:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        fingerprint["sha256"] = digest.hexdigest()
+    return fingerprint
+
+
+def source_fingerprint(kb_base_path: Path, source_files: Iterable[str]) -> str:
+    """
+    Digest of the KB source files' size/mtime manifest
+
+    Describes the KB content on disk regardless of whether (or how) it has
+    been loaded, so it is stable for the lifetime of a process and changes
+    as soon as any source file is edited, added or removed.
+    """
+    kb_base_path = Path(kb_base_path)
+    manifest = {}
+    for rel_path in sorted(source_files):
+        path = kb_base_path / rel_path
+        manifest[rel_path] = _file_fingerprint(path, with_digest=False) if path.exists() else None
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode()).hexdigest()
+
+
+def _align(offset: int) -> int:
+    return (offset + SECTION_ALIGNMENT - 1) // SECTION_ALIGNMENT * SECTION_ALIGNMENT
+
+
+def _snapshot_id(section_meta: Dict[str, Dict[str, Any]]) -> str:
+    """Snapshot identifier: digest over every section name and checksum"""
+    return hashlib.sha256(
+        "".join(f"{name}:{meta['sha256']};" for name, meta in sorted(section_meta.items())).encode()
+    ).hexdigest()
+
+
+def write_snapshot(output_path: Path, sections: Dict[str, Any],
+                   kb_base_path: Path, source_files: Iterable[str]) -> Dict[str, Any]:
+    """
+    Write a compiled KB snapshot
+
+    Args:
+        output_path: Destination snapshot file
+        sections: Mapping of section name to object; numpy arrays are stored
+            raw (mmap-able), everything else is pickled
+        kb_base_path: Root of the KB tree the sections were built from
+        source_files: KB files (relative to kb_base_path) used to build sections
+
+    Returns:
+        The snapshot manifest that was written into the header
+    """
+    output_path = Path(output_path)
+    kb_base_path = Path(kb_base_path)
+
+    sources = {}
+    for rel_path in source_files:
+        path = kb_base_path / rel_path
+        if path.exists():
+            sources[rel_path] = _file_fingerprint(path)
+
+    flat_sections: Dict[str, Any] = {}
+    composites: Dict[str, Dict[str, Any]] = {}
+    for name, obj in sections.items():
+        if hasattr(obj, "to_snapshot_sections"):
+            parts = obj.to_snapshot_sections()
+            composites[name] = {
+                "factory": f"{type(obj).__module__}:{type(obj).__qualname__}",
+                "parts": list(parts.keys()),
+            }
+            for part, value in parts.items():
+                flat_sections[f"{name}/{part}"] = value
+        else:
+            flat_sections[name] = obj
+
+    payloads: List[bytes] = []
+    section_meta: Dict[str, Dict[str, Any]] = {}
+    for name, obj in flat_sections.items():
+        if isinstance(obj, np.ndarray):
+            array = np.ascontiguousarray(obj)
+            payload = array.tobytes()
+            meta = {"kind": "array", "dtype": array.dtype.str, "shape": list(array.shape)}
+        else:
+            payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+            meta = {"kind": "pickle"}
+        meta["length"] = len(payload)
+        meta["sha256"] = hashlib.sha256(payload).hexdigest()
+        section_meta[name] = meta
+        payloads.append(payload)
+
+    snapshot_id = _snapshot_id(section_meta)
+
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "snapshot_id": snapshot_id,
+        "created_at": datetime.utcnow().isoformat(),
+        "sources": sources,
+        "sections": section_meta,
+        "composites": composites,
+    }
+
+    # Offsets depend on header length, so lay out against a provisional header
+    # until the encoded size is stable.
+    header_bytes = b""
+    while True:
+        data_start = _align(_HEADER_STRUCT.size + len(header_bytes))
+        offset = data_start
+        for meta in section_meta.values():
+            meta["offset"] = offset
+            offset = _align(offset + meta["length"])
+        encoded = json.dumps(manifest, sort_keys=True).encode()
+        stable = len(encoded) == len(header_bytes)
+        header_bytes = encoded
+        if stable:
+            break
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER_STRUCT.pack(SNAPSHOT_MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        for meta, payload in zip(section_meta.values(), payloads):
+            f.write(b"\0" * (meta["offset"] - f.tell()))
+            f.write(payload)
+    os.replace(tmp_path, output_path)
+
+    logger.info(f"Wrote KB snapshot {snapshot_id[:12]} with {len(section_meta)} sections to {output_path}")
+    return manifest
+
+
+class KnowledgeBaseSnapshot:
+    """Read-only, memory-mapped view of a compiled KB snapshot"""
+
+    def __init__(self, path: Path, verify: bool = False):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise SnapshotError(f"KB snapshot not found: {self.path}")
+
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            self._file.close()
+            raise SnapshotError(f"KB snapshot is empty: {self.path}") from e
+
+        self._objects: Dict[str, Any] = {}
+        try:
+            self.manifest = self._read_manifest()
+            if verify:
+                self.verify()
+        except SnapshotError:
+            self.close()
+            raise
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        if len(self._mmap) < _HEADER_STRUCT.size:
+            raise SnapshotError(f"KB snapshot truncated: {self.path}")
+
+        magic, header_length = _HEADER_STRUCT.unpack_from(self._mmap, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"Not a KB snapshot (bad magic): {self.path}")
+
+        start = _HEADER_STRUCT.size
+        try:
+            manifest = json.loads(self._mmap[start:start + header_length])
+        except ValueError as e:
+            raise SnapshotError(f"Corrupt KB snapshot header: {self.path}") from e
+
+        if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(
+                f"Unsupported KB snapshot format {manifest.get('format_version')} "
+                f"(expected {SNAPSHOT_FORMAT_VERSION})"
+            )
+
+        try:
+            sections = manifest["sections"]
+            for name, meta in sections.items():
+                if meta["offset"] + meta["length"] > len(self._mmap):
+                    raise SnapshotError(f"KB snapshot section '{name}' is truncated")
+            for name, composite in manifest.get("composites", {}).items():
+                missing = [part for part in composite["parts"] if f"{name}/{part}" not in sections]
+                if missing:
+                    raise SnapshotError(f"KB snapshot composite '{name}' is missing parts {missing}")
+            expected_id = _snapshot_id(sections)
+        except (KeyError, TypeError) as e:
+            raise SnapshotError(f"Malformed KB snapshot manifest: {self.path}") from e
+
+        if manifest.get("snapshot_id") != expected_id:
+            raise SnapshotError(f"KB snapshot manifest checksum mismatch: {self.path}")
+
+        return manifest
+
+    @property
+    def snapshot_id(self) -> str:
+        return self.manifest["snapshot_id"]
+
+    @property
+    def section_names(self) -> List[str]:
+        """Top-level object names (composite parts are folded into their owner)"""
+        composites = self.manifest.get("composites", {})
+        names = [name for name in self.manifest["sections"] if name.split("/", 1)[0] not in composites]
+        return names + list(composites.keys())
+
+    def _section_view(self, name: str) -> memoryview:
+        meta = self.manifest["sections"][name]
+        return memoryview(self._mmap)[meta["offset"]:meta["offset"] + meta["length"]]
+
+    def verify(self) -> None:
+        """Verify every section checksum; raises SnapshotError on mismatch"""
+        for name, meta in self.manifest["sections"].items():
+            if hashlib.sha256(self._section_view(name)).hexdigest() != meta["sha256"]:
+                raise SnapshotError(f"Checksum mismatch in KB snapshot section '{name}'")
+
+    def is_current(self, kb_base_path: Path) -> bool:
+        """
+        Check that the KB source files still match the ones compiled in
+
+        Uses the cheap size/mtime fingerprint; rerun `--compile-kb` after
+        refreshing `.refs` to rebuild.
+        """
+        kb_base_path = Path(kb_base_path)
+        for rel_path, recorded in self.manifest["sources"].items():
+            path = kb_base_path / rel_path
+            if not path.exists():
+                return False
+            current = _file_fingerprint(path, with_digest=False)
+            if current["size"] != recorded["size"] or current["mtime_ns"] != recorded["mtime_ns"]:
+                return False
+        return True
+
+    def get(self, name: str) -> Any:
+        """Return a section; arrays are zero-copy views over the mmap"""
+        if name in self._objects:
+            return self._objects[name]
+
+        composite = self.manifest.get("composites", {}).get(name)
+        if composite is not None:
+            module_name, _, qualname = composite["factory"].partition(":")
+            try:
+                factory = getattr(importlib.import_module(module_name), qualname)
+            except (ImportError, AttributeError) as e:
+                raise SnapshotError(f"Unknown KB snapshot composite factory {composite['factory']}") from e
+            value = factory.from_snapshot_sections(
+                {part: self.get(f"{name}/{part}") for part in composite["parts"]}
+            )
+            self._objects[name] = value
+            return value
+
+        meta = self.manifest["sections"].get(name)
+        if meta is None:
+            raise KeyError(name)
+
+        try:
+            if meta["kind"] == "array":
+                dtype = np.dtype(meta["dtype"])
+                count = meta["length"] // dtype.itemsize if dtype.itemsize else 0
+                value = np.frombuffer(self._mmap, dtype=dtype, count=count,
+                                      offset=meta["offset"]).reshape(meta["shape"])
+            else:
+                value = pickle.loads(self._section_view(name))
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                TypeError, ValueError) as e:
+            raise SnapshotError(f"Cannot decode KB snapshot section '{name}': {e}") from e
+
+        self._objects[name] = value
+        return value
+
+    def load_sections(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Materialise the requested (default: all) sections"""
+        return {name: self.get(name) for name in (names or self.section_names)}
+
+    def close(self) -> None:
+        # Array views keep the mmap alive; only drop our references here.
+        self._objects.clear()
+        self._file.close()
+
+
+def default_snapshot_path(kb_base_path: Path) -> Path:
+    """Snapshot location: $ANNOTATION_ENGINE_KB_SNAPSHOT or <kb_base_path>/kb_snapshot.aekb"""
+    env_path = os.environ.get("ANNOTATION_ENGINE_KB_SNAPSHOT")
+    if env_path:
+        return Path(env_path)
+    return Path(kb_base_path) / DEFAULT_SNAPSHOT_NAME
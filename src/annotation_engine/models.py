@@ -462,6 +462,8 @@ class AnnotationConfig(BaseModel):
     tumor_only_tier_cap: AMPTierLevel = Field(default=AMPTierLevel.TIER_IIC, description="Maximum tier level for tumor-only analysis")
     tumor_only_population_af_threshold: float = Field(default=0.01, description="Population AF threshold for tumor-only germline filtering")
     enable_tumor_only_disclaimers: bool = Field(default=True, description="Enable mandatory disclaimers for tumor-only reports")
+    pon_index_path: Optional[str] = Field(default=None, description="Panel-of-normals index (--build-pon-index) for tumor-only filtering")
+    gnomad_store_path: Optional[str] = Field(default=None, description="gnomAD AF store (--build-gnomad-store) for tumor-only filtering; default: the one in kb_base_path")
     
     # Cancer type mappings
     oncotree_mappings: Dict[str, str] = Field(default_factory=dict, description="OncoTree code mappings")
\ No newline at end of file
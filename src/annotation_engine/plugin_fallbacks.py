@@ -59,6 +59,22 @@ class PluginFallbackManager:
         
         return available
     
+    def _needs_alphamissense(self, variant: VariantAnnotation) -> bool:
+        return bool(self.available_fallbacks.get("alphamissense") and
+                    "alphamissense" not in variant.plugin_data.get("pathogenicity_scores", {}))
+    
+    def _add_alphamissense(self, variant: VariantAnnotation, alphamissense_data: Optional[Dict[str, Any]]):
+        if alphamissense_data:
+            if "pathogenicity_scores" not in variant.plugin_data:
+                variant.plugin_data["pathogenicity_scores"] = {}
+            
+            variant.plugin_data["pathogenicity_scores"]["alphamissense"] = {
+                "score": alphamissense_data["pathogenicity_score"],
+                "prediction": alphamissense_data["classification"],
+                "source": "fallback"
+            }
+            logger.debug(f"Added AlphaMissense fallback for {variant.chromosome}:{variant.position}")
+    
     def enrich_variant_annotation(self, variant: VariantAnnotation) -> VariantAnnotation:
         """
         Enrich variant annotation with fallback data when VEP plugins are missing
@@ -71,27 +87,18 @@ class PluginFallbackManager:
         """
         
         # Check if we need to add AlphaMissense scores
-        if (self.available_fallbacks.get("alphamissense") and 
-            "alphamissense" not in variant.plugin_data.get("pathogenicity_scores", {})):
-            
-            alphamissense_data = self.alphamissense_loader.lookup_variant(
+        if self._needs_alphamissense(variant):
+            self._add_alphamissense(variant, self.alphamissense_loader.lookup_variant(
                 variant.chromosome,
                 variant.position,
                 variant.reference,
                 variant.alternate
-            )
-            
-            if alphamissense_data:
-                if "pathogenicity_scores" not in variant.plugin_data:
-                    variant.plugin_data["pathogenicity_scores"] = {}
-                
-                variant.plugin_data["pathogenicity_scores"]["alphamissense"] = {
-                    "score": alphamissense_data["pathogenicity_score"],
-                    "prediction": alphamissense_data["classification"],
-                    "source": "fallback"
-                }
-                logger.debug(f"Added AlphaMissense fallback for {variant.chromosome}:{variant.position}")
+            ))
         
+        return self._add_conservation_fallbacks(variant)
+    
+    def _add_conservation_fallbacks(self, variant: VariantAnnotation) -> VariantAnnotation:
+        """Add GERP/PhyloP scores missing from VEP output"""
         # Check if we need to add conservation scores
         if (self.available_fallbacks.get("gerp") and
             "gerp" not in variant.plugin_data.get("conservation_data", {})):
@@ -130,6 +137,9 @@ class PluginFallbackManager:
         """
         Enrich a list of variants with fallback data
         
+        AlphaMissense scores are resolved with one batched lookup for the whole
+        list instead of one file scan per variant.
+        
         Args:
             variants: List of VariantAnnotation objects
             
@@ -138,9 +148,17 @@ class PluginFallbackManager:
         """
         logger.info(f"Enriching {len(variants)} variants with fallback data")
         
+        needs_alphamissense = [v for v in variants if self._needs_alphamissense(v)]
+        if needs_alphamissense:
+            predictions = self.alphamissense_loader.lookup_batch([
+                (v.chromosome, v.position, v.reference, v.alternate) for v in needs_alphamissense
+            ])
+            for variant, alphamissense_data in zip(needs_alphamissense, predictions):
+                self._add_alphamissense(variant, alphamissense_data)
+        
         enriched_variants = []
         for variant in variants:
-            enriched_variants.append(self.enrich_variant_annotation(variant))
+            enriched_variants.append(self._add_conservation_fallbacks(variant))
         
         return enriched_variants
     
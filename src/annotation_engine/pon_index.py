@@ -0,0 +1,246 @@
+"""
+Panel-of-Normals Index
+
+Prebuilt, memory-mapped membership index for large panel-of-normals VCFs.
+Sites are stored as a PackedVariantIndex (sorted packed locus keys plus
+allele hashes) inside a KB snapshot file, with a Bloom filter in front so
+that the common case - a tumor variant that is not in the panel - is
+answered from one small bit array without touching the sorted arrays.
+
+Opening an index maps the file rather than reading it, so it is
+effectively instant, costs no per-site Python objects, and its pages are
+shared by every process (forked workers included) that opens it.
+
+Sites on contigs outside 1-22/X/Y/MT are not indexed.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .kb_snapshot import KnowledgeBaseSnapshot, SnapshotError, write_snapshot
+from .variant_index import PackedVariantIndex, pack_variants
+from .vcf_ingest import open_vcf_stream
+
+logger = logging.getLogger(__name__)
+
+PON_INDEX_SUFFIX = ".aepon"
+PON_SECTION = "panel_of_normals"
+DEFAULT_BLOOM_BITS_PER_SITE = 10
+BUILD_CHUNK_SIZE = 1_000_000
+
+_SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_SPLITMIX_C1 = np.uint64(0xBF58476D1CE4E5B9)
+_SPLITMIX_C2 = np.uint64(0x94D049BB133111EB)
+
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    z = values + _SPLITMIX_GAMMA
+    z = (z ^ (z >> np.uint64(30))) * _SPLITMIX_C1
+    z = (z ^ (z >> np.uint64(27))) * _SPLITMIX_C2
+    return z ^ (z >> np.uint64(31))
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over packed (locus, allele) keys"""
+
+    def __init__(self, words: np.ndarray, num_hashes: int):
+        self.words = words
+        self.num_hashes = num_hashes
+        self._mask = np.uint64(len(words) * 64 - 1)
+
+    @classmethod
+    def build(cls, loci: np.ndarray, alleles: np.ndarray,
+              bits_per_site: int = DEFAULT_BLOOM_BITS_PER_SITE) -> "BloomFilter":
+        """Size to a power of two of at least bits_per_site * n bits"""
+        num_bits = max(64, 1 << int(max(len(loci), 1) * bits_per_site - 1).bit_length())
+        num_hashes = max(1, round(bits_per_site * 0.693))
+        bloom = cls(np.zeros(num_bits // 64, dtype=np.uint64), num_hashes)
+        for bits in bloom._bit_positions(loci, alleles):
+            np.bitwise_or.at(bloom.words, bits >> np.uint64(6), np.uint64(1) << (bits & np.uint64(63)))
+        return bloom
+
+    def _bit_positions(self, loci: np.ndarray, alleles: np.ndarray):
+        # Double hashing: bit_i = h1 + i * h2
+        h1 = _splitmix64(loci ^ alleles)
+        h2 = _splitmix64(h1) | np.uint64(1)
+        for i in range(self.num_hashes):
+            yield (h1 + np.uint64(i) * h2) & self._mask
+
+    def might_contain(self, loci: np.ndarray, alleles: np.ndarray) -> np.ndarray:
+        """Boolean mask; False is definite, True may be a false positive"""
+        hits = np.ones(len(loci), dtype=bool)
+        for bits in self._bit_positions(loci, alleles):
+            hits &= (self.words[bits >> np.uint64(6)] >> (bits & np.uint64(63))) & np.uint64(1) == 1
+        return hits
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.nbytes
+
+
+class PanelOfNormalsIndex(PackedVariantIndex):
+    """PackedVariantIndex of PoN sites with a Bloom-filter front"""
+
+    def __init__(self, loci: np.ndarray, alleles: np.ndarray,
+                 columns: Optional[Dict[str, np.ndarray]] = None,
+                 meta: Optional[Dict[str, Any]] = None,
+                 bloom: Optional[BloomFilter] = None):
+        super().__init__(loci, alleles, columns, meta)
+        self.bloom = bloom
+
+    @classmethod
+    def from_packed(cls, loci: np.ndarray, alleles: np.ndarray,
+                    bloom_bits_per_site: int = DEFAULT_BLOOM_BITS_PER_SITE,
+                    meta: Optional[Dict[str, Any]] = None) -> "PanelOfNormalsIndex":
+        """Sort and de-duplicate packed keys (unknown contigs dropped)"""
+        keep = (loci >> np.uint64(32)) > 0
+        loci, alleles = loci[keep], alleles[keep]
+        order = np.lexsort((alleles, loci))
+        loci, alleles = loci[order], alleles[order]
+        if len(loci):
+            unique = np.ones(len(loci), dtype=bool)
+            unique[1:] = (loci[1:] != loci[:-1]) | (alleles[1:] != alleles[:-1])
+            loci, alleles = loci[unique], alleles[unique]
+        bloom = BloomFilter.build(loci, alleles, bloom_bits_per_site) if bloom_bits_per_site else None
+        return cls(loci, alleles, meta=meta, bloom=bloom)
+
+    def contains_batch(self, variants: Sequence[Tuple[Any, int, str, str]]) -> np.ndarray:
+        """Membership for many (chrom, pos, ref, alt) queries at once"""
+        found = np.zeros(len(variants), dtype=bool)
+        if not variants or not len(self.loci):
+            return found
+
+        chroms, positions, refs, alts = zip(*variants)
+        loci, alleles = pack_variants(chroms, positions, refs, alts)
+        candidates = np.arange(len(variants))
+        if self.bloom is not None:
+            candidates = candidates[self.bloom.might_contain(loci, alleles)]
+
+        lo = np.searchsorted(self.loci, loci[candidates], side="left")
+        hi = np.searchsorted(self.loci, loci[candidates], side="right")
+        for i, start, end in zip(candidates.tolist(), lo.tolist(), hi.tolist()):
+            if start < end:
+                row = start + int(np.searchsorted(self.alleles[start:end], alleles[i], side="left"))
+                found[i] = row < end and self.alleles[row] == alleles[i]
+        return found
+
+    def contains(self, chromosome: Any, position: int, reference: str, alternate: str) -> bool:
+        return bool(self.contains_batch([(chromosome, position, reference, alternate)])[0])
+
+    def to_snapshot_sections(self) -> Dict[str, Any]:
+        sections = super().to_snapshot_sections()
+        if self.bloom is not None:
+            sections["bloom"] = self.bloom.words
+            sections["meta"] = {**self.meta, "bloom_hashes": self.bloom.num_hashes}
+        return sections
+
+    @classmethod
+    def from_snapshot_sections(cls, sections: Dict[str, Any]) -> "PanelOfNormalsIndex":
+        meta = sections.get("meta") or {}
+        bloom = BloomFilter(sections["bloom"], meta["bloom_hashes"]) if "bloom" in sections else None
+        return cls(sections["loci"], sections["alleles"], meta=meta, bloom=bloom)
+
+    @property
+    def nbytes(self) -> int:
+        return super().nbytes + (self.bloom.nbytes if self.bloom is not None else 0)
+
+
+def default_pon_index_path(pon_vcf_path: Path) -> Path:
+    """Sidecar index location: <pon.vcf.gz>.aepon"""
+    pon_vcf_path = Path(pon_vcf_path)
+    return pon_vcf_path.with_name(pon_vcf_path.name + PON_INDEX_SUFFIX)
+
+
+def build_pon_index(pon_vcf_path: Path, output_path: Optional[Path] = None,
+                    bloom_bits_per_site: int = DEFAULT_BLOOM_BITS_PER_SITE) -> Dict[str, Any]:
+    """
+    Build a PoN index from a panel-of-normals VCF
+
+    The VCF is streamed and packed in chunks, so peak memory is the packed
+    arrays (16 bytes per site) rather than one Python tuple per site.
+
+    Args:
+        pon_vcf_path: Panel-of-normals VCF (plain or bgzipped)
+        output_path: Index file (default: default_pon_index_path)
+        bloom_bits_per_site: Bloom filter size; 0 disables the filter
+
+    Returns:
+        The snapshot manifest written to the index header
+    """
+    pon_vcf_path = Path(pon_vcf_path)
+    output_path = Path(output_path) if output_path else default_pon_index_path(pon_vcf_path)
+
+    _, records = open_vcf_stream(pon_vcf_path)
+    loci_chunks, allele_chunks = [], []
+    chunk = []
+    for record in records:
+        chunk.append(record.key)
+        if len(chunk) >= BUILD_CHUNK_SIZE:
+            _pack_chunk(chunk, loci_chunks, allele_chunks)
+            chunk = []
+    _pack_chunk(chunk, loci_chunks, allele_chunks)
+
+    loci = np.concatenate(loci_chunks) if loci_chunks else np.zeros(0, dtype=np.uint64)
+    alleles = np.concatenate(allele_chunks) if allele_chunks else np.zeros(0, dtype=np.uint64)
+    index = PanelOfNormalsIndex.from_packed(
+        loci, alleles, bloom_bits_per_site,
+        meta={"source": pon_vcf_path.name, "records": len(loci)},
+    )
+
+    manifest = write_snapshot(output_path, {PON_SECTION: index},
+                              kb_base_path=pon_vcf_path.parent, source_files=[pon_vcf_path.name])
+    logger.info(f"Indexed {len(index)} PoN sites from {len(loci)} records into {output_path}")
+    return manifest
+
+
+def _pack_chunk(keys, loci_chunks, allele_chunks) -> None:
+    if keys:
+        loci, alleles = pack_variants(*zip(*keys))
+        loci_chunks.append(loci)
+        allele_chunks.append(alleles)
+
+
+_OPEN_INDEXES: Dict[Tuple[Path, int, int], Tuple[KnowledgeBaseSnapshot, PanelOfNormalsIndex]] = {}
+_OPEN_INDEXES_LOCK = threading.Lock()
+
+
+def load_pon_index(index_path: Path, pon_vcf_path: Optional[Path] = None) -> PanelOfNormalsIndex:
+    """
+    Open a PoN index, reusing the mapping already open in this process
+
+    Mappings are keyed on the index file's path, mtime and size, so an index
+    rebuilt in place is opened afresh.
+
+    Args:
+        index_path: Index built by build_pon_index
+        pon_vcf_path: If given, the index must still match this VCF's
+            size/mtime or SnapshotError is raised
+
+    Returns:
+        PanelOfNormalsIndex backed by the memory-mapped file
+    """
+    index_path = Path(index_path).resolve()
+    stat = index_path.stat()
+    key = (index_path, stat.st_mtime_ns, stat.st_size)
+    with _OPEN_INDEXES_LOCK:
+        if key not in _OPEN_INDEXES:
+            snapshot = KnowledgeBaseSnapshot(index_path)
+            if PON_SECTION not in snapshot.section_names:
+                snapshot.close()
+                raise SnapshotError(f"Not a panel-of-normals index: {index_path}")
+            # Drop mappings of earlier versions; indexes already handed out keep theirs alive
+            for stale in [k for k in _OPEN_INDEXES if k[0] == index_path]:
+                del _OPEN_INDEXES[stale]
+            _OPEN_INDEXES[key] = (snapshot, snapshot.get(PON_SECTION))
+        snapshot, index = _OPEN_INDEXES[key]
+
+    if pon_vcf_path is not None:
+        pon_vcf_path = Path(pon_vcf_path)
+        if (pon_vcf_path.name not in snapshot.manifest["sources"]
+                or not snapshot.is_current(pon_vcf_path.parent)):
+            raise SnapshotError(f"PoN index {index_path} is stale for {pon_vcf_path}")
+    return index
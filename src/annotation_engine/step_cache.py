@@ -0,0 +1,386 @@
+"""
+Workflow Step Result Cache
+
+Byte-bounded caches for WorkflowExecutor step outputs.  Keys are content
+addressed (see WorkflowExecutor._generate_cache_key): they digest the input
+file contents, step configuration, tool versions, KB snapshot and the keys
+of upstream steps, so editing a VCF in place or upgrading a KB yields a new
+key instead of a stale hit.
+
+MemoryCache is a per-process LRU bounded by the pickled size of its values.
+DiskCache stores one pickle file per entry under a directory that several
+worker processes can share; writes are atomic renames and eviction removes
+the least recently read files.  TieredCache puts a MemoryCache in front of a
+DiskCache.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from .interfaces.execution_interfaces import CacheInterface
+
+logger = logging.getLogger(__name__)
+
+STEP_CACHE_ENV = "ANNOTATION_ENGINE_STEP_CACHE"
+DEFAULT_MEMORY_CACHE_MB = 512
+DEFAULT_DISK_CACHE_MB = 4096
+
+# Evict down to this fraction of the size bound so eviction isn't run on every write
+_EVICTION_TARGET = 0.9
+_ENTRY_SUFFIX = ".pkl"
+
+
+def value_size_bytes(value: Any) -> int:
+    """Serialized size of a cached value (shallow size if it cannot be pickled)"""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+_FILE_DIGESTS: Dict[Tuple[str, int, int], str] = {}
+_FILE_DIGESTS_LOCK = threading.Lock()
+
+
+def file_digest(path: Path) -> str:
+    """
+    sha256 of a file's contents
+
+    Digests are memoized per (path, size, mtime) so a file is read once per
+    process unless it changes.  Missing files digest to "missing".
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return "missing"
+
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _FILE_DIGESTS_LOCK:
+        cached = _FILE_DIGESTS.get(memo_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    with _FILE_DIGESTS_LOCK:
+        _FILE_DIGESTS[memo_key] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+class MemoryCache(CacheInterface):
+    """In-memory LRU cache with TTL support, bounded by value size in bytes"""
+
+    def __init__(self, max_size_mb: float = DEFAULT_MEMORY_CACHE_MB):
+        self.max_size_mb = max_size_mb
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        # key -> (value, expires_at epoch or None, size in bytes); oldest access first
+        self.cache: "OrderedDict[str, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self.lock = threading.RLock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, _ = entry
+            if expires_at is not None and time.time() > expires_at:
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
+        self.set_sized(key, value, value_size_bytes(value), ttl_seconds)
+
+    def set_sized(self, key: str, value: Any, size_bytes: int, ttl_seconds: Optional[int] = None):
+        """set() for callers that already know the value's serialized size"""
+        with self.lock:
+            self._remove(key)
+            if size_bytes > self.max_size_bytes:
+                logger.debug(f"Not caching {key}: {size_bytes} bytes exceeds cache size")
+                return
+
+            expires_at = time.time() + ttl_seconds if ttl_seconds else None
+            self.cache[key] = (value, expires_at, size_bytes)
+            self.size_bytes += size_bytes
+
+            if self.size_bytes > self.max_size_bytes:
+                self._evict(int(self.max_size_bytes * _EVICTION_TARGET))
+
+    def invalidate(self, key: str):
+        with self.lock:
+            self._remove(key)
+
+    def clear(self, pattern: Optional[str] = None):
+        with self.lock:
+            if pattern:
+                for key in [k for k in self.cache if pattern in k]:
+                    self._remove(key)
+            else:
+                self.cache.clear()
+                self.size_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            total_requests = self.hits + self.misses
+            hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
+
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate_percent': hit_rate,
+                'entries': len(self.cache),
+                'evictions': self.evictions,
+                'size_bytes': self.size_bytes,
+                'estimated_size_mb': self.size_bytes / 1024 / 1024,
+                'max_size_mb': self.max_size_mb
+            }
+
+    def _remove(self, key: str):
+        entry = self.cache.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[2]
+
+    def _evict(self, target_bytes: int):
+        """Remove least recently used entries until the cache fits target_bytes"""
+        while self.cache and self.size_bytes > target_bytes:
+            _, (_, _, size_bytes) = self.cache.popitem(last=False)
+            self.size_bytes -= size_bytes
+            self.evictions += 1
+
+
+class DiskCache(CacheInterface):
+    """
+    On-disk cache shared between processes
+
+    Each entry is <directory>/<url-quoted key>.pkl holding (expires_at,
+    value).  Reads bump the file mtime, which is the LRU order eviction
+    uses; the size bound is enforced by whichever process pushes the
+    directory over it.
+    """
+
+    def __init__(self, directory: Path, max_size_mb: float = DEFAULT_DISK_CACHE_MB):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size_mb = max_size_mb
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size_bytes = sum(size for _, size, _ in self._scan())
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires_at, value = pickle.load(f)
+        except FileNotFoundError:
+            return self._miss()
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+            self.invalidate(key)
+            return self._miss()
+
+        if expires_at is not None and time.time() > expires_at:
+            self.invalidate(key)
+            return self._miss()
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self.lock:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
+        self.set_payload(key, self.encode(value, ttl_seconds))
+
+    @staticmethod
+    def encode(value: Any, ttl_seconds: Optional[int] = None) -> bytes:
+        """Serialized entry; len() of it is the entry's size"""
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        return pickle.dumps((expires_at, value), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def set_payload(self, key: str, payload: bytes):
+        """Store an entry produced by encode()"""
+        if len(payload) > self.max_size_bytes:
+            logger.debug(f"Not caching {key}: {len(payload)} bytes exceeds cache size")
+            return
+
+        path = self._path(key)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            try:
+                replaced_bytes = path.stat().st_size
+            except FileNotFoundError:
+                replaced_bytes = 0
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {path.name}: {e}")
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            return
+
+        with self.lock:
+            self._size_bytes += len(payload) - replaced_bytes
+            over_limit = self._size_bytes > self.max_size_bytes
+        if over_limit:
+            self._evict(int(self.max_size_bytes * _EVICTION_TARGET))
+
+    def invalidate(self, key: str):
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def clear(self, pattern: Optional[str] = None):
+        for path, _, _ in self._scan():
+            if pattern is None or pattern in unquote(path.name[:-len(_ENTRY_SUFFIX)]):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+        with self.lock:
+            self._size_bytes = sum(size for _, size, _ in self._scan())
+
+    def get_stats(self) -> Dict[str, Any]:
+        entries = self._scan()
+        size_bytes = sum(size for _, size, _ in entries)
+        with self.lock:
+            total_requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate_percent': (self.hits / total_requests * 100) if total_requests > 0 else 0,
+                'entries': len(entries),
+                'evictions': self.evictions,
+                'size_bytes': size_bytes,
+                'estimated_size_mb': size_bytes / 1024 / 1024,
+                'max_size_mb': self.max_size_mb,
+                'directory': str(self.directory)
+            }
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (quote(key, safe="") + _ENTRY_SUFFIX)
+
+    def _miss(self) -> None:
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def _scan(self) -> List[Tuple[Path, int, float]]:
+        """(path, size, mtime) of every entry currently on disk"""
+        entries = []
+        for path in self.directory.glob("*" + _ENTRY_SUFFIX):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self, target_bytes: int):
+        """Remove least recently read entries until the directory fits target_bytes"""
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        size_bytes = sum(size for _, size, _ in entries)
+        evicted = 0
+        for path, size, _ in entries:
+            if size_bytes <= target_bytes:
+                break
+            try:
+                path.unlink()
+                evicted += 1
+            except FileNotFoundError:
+                pass
+            size_bytes -= size
+        with self.lock:
+            self._size_bytes = size_bytes
+            self.evictions += evicted
+
+
+class TieredCache(CacheInterface):
+    """MemoryCache in front of a shared DiskCache; disk hits are promoted to memory"""
+
+    def __init__(self, memory: MemoryCache, disk: DiskCache):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        value = self.disk.get(key)
+        if value is not None:
+            self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
+        payload = DiskCache.encode(value, ttl_seconds)
+        self.memory.set_sized(key, value, len(payload), ttl_seconds)
+        self.disk.set_payload(key, payload)
+
+    def invalidate(self, key: str):
+        self.memory.invalidate(key)
+        self.disk.invalidate(key)
+
+    def clear(self, pattern: Optional[str] = None):
+        self.memory.clear(pattern)
+        self.disk.clear(pattern)
+
+    def get_stats(self) -> Dict[str, Any]:
+        memory_stats = self.memory.get_stats()
+        disk_stats = self.disk.get_stats()
+        # Every lookup goes to memory first, so memory hits + misses is the request count
+        requests = memory_stats['hits'] + memory_stats['misses']
+        hits = memory_stats['hits'] + disk_stats['hits']
+        return {
+            'hits': hits,
+            'misses': requests - hits,
+            'hit_rate_percent': (hits / requests * 100) if requests > 0 else 0,
+            'entries': memory_stats['entries'],
+            'estimated_size_mb': memory_stats['estimated_size_mb'],
+            'memory': memory_stats,
+            'disk': disk_stats
+        }
+
+
+def create_step_cache(cache_dir: Optional[Path] = None,
+                      memory_size_mb: float = DEFAULT_MEMORY_CACHE_MB,
+                      disk_size_mb: float = DEFAULT_DISK_CACHE_MB) -> CacheInterface:
+    """
+    Step cache for WorkflowExecutor
+
+    Memory-only unless cache_dir (or $ANNOTATION_ENGINE_STEP_CACHE) names a
+    directory for the shared disk tier.
+    """
+    cache_dir = cache_dir or os.environ.get(STEP_CACHE_ENV)
+    memory = MemoryCache(max_size_mb=memory_size_mb)
+    if not cache_dir:
+        return memory
+    return TieredCache(memory, DiskCache(Path(cache_dir), max_size_mb=disk_size_mb))
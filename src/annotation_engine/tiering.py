@@ -982,6 +982,13 @@ def process_vcf_to_tier_results(tumor_vcf_path: Path,
     """
     from .variant_processor import create_variant_annotations_from_vcf
     
+    if config is not None:
+        kwargs.setdefault('kb_base_path', config.kb_base_path)
+        if config.pon_index_path:
+            kwargs.setdefault('pon_index_path', Path(config.pon_index_path))
+        if config.gnomad_store_path:
+            kwargs.setdefault('gnomad_store_path', Path(config.gnomad_store_path))
+    
     # Step 1: Process VCF to variant annotations
     variant_annotations, processing_summary = create_variant_annotations_from_vcf(
         tumor_vcf_path=tumor_vcf_path,
@@ -0,0 +1,144 @@
+"""
+Packed Variant Indexes
+
+Compact, position-sorted numpy indexes for exact (chrom, pos, ref, alt)
+lookups against large variant knowledge bases.  Each record is stored as a
+packed 64-bit locus key (chromosome code << 32 | position) plus a 64-bit
+allele hash, with arbitrary per-record value columns alongside.  Lookups are
+binary searches, so they are O(log n) and the arrays can be served straight
+from a memory-mapped KB snapshot.
+"""
+
+import hashlib
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+CHROM_CODES: Dict[str, int] = {str(i): i for i in range(1, 23)}
+CHROM_CODES.update({"X": 23, "Y": 24, "MT": 25, "M": 25})
+
+_POSITION_BITS = 32
+
+
+def chrom_code(chromosome: Any) -> int:
+    """Numeric chromosome code (1-22, X=23, Y=24, MT=25; 0 if unknown)"""
+    chrom = str(chromosome).strip()
+    if chrom.lower().startswith("chr"):
+        chrom = chrom[3:]
+    return CHROM_CODES.get(chrom.upper(), 0)
+
+
+def pack_locus(chromosome: Any, position: int) -> int:
+    """Pack chromosome and 1-based position into a sortable 64-bit key"""
+    return (chrom_code(chromosome) << _POSITION_BITS) | int(position)
+
+
+def allele_hash(reference: str, alternate: str) -> int:
+    """Stable 64-bit hash of a ref/alt allele pair"""
+    digest = hashlib.blake2b(f"{reference}>{alternate}".upper().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def pack_variants(chromosomes: Sequence[Any], positions: Sequence[int],
+                  references: Sequence[str], alternates: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Vector form of pack_locus/allele_hash for index builds"""
+    codes = {c: chrom_code(c) for c in set(chromosomes)}
+    chrom_array = np.fromiter((codes[c] for c in chromosomes), dtype=np.uint64, count=len(chromosomes))
+    loci = (chrom_array << np.uint64(_POSITION_BITS)) | np.asarray(positions, dtype=np.uint64)
+    alleles = np.fromiter((allele_hash(r, a) for r, a in zip(references, alternates)),
+                          dtype=np.uint64, count=len(references))
+    return loci, alleles
+
+
+class PackedVariantIndex:
+    """Sorted (locus, allele) index with per-record value columns"""
+
+    def __init__(self, loci: np.ndarray, alleles: np.ndarray,
+                 columns: Optional[Dict[str, np.ndarray]] = None,
+                 meta: Optional[Dict[str, Any]] = None):
+        self.loci = loci
+        self.alleles = alleles
+        self.columns = columns or {}
+        self.meta = meta or {}
+
+    @classmethod
+    def build(cls, chromosomes: Sequence[Any], positions: Sequence[int],
+              references: Sequence[str], alternates: Sequence[str],
+              columns: Optional[Dict[str, np.ndarray]] = None,
+              meta: Optional[Dict[str, Any]] = None) -> "PackedVariantIndex":
+        """Build an index from unsorted records; unknown chromosomes are dropped"""
+        loci, alleles = pack_variants(chromosomes, positions, references, alternates)
+        columns = {name: np.asarray(values) for name, values in (columns or {}).items()}
+
+        keep = (loci >> np.uint64(_POSITION_BITS)) > 0
+        order = np.lexsort((alleles[keep], loci[keep]))
+        return cls(
+            loci=loci[keep][order],
+            alleles=alleles[keep][order],
+            columns={name: values[keep][order] for name, values in columns.items()},
+            meta=meta,
+        )
+
+    def __len__(self) -> int:
+        return len(self.loci)
+
+    def find(self, chromosome: Any, position: int, reference: str, alternate: str) -> int:
+        """Row of an exact variant match, or -1"""
+        locus = np.uint64(pack_locus(chromosome, position))
+        lo = int(np.searchsorted(self.loci, locus, side="left"))
+        hi = int(np.searchsorted(self.loci, locus, side="right"))
+        if lo == hi:
+            return -1
+        target = np.uint64(allele_hash(reference, alternate))
+        row = lo + int(np.searchsorted(self.alleles[lo:hi], target, side="left"))
+        if row < hi and self.alleles[row] == target:
+            return row
+        return -1
+
+    def find_batch(self, variants: Sequence[Tuple[Any, int, str, str]]) -> np.ndarray:
+        """Rows for many (chrom, pos, ref, alt) queries at once; -1 where absent"""
+        rows = np.full(len(variants), -1, dtype=np.int64)
+        if not variants or not len(self.loci):
+            return rows
+
+        chroms, positions, refs, alts = zip(*variants)
+        loci, alleles = pack_variants(chroms, positions, refs, alts)
+        lo = np.searchsorted(self.loci, loci, side="left")
+        hi = np.searchsorted(self.loci, loci, side="right")
+
+        for i in np.nonzero(hi > lo)[0]:
+            start, end = int(lo[i]), int(hi[i])
+            row = start + int(np.searchsorted(self.alleles[start:end], alleles[i], side="left"))
+            if row < end and self.alleles[row] == alleles[i]:
+                rows[i] = row
+        return rows
+
+    def contains(self, chromosome: Any, position: int, reference: str, alternate: str) -> bool:
+        return self.find(chromosome, position, reference, alternate) >= 0
+
+    def overlapping(self, chromosome: Any, start: int, end: int) -> np.ndarray:
+        """Rows with start <= position <= end on a chromosome"""
+        lo = np.searchsorted(self.loci, np.uint64(pack_locus(chromosome, start)), side="left")
+        hi = np.searchsorted(self.loci, np.uint64(pack_locus(chromosome, end)), side="right")
+        return np.arange(lo, hi)
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """Column values for one row as Python scalars"""
+        return {name: values[row].item() for name, values in self.columns.items()}
+
+    # Compiled snapshot support (see kb_snapshot.write_snapshot)
+
+    def to_snapshot_sections(self) -> Dict[str, Any]:
+        sections: Dict[str, Any] = {"loci": self.loci, "alleles": self.alleles, "meta": self.meta}
+        for name, values in self.columns.items():
+            sections[f"col.{name}"] = values
+        return sections
+
+    @classmethod
+    def from_snapshot_sections(cls, sections: Dict[str, Any]) -> "PackedVariantIndex":
+        columns = {name[4:]: values for name, values in sections.items() if name.startswith("col.")}
+        return cls(sections["loci"], sections["alleles"], columns, sections.get("meta"))
+
+    @property
+    def nbytes(self) -> int:
+        return self.loci.nbytes + self.alleles.nbytes + sum(v.nbytes for v in self.columns.values())
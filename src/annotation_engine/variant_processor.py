@@ -6,16 +6,24 @@ to create complete VariantAnnotation objects ready for tiering.
 """
 
 import logging
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 from .models import VariantAnnotation, AnalysisType
 from .vcf_filtering import filter_vcf_by_analysis_type
 from .validation.error_handler import ValidationError
-from .vep_runner import annotate_vcf_with_vep, VEPConfiguration
+from .vep_runner import VEPRunner, VEPConfiguration
+from .annotation_cache import VariantAnnotationCache, cache_namespace, get_annotation_cache
+from .evidence_aggregator import get_kb_fingerprint
+from .gnomad_store import default_gnomad_store_path
 
 logger = logging.getLogger(__name__)
 
+# VEP output is consumed in windows of this many annotations; each window is
+# cached and merged with its VCF quality data while VEP produces the next
+VEP_WINDOW_SIZE = 500
+
 
 class VariantProcessor:
     """
@@ -24,9 +32,13 @@ class VariantProcessor:
     Coordinates filtering → annotation → evidence aggregation
     """
     
-    def __init__(self, vep_config: Optional[VEPConfiguration] = None):
+    def __init__(self, vep_config: Optional[VEPConfiguration] = None,
+                 annotation_cache: Optional[VariantAnnotationCache] = None,
+                 kb_base_path: str = ".refs"):
         self.logger = logging.getLogger(__name__)
         self.vep_config = vep_config
+        self.kb_base_path = kb_base_path
+        self.annotation_cache = annotation_cache or get_annotation_cache()
     
     def process_variants(self, 
                         tumor_vcf_path: Path,
@@ -89,6 +101,12 @@ class VariantProcessor:
                            **filter_kwargs) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """Apply analysis-type-specific VCF filtering"""
         
+        if analysis_type == AnalysisType.TUMOR_ONLY and 'gnomad_store_path' not in filter_kwargs:
+            # The same store the evidence aggregator reads population frequencies from
+            store_path = default_gnomad_store_path(self.kb_base_path)
+            if store_path.exists():
+                filter_kwargs['gnomad_store_path'] = store_path
+        
         try:
             filtered_variants, filter_summary = filter_vcf_by_analysis_type(
                 tumor_vcf_path=tumor_vcf_path,
@@ -117,32 +135,52 @@ class VariantProcessor:
                                    original_vcf_path: Path,
                                    analysis_type: AnalysisType,
                                    cancer_type: str) -> List[VariantAnnotation]:
-        """Annotate filtered variants using VEP"""
+        """Annotate filtered variants using VEP, skipping variants already in the annotation cache"""
         
         # If no variants after filtering, return empty list
         if not filtered_variants:
             logger.info("No variants to annotate after filtering")
             return []
         
-        # Create temporary VCF with filtered variants
-        temp_vcf_path = self._create_temp_vcf(filtered_variants, original_vcf_path)
-        
+        temp_vcf_path = None
         try:
-            # Run VEP annotation
-            logger.info(f"Running VEP annotation on {len(filtered_variants)} filtered variants")
-            variant_annotations = annotate_vcf_with_vep(
-                input_vcf=temp_vcf_path,
-                output_format="annotations",
-                config=self.vep_config
-            )
+            vep_runner = VEPRunner(self.vep_config)
             
-            # Enhance annotations with VCF quality data
-            enhanced_annotations = self._enhance_annotations_with_vcf_data(
-                variant_annotations, filtered_variants
-            )
+            cached, namespace = {}, None
+            if self.annotation_cache is not None:
+                namespace = self._annotation_cache_namespace(vep_runner)
+                cached = self.annotation_cache.get_many(
+                    namespace, [self._variant_tuple(v) for v in filtered_variants]
+                )
+            
+            cache_misses = [
+                v for v in filtered_variants
+                if VariantAnnotationCache.variant_key(*self._variant_tuple(v)) not in cached
+            ]
+            
+            vcf_lookup = self._vcf_lookup(filtered_variants)
+            fresh_annotations: List[VariantAnnotation] = []
+            if cache_misses:
+                # Create temporary VCF with cache-miss variants only
+                temp_vcf_path = self._create_temp_vcf(cache_misses, original_vcf_path)
+                
+                # Run VEP annotation
+                logger.info(f"Running VEP annotation on {len(cache_misses)}/{len(filtered_variants)} "
+                            f"filtered variants ({len(filtered_variants) - len(cache_misses)} cached)")
+                for window in self._iter_vep_windows(vep_runner, temp_vcf_path, namespace):
+                    # Enhance annotations with VCF quality data
+                    fresh_annotations.extend(self._enhance_annotations_with_vcf_data(window, vcf_lookup))
+            else:
+                logger.info(f"All {len(filtered_variants)} filtered variants served from annotation cache")
+            
+            cached = {
+                key: self._enhance_annotations_with_vcf_data([annotation], vcf_lookup)[0]
+                for key, annotation in cached.items()
+            }
+            variant_annotations = self._merge_cached_annotations(filtered_variants, cached, fresh_annotations)
             
-            logger.info(f"VEP annotation complete: {len(enhanced_annotations)} variants annotated")
-            return enhanced_annotations
+            logger.info(f"VEP annotation complete: {len(variant_annotations)} variants annotated")
+            return variant_annotations
             
         except Exception as e:
             logger.error(f"VEP annotation failed: {e}")
@@ -152,9 +190,55 @@ class VariantProcessor:
         
         finally:
             # Clean up temporary VCF
-            if temp_vcf_path.exists():
+            if temp_vcf_path is not None and temp_vcf_path.exists():
                 temp_vcf_path.unlink()
     
+    def _iter_vep_windows(self, vep_runner: VEPRunner, vcf_path: Path,
+                          namespace: Optional[str]) -> Iterator[List[VariantAnnotation]]:
+        """Pull VEP annotations in windows of VEP_WINDOW_SIZE, caching each window as it arrives"""
+        annotations = iter(vep_runner.iter_annotations(vcf_path))
+        while True:
+            window = list(islice(annotations, VEP_WINDOW_SIZE))
+            if not window:
+                return
+            if namespace is not None:
+                self.annotation_cache.put_many(namespace, window)
+            yield window
+    
+    def _annotation_cache_namespace(self, vep_runner: VEPRunner) -> str:
+        """Cache namespace for this VEP release, plugin set and KB source files"""
+        config = vep_runner.config
+        plugins = vep_runner._filter_available_plugins(vep_runner.default_plugins, str(config.refs_dir))
+        return cache_namespace(config.assembly, config.release, plugins, get_kb_fingerprint(self.kb_base_path))
+    
+    @staticmethod
+    def _variant_tuple(variant: Dict[str, Any]) -> Tuple[str, int, str, str]:
+        return (str(variant.get('chromosome')), int(variant.get('position', 0)),
+                variant.get('reference', ''), variant.get('alternate', ''))
+    
+    def _merge_cached_annotations(self,
+                                  filtered_variants: List[Dict[str, Any]],
+                                  cached: Dict[str, VariantAnnotation],
+                                  fresh_annotations: List[VariantAnnotation]) -> List[VariantAnnotation]:
+        """Combine cache hits and fresh VEP results in filtered-variant order"""
+        if not cached:
+            return fresh_annotations
+        
+        fresh_by_key = {
+            VariantAnnotationCache.variant_key(a.chromosome, a.position, a.reference, a.alternate): a
+            for a in fresh_annotations
+        }
+        merged = []
+        for variant in filtered_variants:
+            key = VariantAnnotationCache.variant_key(*self._variant_tuple(variant))
+            annotation = cached.get(key) or fresh_by_key.pop(key, None)
+            if annotation is not None:
+                merged.append(annotation)
+        
+        # VEP records whose alleles didn't map back to an input variant
+        merged.extend(fresh_by_key.values())
+        return merged
+    
     def _create_temp_vcf(self, filtered_variants: List[Dict[str, Any]], original_vcf_path: Path) -> Path:
         """Create temporary VCF file with filtered variants"""
         
@@ -202,17 +286,17 @@ class VariantProcessor:
                 details={"original_vcf": str(original_vcf_path), "error": str(e)}
             )
     
+    @staticmethod
+    def _vcf_lookup(filtered_variants: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Filtered VCF records by chromosome:position"""
+        return {f"{variant.get('chromosome')}:{variant.get('position')}": variant
+                for variant in filtered_variants}
+    
     def _enhance_annotations_with_vcf_data(self, 
                                          variant_annotations: List[VariantAnnotation],
-                                         filtered_variants: List[Dict[str, Any]]) -> List[VariantAnnotation]:
+                                         vcf_lookup: Dict[str, Dict[str, Any]]) -> List[VariantAnnotation]:
         """Enhance VEP annotations with VCF quality data"""
         
-        # Create lookup for VCF data by position
-        vcf_lookup = {}
-        for variant in filtered_variants:
-            key = f"{variant.get('chromosome')}:{variant.get('position')}"
-            vcf_lookup[key] = variant
-        
         enhanced_annotations = []
         
         for annotation in variant_annotations:
@@ -359,6 +443,7 @@ def create_variant_annotations_from_vcf(tumor_vcf_path: Path,
                                        normal_vcf_path: Optional[Path] = None,
                                        cancer_type: str = "unknown",
                                        vep_config: Optional[VEPConfiguration] = None,
+                                       kb_base_path: str = ".refs",
                                        **kwargs) -> Tuple[List[VariantAnnotation], Dict[str, Any]]:
     """
     Convenience function to create variant annotations from VCF files
@@ -369,12 +454,13 @@ def create_variant_annotations_from_vcf(tumor_vcf_path: Path,
         normal_vcf_path: Path to normal VCF (for TN analysis)
         cancer_type: Cancer type context
         vep_config: VEP configuration (optional)
+        kb_base_path: Knowledge base bundle (annotation cache key, gnomAD AF store)
         **kwargs: Additional processing parameters
         
     Returns:
         Tuple of (variant_annotations, processing_summary)
     """
-    processor = VariantProcessor(vep_config=vep_config)
+    processor = VariantProcessor(vep_config=vep_config, kb_base_path=kb_base_path)
     return processor.process_variants(
         tumor_vcf_path=tumor_vcf_path,
         analysis_type=analysis_type,
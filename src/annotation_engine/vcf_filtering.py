@@ -9,16 +9,25 @@ Implements separate filtering strategies based on analysis type per TN_VERSUS_TO
 import logging
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List, Set, Any, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Set, Any, Optional, Tuple
+import numpy as np
 import pysam
 
+from .gnomad_store import load_gnomad_store
+from .kb_snapshot import SnapshotError
 from .models import AnalysisType
+from .pon_index import PON_INDEX_SUFFIX, default_pon_index_path, load_pon_index
 from .validation.error_handler import ValidationError
+from .vcf_ingest import VariantBatch, VCFRecord, ingest_vcf, open_vcf_stream, scan_contigs
 from .vcf_parser import VCFFieldExtractor
 from .vcf_utils import VCFFileHandler, detect_vcf_file_type
 
 logger = logging.getLogger(__name__)
 
+# Significant normal keys held for contigs the tumor has not reached yet during
+# a streaming merge-join; beyond this, out-of-order contigs are re-read instead
+NORMAL_READ_AHEAD_LIMIT = 100_000
+
 
 class BaseVCFFilter(ABC):
     """Base class for VCF filtering strategies"""
@@ -50,11 +59,17 @@ class TumorNormalFilter(BaseVCFFilter):
     
     Variants present in normal sample at significant VAF (>5%) are filtered as germline.
     This provides highest confidence somatic calling.
+    
+    streaming=None streams (see iter_somatic_variants) whenever both VCFs are
+    tabix-indexed, and loads the normal into a lookup otherwise.
     """
     
-    def __init__(self, min_normal_vaf_threshold: float = 0.05):
+    def __init__(self, min_normal_vaf_threshold: float = 0.05,
+                 streaming: Optional[bool] = None, workers: int = 1):
         super().__init__()
         self.min_normal_vaf_threshold = min_normal_vaf_threshold
+        self.streaming = streaming
+        self.workers = workers
     
     def filter_variants(self, tumor_vcf_path: Path, normal_vcf_path: Optional[Path] = None) -> List[Dict[str, Any]]:
         """
@@ -70,63 +85,145 @@ class TumorNormalFilter(BaseVCFFilter):
         if normal_vcf_path is None:
             raise ValueError("Tumor-Normal filtering requires normal VCF path")
         
+        streaming = self.streaming
+        if streaming is None:
+            # Per-contig tabix queries beat loading the normal whenever both are indexed
+            streaming = VCFFileHandler(tumor_vcf_path).is_indexed and VCFFileHandler(normal_vcf_path).is_indexed
+        if streaming:
+            return list(self.iter_somatic_variants(tumor_vcf_path, normal_vcf_path))
+        
         logger.info(f"Starting Tumor-Normal filtering: {tumor_vcf_path} vs {normal_vcf_path}")
         
-        # Extract variants from both files
+        # Extract tumor variants; the normal is only needed as a lookup, built
+        # straight from its decoded columns
         tumor_variants = self.vcf_extractor.extract_variant_bundle(tumor_vcf_path)
-        normal_variants = self.vcf_extractor.extract_variant_bundle(normal_vcf_path)
-        
-        # Build normal variant lookup for efficient filtering
-        normal_lookup = self._build_variant_lookup(normal_variants)
+        normal_lookup = self._build_variant_lookup(ingest_vcf(normal_vcf_path))
         
         # Filter tumor variants
         somatic_variants = []
-        self.filter_reasons = {
-            "germline_in_normal": 0,
-            "low_quality": 0,
-            "passed_somatic": 0
-        }
+        self._reset_filter_reasons()
         
         for tumor_var in tumor_variants:
-            filter_reason = self._evaluate_tumor_variant(tumor_var, normal_lookup)
-            
-            if filter_reason == "passed":
+            if self._count(self._evaluate_tumor_variant(tumor_var, normal_lookup)):
                 somatic_variants.append(tumor_var)
-                self.passed_count += 1
-                self.filter_reasons["passed_somatic"] += 1
-            else:
-                self.filtered_count += 1
-                self.filter_reasons[filter_reason] += 1
         
         logger.info(f"TN filtering complete: {self.passed_count} somatic, {self.filtered_count} filtered")
         return somatic_variants
     
-    def _build_variant_lookup(self, normal_variants: List[Dict[str, Any]]) -> Set[Tuple[str, int, str, str]]:
+    def iter_somatic_variants(self, tumor_vcf_path: Path, normal_vcf_path: Path) -> Iterator[Dict[str, Any]]:
+        """
+        Stream somatic candidates without loading either VCF into memory
+        
+        When both VCFs are bgzipped and tabix-indexed, each tumor contig is
+        queried from both files separately (in parallel across `workers`
+        processes when workers > 1).  Otherwise both files are walked in
+        lockstep as a sorted merge-join, which requires them to be
+        coordinate-sorted in the same contig order.
+        
+        Args:
+            tumor_vcf_path: Path to tumor VCF
+            normal_vcf_path: Path to matched normal VCF
+            
+        Yields:
+            Somatic variant bundles in tumor file order; the filter summary is
+            complete once the generator is exhausted
+        """
+        logger.info(f"Starting streaming Tumor-Normal filtering: {tumor_vcf_path} vs {normal_vcf_path}")
+        self._reset_filter_reasons()
+        
+        if VCFFileHandler(tumor_vcf_path).is_indexed and VCFFileHandler(normal_vcf_path).is_indexed:
+            with pysam.TabixFile(str(tumor_vcf_path)) as tabix:
+                contigs = list(tabix.contigs)
+            if self.workers > 1 and len(contigs) > 1:
+                yield from self._iter_contigs_parallel(tumor_vcf_path, normal_vcf_path, contigs)
+            else:
+                for contig in contigs:
+                    yield from self._merge_join(tumor_vcf_path, normal_vcf_path, contig)
+        else:
+            yield from self._merge_join(tumor_vcf_path, normal_vcf_path)
+        
+        logger.info(f"TN filtering complete: {self.passed_count} somatic, {self.filtered_count} filtered")
+    
+    def _merge_join(self, tumor_vcf_path: Path, normal_vcf_path: Path,
+                    region: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Walk tumor and normal records in lockstep, one site at a time"""
+        tumor_header, tumor_records = open_vcf_stream(tumor_vcf_path, region)
+        normal = _NormalCursor(normal_vcf_path, self._significant_in_normal, region)
+        tumor_order = _SortCheck(tumor_vcf_path)
+        
+        contig, read_ahead = None, None
+        site, site_lookup = None, set()
+        for record in tumor_records:
+            tumor_order.check(record.chromosome, record.position)
+            if record.chromosome != contig:
+                if contig is not None:
+                    normal.leave_contig(contig)
+                contig, site = record.chromosome, None
+                read_ahead = normal.enter_contig(contig)
+            
+            if read_ahead is not None:
+                site_lookup = read_ahead
+            elif record.position != site:
+                site, site_lookup = record.position, normal.keys_at(contig, record.position)
+            
+            tumor_var = record.bundle(tumor_header.sample_names)
+            if self._count(self._evaluate_tumor_variant(tumor_var, site_lookup)):
+                yield tumor_var
+    
+    def _iter_contigs_parallel(self, tumor_vcf_path: Path, normal_vcf_path: Path,
+                               contigs: List[str]) -> Iterator[Dict[str, Any]]:
+        """Subtract contig by contig over a process pool, yielding in contig order"""
+        from concurrent.futures import ProcessPoolExecutor
+        import multiprocessing
+        
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        jobs = [(str(tumor_vcf_path), str(normal_vcf_path), contig, self.min_normal_vaf_threshold)
+                for contig in contigs]
+        
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+            for somatic, reasons in executor.map(_subtract_contig, jobs):
+                for reason, count in reasons.items():
+                    self.filter_reasons[reason] += count
+                    if reason == "passed_somatic":
+                        self.passed_count += count
+                    else:
+                        self.filtered_count += count
+                yield from somatic
+    
+    def _significant_in_normal(self, record: VCFRecord) -> bool:
+        """Whether the first (normal) sample carries the allele at significant VAF"""
+        if not record.sample_vaf:
+            return False
+        normal_vaf = record.sample_vaf[0]
+        return normal_vaf > 0 and normal_vaf >= self.min_normal_vaf_threshold  # NaN compares False
+    
+    def _reset_filter_reasons(self) -> None:
+        self.filter_reasons = {
+            "germline_in_normal": 0,
+            "low_quality": 0,
+            "passed_somatic": 0
+        }
+    
+    def _count(self, filter_reason: str) -> bool:
+        """Tally one evaluated variant; True if it passed"""
+        if filter_reason == "passed":
+            self.passed_count += 1
+            self.filter_reasons["passed_somatic"] += 1
+            return True
+        self.filtered_count += 1
+        self.filter_reasons[filter_reason] += 1
+        return False
+    
+    def _build_variant_lookup(self, normal_batch: VariantBatch) -> Set[Tuple[str, int, str, str]]:
         """Build efficient lookup set for normal variants"""
-        lookup = set()
-        
-        for variant in normal_variants:
-            # Check if variant has significant VAF in normal
-            normal_vaf = self._get_normal_vaf(variant)
-            if normal_vaf and normal_vaf >= self.min_normal_vaf_threshold:
-                key = (
-                    variant['chromosome'],
-                    variant['position'], 
-                    variant['reference'],
-                    variant['alternate']
-                )
-                lookup.add(key)
-        
-        return lookup
-    
-    def _get_normal_vaf(self, variant: Dict[str, Any]) -> Optional[float]:
-        """Extract VAF from normal sample"""
-        if not variant.get('samples'):
-            return None
+        if not normal_batch.sample_names:
+            return set()
         
-        # Assuming single normal sample (could extend for multi-sample)
-        sample = variant['samples'][0]
-        return sample.get('variant_allele_frequency')
+        # Significant VAF in the first (normal) sample; NaN compares False
+        normal_vaf = normal_batch.sample_vaf[:, 0]
+        significant = np.flatnonzero((normal_vaf > 0) & (normal_vaf >= self.min_normal_vaf_threshold))
+        return set(normal_batch.variant_keys(significant.tolist()))
     
     def _evaluate_tumor_variant(self, tumor_var: Dict[str, Any], normal_lookup: Set[Tuple[str, int, str, str]]) -> str:
         """Evaluate if tumor variant should be filtered"""
@@ -162,6 +259,147 @@ class TumorNormalFilter(BaseVCFFilter):
         return True
 
 
+class _SortCheck:
+    """Fails fast on records that are out of order within a contig, or on a contig seen twice"""
+    
+    def __init__(self, vcf_path: Path):
+        self.vcf_path = vcf_path
+        self.contig: Optional[str] = None
+        self.position = 0
+        self.closed: Set[str] = set()
+    
+    def check(self, contig: str, position: int) -> None:
+        if contig != self.contig:
+            if contig in self.closed:
+                self._fail(f"records for contig {contig} are not contiguous")
+            if self.contig is not None:
+                self.closed.add(self.contig)
+            self.contig = contig
+        elif position < self.position:
+            self._fail(f"{contig}:{position} follows {contig}:{self.position}")
+        self.position = position
+    
+    def _fail(self, reason: str) -> None:
+        raise ValidationError(
+            error_type="vcf_not_sorted",
+            message=f"VCF is not coordinate-sorted ({reason}): {self.vcf_path}. "
+                    f"Sort it (e.g. bcftools sort) before streaming tumor-normal filtering.",
+            details={"vcf_path": str(self.vcf_path)}
+        )
+
+
+class _NormalCursor:
+    """
+    Forward-only walk over the normal VCF, driven by the tumor's contig order
+    
+    Within a contig the normal is consumed in lockstep with the tumor.  If the
+    two files order their contigs differently, significant keys of normal
+    contigs the tumor has not reached yet are read ahead, up to
+    NORMAL_READ_AHEAD_LIMIT keys in total; contigs past that budget are
+    skipped and found again later by re-reading the normal from the start.
+    A contig order index (one cheap CHROM-column scan, taken only when the
+    orders diverge) keeps contigs the normal lacks from draining the file.
+    """
+    
+    def __init__(self, vcf_path: Path, significant: Callable[[VCFRecord], bool],
+                 region: Optional[str] = None):
+        self.vcf_path = vcf_path
+        self.region = region
+        self.significant = significant
+        self.read_ahead: Dict[str, Set[Tuple[str, int, str, str]]] = {}
+        self.read_ahead_size = 0
+        self.passed: Set[str] = set()  # Contigs the cursor has moved beyond
+        self.skipped: Set[str] = set()  # Passed contigs whose keys were not kept
+        self.finished: Set[str] = set()
+        self.contigs: Optional[Set[str]] = None
+        self._open()
+    
+    def _open(self) -> None:
+        _, self.records = open_vcf_stream(self.vcf_path, self.region)
+        self.order = _SortCheck(self.vcf_path)
+        self.current = self._next()
+    
+    def _next(self) -> Optional[VCFRecord]:
+        record = next(self.records, None)
+        if record is not None:
+            self.order.check(record.chromosome, record.position)
+        return record
+    
+    def _advance(self) -> None:
+        self.passed.add(self.current.chromosome)
+        self.current = self._next()
+    
+    def enter_contig(self, contig: str) -> Optional[Set[Tuple[str, int, str, str]]]:
+        """
+        Move to the tumor's next contig
+        
+        Returns:
+            The contig's significant normal keys if they are already known
+            (read ahead, or empty because the normal has none), else None (the
+            cursor now sits at the contig's first record or past the end of
+            the file)
+        """
+        if contig in self.read_ahead:
+            keys = self.read_ahead.pop(contig)
+            self.read_ahead_size -= len(keys)
+            return keys
+        if contig in self.skipped:
+            self.skipped.discard(contig)
+            self.records.close()
+            self._open()
+            while self.current is not None and self.current.chromosome != contig:
+                self._advance()
+            return None
+        if self.current is None or self.current.chromosome == contig:
+            return None
+        if contig in self.passed:
+            return set()
+        if self.contigs is None:
+            self.contigs = set(scan_contigs(self.vcf_path))
+        if contig not in self.contigs:
+            return set()
+        
+        while self.current is not None and self.current.chromosome != contig:
+            record = self.current
+            chromosome = record.chromosome
+            if (chromosome not in self.finished and chromosome not in self.skipped
+                    and self.significant(record)):
+                if self.read_ahead_size < NORMAL_READ_AHEAD_LIMIT:
+                    keys = self.read_ahead.setdefault(chromosome, set())
+                    self.read_ahead_size -= len(keys)
+                    keys.add(record.key)
+                    self.read_ahead_size += len(keys)
+                else:
+                    self.skipped.add(chromosome)
+                    self.read_ahead_size -= len(self.read_ahead.pop(chromosome, ()))
+            self._advance()
+        return None
+    
+    def leave_contig(self, contig: str) -> None:
+        self.finished.add(contig)
+        self.read_ahead_size -= len(self.read_ahead.pop(contig, ()))
+        self.skipped.discard(contig)
+    
+    def keys_at(self, contig: str, position: int) -> Set[Tuple[str, int, str, str]]:
+        """Significant normal keys at a site, consuming the normal up to it"""
+        keys = set()
+        while (self.current is not None and self.current.chromosome == contig
+               and self.current.position <= position):
+            if self.current.position == position and self.significant(self.current):
+                keys.add(self.current.key)
+            self._advance()
+        return keys
+
+
+def _subtract_contig(job: Tuple[str, str, str, float]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Process-pool worker: somatic variants and filter tallies for one contig"""
+    tumor_vcf_path, normal_vcf_path, contig, min_normal_vaf_threshold = job
+    vcf_filter = TumorNormalFilter(min_normal_vaf_threshold)
+    vcf_filter._reset_filter_reasons()
+    somatic = list(vcf_filter._merge_join(Path(tumor_vcf_path), Path(normal_vcf_path), contig))
+    return somatic, vcf_filter.filter_reasons
+
+
 class TumorOnlyFilter(BaseVCFFilter):
     """
     Tumor-Only filtering: Population AF + Panel of Normals approach
@@ -169,21 +407,33 @@ class TumorOnlyFilter(BaseVCFFilter):
     Somatic status is inferred through in-silico germline filtering:
     1. Panel of Normals (PoN) - filters recurrent sequencing artifacts 
     2. Population AF databases - filters common germline variants
+    
+    Population AFs come from a local gnomAD AF store (gnomad_store) when
+    gnomad_store_path is given, looked up once per tumor VCF.
     """
     
     def __init__(self, 
                  max_population_af: float = 0.01,
                  pon_vcf_path: Optional[Path] = None,
-                 gnomad_af_threshold: float = 0.01):
+                 gnomad_af_threshold: float = 0.01,
+                 pon_index_path: Optional[Path] = None,
+                 gnomad_store_path: Optional[Path] = None):
         super().__init__()
         self.max_population_af = max_population_af
         self.pon_vcf_path = pon_vcf_path
+        self.pon_index_path = pon_index_path
         self.gnomad_af_threshold = gnomad_af_threshold
         self.pon_lookup = None
+        self.pon_index = None
+        self.gnomad_store_path = gnomad_store_path
+        self.gnomad_store = None
         
         # Load Panel of Normals if provided
-        if self.pon_vcf_path and self.pon_vcf_path.exists():
+        if self.pon_index_path or (self.pon_vcf_path and self.pon_vcf_path.exists()):
             self._load_panel_of_normals()
+        
+        if self.gnomad_store_path:
+            self._load_gnomad_store()
     
     def filter_variants(self, tumor_vcf_path: Path, normal_vcf_path: Optional[Path] = None) -> List[Dict[str, Any]]:
         """
@@ -211,8 +461,16 @@ class TumorOnlyFilter(BaseVCFFilter):
             "passed_likely_somatic": 0
         }
         
-        for variant in tumor_variants:
-            filter_reason = self._evaluate_tumor_only_variant(variant)
+        # One batched PoN and store lookup for every tumor variant
+        variant_keys = [(v['chromosome'], v['position'], v['reference'], v['alternate']) for v in tumor_variants]
+        in_pon = self._panel_of_normals_batch(variant_keys)
+        gnomad_afs = [None] * len(tumor_variants)
+        if self.gnomad_store is not None and tumor_variants:
+            max_afs = self.gnomad_store.max_af_batch(variant_keys)
+            gnomad_afs = [None if np.isnan(af) else float(af) for af in max_afs]
+        
+        for variant, pon_hit, gnomad_af in zip(tumor_variants, in_pon, gnomad_afs):
+            filter_reason = self._evaluate_tumor_only_variant(variant, gnomad_af, pon_hit)
             
             if filter_reason == "passed":
                 likely_somatic_variants.append(variant)
@@ -226,21 +484,36 @@ class TumorOnlyFilter(BaseVCFFilter):
         return likely_somatic_variants
     
     def _load_panel_of_normals(self):
-        """Load Panel of Normals variants for filtering"""
+        """
+        Load Panel of Normals variants for filtering
+        
+        Prefers a prebuilt PoN index (pon_index_path, a .aepon path given as
+        pon_vcf_path, or a current <pon>.aepon sidecar), which is memory-mapped
+        rather than parsed.  Otherwise the PoN VCF is read into a set.
+        """
+        index_path = self.pon_index_path
+        source_vcf = self.pon_vcf_path
+        if index_path is None and self.pon_vcf_path:
+            if self.pon_vcf_path.name.endswith(PON_INDEX_SUFFIX):
+                index_path, source_vcf = self.pon_vcf_path, None
+            elif default_pon_index_path(self.pon_vcf_path).exists():
+                index_path = default_pon_index_path(self.pon_vcf_path)
+        
+        if index_path is not None:
+            try:
+                self.pon_index = load_pon_index(index_path, pon_vcf_path=source_vcf)
+                logger.info(f"Opened PoN index {index_path} ({len(self.pon_index)} sites)")
+                return
+            except (SnapshotError, OSError) as e:
+                logger.warning(f"Cannot use PoN index {index_path}: {e}")
+                if not (source_vcf and source_vcf.exists()):
+                    self.pon_lookup = set()
+                    return
+        
         logger.info(f"Loading Panel of Normals: {self.pon_vcf_path}")
         
         try:
-            pon_variants = self.vcf_extractor.extract_variant_bundle(self.pon_vcf_path)
-            self.pon_lookup = set()
-            
-            for variant in pon_variants:
-                key = (
-                    variant['chromosome'],
-                    variant['position'],
-                    variant['reference'],
-                    variant['alternate']
-                )
-                self.pon_lookup.add(key)
+            self.pon_lookup = set(ingest_vcf(self.pon_vcf_path).variant_keys())
             
             logger.info(f"Loaded {len(self.pon_lookup)} PoN variants")
             
@@ -248,8 +521,18 @@ class TumorOnlyFilter(BaseVCFFilter):
             logger.warning(f"Failed to load Panel of Normals: {e}")
             self.pon_lookup = set()
     
-    def _evaluate_tumor_only_variant(self, variant: Dict[str, Any]) -> str:
-        """Evaluate if tumor-only variant should be filtered"""
+    def _load_gnomad_store(self):
+        """Open the local gnomAD AF store (memory-mapped, shared per process)"""
+        try:
+            self.gnomad_store = load_gnomad_store(self.gnomad_store_path)
+            logger.info(f"Opened gnomAD AF store {self.gnomad_store_path} ({len(self.gnomad_store)} sites)")
+        except (SnapshotError, OSError) as e:
+            logger.warning(f"Cannot use gnomAD AF store {self.gnomad_store_path}: {e}")
+            self.gnomad_store = None
+    
+    def _evaluate_tumor_only_variant(self, variant: Dict[str, Any], gnomad_af: Optional[float] = None,
+                                     in_pon: Optional[bool] = None) -> str:
+        """Evaluate if tumor-only variant should be filtered (in_pon: precomputed PoN membership)"""
         
         # Check basic quality filters
         if not self._passes_basic_quality(variant):
@@ -261,11 +544,13 @@ class TumorOnlyFilter(BaseVCFFilter):
             return "low_vaf"
         
         # Check against Panel of Normals
-        if self._is_in_panel_of_normals(variant):
+        if in_pon is None:
+            in_pon = self._is_in_panel_of_normals(variant)
+        if in_pon:
             return "panel_of_normals"
         
-        # Check population frequency (this would be enhanced with actual gnomAD lookup)
-        if self._has_high_population_frequency(variant):
+        # Check population frequency
+        if self._has_high_population_frequency(variant, gnomad_af):
             return "high_population_af"
         
         return "passed"
@@ -281,9 +566,6 @@ class TumorOnlyFilter(BaseVCFFilter):
     
     def _is_in_panel_of_normals(self, variant: Dict[str, Any]) -> bool:
         """Check if variant is present in Panel of Normals"""
-        if not self.pon_lookup:
-            return False
-        
         var_key = (
             variant['chromosome'],
             variant['position'],
@@ -291,22 +573,35 @@ class TumorOnlyFilter(BaseVCFFilter):
             variant['alternate']
         )
         
+        if self.pon_index is not None:
+            return self.pon_index.contains(*var_key)
+        if not self.pon_lookup:
+            return False
+        
         return var_key in self.pon_lookup
     
-    def _has_high_population_frequency(self, variant: Dict[str, Any]) -> bool:
+    def _panel_of_normals_batch(self, variant_keys: List[Tuple[str, int, str, str]]) -> List[bool]:
+        """PoN membership for many (chrom, pos, ref, alt) keys, one index query for all"""
+        if self.pon_index is not None:
+            return self.pon_index.contains_batch(variant_keys).tolist()
+        if not self.pon_lookup:
+            return [False] * len(variant_keys)
+        return [key in self.pon_lookup for key in variant_keys]
+    
+    def _has_high_population_frequency(self, variant: Dict[str, Any], gnomad_af: Optional[float] = None) -> bool:
         """
         Check if variant has high population frequency
         
-        Note: This is a placeholder. In production, this would query:
-        - gnomAD API or local database
-        - dbSNP frequencies
-        - Other population databases
+        Args:
+            variant: Tumor variant dictionary
+            gnomad_af: max(AF, AF_grpmax) from the gnomAD AF store, or None
+                when the variant is absent or no store is loaded
         """
-        # Placeholder logic - check if variant has dbSNP membership as proxy
-        # In reality, this would be a proper AF lookup
-        if variant.get('dbsnp_member'):
-            # Very crude proxy - if in dbSNP, assume common
-            # Real implementation would do proper AF lookup
+        if self.gnomad_store is not None:
+            if gnomad_af is not None and gnomad_af > self.gnomad_af_threshold:
+                return True
+        elif variant.get('dbsnp_member'):
+            # Without a gnomAD store, dbSNP membership is the (crude) proxy
             return True
         
         # Check if allele frequency is annotated in VCF (some pipelines include this)
@@ -350,13 +645,17 @@ class VCFFilterFactory:
         """
         if analysis_type == AnalysisType.TUMOR_NORMAL:
             return TumorNormalFilter(
-                min_normal_vaf_threshold=kwargs.get('min_normal_vaf_threshold', 0.05)
+                min_normal_vaf_threshold=kwargs.get('min_normal_vaf_threshold', 0.05),
+                streaming=kwargs.get('streaming'),
+                workers=kwargs.get('workers', 1)
             )
         elif analysis_type == AnalysisType.TUMOR_ONLY:
             return TumorOnlyFilter(
                 max_population_af=kwargs.get('max_population_af', 0.01),
                 pon_vcf_path=kwargs.get('pon_vcf_path'),
-                gnomad_af_threshold=kwargs.get('gnomad_af_threshold', 0.01)
+                gnomad_af_threshold=kwargs.get('gnomad_af_threshold', 0.01),
+                pon_index_path=kwargs.get('pon_index_path'),
+                gnomad_store_path=kwargs.get('gnomad_store_path')
             )
         else:
             raise ValueError(f"Unsupported analysis type: {analysis_type}")
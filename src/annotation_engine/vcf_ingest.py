@@ -0,0 +1,599 @@
+"""
+Single-Pass VCF Ingestion
+
+Reads a VCF (plain or bgzip/gzip) once and decodes every record exactly once
+into a VariantBatch: typed per-record INFO and FORMAT values alongside numeric
+columns (QUAL, INFO DP/AF, per-sample DP and VAF) held as numpy arrays.
+
+Input validation statistics, metadata bundles, variant bundles and the
+tumor-normal / tumor-only filters are all derived from the batch rather than
+each re-opening the file and re-parsing it through gzip text, pysam and vcfpy
+in turn.  Batches are cached per file (keyed on path, size and modification
+time), so the validator, parser and filters working on the same VCF within
+one run share a single decode.
+
+Field typing follows vcfpy (header Number/Type, with vcfpy's reserved field
+definitions for undeclared keys) so variant bundles keep the structure
+VCFFileHandler produced.
+"""
+
+import gzip
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pysam
+from vcfpy.header import RESERVED_FORMAT, RESERVED_INFO
+
+from .validation.error_handler import ValidationError
+
+logger = logging.getLogger(__name__)
+
+# Number of decoded files kept for reuse (tumor, normal, PoN, ...)
+INGEST_CACHE_SIZE = 4
+
+_STRUCTURED_LINE = re.compile(r"^##(\w+)=<(.*)>$")
+_STRUCTURED_FIELD = re.compile(r'([\w.]+)=("(?:[^"\\]|\\.)*"|[^,]*)')
+_ALLELE_DELIM = re.compile(r"[|/]")
+_UNESCAPE = (("%25", "%"), ("%3A", ":"), ("%3B", ";"), ("%3D", "="),
+             ("%2C", ","), ("%0D", "\r"), ("%0A", "\n"), ("%09", "\t"))
+
+
+@dataclass
+class VCFHeader:
+    """Meta-information lines, field definitions and sample names of a VCF"""
+
+    lines: List[str] = field(default_factory=list)
+    sample_names: List[str] = field(default_factory=list)
+    fileformat: Optional[str] = None
+    reference: Optional[str] = None
+    info: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    format: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    filters: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    contigs: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    def add_line(self, line: str) -> None:
+        """Record one '##' line, indexing the structured ones"""
+        self.lines.append(line)
+        if line.startswith("##fileformat="):
+            self.fileformat = line.split("=", 1)[1].strip()
+        elif line.startswith("##reference=") and self.reference is None:
+            self.reference = line.split("=", 1)[1].strip()
+
+        match = _STRUCTURED_LINE.match(line)
+        if not match:
+            return
+        mapping = {key: value[1:-1] if value.startswith('"') and value.endswith('"') else value
+                   for key, value in _STRUCTURED_FIELD.findall(match.group(2))}
+        if "ID" not in mapping:
+            return
+        section = {"INFO": self.info, "FORMAT": self.format,
+                   "FILTER": self.filters, "contig": self.contigs}.get(match.group(1))
+        if section is not None:
+            section[mapping["ID"]] = mapping
+
+
+def _unescape(value: str) -> str:
+    if "%" in value:
+        for escaped, char in _UNESCAPE:
+            value = value.replace(escaped, char)
+    return value
+
+
+def _scalar_converter(type_: str) -> Callable[[str], Any]:
+    cast = {"Integer": int, "Float": float}.get(type_)
+
+    def convert(value: str) -> Any:
+        if value == ".":
+            return None
+        if cast is None:
+            return _unescape(value)
+        try:
+            return cast(value)
+        except ValueError:
+            return value
+
+    return convert
+
+
+def _field_parser(key: str, definition: Optional[Dict[str, str]], reserved: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Value parser for one INFO/FORMAT key, typed as vcfpy would type it"""
+    if definition is not None:
+        type_ = definition.get("Type", "String")
+        number = definition.get("Number", ".")
+        number = int(number) if number.isdigit() else number
+    elif key in reserved:
+        type_, number = reserved[key].type, reserved[key].number
+    else:
+        type_, number = "String", "."
+
+    if type_ == "Flag":
+        return lambda value: True
+    if key == "FT":
+        return lambda value: [x for x in value.split(";") if x != "."]
+    convert = _scalar_converter(type_)
+    if number == 1:
+        return lambda value: True if value is True else convert(value)
+    return lambda value: True if value is True else (
+        [] if value == "." else [convert(x) for x in value.split(",")])
+
+
+def _parse_qual(value: str) -> float:
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _info_af(info: Dict[str, Any]) -> Optional[float]:
+    for key in ("AF", "VAF", "FREQ"):
+        if key in info:
+            try:
+                value = info[key]
+                return float(value[0] if isinstance(value, list) else value)
+            except (ValueError, TypeError, IndexError):
+                continue
+    return None
+
+
+def _info_dp(info: Dict[str, Any]) -> Optional[int]:
+    for key in ("DP", "DEPTH"):
+        if key in info:
+            try:
+                return int(info[key])
+            except (ValueError, TypeError):
+                continue
+    return None
+
+
+def _ad_vaf(ad: Any) -> Optional[float]:
+    """Alt fraction from an allelic-depth list (first ALT over all alleles)"""
+    if isinstance(ad, list) and len(ad) >= 2:
+        try:
+            total = sum(ad)
+            if total > 0:
+                return ad[1] / total
+        except TypeError:
+            pass
+    return None
+
+
+def _variant_type(ref: str, alt: Optional[str]) -> str:
+    if not alt or alt == ".":
+        return "unknown"
+    if len(ref) == 1 and len(alt) == 1:
+        return "SNV"
+    if len(ref) > len(alt):
+        return "deletion"
+    if len(ref) < len(alt):
+        return "insertion"
+    return "complex"
+
+
+class VCFRecord(NamedTuple):
+    """One decoded VCF record (first ALT only, as in the variant bundles)"""
+
+    chromosome: str
+    position: int
+    id: Optional[str]
+    reference: str
+    alternate: Optional[str]
+    quality: Optional[float]
+    filters: List[str]
+    info: Dict[str, Any]
+    format: List[str]
+    calls: List[Dict[str, Any]]
+    genotypes: List[Optional[List[Optional[int]]]]
+    info_dp: Optional[int]
+    info_af: Optional[float]
+    sample_dp: List[float]   # one per header sample, NaN where absent
+    sample_vaf: List[float]
+
+    @property
+    def key(self) -> Tuple[str, int, str, Optional[str]]:
+        return (self.chromosome, self.position, self.reference, self.alternate)
+
+    def bundle(self, sample_names: List[str]) -> Dict[str, Any]:
+        """Variant dictionary in the VCFFieldExtractor.extract_variant_bundle format"""
+        samples = []
+        for j, (data, genotype) in enumerate(zip(self.calls, self.genotypes)):
+            sample = {
+                "name": sample_names[j],
+                "genotype": None if genotype is None else list(genotype),
+                "data": dict(data),
+            }
+            vaf = self.sample_vaf[j]
+            if vaf == vaf:  # not NaN
+                sample["variant_allele_frequency"] = vaf
+            samples.append(sample)
+
+        return {
+            "chromosome": self.chromosome,
+            "position": self.position,
+            "id": self.id,
+            "reference": self.reference,
+            "alternate": self.alternate,
+            "quality_score": self.quality,
+            "filter_status": list(self.filters),
+            "info": dict(self.info),
+            "format": list(self.format),
+            "samples": samples,
+            "allele_frequency": self.info_af,
+            "total_depth": self.info_dp,
+            "variant_type": _variant_type(self.reference, self.alternate),
+        }
+
+
+class _RecordDecoder:
+    """Decodes data lines against one header, caching per-key value parsers"""
+
+    def __init__(self, header: VCFHeader, source: Path):
+        self.header = header
+        self.source = source
+        self.n_samples = len(header.sample_names)
+        self.info_parsers: Dict[str, Callable[[Any], Any]] = {}
+        self.format_parsers: Dict[str, List[Tuple[str, Callable[[Any], Any]]]] = {}
+
+    def _error(self, message: str, line_number: Optional[int]) -> ValidationError:
+        where = f" at line {line_number}" if line_number else ""
+        return ValidationError(
+            error_type="vcf_parse_error",
+            message=f"Invalid VCF record{where}: {message}",
+            details={"vcf_path": str(self.source), "line": line_number}
+        )
+
+    def decode(self, line: str, line_number: Optional[int] = None) -> VCFRecord:
+        fields = line.split("\t")
+        if len(fields) < 8 or len(fields) == 9:
+            raise self._error(f"expected 8 or 10+ columns, got {len(fields)}", line_number)
+        try:
+            position = int(fields[1])
+            qual = None if fields[5] == "." else _parse_qual(fields[5])
+        except ValueError as e:
+            raise self._error(str(e), line_number)
+
+        info = {}
+        if fields[7] != ".":
+            for entry in fields[7].split(";"):
+                key, sep, value = entry.partition("=")
+                parse = self.info_parsers.get(key)
+                if parse is None:
+                    parse = self.info_parsers[key] = _field_parser(key, self.header.info.get(key), RESERVED_INFO)
+                info[key] = parse(value if sep else True)
+
+        nan = float("nan")
+        format_keys, calls, genotypes, dps, vafs = [], [], [], [], []
+        if len(fields) > 9:
+            format_keys = fields[8].split(":")
+            parsers = self.format_parsers.get(fields[8])
+            if parsers is None:
+                parsers = self.format_parsers[fields[8]] = [
+                    (key, _field_parser(key, self.header.format.get(key), RESERVED_FORMAT))
+                    for key in format_keys]
+            for raw in fields[9:9 + self.n_samples]:
+                data = {}
+                for (key, parse), value in zip(parsers, raw.split(":")):
+                    value = parse(value)
+                    if value is not None:
+                        data[key] = value
+                calls.append(data)
+                gt = data.get("GT")
+                genotypes.append(None if gt is None else [
+                    None if allele == "." else int(allele) for allele in _ALLELE_DELIM.split(str(gt))])
+                try:
+                    dps.append(int(data["DP"]))
+                except (KeyError, TypeError, ValueError):
+                    dps.append(nan)
+                vaf = _ad_vaf(data.get("AD"))
+                vafs.append(nan if vaf is None else vaf)
+        missing = self.n_samples - len(dps)
+
+        return VCFRecord(
+            chromosome=fields[0],
+            position=position,
+            id=None if fields[2] == "." else fields[2].split(";")[0],
+            reference=fields[3],
+            alternate=None if fields[4] == "." else fields[4].split(",")[0],
+            quality=qual,
+            filters=[] if fields[6] == "." else fields[6].split(";"),
+            info=info,
+            format=format_keys,
+            calls=calls,
+            genotypes=genotypes,
+            info_dp=_info_dp(info),
+            info_af=_info_af(info),
+            sample_dp=dps + [nan] * missing,
+            sample_vaf=vafs + [nan] * missing,
+        )
+
+
+class VariantBatch:
+    """All records of one VCF, decoded once, in file order"""
+
+    def __init__(self, path: Path, header: VCFHeader):
+        self.path = path
+        self.header = header
+        self.chromosomes: List[str] = []
+        self.positions: np.ndarray = np.empty(0, dtype=np.int64)
+        self.ids: List[Optional[str]] = []
+        self.references: List[str] = []
+        self.alternates: List[Optional[str]] = []
+        self.qualities: List[Optional[float]] = []
+        self.filters: List[List[str]] = []
+        self.info: List[Dict[str, Any]] = []
+        self.formats: List[List[str]] = []
+        self.calls: List[List[Dict[str, Any]]] = []
+        self.genotypes: List[List[Optional[List[Optional[int]]]]] = []
+
+        # Numeric columns (NaN where absent)
+        self.qual: np.ndarray = np.empty(0)
+        self.info_dp: np.ndarray = np.empty(0)
+        self.info_af: np.ndarray = np.empty(0)
+        self.has_info_af: np.ndarray = np.empty(0, dtype=bool)
+        self.sample_dp: np.ndarray = np.empty((0, len(header.sample_names)))
+        self.sample_vaf: np.ndarray = np.empty((0, len(header.sample_names)))
+
+    @classmethod
+    def from_records(cls, path: Path, header: VCFHeader, records: Iterable[VCFRecord]) -> "VariantBatch":
+        """Collect decoded records into columns"""
+        batch = cls(path, header)
+        positions, quals, info_dps, info_afs, has_afs, sample_dps, sample_vafs = [], [], [], [], [], [], []
+        nan = float("nan")
+        for record in records:
+            batch.chromosomes.append(record.chromosome)
+            positions.append(record.position)
+            batch.ids.append(record.id)
+            batch.references.append(record.reference)
+            batch.alternates.append(record.alternate)
+            batch.qualities.append(record.quality)
+            quals.append(nan if record.quality is None else record.quality)
+            batch.filters.append(record.filters)
+            batch.info.append(record.info)
+            info_dps.append(nan if record.info_dp is None else record.info_dp)
+            info_afs.append(nan if record.info_af is None else record.info_af)
+            has_afs.append("AF" in record.info or "VAF" in record.info or "FREQ" in record.info)
+            batch.formats.append(record.format)
+            batch.calls.append(record.calls)
+            batch.genotypes.append(record.genotypes)
+            sample_dps.append(record.sample_dp)
+            sample_vafs.append(record.sample_vaf)
+
+        n_samples = len(header.sample_names)
+        batch.positions = np.array(positions, dtype=np.int64)
+        batch.qual = np.array(quals, dtype=np.float64)
+        batch.info_dp = np.array(info_dps, dtype=np.float64)
+        batch.info_af = np.array(info_afs, dtype=np.float64)
+        batch.has_info_af = np.array(has_afs, dtype=bool)
+        batch.sample_dp = np.array(sample_dps, dtype=np.float64).reshape(len(batch), n_samples)
+        batch.sample_vaf = np.array(sample_vafs, dtype=np.float64).reshape(len(batch), n_samples)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.chromosomes)
+
+    @property
+    def sample_names(self) -> List[str]:
+        return self.header.sample_names
+
+    def variant_keys(self, rows: Optional[Iterable[int]] = None) -> List[Tuple[str, int, str, Optional[str]]]:
+        """(chromosome, position, reference, alternate) for each (or the given) record"""
+        rows = range(len(self)) if rows is None else rows
+        return [(self.chromosomes[i], int(self.positions[i]), self.references[i], self.alternates[i])
+                for i in rows]
+
+    def depth(self) -> np.ndarray:
+        """Per-record depth: INFO DP, falling back to the first sample's FORMAT DP"""
+        if not self.sample_dp.shape[1]:
+            return self.info_dp
+        return np.where(np.isnan(self.info_dp), self.sample_dp[:, 0], self.info_dp)
+
+    def variant_bundles(self, rows: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Variant dictionaries in the VCFFieldExtractor.extract_variant_bundle format
+
+        Args:
+            rows: Record indexes to materialize (default: all, in file order)
+
+        Returns:
+            Fresh dictionaries; nested INFO/FORMAT dicts are copies, so callers
+            may modify them without affecting the cached batch
+        """
+        rows = range(len(self)) if rows is None else rows
+        names = self.header.sample_names
+        positions, info_dp, info_af = self.positions.tolist(), self.info_dp.tolist(), self.info_af.tolist()
+        sample_dp, sample_vaf = self.sample_dp.tolist(), self.sample_vaf.tolist()
+        bundles = []
+        for i in rows:
+            dp, af = info_dp[i], info_af[i]
+            record = VCFRecord(
+                self.chromosomes[i], positions[i], self.ids[i], self.references[i], self.alternates[i],
+                self.qualities[i], self.filters[i], self.info[i], self.formats[i], self.calls[i],
+                self.genotypes[i], int(dp) if dp == dp else None, af if af == af else None,
+                sample_dp[i], sample_vaf[i])
+            bundles.append(record.bundle(names))
+        return bundles
+
+
+def _open_text(path: Path):
+    with open(path, "rb") as f:
+        is_gzipped = f.read(2) == b"\x1f\x8b"
+    return gzip.open(path, "rt") if is_gzipped else open(path, "r")
+
+
+def _check_exists(vcf_path: Path) -> None:
+    if not vcf_path.is_file():
+        raise ValidationError(
+            error_type="vcf_not_found",
+            message=f"VCF file not found: {vcf_path}",
+            details={"vcf_path": str(vcf_path)}
+        )
+
+
+def _missing_chrom_line(vcf_path: Path) -> ValidationError:
+    return ValidationError(
+        error_type="vcf_parse_error",
+        message=f"VCF has no #CHROM header line: {vcf_path}",
+        details={"vcf_path": str(vcf_path)}
+    )
+
+
+def open_vcf_stream(vcf_path: Path, region: Optional[str] = None) -> Tuple[VCFHeader, Iterator[VCFRecord]]:
+    """
+    Read a VCF's header and return a lazy record iterator
+
+    Records are decoded one at a time, so memory stays constant however large
+    the file is.  The file is closed once the iterator is exhausted.
+
+    Args:
+        vcf_path: Plain, gzip or bgzip compressed VCF
+        region: Optional contig or "contig:start-end" region; requires a
+            bgzip-compressed VCF with a tabix index
+
+    Returns:
+        (header, record iterator in file order)
+
+    Raises:
+        ValidationError: If the file is missing or has no #CHROM line; bad
+            records raise from the iterator
+    """
+    vcf_path = Path(vcf_path)
+    _check_exists(vcf_path)
+    header = VCFHeader()
+
+    if region is not None:
+        tabix = pysam.TabixFile(str(vcf_path))
+        for line in tabix.header:
+            if line.startswith("##"):
+                header.add_line(line)
+            elif line.startswith("#"):
+                header.sample_names = line.split("\t")[9:]
+                break
+        else:
+            tabix.close()
+            raise _missing_chrom_line(vcf_path)
+        decoder = _RecordDecoder(header, vcf_path)
+
+        def fetch() -> Iterator[VCFRecord]:
+            try:
+                if region in tabix.contigs:
+                    lines = tabix.fetch(region)
+                elif region.rsplit(":", 1)[0] in tabix.contigs:
+                    lines = tabix.fetch(region=region)
+                else:
+                    lines = ()  # No records on this contig; tabix would raise
+                for line in lines:
+                    yield decoder.decode(line)
+            finally:
+                tabix.close()
+
+        return header, fetch()
+
+    f = _open_text(vcf_path)
+    line_number = 0
+    for line in f:
+        line_number += 1
+        if line.startswith("##"):
+            header.add_line(line.rstrip("\r\n"))
+            continue
+        if line.startswith("#"):
+            header.sample_names = line.rstrip("\r\n").split("\t")[9:]
+            break
+        if line.strip():
+            f.close()
+            raise ValidationError(
+                error_type="vcf_parse_error",
+                message=f"VCF record before #CHROM header line in {vcf_path}",
+                details={"vcf_path": str(vcf_path), "line": line_number}
+            )
+    else:
+        f.close()
+        raise _missing_chrom_line(vcf_path)
+    decoder = _RecordDecoder(header, vcf_path)
+
+    def scan() -> Iterator[VCFRecord]:
+        with f:
+            for number, line in enumerate(f, line_number + 1):
+                line = line.rstrip()
+                if line:
+                    yield decoder.decode(line, number)
+
+    return header, scan()
+
+
+def scan_contigs(vcf_path: Path) -> List[str]:
+    """
+    Contigs in the order their records first appear
+
+    Only the CHROM column is split off each line, so this is much cheaper than
+    decoding the file, and memory is proportional to the number of contigs.
+    """
+    contigs: Dict[str, None] = {}
+    with _open_text(Path(vcf_path)) as f:
+        for line in f:
+            if not line.startswith("#") and line.strip():
+                contigs.setdefault(line.split("\t", 1)[0], None)
+    return list(contigs)
+
+
+def read_vcf(vcf_path: Path) -> VariantBatch:
+    """
+    Decode a VCF in one pass
+
+    Args:
+        vcf_path: Plain, gzip or bgzip compressed VCF
+
+    Returns:
+        VariantBatch of every record in file order
+
+    Raises:
+        ValidationError: If the file is missing or a record is malformed
+    """
+    vcf_path = Path(vcf_path)
+    header, records = open_vcf_stream(vcf_path)
+    return VariantBatch.from_records(vcf_path, header, records)
+
+
+_cache: "OrderedDict[Tuple[str, int, int], VariantBatch]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def ingest_vcf(vcf_path: Path) -> VariantBatch:
+    """
+    Decoded batch for a VCF, reusing a previous decode of the same file
+
+    The cache key includes the file's size and modification time, so a VCF
+    rewritten in place is decoded afresh.  Batches are shared between callers
+    and must be treated as read-only.
+    """
+    vcf_path = Path(vcf_path)
+    try:
+        stat = vcf_path.stat()
+    except OSError:
+        return read_vcf(vcf_path)  # raises the not-found ValidationError
+    key = (str(vcf_path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+    with _cache_lock:
+        batch = _cache.get(key)
+        if batch is not None:
+            _cache.move_to_end(key)
+            return batch
+
+    batch = read_vcf(vcf_path)
+    logger.info(f"Ingested {len(batch)} records from {vcf_path}")
+
+    with _cache_lock:
+        _cache[key] = batch
+        while len(_cache) > INGEST_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return batch
+
+
+def clear_ingest_cache() -> None:
+    """Drop all cached batches"""
+    with _cache_lock:
+        _cache.clear()
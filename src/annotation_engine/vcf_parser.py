@@ -12,6 +12,7 @@ import logging
 from datetime import datetime
 
 from .validation.error_handler import ValidationError
+from .vcf_ingest import VCFHeader, ingest_vcf
 from .vcf_utils import VCFFileHandler, detect_vcf_file_type
 
 
@@ -38,35 +39,32 @@ class VCFFieldExtractor:
             Complete metadata bundle
         """
         try:
-            with pysam.VariantFile(str(vcf_path)) as vcf:
-                # Extract header information
-                header_metadata = self._extract_header_metadata(vcf.header)
+            # Shares the decode with validation and filtering of the same file
+            batch = ingest_vcf(vcf_path)
+            header_metadata = self._extract_header_metadata(batch.header)
+            
+            # Combine with analysis context
+            metadata_bundle = {
+                # VCF header metadata
+                **header_metadata,
                 
-                # Count variants for summary
-                variant_count = sum(1 for _ in vcf.fetch())
+                # Analysis context
+                'case_uid': analysis_context.get('case_uid'),
+                'patient_uid': analysis_context.get('patient_uid'),
+                'cancer_type': analysis_context.get('cancer_type'),
+                'tissue_type': analysis_context.get('tissue_type'),
+                'oncotree_id': analysis_context.get('oncotree_id'),
+                'guidelines': analysis_context.get('guidelines', []),
+                'genome_build': analysis_context.get('genome_build'),
                 
-                # Combine with analysis context
-                metadata_bundle = {
-                    # VCF header metadata
-                    **header_metadata,
-                    
-                    # Analysis context
-                    'case_uid': analysis_context.get('case_uid'),
-                    'patient_uid': analysis_context.get('patient_uid'),
-                    'cancer_type': analysis_context.get('cancer_type'),
-                    'tissue_type': analysis_context.get('tissue_type'),
-                    'oncotree_id': analysis_context.get('oncotree_id'),
-                    'guidelines': analysis_context.get('guidelines', []),
-                    'genome_build': analysis_context.get('genome_build'),
-                    
-                    # File metadata
-                    'vcf_path': str(vcf_path),
-                    'vcf_size': vcf_path.stat().st_size,
-                    'total_variants': variant_count,
-                    'processing_timestamp': datetime.utcnow().isoformat(),
-                }
-                
-                return metadata_bundle
+                # File metadata
+                'vcf_path': str(vcf_path),
+                'vcf_size': vcf_path.stat().st_size,
+                'total_variants': len(batch),
+                'processing_timestamp': datetime.utcnow().isoformat(),
+            }
+            
+            return metadata_bundle
                 
         except Exception as e:
             raise ValidationError(
@@ -108,12 +106,8 @@ class VCFFieldExtractor:
                 except Exception as e:
                     self.logger.warning(f"Failed to create tabix index (continuing anyway): {e}")
             
-            # Extract variants using our enhanced handler
-            variant_bundles = []
-            for variant_dict in vcf_handler.iterate_variants():
-                # Convert to our expected format if needed
-                variant_bundle = self._standardize_variant_dict(variant_dict)
-                variant_bundles.append(variant_bundle)
+            # Single decode shared with validation and filtering of the same file
+            variant_bundles = ingest_vcf(vcf_path).variant_bundles()
             
             self.logger.info(f"Extracted {len(variant_bundles)} variants from {vcf_path}")
             return variant_bundles
@@ -127,70 +121,46 @@ class VCFFieldExtractor:
                 details={"vcf_path": str(vcf_path), "error": str(e)}
             )
     
-    def _extract_header_metadata(self, header) -> Dict[str, Any]:
+    def _extract_header_metadata(self, header: VCFHeader) -> Dict[str, Any]:
         """Extract metadata from VCF header"""
         
-        metadata = {
-            'vcf_version': None,
-            'genome_build': None,
-            'sample_names': [],
-            'info_definitions': {},
-            'format_definitions': {},
-            'filter_definitions': {},
-            'contig_info': {},
-        }
-        
-        # Extract basic header info
-        if hasattr(header, 'version'):
-            metadata['vcf_version'] = header.version
-        
-        # Extract sample names
-        if hasattr(header, 'samples'):
-            metadata['sample_names'] = list(header.samples)
-        
-        # Extract reference genome
-        for record in header.records:
-            record_str = str(record)
-            if 'reference=' in record_str:
-                metadata['genome_build'] = record_str.split('##reference=')[1].strip()
-                break
-        
-        # Extract INFO field definitions
-        for record in header.records:
-            if record.type == 'INFO':
-                metadata['info_definitions'][record['ID']] = {
-                    'number': record.get('Number'),
-                    'type': record.get('Type'),
-                    'description': record.get('Description', '')
+        return {
+            'vcf_version': header.fileformat,
+            'genome_build': header.reference,
+            'sample_names': list(header.sample_names),
+            'info_definitions': {
+                field_id: {
+                    'number': definition.get('Number'),
+                    'type': definition.get('Type'),
+                    'description': definition.get('Description', '')
                 }
-        
-        # Extract FORMAT field definitions
-        for record in header.records:
-            if record.type == 'FORMAT':
-                metadata['format_definitions'][record['ID']] = {
-                    'number': record.get('Number'),
-                    'type': record.get('Type'),
-                    'description': record.get('Description', '')
+                for field_id, definition in header.info.items()
+            },
+            'format_definitions': {
+                field_id: {
+                    'number': definition.get('Number'),
+                    'type': definition.get('Type'),
+                    'description': definition.get('Description', '')
                 }
-        
-        # Extract FILTER definitions
-        for record in header.records:
-            if record.type == 'FILTER':
-                metadata['filter_definitions'][record['ID']] = {
-                    'description': record.get('Description', '')
+                for field_id, definition in header.format.items()
+            },
+            # PASS is implicitly defined by the VCF spec
+            'filter_definitions': {
+                'PASS': {'description': 'All filters passed'},
+                **{
+                    filter_id: {'description': definition.get('Description', '')}
+                    for filter_id, definition in header.filters.items()
+                },
+            },
+            'contig_info': {
+                contig_id: {
+                    'length': definition.get('length'),
+                    'assembly': definition.get('assembly'),
+                    'species': definition.get('species')
                 }
-        
-        # Extract contig information
-        for record in header.records:
-            if record.type == 'contig':
-                contig_id = record['ID']
-                metadata['contig_info'][contig_id] = {
-                    'length': record.get('length'),
-                    'assembly': record.get('assembly'),
-                    'species': record.get('species')
-                }
-        
-        return metadata
+                for contig_id, definition in header.contigs.items()
+            },
+        }
     
     def _extract_variant_fields(self, record) -> Dict[str, Any]:
         """Extract standard VCF specification fields from variant record"""
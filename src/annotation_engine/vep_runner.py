@@ -10,13 +10,17 @@ Uses centralized VEP Docker Manager for consistent mount configurations.
 
 import json
 import logging
+import re
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Optional, Union, Tuple, Iterator, IO
+import gzip
 import shutil
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from tqdm import tqdm
 
 from .models import VariantAnnotation, PopulationFrequency
@@ -25,6 +29,61 @@ from .vep_docker_manager import VEPDockerManager, VEPDockerConfig, VEPDockerMode
 
 logger = logging.getLogger(__name__)
 
+# Read size for incremental decoding of (legacy) JSON-array VEP output
+JSON_STREAM_CHUNK_SIZE = 1 << 16
+
+# VEP plugins for clinical annotation (evidence-based selection)
+# NOTE: Plugin selection rationale in ./docs/VEP_PLUGINS.md 
+# Plugins marked as "Yes-Plugin" - used via VEP for efficient consequence-dependent lookup
+# AVADA marked as "Yes-Flatfile" - used via direct file access for custom evidence aggregation
+# Some plugins excluded due to file size constraints (e.g., FATHMM_MKL)
+DEFAULT_VEP_PLUGINS = (
+    # Core pathogenicity predictors (High Evidence) - FILES AVAILABLE ✓
+    "AlphaMissense,{refs_dir}/alphamissense/AlphaMissense_hg38.tsv.gz",
+    "dbNSFP,{refs_dir}/variant/vcf/dbnsfp/dbnsfp.vcf.gz,ALL",
+    "FATHMM,{refs_dir}/functional_predictions/plugin_data/pathogenicity/fathmm.v2.3.SQL.gz",
+    "PrimateAI,{refs_dir}/functional_predictions/plugin_data/protein_impact/PrimateAI_scores_v0.2_hg38.tsv.gz",
+    "REVEL,{refs_dir}/functional_predictions/plugin_data/pathogenicity/revel_with_transcript_ids",
+    "SpliceAI,{refs_dir}/spliceai/spliceai_scores.raw.snv.ensembl_mane.grch38.110.vcf.gz",
+    
+    # Moderate Evidence predictors - FILES AVAILABLE ✓  
+    "BayesDel,{refs_dir}/functional_predictions/plugin_data/pathogenicity/BayesDel_170824_noAF.tgz",
+    "Conservation,{refs_dir}/functional_predictions/plugin_data/conservation/hg38.phyloP100way.bw,phyloP100way",
+    "LoFtool,{refs_dir}/functional_predictions/plugin_data/gene_constraint/LoFtool_scores.txt",
+    "MaveDB,{refs_dir}/functional_predictions/plugin_data/mavedb/MaveDB_variants.tsv.gz",
+    "Phenotypes,{refs_dir}/functional_predictions/plugin_data/phenotype/PhenotypesOrthologous_homo_sapiens_112_GRCh38.gff3.gz",
+    "UTRAnnotator,{refs_dir}/functional_predictions/plugin_data/utr/uORF_5UTR_GRCh38_PUBLIC.txt",
+    
+    # Population frequency 
+    "gnomAD,{refs_dir}/variant/vcf/gnomad_non_cancer/gnomad_non_cancer.vcf.gz",
+    
+    # Clinical evidence
+    "ClinVar,{refs_dir}/clinical_evidence/clinvar/clinvar.vcf.gz,exact",
+    
+    # Structural variants
+    "StructuralVariantOverlap,{refs_dir}/population_frequencies/gnomad/gnomad_v2.1_sv.sites.vcf.gz",
+    
+    # Emerging Evidence predictors - FILES AVAILABLE ✓
+    "Enformer,{refs_dir}/functional_predictions/plugin_data/regulatory/enformer_grch38.vcf.gz",
+    
+    # API/Rule-based plugins (no external data files required)
+    "GeneBe",  # Automatic ACMG flags via API/rules
+    "NMD",     # NMD escape prediction via rules
+    "SpliceRegion",  # Built-in VEP plugin for splice region annotation
+    
+    # Additional evidence predictors - FILES AVAILABLE ✓
+    "EVE,{refs_dir}/functional_predictions/plugin_data/protein_impact/eve_merged.vcf",
+    "PolyPhen_SIFT,{refs_dir}/functional_predictions/plugin_data/protein_impact/homo_sapiens_pangenome_PolyPhen_SIFT_20240502.db",
+    
+    # === UNAVAILABLE PLUGINS (Files Not Found) ===
+    # These 4 plugins are unavailable and need data files to be obtained:
+    
+    # "ClinPred,{refs_dir}/functional_predictions/plugin_data/pathogenicity/ClinPred_scores.vcf.gz",  # ❌ Missing
+    # "dbscSNV,{refs_dir}/functional_predictions/plugin_data/splicing/dbscSNV1.1_hg38.txt.gz",      # ❌ Missing
+    # "VARITY,{refs_dir}/functional_predictions/plugin_data/protein_impact/VARITY_R_LOO_v1.0.tsv.gz",  # ❌ Missing (trying install.pl)
+    # "gnomADc,{refs_dir}/population_frequencies/gnomad/gnomad_coverage.vcf.gz",                   # ❌ Missing
+)
+
 
 class VEPConfiguration:
     """VEP configuration and validation"""
@@ -35,12 +94,23 @@ class VEPConfiguration:
                  plugins_dir: Optional[Path] = None,
                  assembly: str = "GRCh38",
                  use_docker: bool = True,
-                 docker_image: str = "ensemblorg/ensembl-vep:release_114.1"):
+                 docker_image: str = "ensemblorg/ensembl-vep:release_114.1",
+                 shard_workers: int = 1,
+                 shard_size: int = 5000,
+                 shard_retries: int = 2,
+                 vep_fork: Optional[int] = None):
         
         self.assembly = assembly
         self.use_docker = use_docker
         self.docker_image = docker_image
         
+        # Sharded execution: concurrent VEP processes over chromosome regions
+        self.shard_workers = max(1, shard_workers)
+        self.shard_size = shard_size
+        self.shard_retries = shard_retries
+        self.vep_fork = vep_fork
+        self._release: Optional[str] = None
+        
         # Auto-detect paths
         self.repo_root = self._find_repo_root()
         self.refs_dir = self.repo_root / ".refs"
@@ -62,6 +132,27 @@ class VEPConfiguration:
         else:
             self.vep_command = self._detect_vep_command()
     
+    @property
+    def release(self) -> str:
+        """VEP release identifier (e.g. "114.1"), used to version cached annotations"""
+        if self._release is None:
+            match = re.search(r"release_([\w.]+)", self.docker_image or "")
+            if self.vep_command == "docker" and match:
+                self._release = match.group(1)
+            else:
+                self._release = get_vep_version(self)
+        return self._release
+    
+    @property
+    def cache_version(self) -> Optional[str]:
+        """Newest installed offline cache for the assembly (<cache_dir>/homo_sapiens/<version>_<assembly>)"""
+        species_dir = self.cache_dir / "homo_sapiens"
+        if not species_dir.is_dir():
+            return None
+        suffix = f"_{self.assembly}"
+        versions = [path.name[:-len(suffix)] for path in species_dir.glob(f"*{suffix}") if path.is_dir()]
+        return max(versions, key=lambda v: [int(part) for part in re.findall(r"\d+", v)], default=None)
+    
     def _find_repo_root(self) -> Path:
         """Find repository root directory"""
         current = Path.cwd()
@@ -184,6 +275,21 @@ class VEPConfiguration:
             logger.warning("No VEP plugin data files found - VEP will run with basic annotation only")
 
 
+@dataclass
+class VCFShard:
+    """A contiguous, single-chromosome slice of an input VCF"""
+    index: int
+    chromosome: str
+    start: int
+    end: int
+    path: Path
+    variant_count: int
+    
+    @property
+    def region(self) -> str:
+        return f"{self.chromosome}:{self.start}-{self.end}"
+
+
 class VEPRunner:
     """
     VEP (Variant Effect Predictor) runner with Docker and native support
@@ -210,62 +316,13 @@ class VEPRunner:
         else:
             self.docker_manager = None
         
-        # VEP plugins for clinical annotation (evidence-based selection)
-        # NOTE: Plugin selection rationale in ./docs/VEP_PLUGINS.md 
-        # Plugins marked as "Yes-Plugin" - used via VEP for efficient consequence-dependent lookup
-        # AVADA marked as "Yes-Flatfile" - used via direct file access for custom evidence aggregation
-        # Some plugins excluded due to file size constraints (e.g., FATHMM_MKL)
-        self.default_plugins = [
-            # Core pathogenicity predictors (High Evidence) - FILES AVAILABLE ✓
-            "AlphaMissense,{refs_dir}/alphamissense/AlphaMissense_hg38.tsv.gz",
-            "dbNSFP,{refs_dir}/variant/vcf/dbnsfp/dbnsfp.vcf.gz,ALL",
-            "FATHMM,{refs_dir}/functional_predictions/plugin_data/pathogenicity/fathmm.v2.3.SQL.gz",
-            "PrimateAI,{refs_dir}/functional_predictions/plugin_data/protein_impact/PrimateAI_scores_v0.2_hg38.tsv.gz",
-            "REVEL,{refs_dir}/functional_predictions/plugin_data/pathogenicity/revel_with_transcript_ids",
-            "SpliceAI,{refs_dir}/spliceai/spliceai_scores.raw.snv.ensembl_mane.grch38.110.vcf.gz",
-            
-            # Moderate Evidence predictors - FILES AVAILABLE ✓  
-            "BayesDel,{refs_dir}/functional_predictions/plugin_data/pathogenicity/BayesDel_170824_noAF.tgz",
-            "Conservation,{refs_dir}/functional_predictions/plugin_data/conservation/hg38.phyloP100way.bw,phyloP100way",
-            "LoFtool,{refs_dir}/functional_predictions/plugin_data/gene_constraint/LoFtool_scores.txt",
-            "MaveDB,{refs_dir}/functional_predictions/plugin_data/mavedb/MaveDB_variants.tsv.gz",
-            "Phenotypes,{refs_dir}/functional_predictions/plugin_data/phenotype/PhenotypesOrthologous_homo_sapiens_112_GRCh38.gff3.gz",
-            "UTRAnnotator,{refs_dir}/functional_predictions/plugin_data/utr/uORF_5UTR_GRCh38_PUBLIC.txt",
-            
-            # Population frequency 
-            "gnomAD,{refs_dir}/variant/vcf/gnomad_non_cancer/gnomad_non_cancer.vcf.gz",
-            
-            # Clinical evidence
-            "ClinVar,{refs_dir}/clinical_evidence/clinvar/clinvar.vcf.gz,exact",
-            
-            # Structural variants
-            "StructuralVariantOverlap,{refs_dir}/population_frequencies/gnomad/gnomad_v2.1_sv.sites.vcf.gz",
-            
-            # Emerging Evidence predictors - FILES AVAILABLE ✓
-            "Enformer,{refs_dir}/functional_predictions/plugin_data/regulatory/enformer_grch38.vcf.gz",
-            
-            # API/Rule-based plugins (no external data files required)
-            "GeneBe",  # Automatic ACMG flags via API/rules
-            "NMD",     # NMD escape prediction via rules
-            "SpliceRegion",  # Built-in VEP plugin for splice region annotation
-            
-            # Additional evidence predictors - FILES AVAILABLE ✓
-            "EVE,{refs_dir}/functional_predictions/plugin_data/protein_impact/eve_merged.vcf",
-            "PolyPhen_SIFT,{refs_dir}/functional_predictions/plugin_data/protein_impact/homo_sapiens_pangenome_PolyPhen_SIFT_20240502.db",
-            
-            # === UNAVAILABLE PLUGINS (Files Not Found) ===
-            # These 4 plugins are unavailable and need data files to be obtained:
-            
-            # "ClinPred,{refs_dir}/functional_predictions/plugin_data/pathogenicity/ClinPred_scores.vcf.gz",  # ❌ Missing
-            # "dbscSNV,{refs_dir}/functional_predictions/plugin_data/splicing/dbscSNV1.1_hg38.txt.gz",      # ❌ Missing
-            # "VARITY,{refs_dir}/functional_predictions/plugin_data/protein_impact/VARITY_R_LOO_v1.0.tsv.gz",  # ❌ Missing (trying install.pl)
-            # "gnomADc,{refs_dir}/population_frequencies/gnomad/gnomad_coverage.vcf.gz",                   # ❌ Missing
-        ]
+        self.default_plugins = list(DEFAULT_VEP_PLUGINS)
     
     def annotate_vcf(self, 
                     input_vcf: Path,
                     output_format: str = "json",
-                    plugins: Optional[List[str]] = None) -> Union[Path, List[VariantAnnotation]]:
+                    plugins: Optional[List[str]] = None,
+                    shard_workers: Optional[int] = None) -> Union[Path, List[VariantAnnotation]]:
         """
         Annotate VCF file with VEP
         
@@ -273,6 +330,8 @@ class VEPRunner:
             input_vcf: Path to input VCF file
             output_format: Output format ("json", "vcf", or "annotations")
             plugins: List of VEP plugins to use
+            shard_workers: Concurrent VEP processes (default: config.shard_workers);
+                values > 1 split the input by chromosome region
             
         Returns:
             Output file path (for json/vcf) or VariantAnnotation objects (for annotations)
@@ -286,16 +345,14 @@ class VEPRunner:
                 message=f"Input VCF file not found: {input_vcf}"
             )
         
+        workers = shard_workers or self.config.shard_workers
+        if workers > 1:
+            return self._annotate_vcf_sharded(input_vcf, output_format, plugins or self.default_plugins, workers)
+        
         # Prepare output
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
-            
-            if output_format == "json":
-                output_file = temp_path / f"{input_vcf.stem}_vep.json"
-            elif output_format == "vcf":
-                output_file = temp_path / f"{input_vcf.stem}_vep.vcf"
-            else:
-                output_file = temp_path / f"{input_vcf.stem}_vep.json"
+            output_file = self._output_path(temp_path, input_vcf.stem, output_format)
             
             # Build VEP command
             vep_cmd = self._build_vep_command(
@@ -305,21 +362,209 @@ class VEPRunner:
                 plugins=plugins or self.default_plugins
             )
             
-            # Execute VEP with progress indication
-            logger.info(f"Executing VEP: {' '.join(vep_cmd[:3])}...")  # Log abbreviated command
+            self._execute_vep(vep_cmd, show_progress=True)
             
-            try:
-                # Start VEP process
+            return self._finalize_output(input_vcf, output_file, output_format)
+    
+    def iter_annotations(self,
+                         input_vcf: Path,
+                         plugins: Optional[List[str]] = None,
+                         shard_workers: Optional[int] = None) -> Iterator[VariantAnnotation]:
+        """
+        Annotate VCF file with VEP, yielding VariantAnnotation objects one at a time
+        
+        Unsharded runs follow VEP's output while it is still running
+        (annotate_vcf_stream); sharded runs decode the merged shard output
+        record by record. Either way the JSON is never held in memory whole.
+        
+        Args:
+            input_vcf: Path to input VCF file
+            plugins: List of VEP plugins to use
+            shard_workers: Concurrent VEP processes (default: config.shard_workers)
+            
+        Yields:
+            VariantAnnotation objects in genomic (input) order
+        """
+        workers = shard_workers or self.config.shard_workers
+        if workers <= 1:
+            yield from self.annotate_vcf_stream(input_vcf, plugins)
+            return
+        
+        if not input_vcf.exists():
+            raise ValidationError(
+                error_type="file_not_found",
+                message=f"Input VCF file not found: {input_vcf}"
+            )
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            merged_output = self._run_sharded(input_vcf, Path(temp_dir), "json",
+                                              plugins or self.default_plugins, workers)
+            yield from self.iter_vep_json_annotations(merged_output)
+    
+    def annotate_vcf_stream(self,
+                            input_vcf: Path,
+                            plugins: Optional[List[str]] = None,
+                            poll_interval: float = 0.5) -> Iterator[VariantAnnotation]:
+        """
+        Annotate VCF file with VEP, yielding annotations while VEP is still running
+        
+        VEP's --json mode writes one JSON object per line, so the output file is
+        followed as it grows and each completed line is parsed immediately.
+        Memory is bounded by the consumer's window rather than the whole run.
+        
+        Args:
+            input_vcf: Path to input VCF file
+            plugins: List of VEP plugins to use
+            poll_interval: Seconds to wait for more output while VEP is running
+            
+        Yields:
+            VariantAnnotation objects in VEP output order
+        """
+        
+        logger.info(f"Starting streaming VEP annotation: {input_vcf}")
+        
+        if not input_vcf.exists():
+            raise ValidationError(
+                error_type="file_not_found",
+                message=f"Input VCF file not found: {input_vcf}"
+            )
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            output_file = self._output_path(temp_path, input_vcf.stem, "json")
+            vep_cmd = self._build_vep_command(
+                input_vcf=input_vcf,
+                output_file=output_file,
+                output_format="json",
+                plugins=plugins or self.default_plugins
+            )
+            
+            logger.info(f"Executing VEP: {' '.join(vep_cmd[:3])}...")
+            
+            # stderr goes to a file so an unread pipe can never stall VEP
+            with open(temp_path / "vep_stderr.log", "w+") as stderr_file:
                 process = subprocess.Popen(
                     vep_cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
+                    stderr=stderr_file,
                     text=True
                 )
                 
+                try:
+                    yield from self._follow_vep_json(output_file, process, poll_interval)
+                finally:
+                    if process.poll() is None:
+                        # Consumer stopped early; don't leave VEP running
+                        process.kill()
+                        process.wait()
+                
+                if process.returncode != 0:
+                    stderr_file.seek(0)
+                    raise ValidationError(
+                        error_type="vep_execution_error",
+                        message=f"VEP annotation failed with exit code {process.returncode}",
+                        details={
+                            "return_code": process.returncode,
+                            "stderr": stderr_file.read(),
+                            "command": " ".join(vep_cmd[:5])  # First few args only
+                        }
+                    )
+    
+    def _follow_vep_json(self, output_file: Path, process: subprocess.Popen,
+                         poll_interval: float) -> Iterator[VariantAnnotation]:
+        """Yield annotations from a line-delimited VEP JSON file that is still being written"""
+        count = 0
+        pending = ""
+        handle: Optional[IO[str]] = None
+        
+        try:
+            while True:
+                finished = process.poll() is not None
+                
+                if handle is None and output_file.exists():
+                    handle = open(output_file, "r")
+                
+                if handle is not None:
+                    for chunk in iter(handle.readline, ""):
+                        pending += chunk
+                        if not pending.endswith("\n"):
+                            break  # Partial line; wait for VEP to finish writing it
+                        annotation = self._annotation_from_json_line(pending, output_file)
+                        pending = ""
+                        if annotation:
+                            count += 1
+                            yield annotation
+                
+                if finished:
+                    break
+                time.sleep(poll_interval)
+            
+            if pending.strip():
+                annotation = self._annotation_from_json_line(pending, output_file)
+                if annotation:
+                    count += 1
+                    yield annotation
+        finally:
+            if handle is not None:
+                handle.close()
+        
+        logger.info(f"Streamed {count} variant annotations from VEP output")
+    
+    def _annotation_from_json_line(self, line: str, source: Path) -> Optional[VariantAnnotation]:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return self._create_variant_annotation_from_vep(json.loads(line))
+        except json.JSONDecodeError as e:
+            raise ValidationError(
+                error_type="vep_parsing_error",
+                message=f"Failed to parse VEP JSON output: {e}",
+                details={"file": str(source), "error": str(e)}
+            )
+    
+    def _output_path(self, directory: Path, stem: str, output_format: str) -> Path:
+        if output_format == "vcf":
+            return directory / f"{stem}_vep.vcf"
+        return directory / f"{stem}_vep.json"
+    
+    def _finalize_output(self, input_vcf: Path, output_file: Path,
+                         output_format: str) -> Union[Path, List[VariantAnnotation]]:
+        """Parse annotations or copy the VEP output next to the input VCF"""
+        if output_format == "annotations":
+            return self._parse_vep_json_to_annotations(output_file)
+        else:
+            # Copy output to permanent location
+            permanent_output = input_vcf.parent / output_file.name
+            shutil.copy2(output_file, permanent_output)
+            return permanent_output
+    
+    def _execute_vep(self, vep_cmd: List[str], show_progress: bool = True) -> float:
+        """
+        Run one VEP process to completion
+        
+        Returns:
+            Elapsed seconds
+            
+        Raises:
+            ValidationError: If VEP exits non-zero or times out
+        """
+        # Execute VEP with progress indication
+        logger.info(f"Executing VEP: {' '.join(vep_cmd[:3])}...")  # Log abbreviated command
+        
+        try:
+            # Start VEP process
+            process = subprocess.Popen(
+                vep_cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            
+            start_time = time.time()
+            if show_progress:
                 # Show progress during execution
                 with tqdm(desc="VEP annotation", unit="sec", dynamic_ncols=True) as pbar:
-                    start_time = time.time()
                     while process.poll() is None:
                         elapsed = time.time() - start_time
                         pbar.set_postfix(elapsed=f"{elapsed:.1f}s")
@@ -330,51 +575,181 @@ class VEPRunner:
                     stdout, stderr = process.communicate()
                     elapsed = time.time() - start_time
                     pbar.set_postfix(elapsed=f"{elapsed:.1f}s", status="complete")
-                
-                # Check if process succeeded
-                if process.returncode != 0:
-                    raise subprocess.CalledProcessError(
-                        process.returncode, vep_cmd, stdout, stderr
-                    )
-                
-                # Create result object for compatibility
-                class VEPResult:
-                    def __init__(self, returncode, stdout, stderr):
-                        self.returncode = returncode
-                        self.stdout = stdout
-                        self.stderr = stderr
-                
-                result = VEPResult(process.returncode, stdout, stderr)
-                logger.info(f"VEP annotation completed successfully in {elapsed:.1f} seconds")
-                
-                if result.stderr:
-                    logger.debug(f"VEP stderr: {result.stderr}")
-                
-            except subprocess.CalledProcessError as e:
-                raise ValidationError(
-                    error_type="vep_execution_error",
-                    message=f"VEP annotation failed: {e}",
-                    details={
-                        "return_code": e.returncode,
-                        "stdout": e.stdout,
-                        "stderr": e.stderr,
-                        "command": " ".join(vep_cmd[:5])  # First few args only
-                    }
-                )
-            except subprocess.TimeoutExpired:
-                raise ValidationError(
-                    error_type="vep_timeout",
-                    message="VEP annotation timed out after 1 hour"
+            else:
+                # Shard workers block on the pipe instead of polling
+                stdout, stderr = process.communicate()
+                elapsed = time.time() - start_time
+            
+            # Check if process succeeded
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    process.returncode, vep_cmd, stdout, stderr
                 )
             
-            # Process output
-            if output_format == "annotations":
-                return self._parse_vep_json_to_annotations(output_file)
-            else:
-                # Copy output to permanent location
-                permanent_output = input_vcf.parent / output_file.name
-                shutil.copy2(output_file, permanent_output)
-                return permanent_output
+            logger.info(f"VEP annotation completed successfully in {elapsed:.1f} seconds")
+            
+            if stderr:
+                logger.debug(f"VEP stderr: {stderr}")
+            
+            return elapsed
+            
+        except subprocess.CalledProcessError as e:
+            raise ValidationError(
+                error_type="vep_execution_error",
+                message=f"VEP annotation failed: {e}",
+                details={
+                    "return_code": e.returncode,
+                    "stdout": e.stdout,
+                    "stderr": e.stderr,
+                    "command": " ".join(vep_cmd[:5])  # First few args only
+                }
+            )
+        except subprocess.TimeoutExpired:
+            raise ValidationError(
+                error_type="vep_timeout",
+                message="VEP annotation timed out after 1 hour"
+            )
+    
+    def _split_vcf(self, input_vcf: Path, shard_dir: Path, shard_size: int) -> List[VCFShard]:
+        """
+        Split a VCF into single-chromosome shards of at most shard_size records
+        
+        Shards keep input order, so for a coordinate-sorted VCF concatenating
+        their outputs by index restores genomic order.
+        """
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        opener = gzip.open if input_vcf.suffix == ".gz" else open
+        
+        header: List[str] = []
+        shards: List[VCFShard] = []
+        handle = None
+        current: Optional[VCFShard] = None
+        
+        def close_current():
+            if handle is not None:
+                handle.close()
+            if current is not None:
+                shards.append(current)
+        
+        with opener(input_vcf, "rt") as f:
+            for line in f:
+                if line.startswith("#"):
+                    header.append(line)
+                    continue
+                
+                chrom, pos = line.split("\t", 2)[:2]
+                pos = int(pos)
+                if current is None or chrom != current.chromosome or current.variant_count >= shard_size:
+                    close_current()
+                    index = len(shards)
+                    current = VCFShard(index=index, chromosome=chrom, start=pos, end=pos,
+                                       path=shard_dir / f"shard_{index:05d}.vcf", variant_count=0)
+                    handle = open(current.path, "w")
+                    handle.writelines(header)
+                
+                handle.write(line)
+                current.variant_count += 1
+                current.end = max(current.end, pos)
+        
+        close_current()
+        return shards
+    
+    def _run_shard(self, shard: VCFShard, output_dir: Path,
+                   output_format: str, plugins: List[str]) -> Path:
+        """Annotate one shard, retrying up to config.shard_retries times"""
+        output_file = self._output_path(output_dir, shard.path.stem, output_format)
+        vep_cmd = self._build_vep_command(
+            input_vcf=shard.path,
+            output_file=output_file,
+            output_format=output_format,
+            plugins=plugins
+        )
+        
+        attempts = self.config.shard_retries + 1
+        last_error: Optional[ValidationError] = None
+        for attempt in range(1, attempts + 1):
+            try:
+                self._execute_vep(vep_cmd, show_progress=False)
+                return output_file
+            except ValidationError as e:
+                last_error = e
+                logger.warning(f"VEP shard {shard.region} failed (attempt {attempt}/{attempts}): {e.message}")
+        
+        raise ValidationError(
+            error_type="vep_shard_failed",
+            message=f"VEP annotation failed for shard {shard.region} after {attempts} attempts",
+            details={
+                "shard": shard.region,
+                "variant_count": shard.variant_count,
+                "last_error": last_error.details if last_error else None
+            }
+        )
+    
+    def _annotate_vcf_sharded(self, input_vcf: Path, output_format: str,
+                              plugins: List[str], workers: int) -> Union[Path, List[VariantAnnotation]]:
+        """Run VEP concurrently over chromosome-region shards and merge in genomic order"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            merged_output = self._run_sharded(input_vcf, Path(temp_dir), output_format, plugins, workers)
+            return self._finalize_output(input_vcf, merged_output, output_format)
+    
+    def _run_sharded(self, input_vcf: Path, temp_path: Path, output_format: str,
+                     plugins: List[str], workers: int) -> Path:
+        """Annotate shards concurrently and return their merged output under temp_path"""
+        shards = self._split_vcf(input_vcf, temp_path / "shards", self.config.shard_size)
+        output_dir = temp_path / "output"
+        output_dir.mkdir()
+        
+        logger.info(f"Annotating {len(shards)} VEP shards with {workers} workers")
+        
+        shard_outputs: Dict[int, Path] = {}
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=workers) as executor, \
+                tqdm(total=len(shards), desc="VEP shards", unit="shard", dynamic_ncols=True) as pbar:
+            futures = {
+                executor.submit(self._run_shard, shard, output_dir, output_format, plugins): shard
+                for shard in shards
+            }
+            try:
+                for future in as_completed(futures):
+                    shard_outputs[futures[future].index] = future.result()
+                    pbar.update(1)
+            except ValidationError:
+                for pending in futures:
+                    pending.cancel()
+                raise
+        
+        logger.info(f"VEP shards completed in {time.time() - start_time:.1f} seconds")
+        
+        merged_output = self._output_path(temp_path, input_vcf.stem, output_format)
+        ordered_outputs = [shard_outputs[shard.index] for shard in shards]
+        if output_format == "vcf":
+            self._merge_vcf_outputs(ordered_outputs, merged_output)
+        else:
+            self._merge_json_outputs(ordered_outputs, merged_output)
+        return merged_output
+    
+    def _merge_json_outputs(self, shard_outputs: List[Path], merged_output: Path) -> None:
+        """Concatenate per-shard VEP JSON records in shard order as line-delimited JSON"""
+        with open(merged_output, "w") as out:
+            for shard_output in shard_outputs:
+                if not shard_output.exists():
+                    continue
+                with open(shard_output) as f:
+                    for record in iter_vep_json_records(f):
+                        out.write(json.dumps(record))
+                        out.write("\n")
+    
+    def _merge_vcf_outputs(self, shard_outputs: List[Path], merged_output: Path) -> None:
+        """Concatenate per-shard VEP VCFs, keeping the first shard's header"""
+        with open(merged_output, "w") as out:
+            for i, shard_output in enumerate(shard_outputs):
+                if not shard_output.exists():
+                    continue
+                with open(shard_output) as f:
+                    for line in f:
+                        if line.startswith("#") and i > 0:
+                            continue
+                        out.write(line)
     
     def _build_vep_command(self, 
                           input_vcf: Path,
@@ -477,6 +852,10 @@ class VEPRunner:
             "--variant_class", # Include variant class
         ]
         
+        # Per-process VEP forking (combine with shard_workers for large inputs)
+        if self.config.vep_fork:
+            args.extend(["--fork", str(self.config.vep_fork)])
+        
         # Set output format
         if output_format == "json":
             args.extend(["--json", "--most_severe"])
@@ -562,6 +941,24 @@ class VEPRunner:
     def _parse_vep_json_to_annotations(self, vep_json_file: Path) -> List[VariantAnnotation]:
         """Parse VEP JSON output to VariantAnnotation objects"""
         
+        variant_annotations = list(self.iter_vep_json_annotations(vep_json_file))
+        logger.info(f"Parsed {len(variant_annotations)} variant annotations from VEP output")
+        return variant_annotations
+    
+    def iter_vep_json_annotations(self, vep_json_file: Path) -> Iterator[VariantAnnotation]:
+        """
+        Lazily parse a completed VEP JSON output file
+        
+        Accepts VEP's native line-delimited JSON as well as a single JSON array,
+        decoding one record at a time in both cases.
+        
+        Args:
+            vep_json_file: VEP output file
+            
+        Yields:
+            VariantAnnotation objects in file order
+        """
+        
         logger.info(f"Parsing VEP JSON output: {vep_json_file}")
         
         if not vep_json_file.exists():
@@ -570,21 +967,14 @@ class VEPRunner:
                 message=f"VEP output file not found: {vep_json_file}"
             )
         
-        variant_annotations = []
-        
         try:
             with open(vep_json_file, 'r') as f:
-                vep_data = json.load(f)
-            
-            for variant_data in vep_data:
-                annotation = self._create_variant_annotation_from_vep(variant_data)
-                if annotation:
-                    variant_annotations.append(annotation)
+                for variant_data in iter_vep_json_records(f):
+                    annotation = self._create_variant_annotation_from_vep(variant_data)
+                    if annotation:
+                        yield annotation
             
-            logger.info(f"Parsed {len(variant_annotations)} variant annotations from VEP output")
-            return variant_annotations
-            
-        except Exception as e:
+        except ValueError as e:
             raise ValidationError(
                 error_type="vep_parsing_error",
                 message=f"Failed to parse VEP JSON output: {e}",
@@ -933,6 +1323,54 @@ class VEPRunner:
         return {"qc_data": qc}
 
 
+def iter_vep_json_records(handle: IO[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Decode VEP JSON records one at a time
+    
+    VEP --json output is line-delimited (one object per line); a single
+    top-level JSON array is also accepted and decoded incrementally.
+    """
+    decoder = json.JSONDecoder()
+    buffer = handle.read(JSON_STREAM_CHUNK_SIZE).lstrip()
+    
+    if not buffer.startswith("["):
+        # Line-delimited JSON
+        for line in _iter_lines(buffer, handle):
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+        return
+    
+    buffer = buffer[1:]
+    eof = False
+    while True:
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            record, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more = handle.read(JSON_STREAM_CHUNK_SIZE)
+            eof = not more
+            buffer += more
+            continue
+        yield record
+        buffer = buffer[end:]
+
+
+def _iter_lines(head: str, handle: IO[str]) -> Iterator[str]:
+    """Lines of a file whose first chunk has already been read into head"""
+    newline = head.rfind("\n")
+    if newline < 0:
+        yield head + handle.readline()
+    else:
+        yield from head[:newline].split("\n")
+        yield head[newline + 1:] + handle.readline()
+    yield from handle
+
+
 def annotate_vcf_with_vep(input_vcf: Path,
                          output_format: str = "annotations",
                          config: Optional[VEPConfiguration] = None) -> Union[Path, List[VariantAnnotation]]:
@@ -3,6 +3,10 @@ Workflow Executor Implementation (Person C)
 
 Executes workflows from Person B with caching, parallelization, and performance monitoring.
 Implements high-performance execution with intelligent caching and resource optimization.
+
+Processing steps declare their inputs/outputs (StepSpec), so a route is run
+as a DAG: once tiering finishes, the exports, VRS normalization and canned
+text run concurrently, subject to per-step worker slots.
 """
 
 import logging
@@ -10,9 +14,13 @@ import time
 import uuid
 import threading
 import hashlib
-from typing import Dict, List, Optional, Any, Callable
-from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import pickle
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from datetime import datetime
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+)
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -33,108 +41,26 @@ from .interfaces.execution_interfaces import (
     CacheStatus,
     CacheInterface,
     ProgressCallback,
-    ParallelExecutorInterface
+    ParallelExecutorInterface,
+    StepExecutorKind,
+    StepSpec
 )
 from .interfaces.workflow_interfaces import WorkflowContext
+from .step_cache import create_step_cache, file_digest
 
 logger = logging.getLogger(__name__)
 
-
-class MemoryCache(CacheInterface):
-    """In-memory cache with TTL support"""
-    
-    def __init__(self, max_size_mb: float = 512):
-        self.max_size_mb = max_size_mb
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.access_times: Dict[str, datetime] = {}
-        self.lock = threading.RLock()
-        self.hits = 0
-        self.misses = 0
-    
-    def get(self, key: str) -> Optional[Any]:
-        with self.lock:
-            if key not in self.cache:
-                self.misses += 1
-                return None
-            
-            entry = self.cache[key]
-            
-            # Check TTL
-            if entry.get('expires_at'):
-                if datetime.utcnow() > entry['expires_at']:
-                    del self.cache[key]
-                    if key in self.access_times:
-                        del self.access_times[key]
-                    self.misses += 1
-                    return None
-            
-            # Update access time
-            self.access_times[key] = datetime.utcnow()
-            self.hits += 1
-            return entry['value']
-    
-    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
-        with self.lock:
-            expires_at = None
-            if ttl_seconds:
-                expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
-            
-            self.cache[key] = {
-                'value': value,
-                'expires_at': expires_at,
-                'created_at': datetime.utcnow()
-            }
-            self.access_times[key] = datetime.utcnow()
-            
-            # Simple size management - remove oldest if too many entries
-            if len(self.cache) > 1000:  # Arbitrary limit
-                self._evict_oldest()
-    
-    def invalidate(self, key: str):
-        with self.lock:
-            if key in self.cache:
-                del self.cache[key]
-            if key in self.access_times:
-                del self.access_times[key]
-    
-    def clear(self, pattern: Optional[str] = None):
-        with self.lock:
-            if pattern:
-                keys_to_remove = [k for k in self.cache.keys() if pattern in k]
-                for key in keys_to_remove:
-                    del self.cache[key]
-                    if key in self.access_times:
-                        del self.access_times[key]
-            else:
-                self.cache.clear()
-                self.access_times.clear()
-    
-    def get_stats(self) -> Dict[str, Any]:
-        with self.lock:
-            total_requests = self.hits + self.misses
-            hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
-            
-            return {
-                'hits': self.hits,
-                'misses': self.misses,
-                'hit_rate_percent': hit_rate,
-                'entries': len(self.cache),
-                'estimated_size_mb': len(self.cache) * 0.1  # Rough estimate
-            }
-    
-    def _evict_oldest(self):
-        """Remove oldest accessed entries"""
-        if not self.access_times:
-            return
-            
-        # Remove 10% of entries (oldest first)
-        sorted_keys = sorted(self.access_times.keys(), key=lambda k: self.access_times[k])
-        keys_to_remove = sorted_keys[:len(sorted_keys) // 10]
-        
-        for key in keys_to_remove:
-            if key in self.cache:
-                del self.cache[key]
-            del self.access_times[key]
+# Data flow of the built-in steps; inputs are the results each step reads
+DEFAULT_STEP_SPECS: Dict[str, StepSpec] = {spec.name: spec for spec in [
+    StepSpec("vep", exclusive=True),
+    StepSpec("somatic_calling", inputs=("vep",), exclusive=True),
+    StepSpec("evidence_aggregation", inputs=("vep", "somatic_calling")),
+    StepSpec("tiering", inputs=("evidence_aggregation",), exclusive=True),
+    StepSpec("canned_text_generation", inputs=("tiering", "vep", "evidence_aggregation")),
+    StepSpec("phenopacket_export", inputs=("tiering", "vep")),
+    StepSpec("va_export", inputs=("tiering", "vep", "evidence_aggregation")),
+    StepSpec("vrs_normalization", inputs=("vep",)),
+]}
 
 
 class SimpleProgressCallback:
@@ -181,20 +107,36 @@ class WorkflowExecutor(WorkflowExecutorProtocol, ParallelExecutorInterface):
                  cache: Optional[CacheInterface] = None,
                  max_parallel_workers: int = 4,
                  enable_caching: bool = True,
-                 cache_ttl_seconds: int = 3600):
+                 cache_ttl_seconds: int = 3600,
+                 step_specs: Optional[Dict[str, StepSpec]] = None,
+                 cache_dir: Optional[Path] = None,
+                 tool_versions: Optional[Dict[str, str]] = None,
+                 kb_fingerprint: Optional[str] = None,
+                 vep_config: Optional[Dict[str, Any]] = None):
         """
         Initialize workflow executor
         
         Args:
-            cache: Cache implementation (defaults to MemoryCache)
-            max_parallel_workers: Maximum parallel threads
+            cache: Cache implementation (defaults to create_step_cache(cache_dir))
+            max_parallel_workers: Worker slots shared by concurrently running steps
             enable_caching: Whether to enable caching
             cache_ttl_seconds: Default cache TTL
+            step_specs: Overrides/additions to DEFAULT_STEP_SPECS
+            cache_dir: Directory for the on-disk cache tier shared across processes
+            tool_versions: Tool versions folded into cache keys (defaults to
+                the engine version and the configured VEP release)
+            kb_fingerprint: KB content fingerprint folded into cache keys
+                (defaults to get_kb_fingerprint() of the KB source files)
+            vep_config: VEP settings folded into the vep step's cache key
+                (defaults to the configured assembly, plugins and cache version)
         """
-        self.cache = cache or MemoryCache()
+        self.cache = cache or create_step_cache(cache_dir)
         self.max_parallel_workers = max_parallel_workers
         self.enable_caching = enable_caching
         self.cache_ttl_seconds = cache_ttl_seconds
+        self._tool_versions = tool_versions
+        self._kb_fingerprint = kb_fingerprint
+        self._vep_config = vep_config
         
         # Performance monitoring
         if PSUTIL_AVAILABLE:
@@ -205,11 +147,14 @@ class WorkflowExecutor(WorkflowExecutorProtocol, ParallelExecutorInterface):
         # Step executors - mapping of step names to execution functions
         self.step_executors = self._initialize_step_executors()
         
-        # Parallel execution capabilities
-        self.parallelizable_steps = {
-            "evidence_aggregation", "canned_text_generation", 
-            "phenopacket_export", "va_export", "vrs_normalization"
-        }
+        # Step data flow and resource hints; non-exclusive steps may overlap
+        self.step_specs = {**DEFAULT_STEP_SPECS, **(step_specs or {})}
+        self.parallelizable_steps = {name for name, spec in self.step_specs.items() if not spec.exclusive}
+        
+        # Process pool for StepExecutorKind.PROCESS steps (created on first use)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
+        self._cancel_events: Dict[str, threading.Event] = {}
         
         logger.info(f"WorkflowExecutor initialized with {max_parallel_workers} workers, caching={'enabled' if enable_caching else 'disabled'}")
     
@@ -244,43 +189,26 @@ class WorkflowExecutor(WorkflowExecutorProtocol, ParallelExecutorInterface):
         initial_memory_mb = self._get_memory_usage_mb()
         peak_memory_mb = initial_memory_mb
         
+        cancel_event = self._cancel_events.setdefault(execution_id, threading.Event())
+        
         try:
-            # Execute processing steps
-            processing_steps = workflow_context.route.processing_steps
-            results = {}
-            
-            for i, step_name in enumerate(processing_steps):
-                # Progress callback
-                progress_callback.on_step_start(step_name, i, len(processing_steps))
-                
-                # Execute step
-                step_result = self.execute_step(step_name, workflow_context, results)
-                
-                # Track performance
-                metrics.add_step_result(step_result)
-                current_memory_mb = self._get_memory_usage_mb()
-                peak_memory_mb = max(peak_memory_mb, current_memory_mb)
-                
-                # Progress callback
-                progress_callback.on_step_complete(step_name, step_result)
-                
-                # Check for failure
-                if not step_result.success:
-                    error_msg = f"Step {step_name} failed: {step_result.error_message}"
-                    logger.error(error_msg)
-                    
-                    return ExecutionResult(
-                        execution_id=execution_id,
-                        status=ExecutionStatus.FAILED,
-                        start_time=start_time,
-                        end_time=datetime.utcnow().isoformat(),
-                        error_message=error_msg,
-                        performance_metrics=metrics
-                    )
-                
-                # Store step output for next steps
-                if step_result.output_data:
-                    results[step_name] = step_result.output_data
+            # Execute processing steps as a DAG
+            step_graph = self.build_step_graph(workflow_context.route.processing_steps)
+            results, failed_status, error_msg, peak_memory_mb = self._run_step_graph(
+                step_graph, workflow_context, progress_callback, metrics, cancel_event, peak_memory_mb
+            )
+            metrics.critical_path, metrics.critical_path_seconds = self._critical_path(step_graph, metrics)
+            
+            if failed_status is not None:
+                logger.error(error_msg)
+                return ExecutionResult(
+                    execution_id=execution_id,
+                    status=failed_status,
+                    start_time=start_time,
+                    end_time=datetime.utcnow().isoformat(),
+                    error_message=error_msg,
+                    performance_metrics=metrics
+                )
             
             # Calculate final metrics
             end_time = datetime.utcnow().isoformat()
@@ -325,12 +253,66 @@ class WorkflowExecutor(WorkflowExecutorProtocol, ParallelExecutorInterface):
                 error_message=error_msg,
                 performance_metrics=metrics
             )
+        finally:
+            self._cancel_events.pop(execution_id, None)
+    
+    def cancel(self, execution_id: str) -> bool:
+        """
+        Cancel a running execution
+        
+        Steps not yet started are skipped and running steps are allowed to
+        finish; execute() then returns with status CANCELLED.
+        
+        Returns:
+            True if the execution was running
+        """
+        cancel_event = self._cancel_events.get(execution_id)
+        if cancel_event is None:
+            return False
+        cancel_event.set()
+        return True
+    
+    def build_step_graph(self, processing_steps: List[str]) -> Dict[str, List[str]]:
+        """
+        Dependencies of each step in a route, in route order
+        
+        A step depends on the earlier route steps producing its declared
+        inputs; inputs not produced by the route (e.g. somatic_calling in
+        tumor-only runs) are ignored.  Steps without a StepSpec keep the
+        sequential semantics and depend on every step before them.
+        """
+        producers: Dict[str, str] = {}
+        graph: Dict[str, List[str]] = {}
+        for i, step_name in enumerate(processing_steps):
+            spec = self.step_specs.get(step_name)
+            if spec is None:
+                graph[step_name] = list(processing_steps[:i])
+                producers[step_name] = step_name
+                continue
+            graph[step_name] = list(dict.fromkeys(producers[key] for key in spec.inputs if key in producers))
+            for key in spec.produces:
+                producers[key] = step_name
+        return graph
+    
+    def shutdown(self):
+        """Release the process pool used by process-bound steps"""
+        with self._process_pool_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
     
     def execute_step(self, 
                     step_name: str, 
                     workflow_context: WorkflowContext,
-                    previous_results: Dict[str, Any]) -> StepResult:
-        """Execute a single processing step"""
+                    previous_results: Dict[str, Any],
+                    cache_key: Optional[str] = None) -> StepResult:
+        """
+        Execute a single processing step
+        
+        cache_key is the step's content-addressed key when the caller has
+        already derived it (execute() chains keys through the DAG); otherwise
+        it is computed from the inputs and the content of previous_results.
+        """
         
         step_result = StepResult(
             step_name=step_name,
@@ -342,9 +324,11 @@ class WorkflowExecutor(WorkflowExecutorProtocol, ParallelExecutorInterface):
             logger.debug(f"Executing step: {step_name}")
             
             # Check cache first
-            cache_key = None
             if self.enable_caching:
-                cache_key = self._generate_cache_key(step_name, workflow_context, previous_results)
+                if cache_key is None:
+                    cache_key = self._generate_cache_key(
+                        step_name, workflow_context, {"previous_results": _content_digest(previous_results)}
+                    )
                 cached_result = self.cache.get(cache_key)
                 
                 if cached_result is not None:
@@ -356,7 +340,12 @@ class WorkflowExecutor(WorkflowExecutorProtocol, ParallelExecutorInterface):
                     step_result.cache_status = CacheStatus.MISS
             
             # Execute step
-            if step_name in self.step_executors:
+            spec = self.step_specs.get(step_name)
+            if spec is not None and spec.executor == StepExecutorKind.PROCESS and step_name in DEFAULT_STEP_SPECS:
+                output_data = self._get_process_pool().submit(
+                    _execute_builtin_step, step_name, workflow_context, previous_results
+                ).result()
+            elif step_name in self.step_executors:
                 output_data = self.step_executors[step_name](workflow_context, previous_results)
             else:
                 # Fallback for unknown steps
@@ -431,6 +420,119 @@ class WorkflowExecutor(WorkflowExecutorProtocol, ParallelExecutorInterface):
     
     # Private helper methods
     
+    def _run_step_graph(self,
+                        step_graph: Dict[str, List[str]],
+                        workflow_context: WorkflowContext,
+                        progress_callback: ProgressCallback,
+                        metrics: PerformanceMetrics,
+                        cancel_event: threading.Event,
+                        peak_memory_mb: float) -> Tuple[Dict[str, Any], Optional[ExecutionStatus], Optional[str], float]:
+        """
+        Run a step DAG on the thread pool
+        
+        Ready steps are launched in route order while worker slots allow
+        (an exclusive step waits for, and then holds, every slot).  Progress
+        callbacks and metrics are updated from this coordinating thread only.
+        The first failure or a cancellation stops new launches; running steps
+        are allowed to finish.
+        
+        Returns:
+            (results, failure status or None, error message, peak memory)
+        """
+        step_keys = self._step_cache_keys(step_graph, workflow_context) if self.enable_caching else {}
+        total_slots = max(1, self.max_parallel_workers)
+        pending = {step: set(deps) for step, deps in step_graph.items()}
+        running: Dict[Future, Tuple[str, int]] = {}
+        results: Dict[str, Any] = {}
+        free_slots = total_slots
+        launched = 0
+        failed_status: Optional[ExecutionStatus] = None
+        error_msg: Optional[str] = None
+        
+        with ThreadPoolExecutor(max_workers=total_slots) as pool:
+            while pending or running:
+                if failed_status is None and cancel_event.is_set():
+                    failed_status = ExecutionStatus.CANCELLED
+                    error_msg = f"Execution {workflow_context.execution_id} cancelled"
+                
+                if failed_status is None:
+                    for step_name in [step for step, deps in pending.items() if not deps]:
+                        slots = self._step_slots(step_name, total_slots)
+                        if slots > free_slots:
+                            break
+                        
+                        progress_callback.on_step_start(step_name, launched, len(step_graph))
+                        step_inputs = {dep: results[dep] for dep in step_graph[step_name] if dep in results}
+                        future = pool.submit(self.execute_step, step_name, workflow_context, step_inputs,
+                                             step_keys.get(step_name))
+                        running[future] = (step_name, slots)
+                        free_slots -= slots
+                        launched += 1
+                        del pending[step_name]
+                
+                if not running:
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    step_name, slots = running.pop(future)
+                    free_slots += slots
+                    step_result = future.result()
+                    
+                    metrics.add_step_result(step_result)
+                    peak_memory_mb = max(peak_memory_mb, self._get_memory_usage_mb())
+                    progress_callback.on_step_complete(step_name, step_result)
+                    
+                    if not step_result.success:
+                        if failed_status is None:
+                            failed_status = ExecutionStatus.FAILED
+                            error_msg = f"Step {step_name} failed: {step_result.error_message}"
+                        continue
+                    
+                    # Store step output for dependent steps
+                    if step_result.output_data:
+                        results[step_name] = step_result.output_data
+                    for deps in pending.values():
+                        deps.discard(step_name)
+        
+        return results, failed_status, error_msg, peak_memory_mb
+    
+    def _step_slots(self, step_name: str, total_slots: int) -> int:
+        """Worker slots a step occupies while running"""
+        spec = self.step_specs.get(step_name)
+        if spec is None or spec.exclusive:
+            return total_slots
+        return min(max(1, spec.cpu_slots), total_slots)
+    
+    def _critical_path(self, step_graph: Dict[str, List[str]],
+                       metrics: PerformanceMetrics) -> Tuple[List[str], float]:
+        """Longest dependency chain of completed steps by measured duration"""
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for step_name, deps in step_graph.items():
+            step_result = metrics.step_metrics.get(step_name)
+            if step_result is None:
+                continue
+            start, parent = max(((finish[dep], dep) for dep in deps if dep in finish), default=(0.0, None))
+            finish[step_name] = start + (step_result.duration_seconds or 0.0)
+            previous[step_name] = parent
+        
+        if not finish:
+            return [], 0.0
+        
+        last = max(finish, key=finish.get)
+        path = []
+        step: Optional[str] = last
+        while step is not None:
+            path.append(step)
+            step = previous[step]
+        return path[::-1], finish[last]
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=max(1, self.max_parallel_workers))
+            return self._process_pool
+    
     def _initialize_step_executors(self) -> Dict[str, Callable]:
         """Initialize step executor functions"""
         return {
@@ -704,25 +806,94 @@ class WorkflowExecutor(WorkflowExecutorProtocol, ParallelExecutorInterface):
                 "error": str(e)
             }
     
-    def _generate_cache_key(self, step_name: str, workflow_context: WorkflowContext, previous_results: Dict[str, Any]) -> str:
-        """Generate cache key for step"""
-        # Create hash from step name, VCF path, and relevant config
+    def _step_cache_keys(self, step_graph: Dict[str, List[str]], workflow_context: WorkflowContext) -> Dict[str, str]:
+        """Cache key of every step in a DAG, each chained to its dependencies' keys"""
+        step_keys: Dict[str, str] = {}
+        for step_name, deps in step_graph.items():
+            step_keys[step_name] = self._generate_cache_key(
+                step_name, workflow_context, {dep: step_keys[dep] for dep in deps}
+            )
+        return step_keys
+    
+    def _generate_cache_key(self, step_name: str, workflow_context: WorkflowContext,
+                            upstream: Dict[str, str]) -> str:
+        """
+        Content-addressed cache key for a step
+        
+        Digests the input VCF contents (not their paths), the analysis and
+        step configuration, tool versions, the KB sources and the keys (or
+        content digest) of upstream results.  Keys are prefixed with the step
+        name so clear_cache("vep") still drops one step's entries.
+        """
+        validated_input = workflow_context.validated_input
+        route = workflow_context.route
         key_data = {
             "step": step_name,
-            "vcf_path": str(workflow_context.validated_input.tumor_vcf.path),
-            "analysis_type": workflow_context.route.analysis_type.value,
-            "cancer_type": workflow_context.validated_input.patient.cancer_type,
-            "variant_count": workflow_context.validated_input.tumor_vcf.variant_count
+            "tumor_vcf": file_digest(validated_input.tumor_vcf.path),
+            "normal_vcf": file_digest(validated_input.normal_vcf.path) if validated_input.normal_vcf else None,
+            "analysis_type": route.analysis_type.value,
+            "cancer_type": validated_input.patient.cancer_type,
+            "requested_outputs": validated_input.requested_outputs,
+            "config": self._step_config(step_name, route),
+            "tool_versions": self.tool_versions,
+            "kb": self.kb_fingerprint,
+            "upstream": upstream,
         }
         
-        # Add step-specific config
+        key_str = json.dumps(key_data, sort_keys=True, default=str)
+        return f"{step_name}:{hashlib.sha256(key_str.encode()).hexdigest()}"
+    
+    def _step_config(self, step_name: str, route) -> Dict[str, Any]:
+        """Route (or tool) configuration a step's output depends on"""
         if step_name == "vep":
-            key_data["vep_config"] = "vep_107_26plugins"
-        elif step_name == "evidence_aggregation":
-            key_data["kb_weights"] = workflow_context.route.aggregator_config.get("kb_weights", {})
-        
-        key_str = str(sorted(key_data.items()))
-        return hashlib.md5(key_str.encode()).hexdigest()
+            return {"vep": self.vep_config}
+        if step_name == "somatic_calling":
+            return {"filter_config": route.filter_config}
+        if step_name == "evidence_aggregation":
+            return {"aggregator_config": route.aggregator_config}
+        if step_name == "tiering":
+            return {"tiering_config": route.tiering_config}
+        if step_name in DEFAULT_STEP_SPECS:
+            return {}
+        return {"filter_config": route.filter_config, "aggregator_config": route.aggregator_config,
+                "tiering_config": route.tiering_config}
+    
+    @property
+    def tool_versions(self) -> Dict[str, str]:
+        """Versions of the engine and external tools whose output is cached"""
+        if self._tool_versions is None:
+            from . import __version__
+            versions = {"annotation_engine": __version__}
+            try:
+                from .vep_runner import VEPConfiguration
+                versions["vep"] = VEPConfiguration().release
+            except Exception as e:
+                logger.debug(f"VEP release unavailable for cache keys: {e}")
+                versions["vep"] = "unknown"
+            self._tool_versions = versions
+        return self._tool_versions
+    
+    @property
+    def vep_config(self) -> Dict[str, Any]:
+        """Assembly, plugin set and offline cache version the vep step runs with"""
+        if self._vep_config is None:
+            try:
+                from .vep_runner import DEFAULT_VEP_PLUGINS, VEPConfiguration
+                config = VEPConfiguration()
+                self._vep_config = {"assembly": config.assembly, "plugins": list(DEFAULT_VEP_PLUGINS),
+                                    "cache_version": config.cache_version}
+            except Exception as e:
+                logger.debug(f"VEP configuration unavailable for cache keys: {e}")
+                self._vep_config = {"assembly": "unknown", "plugins": [], "cache_version": None}
+        return self._vep_config
+    
+    @property
+    def kb_fingerprint(self) -> str:
+        """Content fingerprint of the KB source files, independent of whether they are loaded"""
+        if self._kb_fingerprint is None:
+            from .evidence_aggregator import get_kb_fingerprint
+            self._kb_fingerprint = get_kb_fingerprint()
+        return self._kb_fingerprint
     
     def _get_memory_usage_mb(self) -> float:
         """Get current memory usage in MB"""
@@ -752,6 +923,27 @@ class WorkflowExecutor(WorkflowExecutorProtocol, ParallelExecutorInterface):
         return output_files
 
 
+_PROCESS_STEP_EXECUTOR: Optional[WorkflowExecutor] = None
+
+
+def _execute_builtin_step(step_name: str, workflow_context: WorkflowContext,
+                          previous_results: Dict[str, Any]) -> Dict[str, Any]:
+    """Process-pool entry point: run a built-in step function in this worker"""
+    global _PROCESS_STEP_EXECUTOR
+    if _PROCESS_STEP_EXECUTOR is None:
+        _PROCESS_STEP_EXECUTOR = WorkflowExecutor(enable_caching=False)
+    return _PROCESS_STEP_EXECUTOR.step_executors[step_name](workflow_context, previous_results)
+
+
+def _content_digest(value: Any) -> str:
+    """sha256 of a picklable value (repr for values that cannot be pickled)"""
+    try:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        payload = repr(value).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
 def create_workflow_executor(enable_caching: bool = True, 
                            max_workers: int = 4) -> WorkflowExecutor:
     """
@@ -42,6 +42,17 @@ class Settings(BaseSettings):
     # Job Settings
     JOB_TIMEOUT: int = 3600  # 1 hour
     MAX_JOBS_PER_USER: int = 10
+    ANNOTATION_CHUNK_SIZE: int = 250  # Variants per executor call
+    ANNOTATION_WORKERS: int = max(1, (os.cpu_count() or 2) - 1)  # Processes per annotation job
+    RESULT_FLUSH_ROWS: int = 500  # Buffered variant rows per bulk insert
+    RESULT_FLUSH_SECONDS: float = 2.0  # Max delay before buffered results are written
+    
+    # Progress streaming
+    PROGRESS_WINDOW_SECONDS: float = 0.25  # Coalescing window for progress/variant frames
+    PROGRESS_BATCH_SIZE: int = 200  # Variant updates per frame
+    PROGRESS_STREAM_MAXLEN: int = 20000  # Frames retained per job for replay
+    PROGRESS_REDIS_POOL_SIZE: int = 50  # Shared connections for websocket subscribers
+    PROGRESS_MAX_PENDING_VARIANTS: int = 5000  # Undelivered updates before a slow client must resync
     
     # Annotation Engine
     VEP_DOCKER_IMAGE: str = "ensemblorg/ensembl-vep:latest"
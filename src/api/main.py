@@ -17,7 +17,7 @@ from pathlib import Path
 from .database import init_db, close_db
 from .routers import auth, jobs, variants, reports
 from .config import settings
-from .websocket import websocket_endpoint
+from .websocket import websocket_endpoint, close_progress_hub
 
 # Configure logging
 logging.basicConfig(
@@ -49,6 +49,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down API server...")
+    await close_progress_hub()
     await close_db()
 
 
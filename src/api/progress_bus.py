@@ -0,0 +1,304 @@
+"""
+Job progress bus over Redis Streams
+
+Workers append job events to a capped per-job stream (job_stream:{job_id})
+through ProgressPublisher, which coalesces them into frames: variant
+updates are batched into "variant_batch" frames by size/time window and
+intermediate "progress" frames inside a window are replaced by the latest.
+
+The API side runs one ProgressHub per process.  It reads each watched
+job's stream once over a shared connection pool and fans frames out to
+websocket Subscriptions.  Every frame carries its stream id as event_id, so
+a client that reconnects with ?last_event_id= (or joins late, from "0")
+is replayed what it missed.  A slow client's pending frames are merged
+(adjacent variant batches joined, superseded progress dropped); if it falls
+too far behind it is told to resync from its last event id.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+STREAM_FIELD = "frame"
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+Frame = Dict[str, Any]
+
+
+def stream_key(job_id: str) -> str:
+    return f"job_stream:{job_id}"
+
+
+def parse_event_id(event_id: str) -> Tuple[int, int]:
+    """Stream id "ms-seq" as a comparable tuple ("0" and "" are the start)"""
+    if not event_id or event_id == "0":
+        return (0, 0)
+    ms, _, seq = str(event_id).partition("-")
+    return (int(ms), int(seq or 0))
+
+
+class ProgressPublisher:
+    """
+    Coalescing writer of one job's progress stream (worker side)
+
+    variant() buffers variant updates until max_batch are pending or
+    window_seconds have passed; progress() frames within a window replace
+    each other unless their status is terminal.  Callers flush() at natural
+    boundaries (e.g. after each annotated chunk) and close() at job end.
+    """
+
+    def __init__(self, redis_conn: redis.Redis, job_id: str, window_seconds: float = 0.25,
+                 max_batch: int = 200, maxlen: int = 10000, ttl_seconds: int = 86400):
+        self.redis = redis_conn
+        self.job_id = job_id
+        self.key = stream_key(job_id)
+        self.window_seconds = window_seconds
+        self.max_batch = max(1, max_batch)
+        self.maxlen = maxlen
+        self.ttl_seconds = ttl_seconds
+        self.frames_written = 0
+
+        self._variants: List[Dict[str, Any]] = []
+        self._progress: Optional[Frame] = None
+        self._last_flush = time.monotonic()
+
+    def variant(self, variant_data: Dict[str, Any], flow_data: Optional[Dict[str, Any]] = None):
+        self._variants.append({"variant": variant_data, "flow_data": flow_data})
+        if len(self._variants) >= self.max_batch or self._window_elapsed():
+            self.flush()
+
+    def progress(self, status: str, progress: int, message: str,
+                 current_step: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
+        self._progress = {
+            "type": "progress",
+            "job_id": self.job_id,
+            "status": status,
+            "progress": progress,
+            "message": message,
+            "current_step": current_step,
+            "details": details or {},
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        if status in TERMINAL_STATUSES or self._window_elapsed():
+            self.flush()
+
+    def flush(self):
+        """Write pending variant updates, then the latest progress, as frames"""
+        frames = []
+        if self._variants:
+            frames.append({
+                "type": "variant_batch",
+                "job_id": self.job_id,
+                "updates": self._variants,
+                "timestamp": datetime.utcnow().isoformat()
+            })
+            self._variants = []
+        if self._progress is not None:
+            frames.append(self._progress)
+            self._progress = None
+        self._last_flush = time.monotonic()
+        if not frames:
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        for frame in frames:
+            pipe.xadd(self.key, {STREAM_FIELD: json.dumps(frame, default=str)},
+                      maxlen=self.maxlen, approximate=True)
+        pipe.expire(self.key, self.ttl_seconds)
+        pipe.execute()
+        self.frames_written += len(frames)
+
+    def close(self):
+        self.flush()
+
+    def _window_elapsed(self) -> bool:
+        return time.monotonic() - self._last_flush >= self.window_seconds
+
+
+def merge_frames(entries: List[Tuple[str, Frame]], max_frame_updates: int = 1000) -> List[Frame]:
+    """
+    Coalesce stream entries into the frames sent to a client, tagged with event_id
+
+    Adjacent variant batches are joined up to max_frame_updates updates and
+    non-terminal progress frames other than the last are dropped; order is
+    otherwise preserved.
+    """
+    last_progress = max((i for i, (_, frame) in enumerate(entries) if frame.get("type") == "progress"),
+                        default=-1)
+    merged: List[Frame] = []
+    for i, (event_id, frame) in enumerate(entries):
+        frame_type = frame.get("type")
+        if frame_type == "progress" and i != last_progress and frame.get("status") not in TERMINAL_STATUSES:
+            continue
+        if frame_type == "variant_batch":
+            updates = frame.get("updates", [])
+            previous = merged[-1] if merged else None
+            if (previous is not None and previous.get("type") == "variant_batch"
+                    and len(previous["updates"]) + len(updates) <= max_frame_updates):
+                previous["updates"].extend(updates)
+                previous["event_id"] = event_id
+                continue
+            frame = {**frame, "updates": list(updates)}
+        merged.append({**frame, "event_id": event_id})
+    return merged
+
+
+class Subscription:
+    """
+    One client's view of a job stream with merge-on-backpressure
+
+    Frames are queued by the hub and drained by the client's sender; when
+    the sender lags, drain() merges what accumulated.  More than
+    max_pending_variants undelivered variant updates marks the subscription
+    overflowed and the client must resync from last_event_id.
+    """
+
+    def __init__(self, job_id: str, last_event_id: str = "0", max_pending_variants: int = 5000):
+        self.job_id = job_id
+        self.last_event_id = last_event_id or "0"
+        self.max_pending_variants = max_pending_variants
+        self.overflowed = False
+
+        self._last_seen = parse_event_id(self.last_event_id)
+        self._pending: List[Tuple[str, Frame]] = []
+        self._pending_variants = 0
+        self._ready = asyncio.Event()
+
+    def offer(self, event_id: str, frame: Frame):
+        """Queue a frame unless it was already delivered (replay/live overlap)"""
+        parsed = parse_event_id(event_id)
+        if parsed <= self._last_seen or self.overflowed:
+            return
+        self._last_seen = parsed
+        if frame.get("type") == "variant_batch":
+            self._pending_variants += len(frame.get("updates", []))
+            if self._pending_variants > self.max_pending_variants:
+                self.request_resync()
+                return
+        self._pending.append((event_id, frame))
+        self._ready.set()
+
+    async def wait(self):
+        await self._ready.wait()
+
+    def drain(self) -> List[Frame]:
+        """Pending frames merged by merge_frames()"""
+        pending, self._pending = self._pending, []
+        self._pending_variants = 0
+        self._ready.clear()
+
+        merged = merge_frames(pending)
+        if merged:
+            self.last_event_id = merged[-1]["event_id"]
+        return merged
+
+    def skip_through(self, event_id: str):
+        """Mark everything up to event_id as delivered (e.g. by a replay)"""
+        parsed = parse_event_id(event_id)
+        if parsed > parse_event_id(self.last_event_id):
+            self.last_event_id = event_id
+        self._last_seen = max(self._last_seen, parsed)
+        self._pending = [(eid, frame) for eid, frame in self._pending if parse_event_id(eid) > parsed]
+        self._pending_variants = sum(len(frame.get("updates", [])) for _, frame in self._pending)
+        if not self._pending and not self.overflowed:
+            self._ready.clear()
+
+    def request_resync(self):
+        """Drop pending frames; the client must reconnect from last_event_id"""
+        self.overflowed = True
+        self._pending.clear()
+        self._pending_variants = 0
+        self._ready.set()
+
+
+class ProgressHub:
+    """Per-process fan-out of job streams to websocket subscriptions"""
+
+    def __init__(self, redis_url: str, max_connections: int = 50,
+                 block_ms: int = 5000, read_count: int = 500):
+        self.pool = aioredis.ConnectionPool.from_url(redis_url, max_connections=max_connections,
+                                                     decode_responses=True)
+        self.block_ms = block_ms
+        self.read_count = read_count
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._readers: Dict[str, asyncio.Task] = {}
+
+    def _client(self) -> aioredis.Redis:
+        return aioredis.Redis(connection_pool=self.pool)
+
+    async def subscribe(self, job_id: str, last_event_id: str = "0", **kwargs) -> Subscription:
+        """
+        Register a subscription for live frames
+
+        Registration happens before the caller replays history, and the
+        job's reader starts at the stream's current tail, so replay and live
+        frames together leave no gap (overlap is dropped by event id).
+        """
+        subscription = Subscription(job_id, last_event_id, **kwargs)
+        if job_id not in self._readers:
+            tail = await self._client().xrevrange(stream_key(job_id), count=1)
+            if job_id not in self._readers:
+                start_id = tail[0][0] if tail else "0-0"
+                self._readers[job_id] = asyncio.create_task(self._read_stream(job_id, start_id))
+        self._subscribers.setdefault(job_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.job_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.job_id]
+            reader = self._readers.pop(subscription.job_id, None)
+            if reader is not None:
+                reader.cancel()
+
+    async def replay(self, job_id: str, after_event_id: str) -> AsyncIterator[List[Tuple[str, Frame]]]:
+        """Stream history after an event id, in pages"""
+        client = self._client()
+        start = f"({after_event_id}" if parse_event_id(after_event_id) > (0, 0) else "-"
+        while True:
+            entries = await client.xrange(stream_key(job_id), min=start, count=self.read_count)
+            if not entries:
+                return
+            yield [(event_id, json.loads(fields[STREAM_FIELD])) for event_id, fields in entries]
+            if len(entries) < self.read_count:
+                return
+            start = f"({entries[-1][0]}"
+
+    async def close(self):
+        for reader in self._readers.values():
+            reader.cancel()
+        self._readers.clear()
+        self._subscribers.clear()
+        await self.pool.disconnect()
+
+    async def _read_stream(self, job_id: str, cursor: str):
+        """Blocking XREAD loop for one job, dispatching to its subscribers"""
+        client = self._client()
+        key = stream_key(job_id)
+        try:
+            while True:
+                response = await client.xread({key: cursor}, count=self.read_count, block=self.block_ms)
+                for _, entries in response or []:
+                    for event_id, fields in entries:
+                        cursor = event_id
+                        frame = json.loads(fields[STREAM_FIELD])
+                        for subscription in list(self._subscribers.get(job_id, ())):
+                            subscription.offer(event_id, frame)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Progress stream reader for job {job_id} failed: {e}")
+            self._readers.pop(job_id, None)
+            for subscription in list(self._subscribers.get(job_id, ())):
+                subscription.request_resync()  # Reconnecting clients restart the reader
@@ -0,0 +1,117 @@
+"""
+Buffered persistence of annotation job results
+
+Annotated variants and job progress are accumulated in memory and written
+in batches: one multi-row INSERT ... RETURNING for the Variant rows, one
+UPDATE for the job's progress and a single commit per flush, so database
+load scales with batches rather than variants.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from .database import Job, Variant
+
+logger = logging.getLogger(__name__)
+
+
+def variant_row(job_pk: int, variant_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values of the Variant row for an annotated variant"""
+    return {
+        "job_id": job_pk,
+        "chromosome": variant_result["chromosome"],
+        "position": variant_result["position"],
+        "reference": variant_result["reference"],
+        "alternate": variant_result["alternate"],
+        "gene_symbol": variant_result.get("gene_symbol"),
+        "transcript_id": variant_result.get("transcript_id"),
+        "hgvs_c": variant_result.get("hgvs_c"),
+        "hgvs_p": variant_result.get("hgvs_p"),
+        "consequence": variant_result.get("consequence"),
+        "amp_tier": variant_result.get("amp_tier"),
+        "vicc_tier": variant_result.get("vicc_tier"),
+        "confidence_score": variant_result.get("confidence_score"),
+        "gnomad_af": variant_result.get("gnomad_af"),
+        "gnomad_af_popmax": variant_result.get("gnomad_af_popmax"),
+        "oncokb_evidence": variant_result.get("oncokb_evidence"),
+        "civic_evidence": variant_result.get("civic_evidence"),
+        "cosmic_evidence": variant_result.get("cosmic_evidence"),
+        "annotations": variant_result,
+    }
+
+
+class VariantResultWriter:
+    """
+    Accumulates Variant rows and job progress and writes them in batches
+
+    add() and set_progress() only buffer; flush_if_due() writes once
+    max_rows rows are pending or max_interval_seconds have passed since the
+    last write, and flush() writes unconditionally.  Both return the
+    (variant id, variant result) pairs they persisted so callers can publish
+    them with their database ids.
+    """
+
+    def __init__(self, db: Session, job_pk: int, max_rows: int = 500,
+                 max_interval_seconds: float = 2.0):
+        self.db = db
+        self.job_pk = job_pk
+        self.max_rows = max(1, max_rows)
+        self.max_interval_seconds = max_interval_seconds
+        self.rows_written = 0
+        self.flushes = 0
+
+        self._pending: List[Dict[str, Any]] = []
+        self._progress: Optional[Dict[str, Any]] = None
+        self._last_flush = time.monotonic()
+
+    @property
+    def pending_rows(self) -> int:
+        return len(self._pending)
+
+    def add(self, variant_results: List[Dict[str, Any]]):
+        """Buffer annotated variants for insertion"""
+        self._pending.extend(variant_results)
+
+    def set_progress(self, progress: int, current_step: Optional[str] = None):
+        """Record the job's latest progress; only the last value is written"""
+        self._progress = {"progress": progress, "current_step": current_step}
+
+    def flush_if_due(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """Flush when the row or time threshold has been reached"""
+        if (len(self._pending) >= self.max_rows
+                or time.monotonic() - self._last_flush >= self.max_interval_seconds):
+            return self.flush()
+        return []
+
+    def flush(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Write buffered rows and progress in one transaction
+
+        Returns:
+            (id, variant result) for every row inserted, in buffer order
+        """
+        pending, self._pending = self._pending, []
+        progress, self._progress = self._progress, None
+        self._last_flush = time.monotonic()
+        if not pending and progress is None:
+            return []
+
+        ids: List[int] = []
+        if pending:
+            rows = [variant_row(self.job_pk, result) for result in pending]
+            ids = self.db.scalars(
+                insert(Variant).returning(Variant.id, sort_by_parameter_order=True), rows
+            ).all()
+        if progress is not None:
+            self.db.execute(update(Job).where(Job.id == self.job_pk).values(**progress))
+        self.db.commit()
+
+        self.rows_written += len(pending)
+        self.flushes += 1
+        logger.debug(f"Flushed {len(pending)} variants for job {self.job_pk} "
+                     f"({self.rows_written} total in {self.flushes} flushes)")
+        return list(zip(ids, pending))
@@ -7,11 +7,11 @@ from rq import Queue, Worker
 from rq.job import Job as RQJob
 import logging
 from pathlib import Path
-import json
 from datetime import datetime
 import asyncio
 import sys
-from typing import Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent.parent))
@@ -19,8 +19,10 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 from src.annotation_engine.input_validator_v2 import InputValidatorV2
 from src.annotation_engine.workflow_router import WorkflowRouter
 from src.annotation_engine.workflow_executor import WorkflowExecutor
-from src.api.database import Job, JobStatus, Variant
+from src.api.database import Job, JobStatus
 from src.api.config import settings
+from src.api.progress_bus import ProgressPublisher
+from src.api.result_writer import VariantResultWriter
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +30,27 @@ logger = logging.getLogger(__name__)
 redis_conn = redis.from_url(settings.REDIS_URL)
 queue = Queue('annotation_jobs', connection=redis_conn)
 
-# Redis pubsub for real-time updates
-pubsub_conn = redis.from_url(settings.REDIS_URL)
+# Coalescing progress-stream publishers, one per running job
+_publishers: Dict[str, ProgressPublisher] = {}
+
+
+def get_publisher(job_id: str) -> ProgressPublisher:
+    """Progress publisher for a job, created on first use"""
+    if job_id not in _publishers:
+        _publishers[job_id] = ProgressPublisher(
+            redis_conn, job_id,
+            window_seconds=settings.PROGRESS_WINDOW_SECONDS,
+            max_batch=settings.PROGRESS_BATCH_SIZE,
+            maxlen=settings.PROGRESS_STREAM_MAXLEN
+        )
+    return _publishers[job_id]
+
+
+def close_publisher(job_id: str):
+    """Flush and drop a job's publisher"""
+    publisher = _publishers.pop(job_id, None)
+    if publisher is not None:
+        publisher.close()
 
 
 def submit_annotation_job(job_id: str):
@@ -44,40 +65,16 @@ def submit_annotation_job(job_id: str):
 
 
 def send_variant_update(job_id: str, variant_data: Dict[str, Any], flow_data: Dict[str, Any] = None):
-    """Send real-time variant update via Redis pubsub"""
-    update = {
-        "type": "variant_update",
-        "job_id": job_id,
-        "variant": variant_data,
-        "flow_data": flow_data,
-        "timestamp": datetime.utcnow().isoformat()
-    }
-    
-    # Publish to Redis channel
-    channel = f"job_updates:{job_id}"
-    pubsub_conn.publish(channel, json.dumps(update))
+    """Queue a real-time variant update; it is streamed in the next variant_batch frame"""
+    get_publisher(job_id).variant(variant_data, flow_data)
     
-    logger.debug(f"Sent variant update for job {job_id}: {variant_data.get('variant_id')}")
+    logger.debug(f"Queued variant update for job {job_id}: {variant_data.get('variant_id')}")
 
 
 def send_progress(job_id: str, status: str, progress: int, message: str, 
                  current_step: str = None, details: Dict[str, Any] = None):
-    """Send progress update via Redis pubsub"""
-    
-    update = {
-        "type": "progress",
-        "job_id": job_id,
-        "status": status,
-        "progress": progress,
-        "message": message,
-        "current_step": current_step,
-        "details": details or {},
-        "timestamp": datetime.utcnow().isoformat()
-    }
-    
-    # Publish to Redis channel
-    channel = f"job_updates:{job_id}"
-    pubsub_conn.publish(channel, json.dumps(update))
+    """Send progress update via the job's progress stream (coalesced within a window)"""
+    get_publisher(job_id).progress(status, progress, message, current_step, details)
     
     logger.info(f"Progress update for job {job_id}: {progress}% - {message}")
 
@@ -147,78 +144,57 @@ def process_annotation_job(job_id: str):
             
             # Custom progress callback that sends real-time updates
             processed_variants = []
+            result_writer = VariantResultWriter(
+                db, job.id,
+                max_rows=settings.RESULT_FLUSH_ROWS,
+                max_interval_seconds=settings.RESULT_FLUSH_SECONDS
+            )
+            
+            def publish_variants(persisted):
+                """Stream persisted variants to the websocket, with flow data if available"""
+                for variant_id, variant_result in persisted:
+                    variant_update = {
+                        "variant_id": variant_id,
+                        "chromosome": variant_result["chromosome"],
+                        "position": variant_result["position"],
+                        "reference": variant_result["reference"],
+                        "alternate": variant_result["alternate"],
+                        "gene": variant_result.get("gene_symbol"),
+                        "consequence": variant_result.get("consequence"),
+                        "amp_tier": variant_result.get("amp_tier"),
+                        "vicc_tier": variant_result.get("vicc_tier"),
+                        "confidence_score": variant_result.get("confidence_score"),
+                        "canned_text": variant_result.get("canned_text", {}).get("summary"),
+                        "interpretation": variant_result.get("clinical_interpretation")
+                    }
+                    send_variant_update(job_id, variant_update, variant_result.get("flow_data"))
+                    processed_variants.append(variant_result)
             
-            def progress_callback(current, total, message, variant_result=None):
+            def progress_callback(current, total, message, variant_results=None):
                 progress = 20 + int((current / total) * 70)  # 20-90%
                 
-                # Update job progress
-                job.progress = progress
-                job.current_step = message
-                db.commit()
+                # Buffer rows and progress; the writer flushes at its row/time threshold
+                result_writer.add(variant_results or [])
+                result_writer.set_progress(progress, message)
+                publish_variants(result_writer.flush_if_due())
                 
-                # Send progress update
+                # Send progress update and stream the chunk's frames
                 send_progress(job_id, "running", progress, message, 
                              "annotation", 
                              {"current": current, "total": total})
-                
-                # If we have a variant result, send it immediately
-                if variant_result:
-                    # Create variant record
-                    variant = Variant(
-                        job_id=job.id,
-                        chromosome=variant_result["chromosome"],
-                        position=variant_result["position"],
-                        reference=variant_result["reference"],
-                        alternate=variant_result["alternate"],
-                        gene_symbol=variant_result.get("gene_symbol"),
-                        transcript_id=variant_result.get("transcript_id"),
-                        hgvs_c=variant_result.get("hgvs_c"),
-                        hgvs_p=variant_result.get("hgvs_p"),
-                        consequence=variant_result.get("consequence"),
-                        amp_tier=variant_result.get("amp_tier"),
-                        vicc_tier=variant_result.get("vicc_tier"),
-                        confidence_score=variant_result.get("confidence_score"),
-                        gnomad_af=variant_result.get("gnomad_af"),
-                        gnomad_af_popmax=variant_result.get("gnomad_af_popmax"),
-                        oncokb_evidence=variant_result.get("oncokb_evidence"),
-                        civic_evidence=variant_result.get("civic_evidence"),
-                        cosmic_evidence=variant_result.get("cosmic_evidence"),
-                        annotations=variant_result
-                    )
-                    db.add(variant)
-                    db.commit()
-                    db.refresh(variant)
-                    
-                    # Send real-time variant update with flow data
-                    variant_update = {
-                        "variant_id": variant.id,
-                        "chromosome": variant.chromosome,
-                        "position": variant.position,
-                        "reference": variant.reference,
-                        "alternate": variant.alternate,
-                        "gene": variant.gene_symbol,
-                        "consequence": variant.consequence,
-                        "amp_tier": variant.amp_tier,
-                        "vicc_tier": variant.vicc_tier,
-                        "confidence_score": variant.confidence_score,
-                        "canned_text": variant_result.get("canned_text", {}).get("summary"),
-                        "interpretation": variant_result.get("clinical_interpretation")
-                    }
-                    
-                    # Include flow data if available
-                    flow_data = variant_result.get("flow_data")
-                    
-                    send_variant_update(job_id, variant_update, flow_data)
-                    processed_variants.append(variant_result)
+                get_publisher(job_id).flush()
             
             # Execute annotation with real-time updates
             send_progress(job_id, "running", 30, "Starting VEP annotation", 
                          "vep_annotation")
             
-            # Modify executor to support per-variant callbacks
+            # Annotate variant chunks concurrently, reporting each chunk as it completes
             annotation_results = execute_with_updates(
-                executor, workflow, progress_callback
+                executor, workflow, progress_callback,
+                chunk_size=settings.ANNOTATION_CHUNK_SIZE,
+                max_workers=settings.ANNOTATION_WORKERS
             )
+            publish_variants(result_writer.flush())
             
             # Calculate final statistics
             tier_counts = {}
@@ -253,6 +229,9 @@ def process_annotation_job(job_id: str):
         except Exception as e:
             logger.error(f"Job {job_id} failed: {e}")
             
+            # Drop any half-finished transaction before recording the failure
+            db.rollback()
+            
             # Update job status
             job.status = JobStatus.FAILED
             job.error_message = str(e)
@@ -263,71 +242,104 @@ def process_annotation_job(job_id: str):
                          "error")
             
             raise
+        
+        finally:
+            close_publisher(job_id)
 
 
 def execute_with_updates(executor: WorkflowExecutor, workflow: Dict[str, Any], 
-                         progress_callback) -> Dict[str, Any]:
+                         progress_callback, chunk_size: int = 250,
+                         max_workers: int = 1) -> Dict[str, Any]:
     """
-    Execute workflow with per-variant progress updates
-    This is a modified version that processes variants one by one
+    Execute workflow in variant chunks with per-chunk progress updates
+    
+    Variants are split into chunks of chunk_size, each annotated with a
+    single executor call.  With max_workers > 1 the chunks run concurrently
+    in worker processes (each with its own WorkflowExecutor); otherwise they
+    run in order on the given executor.  progress_callback(current, total,
+    message, variant_results) is called from this process as each chunk
+    completes, so updates stay incremental while chunks finish out of order.
+    
+    Returns:
+        {"annotated_variants": [...]} in input order
     """
     
     variants = workflow["variants"]
     total_variants = len(variants)
-    results = []
+    chunk_size = max(1, chunk_size)
+    chunks = [variants[i:i + chunk_size] for i in range(0, total_variants, chunk_size)]
+    chunk_results: Dict[int, List[Dict[str, Any]]] = {}
+    completed = 0
+    
+    def report(index: int, chunk_result: List[Dict[str, Any]]):
+        nonlocal completed
+        completed += len(chunks[index])
+        chunk_results[index] = chunk_result
+        progress_callback(completed, total_variants,
+                          f"Completed {completed}/{total_variants} variants", chunk_result)
+    
+    workers = min(max_workers, len(chunks))
+    if workers <= 1:
+        for index, chunk in enumerate(chunks):
+            report(index, _annotate_chunk(executor, workflow, chunk))
+    else:
+        logger.info(f"Annotating {total_variants} variants in {len(chunks)} chunks on {workers} processes")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(annotate_variant_chunk, workflow, chunk): index
+                       for index, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                report(futures[future], future.result())
+    
+    results = [result for index in range(len(chunks)) for result in chunk_results[index]]
+    return {"annotated_variants": results}
+
+
+_CHUNK_EXECUTOR: Optional[WorkflowExecutor] = None
+
+
+def annotate_variant_chunk(workflow: Dict[str, Any], variants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Worker-process entry point: annotate one chunk with this process's executor"""
+    global _CHUNK_EXECUTOR
+    if _CHUNK_EXECUTOR is None:
+        _CHUNK_EXECUTOR = WorkflowExecutor()
+    return _annotate_chunk(_CHUNK_EXECUTOR, workflow, variants)
+
+
+def _annotate_chunk(executor: WorkflowExecutor, workflow: Dict[str, Any],
+                    variants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Annotate a chunk of variants with one executor call and add tiers, text and flow data"""
+    result = executor.execute({**workflow, "variants": variants})
+    return [_finalize_variant_result(variant_result) for variant_result in result["annotated_variants"]]
+
+
+def _finalize_variant_result(variant_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply rules, tiers, canned text and flow data to an annotated variant"""
+    # Extract annotations for flow diagram
+    annotations = extract_annotations(variant_result)
     
-    # Process each variant individually for real-time updates
-    for i, variant in enumerate(variants):
-        current = i + 1
-        
-        # Update progress
-        progress_callback(
-            current, 
-            total_variants, 
-            f"Processing variant {current}/{total_variants}: "
-            f"{variant['chromosome']}:{variant['position']}"
-        )
-        
-        # Run annotation for single variant
-        single_workflow = {**workflow, "variants": [variant]}
-        result = executor.execute(single_workflow)
-        
-        if result["annotated_variants"]:
-            variant_result = result["annotated_variants"][0]
-            
-            # Extract annotations for flow diagram
-            annotations = extract_annotations(variant_result)
-            
-            # Apply rules and get triggered rules
-            rules_result = apply_rules(variant_result, annotations)
-            
-            # Add tier assignment based on rules
-            variant_result["amp_tier"] = assign_tier_with_rules(variant_result, rules_result)
-            variant_result["vicc_tier"] = assign_vicc_tier_with_rules(variant_result, rules_result)
-            variant_result["confidence_score"] = rules_result["confidence_score"]
-            
-            # Generate canned text
-            variant_result["canned_text"] = generate_canned_text(variant_result)
-            
-            # Add clinical interpretation
-            variant_result["clinical_interpretation"] = generate_interpretation(variant_result)
-            
-            # Add flow data for visualization
-            variant_result["flow_data"] = {
-                "annotations": annotations,
-                "rules": rules_result["rules"],
-                "triggered_rules": rules_result["triggered_rules"],
-                "tier_rationale": rules_result["tier_rationale"]
-            }
-            
-            # Send real-time update with full variant data
-            progress_callback(current, total_variants, 
-                            f"Completed variant {current}/{total_variants}", 
-                            variant_result)
-            
-            results.append(variant_result)
+    # Apply rules and get triggered rules
+    rules_result = apply_rules(variant_result, annotations)
     
-    return {"annotated_variants": results}
+    # Add tier assignment based on rules
+    variant_result["amp_tier"] = assign_tier_with_rules(variant_result, rules_result)
+    variant_result["vicc_tier"] = assign_vicc_tier_with_rules(variant_result, rules_result)
+    variant_result["confidence_score"] = rules_result["confidence_score"]
+    
+    # Generate canned text
+    variant_result["canned_text"] = generate_canned_text(variant_result)
+    
+    # Add clinical interpretation
+    variant_result["clinical_interpretation"] = generate_interpretation(variant_result)
+    
+    # Add flow data for visualization
+    variant_result["flow_data"] = {
+        "annotations": annotations,
+        "rules": rules_result["rules"],
+        "triggered_rules": rules_result["triggered_rules"],
+        "tier_rationale": rules_result["tier_rationale"]
+    }
+    
+    return variant_result
 
 
 def extract_annotations(variant: Dict[str, Any]) -> List[Dict[str, Any]]:
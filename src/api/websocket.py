@@ -1,35 +1,57 @@
 """
-WebSocket handler for real-time job progress with Redis pubsub
+WebSocket handler for real-time job progress from the Redis progress stream
 """
 
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict
-import json
+from typing import Dict, Optional
 import asyncio
 import logging
-import redis.asyncio as redis
+
+from .config import settings
+from .progress_bus import ProgressHub, merge_frames
 
 logger = logging.getLogger(__name__)
 
 # Store active connections
 connections: Dict[str, WebSocket] = {}
 
+# Shared stream reader / connection pool for all sockets in this process
+_progress_hub: Optional[ProgressHub] = None
+
+
+def get_progress_hub() -> ProgressHub:
+    global _progress_hub
+    if _progress_hub is None:
+        _progress_hub = ProgressHub(settings.REDIS_URL, max_connections=settings.PROGRESS_REDIS_POOL_SIZE)
+    return _progress_hub
+
+
+async def close_progress_hub():
+    global _progress_hub
+    if _progress_hub is not None:
+        await _progress_hub.close()
+        _progress_hub = None
+
 
 async def websocket_endpoint(websocket: WebSocket, job_id: str):
-    """WebSocket endpoint for job progress with Redis pubsub"""
+    """
+    WebSocket endpoint for job progress
+    
+    Replays the job's stream after ?last_event_id= (from the start when
+    omitted, so late joiners see earlier results), then forwards live
+    frames.  A client that falls too far behind receives a "resync" frame
+    and should reconnect with the last event_id it processed.
+    """
     
     await websocket.accept()
     connections[job_id] = websocket
     
-    # Create Redis connection for pubsub
-    redis_client = await redis.from_url("redis://localhost:6379")
-    pubsub = redis_client.pubsub()
+    last_event_id = websocket.query_params.get("last_event_id", "0")
+    hub = get_progress_hub()
+    subscription = await hub.subscribe(job_id, last_event_id,
+                                       max_pending_variants=settings.PROGRESS_MAX_PENDING_VARIANTS)
     
     try:
-        # Subscribe to job updates channel
-        channel = f"job_updates:{job_id}"
-        await pubsub.subscribe(channel)
-        
         # Send initial connection message
         await websocket.send_json({
             "type": "connected",
@@ -37,16 +59,27 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str):
             "message": "Connected to job progress stream"
         })
         
-        # Create tasks for handling messages
-        async def handle_redis_messages():
-            """Handle messages from Redis pubsub"""
-            async for message in pubsub.listen():
-                if message['type'] == 'message':
-                    try:
-                        data = json.loads(message['data'])
-                        await websocket.send_json(data)
-                    except Exception as e:
-                        logger.error(f"Error sending message: {e}")
+        async def forward_frames():
+            """Replay missed frames, then forward live frames merged under backpressure"""
+            replayed_through = last_event_id
+            async for entries in hub.replay(job_id, last_event_id):
+                for frame in merge_frames(entries):
+                    await websocket.send_json(frame)
+                replayed_through = entries[-1][0]
+            subscription.skip_through(replayed_through)
+            
+            while True:
+                await subscription.wait()
+                if subscription.overflowed:
+                    await websocket.send_json({
+                        "type": "resync",
+                        "job_id": job_id,
+                        "last_event_id": subscription.last_event_id
+                    })
+                    await websocket.close()
+                    return
+                for frame in subscription.drain():
+                    await websocket.send_json(frame)
         
         async def handle_websocket_messages():
             """Handle messages from WebSocket client"""
@@ -61,11 +94,13 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str):
                     logger.error(f"WebSocket error: {e}")
                     break
         
-        # Run both tasks concurrently
-        await asyncio.gather(
-            handle_redis_messages(),
-            handle_websocket_messages()
-        )
+        # Run until the client disconnects or must resync
+        tasks = [asyncio.create_task(forward_frames()), asyncio.create_task(handle_websocket_messages())]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
                 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for job {job_id}")
@@ -73,12 +108,10 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str):
         logger.error(f"WebSocket error for job {job_id}: {e}")
     finally:
         # Cleanup
-        await pubsub.unsubscribe(channel)
-        await pubsub.close()
-        await redis_client.close()
+        hub.unsubscribe(subscription)
         
         # Remove connection
-        if job_id in connections:
+        if connections.get(job_id) is websocket:
             del connections[job_id]
 
 
@@ -0,0 +1,115 @@
+"""
+Tests for AlphaMissense batch and tabix-indexed lookups
+"""
+
+import sys
+import gzip
+import pytest
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine.alpha_missense import AlphaMissenseLoader, pysam
+
+
+ROWS = [
+    ("chr7", 140753336, "A", "T", "hg38", "P15056", "ENST00000646891.2", "V600E", "0.9927", "likely_pathogenic"),
+    ("chr7", 140753336, "A", "G", "hg38", "P15056", "ENST00000646891.2", "V600A", "0.9540", "likely_pathogenic"),
+    ("chr12", 25245350, "C", "A", "hg38", "P01116", "ENST00000256078.10", "G12V", "0.9988", "likely_pathogenic"),
+    ("chr17", 7674220, "C", "T", "hg38", "P04637", "ENST00000269305.9", "R248Q", "0.9964", "likely_pathogenic"),
+    ("chr17", 7676154, "G", "C", "hg38", "P04637", "ENST00000269305.9", "P72R", "0.0812", "likely_benign"),
+]
+
+
+def _write_refs(refs_dir, rows):
+    am_dir = refs_dir / "alphamissense"
+    am_dir.mkdir()
+    with gzip.open(am_dir / "AlphaMissense_hg38.tsv.gz", "wt") as f:
+        f.write("# Copyright 2023 DeepMind Technologies Limited\n")
+        f.write("#CHROM\tPOS\tREF\tALT\tgenome\tuniprot_id\ttranscript_id\tprotein_variant\t"
+                "am_pathogenicity\tam_class\n")
+        for row in rows:
+            f.write("\t".join(str(v) for v in row) + "\n")
+    return refs_dir
+
+
+@pytest.fixture
+def refs_dir(tmp_path):
+    return _write_refs(tmp_path, ROWS)
+
+
+QUERIES = [
+    ("17", 7676154, "G", "C"),
+    ("chr7", 140753336, "A", "T"),
+    ("1", 1000, "A", "C"),
+    ("12", 25245350, "C", "A"),
+    ("7", 140753336, "A", "T"),  # duplicate query
+]
+
+
+def _check_batch(results):
+    assert results[0]["protein_variant"] == "P72R"
+    assert results[0]["classification"] == "likely_benign"
+    assert results[1]["pathogenicity_score"] == pytest.approx(0.9927)
+    assert results[2] is None
+    assert results[3]["uniprot_id"] == "P01116"
+    assert results[4] == results[1]
+
+
+def test_lookup_batch_linear_sweep(refs_dir):
+    loader = AlphaMissenseLoader(refs_dir)
+    _check_batch(loader.lookup_batch(QUERIES))
+    assert loader.get_stats()["indexed"] is False
+
+
+def test_single_lookup_matches_batch(refs_dir):
+    loader = AlphaMissenseLoader(refs_dir)
+    assert loader.lookup_variant("7", 140753336, "A", "G")["protein_variant"] == "V600A"
+    assert loader.lookup_variant("7", 140753336, "A", "C") is None
+
+
+@pytest.mark.skipif(pysam is None, reason="pysam not installed")
+def test_lookup_batch_tabix(refs_dir):
+    loader = AlphaMissenseLoader(refs_dir)
+    loader.build_tabix_index()
+
+    assert loader.get_stats()["indexed"] is True
+    _check_batch(loader.lookup_batch(QUERIES))
+
+
+# The same allele scored on a second transcript, ahead of another queried key
+DUPLICATE_ROWS = ROWS[:1] + [
+    ("chr7", 140753336, "A", "T", "hg38", "Q9XXXX", "ENST00000288602.11", "V640E", "0.9800", "likely_pathogenic"),
+] + ROWS[1:]
+
+
+@pytest.mark.parametrize("indexed", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(pysam is None, reason="pysam not installed")),
+])
+def test_duplicate_rows_keep_first_match(tmp_path, indexed):
+    """Repeated keys neither end the scan early nor disagree between lookup paths"""
+    loader = AlphaMissenseLoader(_write_refs(tmp_path, DUPLICATE_ROWS))
+    if indexed:
+        loader.build_tabix_index()
+
+    results = loader.lookup_batch([("7", 140753336, "A", "T"), ("7", 140753336, "A", "G"),
+                                   ("12", 25245350, "C", "A")])
+
+    assert results[0]["transcript_id"] == "ENST00000646891.2"
+    assert results[1]["protein_variant"] == "V600A"
+    assert results[2]["protein_variant"] == "G12V"
+
+
+@pytest.mark.skipif(pysam is None, reason="pysam not installed")
+def test_cli_builds_index_for_kb_bundle(refs_dir, monkeypatch):
+    from annotation_engine.cli import AnnotationEngineCLI
+    
+    monkeypatch.setattr(sys, "argv", ["annotation-engine", "--build-alphamissense-index",
+                                      "--kb-bundle", str(refs_dir)])
+    assert AnnotationEngineCLI().run() == 0
+    
+    loader = AlphaMissenseLoader(refs_dir)
+    assert loader._get_tabix_handle() is not None
+    _check_batch(loader.lookup_batch(QUERIES))
@@ -0,0 +1,142 @@
+"""
+Tests for the persistent variant annotation cache
+"""
+
+import base64
+import os
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine import variant_processor
+from annotation_engine.annotation_cache import (
+    VariantAnnotationCache, cache_namespace, normalize_allele
+)
+from annotation_engine.models import VariantAnnotation, AnalysisType
+from annotation_engine.variant_processor import VariantProcessor
+
+
+def _annotation(chrom, pos, ref, alt, gene="BRAF", **kwargs):
+    return VariantAnnotation(chromosome=chrom, position=pos, reference=ref, alternate=alt,
+                             gene_symbol=gene, consequence=["missense_variant"], **kwargs)
+
+
+NAMESPACE = cache_namespace("GRCh38", "114.1", ["SpliceAI", "REVEL"], "snap1")
+
+
+def test_normalize_allele():
+    assert normalize_allele("chr7", 140753336, "a", "t") == ("7", 140753336, "A", "T")
+    assert normalize_allele("chrM", 100, "A", "G") == ("MT", 100, "A", "G")
+    # Shared suffix/prefix trimmed; position follows the prefix trim
+    assert normalize_allele("1", 100, "CTA", "CGA") == ("1", 101, "T", "G")
+    assert normalize_allele("1", 100, "AT", "A") == ("1", 100, "AT", "A")
+
+
+def test_namespace_tracks_versions():
+    assert NAMESPACE == cache_namespace("GRCh38", "114.1", ["REVEL", "SpliceAI"], "snap1")
+    assert NAMESPACE != cache_namespace("GRCh38", "115", ["REVEL", "SpliceAI"], "snap1")
+    assert NAMESPACE != cache_namespace("GRCh38", "114.1", ["REVEL"], "snap1")
+    assert NAMESPACE != cache_namespace("GRCh38", "114.1", ["REVEL", "SpliceAI"], "snap2")
+
+
+def test_roundtrip_strips_sample_fields(tmp_path):
+    cache = VariantAnnotationCache(tmp_path / "cache.sqlite")
+    cache.put_many(NAMESPACE, [_annotation("7", 140753336, "A", "T", hgvs_p="p.V600E",
+                                           vaf=0.42, total_depth=80, filter_status=["PASS"])])
+
+    found = cache.get_many(NAMESPACE, [("chr7", 140753336, "A", "T"), ("12", 25245350, "C", "A")])
+    assert list(found) == ["7:140753336:A>T"]
+    hit = found["7:140753336:A>T"]
+    assert hit.hgvs_p == "p.V600E"
+    assert hit.vaf is None and hit.total_depth is None and hit.filter_status == []
+
+    assert cache.get_many("other-namespace", [("7", 140753336, "A", "T")]) == {}
+
+    stats = cache.get_statistics()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+    # Persists across connections
+    cache.close()
+    assert VariantAnnotationCache(tmp_path / "cache.sqlite").get_many(NAMESPACE, [("7", 140753336, "A", "T")])
+
+
+def _bulky_annotation(pos):
+    """Annotation whose compressed payload spans several database pages"""
+    return _annotation("1", pos, "A", "C", hgvs_c=base64.b64encode(os.urandom(24000)).decode())
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path):
+    cache = VariantAnnotationCache(tmp_path / "cache.sqlite")
+    empty_size = cache._database_size_bytes()
+    cache.put_many(NAMESPACE, [_bulky_annotation(1000)])
+    entry_size = cache._database_size_bytes() - empty_size
+    cache.max_cache_size_bytes = empty_size + int(entry_size * 3.5)
+
+    cache.put_many(NAMESPACE, [_bulky_annotation(2000)])
+    cache.put_many(NAMESPACE, [_bulky_annotation(3000)])
+    cache.get_many(NAMESPACE, [("1", 1000, "A", "C")])  # refresh the oldest entry
+    cache.put_many(NAMESPACE, [_bulky_annotation(4000)])
+
+    remaining = cache.get_many(NAMESPACE, [("1", p, "A", "C") for p in (1000, 2000, 3000, 4000)])
+    assert "1:2000:A>C" not in remaining
+    assert {"1:1000:A>C", "1:4000:A>C"} <= set(remaining)
+    assert cache.get_statistics()["evictions"] >= 1
+    assert cache._database_size_bytes() <= cache.max_cache_size_bytes
+
+
+def test_size_bound_counts_entries_written_by_other_connections(tmp_path):
+    """Processes sharing the WAL database see each other's writes when evicting"""
+    first = VariantAnnotationCache(tmp_path / "cache.sqlite")
+    second = VariantAnnotationCache(tmp_path / "cache.sqlite")
+    empty_size = first._database_size_bytes()
+    first.put_many(NAMESPACE, [_bulky_annotation(p) for p in (1000, 2000, 3000)])
+    assert second._database_size_bytes() == first._database_size_bytes()
+
+    second.max_cache_size_bytes = empty_size + (first._database_size_bytes() - empty_size) // 2
+    second.put_many(NAMESPACE, [_bulky_annotation(4000)])
+
+    assert second.get_statistics()["evictions"] >= 2
+    assert "1:1000:A>C" not in first.get_many(NAMESPACE, [("1", 1000, "A", "C")])
+    assert first._database_size_bytes() <= second.max_cache_size_bytes
+
+
+def test_processor_only_sends_cache_misses_to_vep(tmp_path):
+    """A second case re-annotates only the variants not seen before"""
+    vcf = tmp_path / "tumor.vcf"
+    vcf.write_text("##fileformat=VCFv4.2\n#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n")
+
+    def filtered(*positions):
+        return [{"chromosome": "7", "position": p, "reference": "A", "alternate": "T",
+                 "quality_score": 60.0, "filter_status": "PASS"} for p in positions]
+
+    vep_inputs = []
+
+    class FakeRunner:
+        default_plugins = ["REVEL"]
+
+        def __init__(self, config=None):
+            self.config = type("Config", (), {"assembly": "GRCh38", "release": "114.1", "refs_dir": tmp_path})()
+
+        def _filter_available_plugins(self, plugins, refs_dir):
+            return plugins
+
+        def iter_annotations(self, input_vcf):
+            records = [line.split("\t") for line in input_vcf.read_text().splitlines() if not line.startswith("#")]
+            vep_inputs.append([int(r[1]) for r in records])
+            return [_annotation(r[0], int(r[1]), r[3], r[4]) for r in records]
+
+    processor = VariantProcessor(annotation_cache=VariantAnnotationCache(tmp_path / "cache.sqlite"))
+    with patch.object(variant_processor, "VEPRunner", FakeRunner):
+        first = processor._annotate_variants_with_vep(filtered(100, 200), vcf, AnalysisType.TUMOR_ONLY, "melanoma")
+        second = processor._annotate_variants_with_vep(filtered(300, 200, 100), vcf, AnalysisType.TUMOR_ONLY, "melanoma")
+
+    assert vep_inputs == [[100, 200], [300]]
+    assert [a.position for a in first] == [100, 200]
+    assert [a.position for a in second] == [300, 200, 100]
+    assert all(a.quality_score == 60.0 for a in second)
+    assert processor.annotation_cache.get_statistics()["hits"] == 2
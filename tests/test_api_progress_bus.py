@@ -0,0 +1,82 @@
+"""
+Tests for progress-frame coalescing and per-client backpressure
+"""
+
+import pytest
+
+pytest.importorskip("redis")
+
+from src.api.progress_bus import Subscription, merge_frames
+
+
+def batch(*ids):
+    return {"type": "variant_batch", "job_id": "j", "updates": [{"variant": {"id": i}} for i in ids]}
+
+
+def progress(value, status="running"):
+    return {"type": "progress", "job_id": "j", "status": status, "progress": value}
+
+
+def test_adjacent_variant_batches_join_up_to_limit():
+    entries = [("1-0", batch(1, 2)), ("2-0", batch(3)), ("3-0", batch(4, 5)), ("4-0", batch(6))]
+
+    merged = merge_frames(entries, max_frame_updates=3)
+
+    assert [[u["variant"]["id"] for u in f["updates"]] for f in merged] == [[1, 2, 3], [4, 5, 6]]
+    assert [f["event_id"] for f in merged] == ["2-0", "4-0"]  # Last entry folded into each frame
+    assert len(entries[0][1]["updates"]) == 2  # Stream entries are not mutated
+
+
+def test_batches_separated_by_kept_frames_stay_apart():
+    entries = [("1-0", batch(1)), ("2-0", progress(50, "completed")), ("3-0", batch(2))]
+
+    assert [f["type"] for f in merge_frames(entries)] == ["variant_batch", "progress", "variant_batch"]
+
+
+def test_superseded_progress_dropped_but_terminal_kept():
+    entries = [("1-0", progress(10)), ("2-0", batch(1)), ("3-0", progress(20)),
+               ("4-0", progress(90, "failed")), ("5-0", progress(95))]
+
+    merged = merge_frames(entries)
+
+    assert [(f["event_id"], f["type"]) for f in merged] == [
+        ("2-0", "variant_batch"), ("4-0", "progress"), ("5-0", "progress")]
+    assert merged[1]["status"] == "failed"
+
+
+def test_offer_drops_replay_live_overlap_by_event_id():
+    subscription = Subscription("j", last_event_id="2-0")
+    subscription.offer("1-5", batch(1))  # Already delivered before reconnect
+    subscription.offer("3-0", batch(2))
+    subscription.offer("3-0", batch(2))  # Same entry from replay and live reader
+    subscription.offer("2-9", progress(40))  # Out of order, older than what was queued
+
+    merged = subscription.drain()
+
+    assert [f["event_id"] for f in merged] == ["3-0"]
+    assert subscription.last_event_id == "3-0"
+    assert subscription.drain() == []
+
+
+def test_skip_through_discards_replayed_frames():
+    subscription = Subscription("j")
+    subscription.offer("1-0", batch(1))
+    subscription.offer("2-0", batch(2))
+
+    subscription.skip_through("1-0")
+
+    assert [f["event_id"] for f in subscription.drain()] == ["2-0"]
+
+
+def test_overflow_requests_resync():
+    subscription = Subscription("j", max_pending_variants=3)
+    subscription.offer("1-0", batch(1, 2))
+    subscription.offer("2-0", batch(3, 4))
+
+    assert subscription.overflowed
+    assert subscription._ready.is_set()  # Sender wakes to tell the client
+    assert subscription.drain() == []
+    assert subscription.last_event_id == "0"  # Client resyncs from its last delivered frame
+
+    subscription.offer("3-0", progress(50))
+    assert subscription.drain() == []
@@ -0,0 +1,103 @@
+"""
+Tests for buffered, batched persistence of API job results
+"""
+
+import pytest
+
+pytest.importorskip("asyncpg")  # src.api.database builds its async engine at import
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from src.api import result_writer
+from src.api.database import Base, Job, User, Variant
+from src.api.result_writer import VariantResultWriter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_writer.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'api.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(id=1, email="a@b.c", username="a", hashed_password="x"))
+        session.add(Job(id=1, job_id="job-1", user_id=1, name="job", input_file="in.vcf"))
+        session.commit()
+        session.commits = 0
+
+        @event.listens_for(session, "after_commit")
+        def count_commit(s):
+            s.commits += 1
+
+        yield session
+    engine.dispose()
+
+
+def _variants(start, n):
+    return [{"chromosome": "7", "position": 140453136 + i, "reference": "A", "alternate": "T",
+             "gene_symbol": f"GENE{i}", "amp_tier": "Tier I"} for i in range(start, start + n)]
+
+
+def test_flush_if_due_waits_for_row_threshold(db, clock):
+    writer = VariantResultWriter(db, 1, max_rows=3, max_interval_seconds=60)
+
+    writer.add(_variants(0, 2))
+    assert writer.flush_if_due() == []
+    assert db.query(Variant).count() == 0
+
+    writer.add(_variants(2, 1))
+    assert len(writer.flush_if_due()) == 3
+    assert writer.pending_rows == 0
+    assert db.query(Variant).count() == 3
+
+
+def test_flush_if_due_writes_after_interval(db, clock):
+    writer = VariantResultWriter(db, 1, max_rows=100, max_interval_seconds=2.0)
+
+    writer.add(_variants(0, 1))
+    writer.set_progress(40, "annotation")
+    clock.now += 1.9
+    assert writer.flush_if_due() == []
+
+    clock.now += 0.1
+    assert len(writer.flush_if_due()) == 1
+    job = db.get(Job, 1)
+    assert (job.progress, job.current_step) == (40, "annotation")
+
+    writer.add(_variants(1, 1))
+    assert writer.flush_if_due() == []  # Interval restarts at each flush
+
+
+def test_flush_returns_ids_in_buffer_order_with_one_commit(db, clock):
+    writer = VariantResultWriter(db, 1, max_rows=100)
+    variants = _variants(0, 5)
+    writer.add(variants[:3])
+    writer.add(variants[3:])
+    writer.set_progress(10, "validation")
+    writer.set_progress(55, "annotation")
+
+    persisted = writer.flush()
+
+    assert db.commits == 1
+    assert [result for _, result in persisted] == variants
+    for variant_id, result in persisted:
+        assert db.get(Variant, variant_id).gene_symbol == result["gene_symbol"]
+    assert db.get(Job, 1).progress == 55  # Only the latest progress is written
+    assert (writer.rows_written, writer.flushes) == (5, 1)
+
+    assert writer.flush() == []
+    assert db.commits == 1  # Nothing buffered, nothing written
@@ -0,0 +1,95 @@
+"""
+Tests for chunked, concurrent annotation in the API job worker
+"""
+
+import pytest
+
+pytest.importorskip("redis")
+pytest.importorskip("rq")
+pytest.importorskip("asyncpg")  # src.api.database builds its async engine at import
+
+from src.api import tasks
+
+WORKFLOW = {"variants": [{"id": i} for i in range(7)], "cancer_type": "melanoma"}
+
+
+class RecordingExecutor:
+    """Stands in for WorkflowExecutor, annotating each variant with its chunk"""
+
+    def __init__(self, fail_on=None):
+        self.chunks = []
+        self.fail_on = fail_on
+
+    def execute(self, workflow):
+        ids = [v["id"] for v in workflow["variants"]]
+        if self.fail_on in ids:
+            raise RuntimeError(f"annotation failed at variant {self.fail_on}")
+        self.chunks.append(ids)
+        return {"annotated_variants": [{**v, "chunk": ids} for v in workflow["variants"]]}
+
+
+def tagging_chunk(workflow, variants):
+    """Worker entry point that tags each variant with its chunk"""
+    return [{**v, "chunk": [x["id"] for x in variants]} for v in variants]
+
+
+def failing_chunk(workflow, variants):
+    if any(v["id"] == 4 for v in variants):
+        raise RuntimeError("worker crashed")
+    return list(variants)
+
+
+@pytest.fixture(autouse=True)
+def no_finalize(monkeypatch):
+    monkeypatch.setattr(tasks, "_finalize_variant_result", lambda result: result)
+
+
+def _collect():
+    calls = []
+    return calls, lambda current, total, message, results: calls.append((current, total, len(results)))
+
+
+def test_chunks_split_on_chunk_size_boundaries():
+    executor = RecordingExecutor()
+    calls, callback = _collect()
+
+    result = tasks.execute_with_updates(executor, WORKFLOW, callback, chunk_size=3)
+
+    assert executor.chunks == [[0, 1, 2], [3, 4, 5], [6]]
+    assert calls == [(3, 7, 3), (6, 7, 3), (7, 7, 1)]
+    assert [v["id"] for v in result["annotated_variants"]] == list(range(7))
+
+
+def test_zero_chunk_size_falls_back_to_single_variants():
+    executor = RecordingExecutor()
+    tasks.execute_with_updates(executor, WORKFLOW, lambda *args: None, chunk_size=0)
+    assert executor.chunks == [[i] for i in range(7)]
+
+
+def test_concurrent_chunks_merge_in_input_order(monkeypatch):
+    monkeypatch.setattr(tasks, "annotate_variant_chunk", tagging_chunk)
+    calls, callback = _collect()
+
+    result = tasks.execute_with_updates(None, WORKFLOW, callback, chunk_size=2, max_workers=3)
+
+    assert [v["id"] for v in result["annotated_variants"]] == list(range(7))
+    assert [v["chunk"] for v in result["annotated_variants"]][-1] == [6]
+    completed = [c[0] for c in calls]
+    assert len(calls) == 4 and completed == sorted(completed) and completed[-1] == 7
+    assert sum(c[2] for c in calls) == 7
+
+
+def test_serial_chunk_failure_propagates_after_earlier_chunks_report():
+    calls, callback = _collect()
+
+    with pytest.raises(RuntimeError, match="variant 4"):
+        tasks.execute_with_updates(RecordingExecutor(fail_on=4), WORKFLOW, callback, chunk_size=3)
+
+    assert calls == [(3, 7, 3)]
+
+
+def test_worker_failure_propagates(monkeypatch):
+    monkeypatch.setattr(tasks, "annotate_variant_chunk", failing_chunk)
+
+    with pytest.raises(RuntimeError, match="worker crashed"):
+        tasks.execute_with_updates(None, WORKFLOW, lambda *args: None, chunk_size=2, max_workers=2)
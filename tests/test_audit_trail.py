@@ -0,0 +1,175 @@
+"""
+Tests for batched, hash-chained audit trail writes
+"""
+
+import csv
+import io
+import json
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine.db.base import get_db_session, init_db
+from annotation_engine.db.audit_trail import (
+    AuditBatch, AuditContext, AuditEventType, AuditEventWriter, AuditSeverity,
+    AuditTrailManager, AuditVerificationReport, ClinicalAuditLog, GENESIS_HASH
+)
+
+CONTEXT = AuditContext(user_id="dr_smith", session_id="s1", ip_address="10.0.0.1", user_agent="pytest")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    init_db(f"sqlite:///{tmp_path / 'audit.db'}")
+    # No writer thread: rows reach the database only through explicit flushes
+    writer = AuditEventWriter(max_batch=3, max_interval_seconds=60, spool_dir=tmp_path / "spool",
+                              background=False)
+    yield AuditTrailManager(writer=writer)
+    writer.close()
+
+
+def _log(manager, n, severity=AuditSeverity.MEDIUM):
+    return [manager.log_event(AuditEventType.CASE_ACCESS, f"Accessed case {i}", CONTEXT, severity,
+                              case_uid=f"CASE_{i}")
+            for i in range(n)]
+
+
+def test_events_are_queued_then_written_in_chained_batches(manager):
+    uuids = _log(manager, 5)
+
+    with get_db_session() as session:
+        assert session.query(ClinicalAuditLog).count() == 0
+    assert manager.writer.pending_events == 5
+
+    assert manager.writer.flush() == 5
+    with get_db_session() as session:
+        batches = session.query(AuditBatch).order_by(AuditBatch.batch_id).all()
+        assert [b.event_count for b in batches] == [3, 2]
+        assert batches[0].previous_batch_id == 0 and batches[0].previous_hash == GENESIS_HASH
+        assert batches[1].previous_batch_id == batches[0].batch_id
+        assert batches[1].previous_hash == batches[0].batch_hash
+        rows = session.query(ClinicalAuditLog).all()
+        assert sorted(r.event_uuid for r in rows) == sorted(uuids)
+        assert rows[0].case_uid.startswith("CASE_")
+        batch_ids = [b.batch_id for b in batches]
+        audit_id = rows[0].audit_id
+
+    assert all(manager.verify_batch_integrity(batch_id) for batch_id in batch_ids)
+    assert manager.verify_audit_integrity(audit_id)
+
+
+def test_tampering_breaks_batch_verification(manager):
+    _log(manager, 3)
+    manager.writer.flush()
+
+    with get_db_session() as session:
+        row = session.query(ClinicalAuditLog).first()
+        row.event_description = "edited"
+        batch_id = row.batch_id
+
+    assert not manager.verify_batch_integrity(batch_id)
+
+
+def test_critical_events_are_written_immediately(manager):
+    _log(manager, 1)
+    manager.log_event(AuditEventType.UNAUTHORIZED_ACCESS, "Blocked", CONTEXT, AuditSeverity.CRITICAL)
+
+    assert manager.writer.pending_events == 0
+    with get_db_session() as session:
+        assert session.query(ClinicalAuditLog).count() == 2
+
+
+def test_unwritable_events_are_spooled_and_requeued(tmp_path):
+    @contextmanager
+    def unavailable():
+        raise RuntimeError("database down")
+        yield
+
+    writer = AuditEventWriter(max_interval_seconds=60, spool_dir=tmp_path / "spool",
+                              session_factory=unavailable)
+    manager = AuditTrailManager(writer=writer)
+    uuids = _log(manager, 2)
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert writer.pending_events == 2
+    writer.close()
+
+    init_db(f"sqlite:///{tmp_path / 'audit.db'}")
+    recovered = AuditEventWriter(max_interval_seconds=60, spool_dir=tmp_path / "spool")
+    assert recovered.pending_events == 2
+    recovered.close()
+    with get_db_session() as session:
+        assert sorted(r.event_uuid for r in session.query(ClinicalAuditLog)) == sorted(uuids)
+
+
+def test_keyset_pages_cover_the_trail_once(manager):
+    uuids = _log(manager, 7)
+
+    seen, cursor = [], None
+    while True:
+        page = manager.get_audit_trail_page(limit=3, cursor=cursor)
+        seen.extend(event["event_uuid"] for event in page["events"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 7 and set(seen) == set(uuids)
+    assert [e["event_uuid"] for e in manager.get_audit_trail()] == seen  # Same (timestamp, id) order
+    assert len(manager.get_audit_trail(limit=2)) == 2
+    assert manager.get_audit_trail_page(limit=3, case_uid="CASE_4")["events"][0]["case_uid"] == "CASE_4"
+
+
+def test_exports_stream_ndjson_and_csv(manager):
+    uuids = _log(manager, 4)
+
+    lines = "".join(manager.iter_audit_export("ndjson")).splitlines()
+    assert sorted(json.loads(line)["event_uuid"] for line in lines) == sorted(uuids)
+
+    rows = list(csv.DictReader(io.StringIO("".join(manager.iter_audit_export("csv")))))
+    assert sorted(row["event_uuid"] for row in rows) == sorted(uuids)
+    assert json.loads(rows[0]["details"])["case_uid"].startswith("CASE_")
+
+    with pytest.raises(ValueError):
+        list(manager.iter_audit_export("xml"))
+
+
+def test_full_verification_is_chunked_and_resumable(manager, tmp_path):
+    _log(manager, 10)  # Four batches of at most three events
+    manager.writer.flush()
+    checkpoint = tmp_path / "verify.json"
+
+    report = manager.verify_audit_trail(workers=2, batches_per_chunk=1, checkpoint_path=checkpoint)
+    assert report.ok
+    assert (report.batches_verified, report.events_verified) == (4, 10)
+    assert AuditVerificationReport.load(checkpoint).verified_through_batch_id == 4
+
+    _log(manager, 2)
+    manager.writer.flush()
+    with get_db_session() as session:
+        row = session.query(ClinicalAuditLog).filter(ClinicalAuditLog.batch_id == 5).first()
+        row.user_id = "someone_else"
+
+    resumed = manager.verify_audit_trail(workers=2, batches_per_chunk=1, checkpoint_path=checkpoint)
+    assert resumed.batches_verified == 5  # Only batch 5 was checked again
+    assert resumed.failed_batch_ids == [5]
+    assert not resumed.ok
+
+
+def test_background_writer_flushes_full_batches(tmp_path):
+    init_db(f"sqlite:///{tmp_path / 'audit.db'}")
+    writer = AuditEventWriter(max_batch=2, max_interval_seconds=60, spool_dir=tmp_path / "spool")
+    manager = AuditTrailManager(writer=writer)
+    _log(manager, 2)
+
+    deadline = time.monotonic() + 5
+    while writer.events_written < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    writer.close()
+
+    assert writer.events_written == 2 and writer.batches_written == 1
@@ -375,5 +375,61 @@ class TestOncogenicityIntegration:
             pytest.skip(f"Integration test requires full KB setup: {e}")
 
 
+
+def test_classify_variants_matches_per_variant(tmp_path):
+    """Batch classification reproduces classify_variant exactly"""
+    import pandas as pd
+
+    oncokb = tmp_path / "clinical_evidence/oncokb/oncokb_data"
+    oncokb.mkdir(parents=True)
+    pd.DataFrame({
+        "gene": ["BRAF", "BRAF", "KRAS", "TP53"],
+        "alteration": ["V600K", "V600E", "G12D", "R248Q"],
+        "oncogenicity": ["Likely Oncogenic", "Oncogenic", "Oncogenic", "Likely Neutral"],
+    }).to_csv(oncokb / "oncokb_all_annotated_variants.tsv", sep="\t", index=False)
+    msk = tmp_path / "hotspots/msk_hotspots"
+    msk.mkdir(parents=True)
+    pd.DataFrame({
+        "Hugo_Symbol": ["BRAF", "KRAS"],
+        "Amino_Acid_Position": [600, 12],
+        "qvalue": [0.001, 0.05],
+        "Variant_Count": [900, 40],
+    }).to_csv(msk / "cancer_hotspots_v2.5.tsv", sep="\t", index=False)
+
+    def missense(gene, hgvs_p, af=None):
+        return VariantAnnotation(
+            chromosome="1", position=1, reference="A", alternate="T", gene_symbol=gene,
+            hgvs_p=hgvs_p, consequence=["missense_variant"],
+            population_frequencies=[PopulationFrequency(database="gnomAD", population="global",
+                                                        allele_frequency=af)] if af is not None else [],
+        )
+
+    variants = [missense("BRAF", "p.V600E"), missense("KRAS", "p.G12D"), missense("TP53", "p.R248Q"),
+                missense("BRAF", "p.V600E", af=0.2), missense("EGFR", None), missense("KRAS", "p.G13D")]
+
+    batch = CGCVICCClassifier(kb_path=tmp_path).classify_variants(variants, "Melanoma")
+    single_classifier = CGCVICCClassifier(kb_path=tmp_path)
+    single = [single_classifier.classify_variant(v, "Melanoma") for v in variants]
+
+    assert batch == single
+    assert batch[0].classification == OncogenicityClassification.ONCOGENIC
+    assert {c.criterion for c in batch[0].criteria_met} >= {OncogenicityCriteria.OS1, OncogenicityCriteria.OS3}
+    assert OncogenicityCriteria.OS1 not in {c.criterion for c in batch[2].criteria_met}
+
+
+def test_op2_requires_somatic_vaf_evidence(tmp_path):
+    """OP2 reads tumor/normal VAFs; a variant carried by the matched normal is not somatic"""
+    classifier = CGCVICCClassifier(kb_path=tmp_path)
+
+    def tp53(**vafs):
+        return VariantAnnotation(chromosome="17", position=7674220, reference="C", alternate="T",
+                                 gene_symbol="TP53", consequence=["missense_variant"], **vafs)
+
+    assert classifier._evaluate_OP2(tp53(tumor_vaf=0.3)).is_met
+    assert not classifier._evaluate_OP2(tp53(tumor_vaf=0.3, normal_vaf=0.45)).is_met
+    assert not classifier._evaluate_OP2(tp53(tumor_vaf=0.05)).is_met
+    assert not classifier._evaluate_OP2(tp53()).is_met
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
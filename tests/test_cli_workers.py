@@ -0,0 +1,94 @@
+"""
+Tests for process-pool tier assignment in the CLI (--workers)
+"""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine.cli import AnnotationEngineCLI
+from annotation_engine.models import VariantAnnotation, AnalysisType
+
+
+class _FakeTierResult:
+    """Picklable stand-in for TierResult"""
+    def __init__(self, gene_symbol, worker_pid, kb_base_path):
+        self.gene_symbol = gene_symbol
+        self.worker_pid = worker_pid
+        self.kb_base_path = kb_base_path
+
+
+class _FakeTieringEngine:
+    def __init__(self, config=None, workflow_router=None):
+        self.kb_base_path = config.kb_base_path if config else None
+        self.workflow_router = workflow_router
+    
+    def assign_tier(self, annotation, cancer_type, analysis_type):
+        if annotation.gene_symbol == "FAIL":
+            raise ValueError("tiering exploded")
+        return _FakeTierResult(annotation.gene_symbol, os.getpid(), self.kb_base_path)
+
+
+def test_workers_argument():
+    parser = AnnotationEngineCLI().create_parser()
+    assert parser.parse_args([]).workers == 1
+    assert parser.parse_args(['--workers', '4']).workers == 4
+
+
+def test_parallel_tiering_preserves_order_and_errors():
+    genes = [f"GENE{i}" for i in range(20)]
+    genes[7] = "FAIL"
+    annotations = [
+        VariantAnnotation(chromosome="1", position=1000 + i, reference="A", alternate="T", gene_symbol=gene)
+        for i, gene in enumerate(genes)
+    ]
+    
+    with patch('annotation_engine.tiering.TieringEngine', _FakeTieringEngine), \
+         patch('annotation_engine.evidence_aggregator.KnowledgeBaseLoader.load_all_kbs'):
+        outcomes = AnnotationEngineCLI()._assign_tiers_parallel(
+            annotations, "melanoma", AnalysisType.TUMOR_ONLY, "SKCM", workers=3, kb_base_path="/kb/bundle"
+        )
+    
+    assert len(outcomes) == len(annotations)
+    assert outcomes[7] == (None, "tiering exploded")
+    successes = [result for result, error in outcomes if error is None]
+    assert [r.gene_symbol for r in successes] == [g for g in genes if g != "FAIL"]
+    assert all(r.worker_pid != os.getpid() for r in successes)
+    assert {r.kb_base_path for r in successes} == {"/kb/bundle"}
+
+
+def test_throughput_report(capsys):
+    AnnotationEngineCLI()._print_throughput_report({"evidence": (100, 2.0), "tiering": (100, 0.5)})
+    output = capsys.readouterr().out
+    assert "evidence: 100 variants in 2.00s (50.0 variants/s)" in output
+    assert "tiering: 100 variants in 0.50s (200.0 variants/s)" in output
+
+
+def test_vep_shards_reach_vep_configuration(tmp_path):
+    """--vep-shards sets the shard worker count VEPRunner runs with"""
+    parser = AnnotationEngineCLI().create_parser()
+    assert parser.parse_args([]).vep_shards == 1
+    
+    seen = {}
+    
+    class _RecordingRunner:
+        def __init__(self, config):
+            seen["shard_workers"] = config.shard_workers
+        
+        def iter_annotations(self, input_vcf):
+            return iter([])
+    
+    cli = AnnotationEngineCLI()
+    args = parser.parse_args(['--input', 'example_input/proper_test.vcf', '--case-uid', 'CASE_1',
+                              '--cancer-type', 'melanoma', '--output', str(tmp_path), '--vep-shards', '4'])
+    request = cli.create_analysis_request(cli.validate_arguments(args), {})
+    
+    with patch('annotation_engine.vep_runner.VEPConfiguration.validate', return_value=True), \
+         patch('annotation_engine.vep_runner.VEPRunner', _RecordingRunner):
+        assert cli._execute_annotation_pipeline(request, vep_shards=args.vep_shards) == []
+    
+    assert seen["shard_workers"] == 4
@@ -0,0 +1,94 @@
+"""
+Tests for the position-indexed ClinVar store
+"""
+
+import sys
+import gzip
+import pytest
+import numpy as np
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine.clinvar_index import ClinVarIndex
+from annotation_engine.kb_snapshot import KnowledgeBaseSnapshot, write_snapshot
+
+
+VARIANT_SUMMARY = [
+    ["VariationID", "GeneSymbol", "ClinicalSignificance", "ReviewStatus", "Assembly",
+     "Chromosome", "Start", "ReferenceAllele", "AlternateAllele",
+     "PositionVCF", "ReferenceAlleleVCF", "AlternateAlleleVCF"],
+    ["13961", "BRAF", "Pathogenic", "reviewed by expert panel", "GRCh38",
+     "7", "140753336", "na", "na", "140753336", "A", "T"],
+    ["12347", "TP53", "Likely pathogenic", "criteria provided, single submitter", "GRCh38",
+     "17", "7674220", "na", "na", "7674220", "C", "T"],
+    ["99999", "TP53", "Benign", "criteria provided, single submitter", "GRCh38",
+     "17", "7676154", "na", "na", "7676154", "G", "C"],
+    ["13961", "BRAF", "Pathogenic", "reviewed by expert panel", "GRCh37",
+     "7", "140453136", "na", "na", "140453136", "A", "T"],
+    ["55555", "-", "Uncertain significance", "no assertion criteria provided", "GRCh38",
+     "X", "1000", "na", "na", "1000", "G", "GA"],
+]
+
+
+@pytest.fixture
+def variant_summary(tmp_path):
+    path = tmp_path / "variant_summary.txt.gz"
+    with gzip.open(path, "wt") as f:
+        for row in VARIANT_SUMMARY:
+            f.write("\t".join(row) + "\n")
+    return path
+
+
+def test_exact_variant_lookup(variant_summary):
+    index = ClinVarIndex.from_variant_summary(variant_summary)
+
+    assert index.total_variants == 4  # GRCh38 rows only
+    record = index.lookup("chr7", 140753336, "A", "T")
+    assert record["significance"] == "Pathogenic"
+    assert record["significance_class"] == "pathogenic"
+    assert record["gene"] == "BRAF"
+    assert record["variation_id"] == 13961
+
+    assert index.lookup("7", 140753336, "A", "G") is None
+    assert index.lookup("7", 140453136, "A", "T") is None  # GRCh37 coordinate
+
+
+def test_gene_aggregates(variant_summary):
+    index = ClinVarIndex.from_variant_summary(variant_summary)
+
+    assert index.gene_counts("TP53") == (1, 1)
+    assert index.gene_counts("BRAF") == (1, 0)
+    assert index.gene_counts("-") == (0, 0)
+    assert index.gene_counts("KRAS") == (0, 0)
+
+
+def test_batch_lookup_preserves_order(variant_summary):
+    index = ClinVarIndex.from_variant_summary(variant_summary)
+
+    records = index.lookup_batch([
+        ("17", 7676154, "G", "C"),
+        ("1", 12345, "A", "C"),
+        ("X", 1000, "G", "GA"),
+    ])
+    assert records[0]["significance_class"] == "benign"
+    assert records[1] is None
+    assert records[2]["gene"] == "-"
+
+
+def test_index_roundtrips_through_snapshot(variant_summary, tmp_path):
+    """Snapshot stores the index as mmap-able arrays, not a pickled blob"""
+    index = ClinVarIndex.from_variant_summary(variant_summary)
+    path = tmp_path / "kb.aekb"
+    write_snapshot(path, {"clinvar_data": index}, tmp_path, [])
+
+    snapshot = KnowledgeBaseSnapshot(path, verify=True)
+    assert snapshot.section_names == ["clinvar_data"]
+    assert snapshot.manifest["sections"]["clinvar_data/loci"]["kind"] == "array"
+
+    restored = snapshot.get("clinvar_data")
+    assert isinstance(restored, ClinVarIndex)
+    assert np.array_equal(restored.loci, index.loci)
+    assert restored.lookup("7", 140753336, "A", "T")["gene"] == "BRAF"
+    assert restored.gene_counts("TP53") == (1, 1)
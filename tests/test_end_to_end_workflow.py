@@ -53,7 +53,7 @@ class TestEndToEndWorkflow:
                 
                 f.write(f"{chrom}\t{pos}\t.\t{ref}\t{alt}\t{qual}\t{filt}\t{info}\t{fmt}\t{sample}\n")
     
-    @patch('annotation_engine.vep_runner.VEPRunner.annotate_vcf')
+    @patch('annotation_engine.vep_runner.VEPRunner.iter_annotations')
     def test_tumor_only_workflow(self, mock_vep_annotate):
         """Test complete tumor-only workflow from CLI to results"""
         
@@ -133,7 +133,7 @@ class TestEndToEndWorkflow:
             assert variant['gene_annotation']['gene_symbol'] == 'BRAF'
             assert variant['variant_id'] == '7_140753336_A_T'
     
-    @patch('annotation_engine.vep_runner.VEPRunner.annotate_vcf')
+    @patch('annotation_engine.vep_runner.VEPRunner.iter_annotations')
     def test_tumor_normal_workflow(self, mock_vep_annotate):
         """Test complete tumor-normal workflow from CLI to results"""
         
@@ -266,7 +266,7 @@ class TestEndToEndWorkflow:
             # Should succeed but not run pipeline
             assert result == 0
     
-    @patch('annotation_engine.vep_runner.VEPRunner.annotate_vcf')
+    @patch('annotation_engine.vep_runner.VEPRunner.iter_annotations')
     def test_pipeline_error_handling(self, mock_vep_annotate):
         """Test error handling when pipeline fails"""
         
@@ -291,7 +291,8 @@ class TestEndToEndWorkflow:
             args = [
                 '--input', str(vcf_file),
                 '--case-uid', 'TEST_005',
-                '--cancer-type', 'melanoma'
+                '--cancer-type', 'melanoma',
+                '--output', str(temp_path / "results")
             ]
             
             # Execute CLI
@@ -0,0 +1,100 @@
+"""
+Tests for batched evidence aggregation
+"""
+
+import sys
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine import evidence_aggregator
+from annotation_engine.clinvar_index import ClinVarIndex
+from annotation_engine.evidence_aggregator import EvidenceAggregator
+from annotation_engine.interval_index import IntervalIndex
+from annotation_engine.models import AnalysisType, PopulationFrequency, VariantAnnotation
+from annotation_engine.workflow_router import create_workflow_router
+
+
+@pytest.fixture
+def kb_cache(monkeypatch):
+    """Small in-memory KB in place of the .refs bundle"""
+    clinvar = ClinVarIndex.from_dataframe(pd.DataFrame({
+        'VariationID': [13961, 99999],
+        'GeneSymbol': ['BRAF', 'TP53'],
+        'ClinicalSignificance': ['Pathogenic', 'Benign'],
+        'ReviewStatus': ['reviewed by expert panel', 'criteria provided, single submitter'],
+        'Chromosome': ['7', '17'],
+        'PositionVCF': [140753336, 7676154],
+        'ReferenceAlleleVCF': ['A', 'G'],
+        'AlternateAlleleVCF': ['T', 'C'],
+    }))
+    cache = {
+        'oncovi_tsg': {'TP53'},
+        'oncovi_oncogenes': {'BRAF', 'KRAS'},
+        'cosmic_cgc': {'BRAF': {'role_in_cancer': 'oncogene'}},
+        'oncovi_domains': IntervalIndex.build([
+            ('BRAF', 457, 717, {'domain': 'kinase', 'start': 457, 'end': 717, 'importance': 'critical'})]),
+        'oncokb_variants': {
+            'BRAF:V600E': {'gene': 'BRAF', 'alteration': 'V600E', 'evidence_items': [
+                {'level': '1', 'cancer_type': 'Melanoma', 'drugs': 'Dabrafenib'}]},
+            'KRAS:Oncogenic Mutations': {'gene': 'KRAS', 'alteration': 'Oncogenic Mutations', 'evidence_items': [
+                {'level': '4', 'cancer_type': 'All Solid Tumors', 'drugs': 'Trametinib'}]},
+        },
+        'clinvar_data': clinvar,
+    }
+    monkeypatch.setattr(evidence_aggregator, "_KB_CACHE", cache)
+    monkeypatch.setattr(evidence_aggregator, "_KB_LOADED", True)
+    return cache
+
+
+def _variant(chrom, pos, ref, alt, gene, hgvs_p=None, consequence="missense_variant", af=None):
+    return VariantAnnotation(
+        chromosome=chrom, position=pos, reference=ref, alternate=alt, gene_symbol=gene,
+        hgvs_p=hgvs_p, consequence=[consequence],
+        population_frequencies=[PopulationFrequency(database="gnomAD", population="global",
+                                                    allele_frequency=af)] if af is not None else [],
+    )
+
+
+VARIANTS = [
+    _variant("17", 7674220, "C", "T", "TP53", "p.Arg248Gln", "stop_gained", af=0.00001),
+    _variant("7", 140753336, "A", "T", "BRAF", "p.Val600Glu"),
+    _variant("12", 25245350, "C", "A", "KRAS", "p.Gly12Val"),
+    _variant("7", 140753336, "A", "T", "BRAF", "p.Val600Glu"),
+    _variant("17", 7676154, "G", "C", "TP53", "p.Pro72Arg", af=0.3),
+    _variant("1", 1000, "A", "C", "NOTAGENE"),
+]
+
+
+def _comparable(evidence_lists):
+    return [[e.model_dump(exclude={"created_at"}) for e in evidence] for evidence in evidence_lists]
+
+
+@pytest.mark.parametrize("analysis_type", [AnalysisType.TUMOR_ONLY, AnalysisType.TUMOR_NORMAL])
+@pytest.mark.parametrize("with_router", [False, True])
+def test_batch_matches_per_variant_aggregation(kb_cache, analysis_type, with_router):
+    router = create_workflow_router(analysis_type, "SKCM") if with_router else None
+    aggregator = EvidenceAggregator(workflow_router=router)
+
+    single = [aggregator.aggregate_evidence(v, "melanoma", analysis_type) for v in VARIANTS]
+    batch = aggregator.aggregate_evidence_batch(VARIANTS, "melanoma", analysis_type)
+
+    assert _comparable(batch) == _comparable(single)
+    assert batch[5] == []
+
+
+def test_batch_evidence_content(kb_cache):
+    aggregator = EvidenceAggregator()
+    batch = aggregator.aggregate_evidence_batch(VARIANTS, "melanoma", AnalysisType.TUMOR_ONLY)
+
+    braf_codes = [e.code for e in batch[1]]
+    assert {"OS1", "OM4", "ONCOKB_LEVEL_1", "OM1", "SBVS1"} <= set(braf_codes)
+    clinvar = next(e for e in batch[1] if e.source_kb == "ClinVar")
+    assert clinvar.data["exact_match"]["variation_id"] == 13961
+
+    assert "OVS1" in [e.code for e in batch[0]]
+    assert "ONCOKB_LEVEL_4" in [e.code for e in batch[2]]
+    assert aggregator.aggregate_evidence_batch([], "melanoma") == []
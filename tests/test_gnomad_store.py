@@ -0,0 +1,144 @@
+"""
+Tests for the local gnomAD allele-frequency store
+"""
+
+import gzip
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine import evidence_aggregator
+from annotation_engine.evidence_aggregator import EvidenceAggregator
+from annotation_engine.gnomad_store import build_gnomad_store, load_gnomad_store
+from annotation_engine.models import AnalysisType, VariantAnnotation
+from annotation_engine.vcf_filtering import TumorOnlyFilter
+
+CHR7_EXTRACT = [
+    ("CHROM", "POS", "REF", "ALT", "AF", "AF_grpmax"),
+    ("chr7", "140753336", "A", "T", "0.00001", "."),
+    ("chr7", "140753400", "G", "A", "0.02", "0.15"),
+    ("chr7", "140753500", "C", "T", ".", "."),
+]
+CHR17_EXTRACT = [
+    ("CHROM", "POS", "REF", "ALT", "AF"),
+    ("chr17", "7676154", "G", "C", "0.3"),
+    ("chr17", "7676154", "G", "C", "0.6"),
+    ("chrUn_KI270742v1", "100", "A", "G", "0.5"),
+]
+
+VCF_HEADER = """##fileformat=VCFv4.2
+##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+##FORMAT=<ID=AD,Number=R,Type=Integer,Description="Allelic depths">
+##FORMAT=<ID=DP,Number=1,Type=Integer,Description="Sample depth">
+#CHROM	POS	ID	REF	ALT	QUAL	FILTER	INFO	FORMAT	SAMPLE
+"""
+
+
+def _write_tsv(path: Path, rows) -> Path:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "wt") as f:
+        for row in rows:
+            f.write("\t".join(row) + "\n")
+    return path
+
+
+@pytest.fixture
+def gnomad_store(tmp_path):
+    extracts = [_write_tsv(tmp_path / "gnomad_chr7.tsv", CHR7_EXTRACT),
+                _write_tsv(tmp_path / "gnomad_chr17.tsv.gz", CHR17_EXTRACT)]
+    store_path = tmp_path / "gnomad_af.aegaf"
+    build_gnomad_store(extracts, store_path, dataset="gnomAD_v4")
+    return store_path
+
+
+def test_lookup_round_trip(gnomad_store):
+    store = load_gnomad_store(gnomad_store)
+
+    assert len(store) == 4  # duplicate collapsed, non-primary contig dropped
+    assert store.columns["af"].dtype == np.float16
+    assert not store.loci.flags.owndata  # view over the mapped file
+
+    record = store.lookup("7", 140753400, "G", "A")
+    assert record["dataset"] == "gnomAD_v4"
+    assert record["af"] == pytest.approx(0.02, rel=1e-3)
+    assert record["af_grpmax"] == pytest.approx(0.15, rel=1e-3)
+    assert store.lookup("chr7", 140753336, "A", "T")["af_grpmax"] is None
+    assert store.lookup("17", 7676154, "G", "C")["af"] == pytest.approx(0.6, rel=1e-3)
+    assert store.lookup("7", 140753336, "A", "G") is None
+    assert load_gnomad_store(gnomad_store) is store
+
+
+def test_max_af_batch(gnomad_store):
+    store = load_gnomad_store(gnomad_store)
+
+    afs = store.max_af_batch([("7", 140753400, "G", "A"), ("7", 140753336, "A", "T"),
+                              ("7", 140753500, "C", "T"), ("1", 1, "A", "C")])
+
+    assert afs[0] == pytest.approx(0.15, rel=1e-3)
+    assert afs[1] == pytest.approx(0.00001, rel=1e-2)
+    assert np.isnan(afs[2]) and np.isnan(afs[3])
+
+
+def test_tumor_only_filter_uses_store(gnomad_store, tmp_path):
+    tumor_vcf = tmp_path / "tumor.vcf"
+    with open(tumor_vcf, "w") as f:
+        f.write(VCF_HEADER)
+        for chrom, pos, ref, alt in [("7", 140753336, "A", "T"), ("7", 140753400, "G", "A"),
+                                     ("17", 7676154, "G", "C"), ("1", 1000, "A", "C")]:
+            f.write(f"{chrom}\t{pos}\t.\t{ref}\t{alt}\t60\tPASS\t.\tGT:AD:DP\t0/1:40,20:60\n")
+
+    somatic = TumorOnlyFilter(gnomad_store_path=gnomad_store).filter_variants(tumor_vcf)
+
+    assert [(v["chromosome"], v["position"]) for v in somatic] == [("7", 140753336), ("1", 1000)]
+
+
+def test_population_evidence_from_store(gnomad_store, monkeypatch):
+    monkeypatch.setattr(evidence_aggregator, "_KB_CACHE", {"gnomad_af": load_gnomad_store(gnomad_store)})
+    monkeypatch.setattr(evidence_aggregator, "_KB_LOADED", True)
+    variants = [
+        VariantAnnotation(chromosome="17", position=7676154, reference="G", alternate="C",
+                          gene_symbol="TP53", consequence=["missense_variant"]),
+        VariantAnnotation(chromosome="7", position=140753336, reference="A", alternate="T",
+                          gene_symbol="BRAF", consequence=["missense_variant"]),
+    ]
+    aggregator = EvidenceAggregator()
+
+    batch = aggregator.aggregate_evidence_batch(variants, analysis_type=AnalysisType.TUMOR_ONLY)
+    single = [aggregator.aggregate_evidence(v, analysis_type=AnalysisType.TUMOR_ONLY) for v in variants]
+
+    common = {e.code: e for e in batch[0]}
+    assert {"SBVS1", "COMMON_VARIANT"} <= set(common)
+    assert common["SBVS1"].source_kb == "gnomAD_v4"
+    assert "OP4" in {e.code for e in batch[1]}
+    assert ([[e.model_dump(exclude={"created_at"}) for e in evidence] for evidence in batch] ==
+            [[e.model_dump(exclude={"created_at"}) for e in evidence] for evidence in single])
+
+
+def test_pipeline_filters_against_kb_bundle_store(tmp_path, monkeypatch):
+    from annotation_engine import variant_processor
+    from annotation_engine.gnomad_store import default_gnomad_store_path
+
+    kb_base_path = tmp_path / "kb"
+    store_path = default_gnomad_store_path(kb_base_path)
+    store_path.parent.mkdir(parents=True)
+    build_gnomad_store([_write_tsv(tmp_path / "gnomad_chr7.tsv", CHR7_EXTRACT),
+                        _write_tsv(tmp_path / "gnomad_chr17.tsv.gz", CHR17_EXTRACT)], store_path)
+    tumor_vcf = tmp_path / "tumor.vcf"
+    with open(tumor_vcf, "w") as f:
+        f.write(VCF_HEADER)
+        for chrom, pos, ref, alt in [("7", 140753336, "A", "T"), ("17", 7676154, "G", "C")]:
+            f.write(f"{chrom}\t{pos}\t.\t{ref}\t{alt}\t60\tPASS\t.\tGT:AD:DP\t0/1:40,20:60\n")
+
+    def no_vep(config=None):
+        raise RuntimeError("VEP unavailable")
+    monkeypatch.setattr(variant_processor, "VEPRunner", no_vep)
+
+    annotations, summary = variant_processor.create_variant_annotations_from_vcf(
+        tumor_vcf, AnalysisType.TUMOR_ONLY, kb_base_path=str(kb_base_path))
+
+    assert summary["filtering"]["filter_reasons"]["high_population_af"] == 1
+    assert [(a.chromosome, a.position) for a in annotations] == [("7", 140753336)]
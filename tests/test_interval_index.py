@@ -0,0 +1,161 @@
+"""
+Tests for the hotspot / protein domain interval index
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine.interval_index import IntervalIndex, genomic_key, residue_index
+from annotation_engine.kb_snapshot import KnowledgeBaseSnapshot, write_snapshot
+from annotation_engine.cgc_vicc_classifier import CGCVICCClassifier
+from annotation_engine.models import VariantAnnotation
+
+
+def _brute_force(intervals, key, start, end):
+    return [record for k, s, e, record in intervals if k == key and s <= end and e >= start]
+
+
+def test_overlapping_matches_linear_scan():
+    rng = np.random.default_rng(7)
+    intervals = []
+    for i in range(500):
+        start = int(rng.integers(1, 2000))
+        intervals.append((str(rng.choice(["BRAF", "TP53", "EGFR"])), start,
+                          start + int(rng.integers(0, 300)), {"id": i}))
+    index = IntervalIndex.build(intervals)
+
+    assert len(index) == 500
+    for _ in range(200):
+        key = str(rng.choice(["BRAF", "TP53", "EGFR", "KRAS"]))
+        start = int(rng.integers(0, 2400))
+        end = start + int(rng.integers(0, 50))
+        assert index.overlapping(key, start, end) == _brute_force(intervals, key, start, end)
+
+
+def test_point_batch_matches_single_queries():
+    rng = np.random.default_rng(11)
+    intervals = [("TP53", int(s), int(s) + int(w), {"id": i})
+                 for i, (s, w) in enumerate(zip(rng.integers(1, 400, 200), rng.integers(0, 20, 200)))]
+    index = IntervalIndex.build(intervals)
+    points = rng.integers(0, 450, 100).tolist()
+
+    assert index.overlapping_points("TP53", points) == [index.overlapping("TP53", p) for p in points]
+    assert index.overlapping_points("KRAS", [12, 13]) == [[], []]
+
+
+def test_point_query_returns_file_order():
+    index = IntervalIndex.build([
+        ("BRAF", 457, 717, {"domain": "kinase"}),
+        ("BRAF", 155, 227, {"domain": "RBD"}),
+        ("BRAF", 594, 600, {"domain": "activation_loop"}),
+    ])
+
+    assert [d["domain"] for d in index.overlapping("BRAF", 600)] == ["kinase", "activation_loop"]
+    assert index.overlapping("BRAF", 300) == []
+    assert index.overlapping("KRAS", 12) == []
+    assert [d["domain"] for d in index.get("BRAF")] == ["kinase", "RBD", "activation_loop"]
+
+
+def test_genomic_key_normalization():
+    assert genomic_key("chr7") == genomic_key("7") == "7"
+    assert genomic_key("chrM") == "MT"
+    assert genomic_key("x") == "X"
+
+
+def test_index_roundtrips_through_snapshot(tmp_path):
+    index = residue_index(pd.DataFrame({
+        "gene": ["KRAS", "KRAS", "TP53", None],
+        "position": [12, 13, 248, 1],
+        "frequency": [0.4, 0.1, 0.2, 0.0],
+    }), "gene", "position")
+    path = tmp_path / "kb.aekb"
+    write_snapshot(path, {"hotspots": index}, tmp_path, [])
+
+    snapshot = KnowledgeBaseSnapshot(path)
+    assert snapshot.manifest["sections"]["hotspots/starts"]["kind"] == "array"
+    restored = snapshot.get("hotspots")
+    assert len(restored) == 3
+    assert restored.overlapping("KRAS", 12)[0]["frequency"] == pytest.approx(0.4)
+
+
+@pytest.fixture
+def refs_dir(tmp_path):
+    msk = tmp_path / "hotspots/msk_hotspots"
+    msk.mkdir(parents=True)
+    pd.DataFrame({
+        "Hugo_Symbol": ["BRAF", "KRAS", "BRAF"],
+        "Amino_Acid_Position": [600, 12, 600],
+        "qvalue": [0.001, 0.05, 0.5],
+        "Variant_Count": [900, 40, 3],
+    }).to_csv(msk / "cancer_hotspots_v2.5.tsv", sep="\t", index=False)
+
+    domains = tmp_path / "functional_predictions/plugin_data/protein_domains"
+    domains.mkdir(parents=True)
+    pd.DataFrame({
+        "gene": ["TP53", "TP53"],
+        "domain": ["DNA_binding", "tetramerization"],
+        "start": [102, 325],
+        "end": [292, 356],
+        "importance": ["critical", "moderate"],
+    }).to_csv(domains / "oncovi_domains.tsv", sep="\t", index=False)
+    return tmp_path
+
+
+def _missense(gene, hgvs_p):
+    return VariantAnnotation(chromosome="1", position=1, reference="A", alternate="T",
+                             gene_symbol=gene, hgvs_p=hgvs_p, consequence=["missense_variant"])
+
+
+def test_classifier_hotspot_criteria_use_index(refs_dir):
+    classifier = CGCVICCClassifier(kb_path=refs_dir)
+
+    os3 = classifier._evaluate_OS3(_missense("BRAF", "p.V600E"), None)
+    assert os3.is_met
+    assert os3.evidence_sources[0]["samples"] == 900
+
+    assert not classifier._evaluate_OS3(_missense("KRAS", "p.G12D"), None).is_met
+    assert classifier._evaluate_OM3(_missense("KRAS", "p.G12D"), None).is_met
+    assert not classifier._evaluate_OM3(_missense("KRAS", "p.G13D"), None).is_met
+
+
+def test_classifier_om1_uses_domain_index(refs_dir):
+    classifier = CGCVICCClassifier(kb_path=refs_dir)
+
+    om1 = classifier._evaluate_OM1(_missense("TP53", "p.R248Q"))
+    assert om1.is_met
+    assert om1.evidence_sources[0]["domain"] == "DNA_binding"
+    assert not classifier._evaluate_OM1(_missense("TP53", "p.R337H")).is_met
+
+
+def test_aggregator_hotspot_evidence_queries_msk_index(monkeypatch):
+    """MSK hotspots reach VICC hotspot codes through the genomic interval index"""
+    from annotation_engine import evidence_aggregator
+    from annotation_engine.evidence_aggregator import EvidenceAggregator
+    from annotation_engine.models import AnalysisType, HotspotEvidence
+
+    index = IntervalIndex.build([
+        ("7", 140753336, 140753336, {"gene": "BRAF", "samples": 897, "source": "MSK_hotspots"}),
+        ("7", 140753336, 140753336, {"gene": "OTHER", "samples": 5000, "source": "MSK_hotspots"}),
+        ("12", 25245350, 25245350, {"gene": "KRAS", "samples": "12", "source": "MSK_hotspots"}),
+    ])
+    monkeypatch.setattr(evidence_aggregator, "_KB_CACHE", {"cosmic_hotspots": index})
+    aggregator = EvidenceAggregator()
+
+    def codes(chrom, pos, gene, **kwargs):
+        variant = VariantAnnotation(chromosome=chrom, position=pos, reference="C", alternate="A",
+                                    gene_symbol=gene, **kwargs)
+        return [(e.code, e.data["samples"]) for e in
+                aggregator._get_hotspot_evidence(variant, AnalysisType.TUMOR_ONLY)]
+
+    assert codes("chr7", 140753336, "BRAF") == [("OS3", 897)]
+    assert codes("12", 25245350, "KRAS") == [("OM3", 12)]
+    assert codes("7", 140753337, "BRAF") == []
+    # Hotspots already annotated from MSK are not counted twice
+    annotated = [HotspotEvidence(source="MSK_hotspots", samples_observed=4, hotspot_type="single_residue")]
+    assert codes("7", 140753336, "BRAF", hotspot_evidence=annotated) == [("OP3", 4)]
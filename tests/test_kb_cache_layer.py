@@ -0,0 +1,68 @@
+"""
+Tests for the in-process L1 in front of the knowledge base cache
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine.db import caching_layer
+from annotation_engine.db.base import get_db_session, init_db
+from annotation_engine.db.caching_layer import KnowledgeBaseCacheManager
+from annotation_engine.db.expanded_models import KnowledgeBaseCache
+
+RESULT = {"gene": "BRAF", "variant": "V600E", "oncogenic": "Oncogenic"}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    init_db(f"sqlite:///{tmp_path / 'kb_cache.db'}")
+    manager = KnowledgeBaseCacheManager(access_flush_seconds=3600)
+    yield manager
+    manager.close()
+
+
+def _access_count(cache_key):
+    with get_db_session() as session:
+        return session.query(KnowledgeBaseCache).filter(KnowledgeBaseCache.cache_key == cache_key).one().access_count
+
+
+def test_reads_are_served_from_l1_after_first_hit(manager):
+    key = manager.generate_cache_key(gene="BRAF", variant="V600E")
+    assert manager.cache_result(key, "oncokb", "variant_lookup", RESULT)
+
+    assert manager.get_cached_result(key, "oncokb", "variant_lookup") == RESULT  # From the database
+    with patch.object(caching_layer, "get_db_session", side_effect=AssertionError("database hit")):
+        assert manager.get_cached_result(key, "oncokb", "variant_lookup") == RESULT
+
+    assert manager.stats.cache_hits == 2
+    assert manager.stats.l1_hits == 1
+
+
+def test_access_statistics_are_flushed_in_bulk(manager):
+    key = manager.generate_cache_key(gene="EGFR", variant="L858R")
+    manager.cache_result(key, "oncokb", "variant_lookup", RESULT)
+
+    for _ in range(3):
+        manager.get_cached_result(key, "oncokb", "variant_lookup")
+    assert _access_count(key) == 0
+
+    assert manager.flush_access_stats() == 1
+    assert _access_count(key) == 3
+    assert manager.flush_access_stats() == 0
+
+
+def test_invalidation_reaches_l1(manager):
+    key = manager.generate_cache_key(gene="KRAS", variant="G12D")
+    manager.cache_result(key, "oncokb", "variant_lookup", RESULT)
+    manager.get_cached_result(key, "oncokb", "variant_lookup")
+
+    manager.invalidate_cache(kb_source="oncokb")
+
+    assert manager.get_cached_result(key, "oncokb", "variant_lookup") is None
+    assert manager.l1.get_stats()["entries"] == 0
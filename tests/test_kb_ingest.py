@@ -0,0 +1,109 @@
+"""
+Tests for the vectorized KB ingestion helpers and the loaders built on them
+"""
+
+import sys
+import math
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine.kb_ingest import (
+    read_kb_table, records_by_key, grouped_records, require_columns
+)
+from annotation_engine.evidence_aggregator import KnowledgeBaseLoader
+
+
+def _write(path, rows, compression=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(rows).to_csv(path, sep="\t", index=False, compression=compression)
+
+
+def test_read_kb_table_selects_columns_and_categories(tmp_path):
+    path = tmp_path / "genes.tsv"
+    _write(path, {"gene": ["BRAF", "TP53", "BRAF"], "score": [1, 2, 3], "unused": ["x", "y", "z"]})
+
+    df = read_kb_table(path, columns=["gene", "score", "absent"], categorical=["gene"])
+
+    assert list(df.columns) == ["gene", "score"]
+    assert isinstance(df["gene"].dtype, pd.CategoricalDtype)
+
+
+def test_records_by_key_defaults_and_last_row_wins():
+    df = pd.DataFrame({"gene": pd.Categorical(["BRAF", "TP53", "BRAF"]),
+                       "role": ["oncogene", None, "kinase"]})
+
+    records = records_by_key(df, "gene", {"role": "role", "summary": ("summary", ""),
+                                          "flag": df["gene"].astype(str) == "TP53"})
+
+    assert list(records) == ["BRAF", "TP53"]
+    assert records["BRAF"] == {"role": "kinase", "summary": "", "flag": False}
+    assert records["TP53"]["role"] is None
+    assert records["TP53"]["flag"] is True
+
+
+def test_grouped_records_keeps_first_occurrence_order():
+    df = pd.DataFrame({"Gene": pd.Categorical(["KRAS", "BRAF", "KRAS", None]),
+                       "Alt": ["G12D", "V600E", "G12D", "X"],
+                       "Level": ["1", "2", "3A", "4"]})
+
+    groups = grouped_records(df, ["Gene", "Alt"], {"level": "Level"})
+
+    keys = list(groups)
+    assert keys[:2] == [("KRAS", "G12D"), ("BRAF", "V600E")]
+    assert groups[("KRAS", "G12D")] == [{"level": "1"}, {"level": "3A"}]
+    assert math.isnan(keys[2][0])  # missing keys are kept, not dropped
+
+
+def test_require_columns():
+    with pytest.raises(KeyError, match="Level"):
+        require_columns(pd.DataFrame({"Gene": []}), "Gene", "Level")
+
+
+@pytest.fixture
+def loader(tmp_path):
+    oncokb = tmp_path / "clinical_evidence" / "oncokb"
+    _write(oncokb / "oncokb_biomarker_drug_associations.tsv", {
+        "Level": ["1", "R1", "4"],
+        "Gene": ["BRAF", "BRAF", "KRAS"],
+        "Alterations": ["V600E", "V600E", "Oncogenic Mutations"],
+        "Cancer Types": ["Melanoma", "Melanoma", "All Solid Tumors"],
+        "Drugs (for therapeutic implications only)": ["Dabrafenib", "Vemurafenib", "Trametinib"],
+    })
+    _write(tmp_path / "cancer_genes" / "cosmic_cgc" / "cancer_gene_census.tsv.gz", {
+        "GENE_SYMBOL": ["BRAF", "TP53"],
+        "ROLE_IN_CANCER": ["oncogene, fusion", "TSG"],
+    }, compression="gzip")
+    _write(tmp_path / "hotspots" / "oncovi_hotspots" / "single_residue_hotspots.tsv", {
+        "gene": ["BRAF", "KRAS"], "residue": ["V600", "G12"], "cancer_types": ["melanoma,thyroid", None],
+    })
+    return KnowledgeBaseLoader(kb_base_path=str(tmp_path))
+
+
+def test_oncokb_variants_grouped_by_alteration(loader):
+    variants = loader._load_oncokb_variants()
+
+    assert list(variants) == ["BRAF:V600E", "KRAS:Oncogenic Mutations"]
+    items = variants["BRAF:V600E"]["evidence_items"]
+    assert [item["drugs"] for item in items] == ["Dabrafenib", "Vemurafenib"]
+    assert items[1]["therapeutic_level"] == "LEVEL_R1"
+
+
+def test_cosmic_cgc_roles(loader):
+    genes = loader._load_cosmic_cgc()
+
+    assert genes["BRAF"]["is_oncogene"] is True
+    assert genes["BRAF"]["is_tsg"] is False
+    assert genes["TP53"]["is_tsg"] is True
+    assert genes["TP53"]["tumour_types_somatic"] == ""
+
+
+def test_oncovi_hotspots_tolerate_missing_cancer_types(loader):
+    hotspots = loader._load_oncovi_hotspots()
+
+    assert hotspots["BRAF:V600"]["cancer_types"] == ["melanoma", "thyroid"]
+    assert hotspots["KRAS:G12"]["cancer_types"] == [""]
+    assert hotspots["KRAS:G12"]["samples"] == 0
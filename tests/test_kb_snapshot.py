@@ -0,0 +1,163 @@
+"""
+Tests for compiled, memory-mapped knowledge base snapshots
+"""
+
+import sys
+import os
+import pytest
+import numpy as np
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine import evidence_aggregator
+from annotation_engine.evidence_aggregator import KnowledgeBaseLoader
+from annotation_engine.kb_snapshot import (
+    KnowledgeBaseSnapshot, SnapshotError, write_snapshot
+)
+
+
+@pytest.fixture
+def kb_dir(tmp_path):
+    """Minimal KB tree with an OncoKB gene file and OncoVI gene lists"""
+    oncokb = tmp_path / "clinical_evidence" / "oncokb"
+    oncokb.mkdir(parents=True)
+    (oncokb / "curated_genes.tsv").write_text(
+        "hugoSymbol\toncogene\ttsg\thighestSensitiveLevel\n"
+        "BRAF\tTRUE\tFALSE\tLEVEL_1\n"
+        "TP53\tFALSE\tTRUE\t\n"
+    )
+    lists = tmp_path / "cancer_genes" / "oncovi_lists"
+    lists.mkdir(parents=True)
+    (lists / "tumor_suppressors.txt").write_text("TP53\nPTEN\n")
+    (lists / "oncogenes.txt").write_text("BRAF\nKRAS\n")
+    return tmp_path
+
+
+@pytest.fixture
+def fresh_kb_cache(monkeypatch):
+    """Isolate the module-level KB cache for each test"""
+    monkeypatch.setattr(evidence_aggregator, "_KB_CACHE", {})
+    monkeypatch.setattr(evidence_aggregator, "_KB_LOADED", False)
+    monkeypatch.setattr(evidence_aggregator, "_KB_SNAPSHOT", None)
+    return evidence_aggregator._KB_CACHE
+
+
+def test_snapshot_roundtrip_objects_and_arrays(tmp_path):
+    """Pickled sections and raw arrays survive a write/read cycle"""
+    positions = np.array([10, 20, 30], dtype=np.int64)
+    path = tmp_path / "kb.aekb"
+    manifest = write_snapshot(path, {"genes": {"BRAF": {"is_oncogene": True}}, "positions": positions},
+                              tmp_path, [])
+
+    snapshot = KnowledgeBaseSnapshot(path, verify=True)
+    assert snapshot.snapshot_id == manifest["snapshot_id"]
+    assert snapshot.get("genes") == {"BRAF": {"is_oncogene": True}}
+
+    mapped = snapshot.get("positions")
+    assert np.array_equal(mapped, positions)
+    assert not mapped.flags.writeable  # zero-copy view over the read-only mmap
+
+
+def test_snapshot_detects_corruption(tmp_path):
+    """A flipped payload byte fails checksum verification"""
+    path = tmp_path / "kb.aekb"
+    write_snapshot(path, {"genes": {"BRAF": 1}}, tmp_path, [])
+
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(SnapshotError):
+        KnowledgeBaseSnapshot(path, verify=True)
+
+
+def test_snapshot_rejects_non_snapshot_file(tmp_path):
+    path = tmp_path / "kb.aekb"
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(SnapshotError):
+        KnowledgeBaseSnapshot(path)
+
+
+def test_loader_prefers_current_snapshot(kb_dir, fresh_kb_cache):
+    """load_all_kbs uses the compiled snapshot instead of re-parsing"""
+    loader = KnowledgeBaseLoader(str(kb_dir))
+    manifest = loader.compile_snapshot()
+    assert "clinical_evidence/oncokb/curated_genes.tsv" in manifest["sources"]
+
+    loader.load_all_kbs()
+
+    assert evidence_aggregator.get_kb_snapshot_id() == manifest["snapshot_id"]
+    assert fresh_kb_cache["oncovi_tsg"] == {"TP53", "PTEN"}
+    assert fresh_kb_cache["oncokb_genes"]["BRAF"]["is_oncogene"] is True
+
+
+def test_loader_ignores_stale_snapshot(kb_dir, fresh_kb_cache):
+    """Edited source files invalidate the snapshot and trigger a re-parse"""
+    loader = KnowledgeBaseLoader(str(kb_dir))
+    loader.compile_snapshot()
+
+    tsg_file = kb_dir / "cancer_genes" / "oncovi_lists" / "tumor_suppressors.txt"
+    tsg_file.write_text("TP53\nPTEN\nRB1\n")
+    os.utime(tsg_file, ns=(0, 0))
+
+    loader.load_all_kbs()
+
+    assert evidence_aggregator.get_kb_snapshot_id() is None
+    assert "RB1" in fresh_kb_cache["oncovi_tsg"]
+
+
+def test_loader_reparses_corrupt_snapshot(kb_dir, fresh_kb_cache):
+    """A damaged snapshot is rejected and the loader falls back to the source files"""
+    loader = KnowledgeBaseLoader(str(kb_dir))
+    loader.compile_snapshot()
+
+    data = bytearray(loader.snapshot_path.read_bytes())
+    data[-1] ^= 0xFF
+    loader.snapshot_path.write_bytes(bytes(data))
+
+    loader.load_all_kbs()
+
+    assert evidence_aggregator.get_kb_snapshot_id() is None
+    assert fresh_kb_cache["oncovi_tsg"] == {"TP53", "PTEN"}
+
+
+def test_snapshot_rejects_tampered_manifest(tmp_path):
+    """Section checksums in the header must add up to the recorded snapshot id"""
+    path = tmp_path / "kb.aekb"
+    manifest = write_snapshot(path, {"genes": {"BRAF": 1}}, tmp_path, [])
+
+    data = path.read_bytes().replace(manifest["snapshot_id"].encode(), b"0" * 64)
+    path.write_bytes(data)
+
+    with pytest.raises(SnapshotError):
+        KnowledgeBaseSnapshot(path)
+
+
+def test_loader_reparses_snapshot_from_older_format(kb_dir, fresh_kb_cache, monkeypatch):
+    """Snapshots written with a previous section encoding are not misread"""
+    from annotation_engine import kb_snapshot
+
+    loader = KnowledgeBaseLoader(str(kb_dir))
+    with monkeypatch.context() as m:
+        m.setattr(kb_snapshot, "SNAPSHOT_FORMAT_VERSION", kb_snapshot.SNAPSHOT_FORMAT_VERSION - 1)
+        loader.compile_snapshot()
+
+    loader.load_all_kbs()
+
+    assert evidence_aggregator.get_kb_snapshot_id() is None
+    assert fresh_kb_cache["oncokb_genes"]["BRAF"]["is_oncogene"] is True
+
+
+def test_kb_fingerprint_ignores_load_state(kb_dir, fresh_kb_cache):
+    """The fingerprint describes the source files, not how they were loaded"""
+    before = evidence_aggregator.get_kb_fingerprint(str(kb_dir))
+    loader = KnowledgeBaseLoader(str(kb_dir))
+    loader.compile_snapshot()
+    loader.load_all_kbs()
+    assert evidence_aggregator.get_kb_fingerprint(str(kb_dir)) == before
+
+    tsg_file = kb_dir / "cancer_genes" / "oncovi_lists" / "tumor_suppressors.txt"
+    tsg_file.write_text("TP53\nPTEN\nRB1\n")
+    assert evidence_aggregator.get_kb_fingerprint(str(kb_dir)) != before
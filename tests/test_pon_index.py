@@ -0,0 +1,141 @@
+"""
+Tests for the memory-mapped panel-of-normals index
+"""
+
+import os
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine.kb_snapshot import SnapshotError
+from annotation_engine.pon_index import (
+    PanelOfNormalsIndex, build_pon_index, default_pon_index_path, load_pon_index
+)
+from annotation_engine.variant_index import pack_variants
+from annotation_engine.vcf_filtering import TumorOnlyFilter
+
+HEADER = """##fileformat=VCFv4.2
+##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+##FORMAT=<ID=AD,Number=R,Type=Integer,Description="Allelic depths">
+##FORMAT=<ID=DP,Number=1,Type=Integer,Description="Sample depth">
+#CHROM	POS	ID	REF	ALT	QUAL	FILTER	INFO	FORMAT	SAMPLE
+"""
+
+
+def _write_vcf(path: Path, sites) -> Path:
+    with open(path, "w") as f:
+        f.write(HEADER)
+        for chrom, pos, ref, alt in sites:
+            f.write(f"{chrom}\t{pos}\t.\t{ref}\t{alt}\t60\tPASS\t.\tGT:AD:DP\t0/1:40,20:60\n")
+    return path
+
+
+PON_SITES = [("1", 1000, "A", "G"), ("1", 1000, "A", "T"), ("7", 140753336, "A", "T"),
+             ("X", 5000, "C", "CA"), ("GL000192.1", 10, "A", "C"), ("1", 1000, "A", "G")]
+
+
+def test_index_membership_matches_sites():
+    rng = np.random.default_rng(0)
+    sites = [(str(c), int(p), "ACGT"[r], "ACGT"[(r + 1) % 4])
+             for c, p, r in zip(rng.integers(1, 23, 20000), rng.integers(1, 10**8, 20000), rng.integers(0, 4, 20000))]
+    index = PanelOfNormalsIndex.from_packed(*pack_variants(*zip(*sites)))
+
+    assert index.contains_batch(sites).all()
+    present = set(sites)
+    absent = [(c, p + 1, r, a) for c, p, r, a in sites[:2000] if (c, p + 1, r, a) not in present]
+    assert not index.contains_batch(absent).any()
+    # The Bloom front rejects most absent sites before any binary search
+    loci, alleles = pack_variants(*zip(*absent))
+    assert index.bloom.might_contain(loci, alleles).mean() < 0.05
+
+
+def test_build_and_load_round_trip(tmp_path):
+    pon_vcf = _write_vcf(tmp_path / "pon.vcf", PON_SITES)
+    build_pon_index(pon_vcf)
+
+    index = load_pon_index(default_pon_index_path(pon_vcf), pon_vcf_path=pon_vcf)
+
+    assert len(index) == 4  # duplicate collapsed, non-primary contig dropped
+    assert not index.loci.flags.owndata  # view over the mapped file
+    assert index.contains("chr7", 140753336, "A", "T")
+    assert index.contains("X", 5000, "C", "CA")
+    assert not index.contains("1", 1000, "A", "C")
+    assert load_pon_index(default_pon_index_path(pon_vcf)) is index
+
+
+def test_stale_index_is_rejected(tmp_path):
+    pon_vcf = _write_vcf(tmp_path / "pon.vcf", PON_SITES[:2])
+    build_pon_index(pon_vcf, tmp_path / "pon.aepon")
+
+    _write_vcf(pon_vcf, PON_SITES[:3])
+    stat = pon_vcf.stat()
+    os.utime(pon_vcf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    with pytest.raises(SnapshotError, match="stale"):
+        load_pon_index(tmp_path / "pon.aepon", pon_vcf_path=pon_vcf)
+
+
+def test_tumor_only_filter_uses_index_like_vcf(tmp_path):
+    pon_vcf = _write_vcf(tmp_path / "pon.vcf", PON_SITES)
+    tumor_vcf = _write_vcf(tmp_path / "tumor.vcf", [("1", 1000, "A", "G"), ("1", 2000, "G", "T"),
+                                                    ("7", 140753336, "A", "T")])
+    from_vcf = TumorOnlyFilter(pon_vcf_path=pon_vcf)
+    expected = from_vcf.filter_variants(tumor_vcf)
+
+    build_pon_index(pon_vcf)
+    from_index = TumorOnlyFilter(pon_vcf_path=pon_vcf)
+
+    assert from_index.pon_index is not None and from_index.pon_lookup is None
+    assert from_index.filter_variants(tumor_vcf) == expected
+    assert from_index.filter_reasons == from_vcf.filter_reasons
+    assert from_index.filter_reasons["panel_of_normals"] == 2
+
+
+def test_tumor_only_filter_queries_index_once_per_vcf(tmp_path, monkeypatch):
+    pon_vcf = _write_vcf(tmp_path / "pon.vcf", PON_SITES)
+    tumor_vcf = _write_vcf(tmp_path / "tumor.vcf", [("1", 1000, "A", "G"), ("1", 2000, "G", "T"),
+                                                    ("7", 140753336, "A", "T")])
+    build_pon_index(pon_vcf)
+    vcf_filter = TumorOnlyFilter(pon_index_path=default_pon_index_path(pon_vcf))
+    monkeypatch.setattr(PanelOfNormalsIndex, "contains", lambda *args: pytest.fail("per-variant PoN lookup"))
+    batches = []
+    contains_batch = PanelOfNormalsIndex.contains_batch
+    monkeypatch.setattr(PanelOfNormalsIndex, "contains_batch",
+                        lambda self, variants: batches.append(len(variants)) or contains_batch(self, variants))
+
+    somatic = vcf_filter.filter_variants(tumor_vcf)
+
+    assert batches == [3]
+    assert [v["position"] for v in somatic] == [2000]
+
+
+def test_index_rebuilt_in_place_is_reopened(tmp_path):
+    pon_vcf = _write_vcf(tmp_path / "pon.vcf", PON_SITES[:1])
+    index_path = tmp_path / "pon.aepon"
+    build_pon_index(pon_vcf, index_path)
+    assert not load_pon_index(index_path).contains("7", 140753336, "A", "T")
+
+    _write_vcf(pon_vcf, PON_SITES[:3])
+    build_pon_index(pon_vcf, index_path)
+
+    assert load_pon_index(index_path).contains("7", 140753336, "A", "T")
+
+
+def test_config_pon_index_reaches_the_filter(tmp_path, monkeypatch):
+    from annotation_engine import tiering, variant_processor
+    from annotation_engine.models import AnalysisType, AnnotationConfig
+
+    captured = {}
+    monkeypatch.setattr(variant_processor, "create_variant_annotations_from_vcf",
+                        lambda **kwargs: captured.update(kwargs) or ([], {}))
+    monkeypatch.setattr(tiering, "TieringEngine", lambda config: None)
+    config = AnnotationConfig(kb_base_path=str(tmp_path), pon_index_path=str(tmp_path / "pon.aepon"))
+
+    tiering.process_vcf_to_tier_results(tmp_path / "tumor.vcf", AnalysisType.TUMOR_ONLY, "melanoma",
+                                        config=config)
+
+    assert captured["pon_index_path"] == tmp_path / "pon.aepon"
@@ -0,0 +1,162 @@
+"""
+Tests for the workflow step result cache and content-addressed step keys
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine.step_cache import DiskCache, MemoryCache, TieredCache, value_size_bytes
+from annotation_engine.workflow_executor import WorkflowExecutor
+
+KB = 1024
+
+
+def test_memory_cache_evicts_least_recently_used_by_bytes():
+    cache = MemoryCache(max_size_mb=0.01)  # ~10 KB
+    payload = "x" * (3 * KB)
+
+    cache.set("a", payload)
+    cache.set("b", payload)
+    cache.set("c", payload)
+    assert cache.get("a") == payload  # a is now most recently used
+    cache.set("d", payload)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == payload
+    stats = cache.get_stats()
+    assert stats["evictions"] >= 1
+    assert stats["size_bytes"] <= cache.max_size_bytes
+    assert stats["size_bytes"] == sum(value_size_bytes(v) for v, _, _ in cache.cache.values())
+
+
+def test_memory_cache_skips_oversized_values_and_expires():
+    cache = MemoryCache(max_size_mb=0.001)
+
+    cache.set("big", "x" * (2 * KB))
+    cache.set("short", {"v": 1}, ttl_seconds=1)
+
+    assert cache.get("big") is None
+    assert cache.get("short") == {"v": 1}
+    cache.cache["short"] = (cache.cache["short"][0], time.time() - 1, cache.cache["short"][2])
+    assert cache.get("short") is None
+    assert cache.get_stats()["size_bytes"] == 0
+
+
+def test_disk_cache_is_shared_between_instances(tmp_path):
+    writer = DiskCache(tmp_path / "steps")
+    reader = DiskCache(tmp_path / "steps")
+
+    writer.set("vep:abc", {"variants": [1, 2, 3]})
+    writer.set("tiering:def", {"tiers": []}, ttl_seconds=60)
+
+    assert reader.get("vep:abc") == {"variants": [1, 2, 3]}
+    assert reader.get("missing") is None
+    reader.clear("vep")
+    assert writer.get("vep:abc") is None
+    assert writer.get("tiering:def") == {"tiers": []}
+
+
+def test_disk_cache_evicts_least_recently_read(tmp_path):
+    cache = DiskCache(tmp_path / "steps", max_size_mb=0.01)
+    payload = "x" * (3 * KB)
+
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.set(key, payload)
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    cache.get("a")
+    cache.set("d", payload)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == payload
+    assert cache.get_stats()["size_bytes"] <= cache.max_size_bytes
+
+
+def test_disk_cache_overwrite_replaces_entry_size(tmp_path):
+    cache = DiskCache(tmp_path / "steps")
+
+    for _ in range(5):
+        cache.set("vep:abc", "x" * (4 * KB))
+
+    assert cache._size_bytes == cache.get_stats()["size_bytes"]
+
+
+def test_default_keys_ignore_kb_load_state(tmp_path, monkeypatch):
+    from annotation_engine import evidence_aggregator
+
+    vcf = tmp_path / "tumor.vcf"
+    vcf.write_text("##fileformat=VCFv4.2\nchr7\t140453136\t.\tA\tT\n")
+    graph = {"vep": [], "tiering": ["vep"]}
+    before = WorkflowExecutor(cache=MemoryCache())._step_cache_keys(graph, _context(vcf))
+
+    monkeypatch.setattr(evidence_aggregator, "_KB_SNAPSHOT", SimpleNamespace(snapshot_id="loaded-snapshot"))
+    monkeypatch.setattr(evidence_aggregator, "_KB_LOADED", True)
+
+    assert WorkflowExecutor(cache=MemoryCache())._step_cache_keys(graph, _context(vcf)) == before
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = DiskCache(tmp_path / "steps")
+    DiskCache(tmp_path / "steps").set("vep:abc", {"v": 1})
+    cache = TieredCache(MemoryCache(), disk)
+
+    assert cache.get("vep:abc") == {"v": 1}
+    assert "vep:abc" in cache.memory.cache
+    assert cache.get_stats()["hits"] == 1
+
+
+def _context(vcf_path: Path, kb_weights=None):
+    return SimpleNamespace(
+        validated_input=SimpleNamespace(
+            tumor_vcf=SimpleNamespace(path=vcf_path, variant_count=1),
+            normal_vcf=None,
+            patient=SimpleNamespace(cancer_type="LUAD"),
+            requested_outputs=["json"],
+        ),
+        route=SimpleNamespace(
+            analysis_type=SimpleNamespace(value="tumor_only"),
+            filter_config={},
+            aggregator_config={"kb_weights": kb_weights or {}},
+            tiering_config={},
+        ),
+    )
+
+
+VEP_CONFIG = {"assembly": "GRCh38", "plugins": ["REVEL"], "cache_version": "114"}
+
+
+def test_step_keys_follow_content_not_path(tmp_path):
+    vcf = tmp_path / "tumor.vcf"
+    vcf.write_text("##fileformat=VCFv4.2\nchr7\t140453136\t.\tA\tT\n")
+    executor = WorkflowExecutor(cache=MemoryCache(), tool_versions={"vep": "114.1"}, kb_fingerprint="kb1",
+                                vep_config=VEP_CONFIG)
+    graph = executor.build_step_graph(["vep", "evidence_aggregation", "tiering"])
+
+    keys = executor._step_cache_keys(graph, _context(vcf))
+    assert keys == executor._step_cache_keys(graph, _context(vcf))
+    assert all(key.startswith(f"{step}:") for step, key in keys.items())
+
+    vcf.write_text("##fileformat=VCFv4.2\nchr12\t25245350\t.\tC\tA\n")
+    edited = executor._step_cache_keys(graph, _context(vcf))
+    assert all(edited[step] != keys[step] for step in keys)
+
+    reweighted = executor._step_cache_keys(graph, _context(vcf, kb_weights={"oncokb": 2}))
+    assert reweighted["vep"] == edited["vep"]
+    assert reweighted["evidence_aggregation"] != edited["evidence_aggregation"]
+    assert reweighted["tiering"] != edited["tiering"]  # chained through its input
+
+    upgraded = WorkflowExecutor(cache=MemoryCache(), tool_versions={"vep": "115"}, kb_fingerprint="kb1",
+                                vep_config=VEP_CONFIG)
+    assert upgraded._step_cache_keys(graph, _context(vcf))["vep"] != edited["vep"]
+    rebuilt_kb = WorkflowExecutor(cache=MemoryCache(), tool_versions={"vep": "114.1"}, kb_fingerprint="kb2",
+                                  vep_config=VEP_CONFIG)
+    assert rebuilt_kb._step_cache_keys(graph, _context(vcf))["tiering"] != edited["tiering"]
+    for changed in ({"assembly": "GRCh37"}, {"plugins": ["REVEL", "SpliceAI"]}, {"cache_version": "115"}):
+        reconfigured = WorkflowExecutor(cache=MemoryCache(), tool_versions={"vep": "114.1"}, kb_fingerprint="kb1",
+                                        vep_config={**VEP_CONFIG, **changed})
+        assert reconfigured._step_cache_keys(graph, _context(vcf))["vep"] != edited["vep"]
@@ -3,11 +3,29 @@ Integration tests for technical filtering API with VCF validation
 """
 
 import pytest
+import shutil
 import tempfile
 import json
 from pathlib import Path
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from src.annotation_engine.api.main import app
+from src.annotation_engine.api.routers import tech_filtering
+
+# The filtering endpoints need no other router; mount them on their own
+app = FastAPI()
+app.include_router(tech_filtering.router)
+
+requires_bcftools = pytest.mark.skipif(shutil.which("bcftools") is None,
+                                       reason="bcftools not installed")
+
+
+def _full_app():
+    """The complete API application, for tests that span several routers"""
+    try:
+        from src.annotation_engine.api.main import app as full_app
+    except ImportError as e:
+        pytest.skip(f"API application not importable: {e}")
+    return full_app
 
 
 class TestTechFilteringIntegration:
@@ -58,6 +76,7 @@ chr7	140453137	.	C	G	80	PASS	DP=80;SOMATIC	GT:DP:AD	0/1:80:40,40	0/0:80:80,0
             f.write(content)
             return f.name
     
+    @requires_bcftools
     def test_tumor_only_valid_submission(self, client, auth_headers, tumor_only_vcf):
         """Test valid tumor-only submission with filters"""
         request_data = {
@@ -92,6 +111,9 @@ chr7	140453137	.	C	G	80	PASS	DP=80;SOMATIC	GT:DP:AD	0/1:80:40,40	0/0:80:80,0
         assert data["variant_counts"]["input"] == 3
         # After filters (PASS only, QUAL>=50), should have 2 variants
         assert data["variant_counts"]["filtered"] <= 2
+        # Survivors per step come from the same streamed pass
+        assert list(data["step_counts"]) == ["FILTER_PASS", "MIN_QUAL", "MIN_DP", "MIN_GQ"]
+        assert data["step_counts"]["MIN_GQ"] == data["variant_counts"]["filtered"]
     
     def test_tumor_only_with_multisample_vcf_error(self, client, auth_headers, multi_sample_vcf):
         """Test tumor-only mode rejects multi-sample VCF"""
@@ -118,6 +140,7 @@ chr7	140453137	.	C	G	80	PASS	DP=80;SOMATIC	GT:DP:AD	0/1:80:40,40	0/0:80:80,0
         assert "VCF validation failed" in data["error"]
         assert "Tumor-only mode requires single-sample VCF" in data["error"]
     
+    @requires_bcftools
     def test_tumor_normal_multisample_valid(self, client, auth_headers, multi_sample_vcf):
         """Test valid tumor-normal with multi-sample VCF"""
         request_data = {
@@ -147,6 +170,7 @@ chr7	140453137	.	C	G	80	PASS	DP=80;SOMATIC	GT:DP:AD	0/1:80:40,40	0/0:80:80,0
         assert data["success"] is True
         assert data["variant_counts"]["input"] == 2
     
+    @requires_bcftools
     def test_tumor_normal_separate_files(self, client, auth_headers, tumor_only_vcf):
         """Test tumor-normal with separate VCF files"""
         # Create normal VCF
@@ -234,6 +258,7 @@ chr7	140453137	.	C	G	80	PASS	DP=80	GT:DP:AD	0/0:80:80,0
         assert "Metadata validation failed" in data["error"]
         assert "Invalid value for tumor_purity" in data["error"]
     
+    @requires_bcftools
     def test_multisample_with_sample_names(self, client, auth_headers):
         """Test multi-sample VCF with explicit sample name mapping"""
         # Create VCF with non-standard sample names
@@ -297,8 +322,11 @@ chr7	140453136	.	A	T	100	PASS	DP=100	GT:DP:AD	0/1:100:50,50	0/0:100:100,0	0/0:50
         data = response.json()
         assert data["success"] is False
     
+    @requires_bcftools
     def test_handoff_to_arti_pipeline(self, client, auth_headers, tumor_only_vcf):
         """Test successful handoff from tech filtering to Arti annotation"""
+        client = TestClient(_full_app())
+        
         # First, apply filters
         filter_request = {
             "mode": "tumor-only",
@@ -360,6 +388,7 @@ class TestEdgeCases:
     def client(self):
         return TestClient(app)
     
+    @requires_bcftools
     def test_empty_vcf(self, client):
         """Test handling of empty VCF file"""
         content = """##fileformat=VCFv4.2
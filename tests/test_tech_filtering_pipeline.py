@@ -0,0 +1,162 @@
+"""
+Tests for the streamed technical filtering pipeline
+"""
+
+import asyncio
+import struct
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.annotation_engine.api.core.config import get_settings
+from src.annotation_engine.api.routers import tech_filtering
+from src.annotation_engine.api.routers.tech_filtering import (
+    BCFRecordCounter, BCFtoolsFilterBuilder, FilterJobManager, FilterRunResult, get_filter_jobs
+)
+
+
+def _bcf_stream(n_records: int) -> bytes:
+    header = b"##fileformat=VCFv4.2\n#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n\x00"
+    data = b"BCF\x02\x02" + struct.pack("<I", len(header)) + header
+    for i in range(n_records):
+        shared, indiv = b"s" * (24 + i), b"i" * (i % 3)
+        data += struct.pack("<II", len(shared), len(indiv)) + shared + indiv
+    return data
+
+
+def test_record_counter_handles_any_chunking():
+    stream = _bcf_stream(7)
+    for chunk_size in (1, 3, 8, 64, len(stream)):
+        counter = BCFRecordCounter()
+        for start in range(0, len(stream), chunk_size):
+            counter.feed(stream[start:start + chunk_size])
+        assert counter.records == 7
+
+
+def test_record_counter_rejects_compressed_input():
+    counter = BCFRecordCounter()
+    try:
+        counter.feed(b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("BGZF input should be rejected")
+
+
+def test_pipeline_streams_uncompressed_bcf_between_stages():
+    builder = BCFtoolsFilterBuilder("tumor-only", "default_assay")
+    builder.add_filter("FILTER_PASS", True)
+    builder.add_filter("MIN_QUAL", 50)
+    builder.add_filter("MIN_DP", 20, enabled=False)
+    builder.add_filter("HET_AB_RANGE", [0.25, 0.75])
+
+    commands = builder.build_pipeline("in.vcf", "out.vcf.gz")
+
+    assert [stage.filter_id for stage in builder.stages] == ["FILTER_PASS", "MIN_QUAL", "HET_AB_RANGE"]
+    assert commands[0] == ["bcftools", "view", "-Ou", "in.vcf"]
+    assert commands[-1] == ["bcftools", "view", "-Oz", "-o", "out.vcf.gz", "-"]
+    for command in commands[1:-1]:
+        assert command[command.index("-Ou") + 1] == "-"
+    assert commands[3][:5] == ["bcftools", "+setGT", "-Ou", "-", "--"]
+
+
+class _SlowBuilder:
+    """Stands in for BCFtoolsFilterBuilder, reporting progress in two halves"""
+    
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+    
+    async def run(self, input_vcf, output_vcf, on_progress=None):
+        on_progress(5, 10)
+        await asyncio.sleep(self.delay)
+        on_progress(10, 10)
+        return FilterRunResult(input_count=3, output_count=2, step_counts={"MIN_QUAL": 2})
+
+
+def test_job_manager_caps_concurrency_and_reports_progress(tmp_path):
+    input_vcf = tmp_path / "in.vcf"
+    input_vcf.write_bytes(b"x" * 10)
+    
+    async def scenario():
+        manager = FilterJobManager(max_concurrent=1)
+        first = manager.submit(_SlowBuilder(), str(input_vcf), "a.vcf.gz")
+        second = manager.submit(_SlowBuilder(), str(input_vcf), "b.vcf.gz")
+        await asyncio.sleep(0.01)
+        assert (first.status, second.status) == ("running", "queued")
+        assert first.to_status().progress == 0.5
+        
+        await asyncio.wait({first.task, second.task})
+        return first.to_status(), second.to_status()
+    
+    first, second = asyncio.run(scenario())
+    
+    assert first.status == second.status == "completed"
+    assert first.progress == 1.0
+    assert first.variant_counts == {"input": 3, "filtered": 2}
+    assert first.step_counts == {"MIN_QUAL": 2}
+
+
+def test_job_manager_cancels_running_jobs(tmp_path):
+    input_vcf = tmp_path / "in.vcf"
+    input_vcf.write_bytes(b"x" * 10)
+    
+    async def scenario():
+        manager = FilterJobManager(max_concurrent=1)
+        job = manager.submit(_SlowBuilder(delay=10), str(input_vcf), "a.vcf.gz")
+        await asyncio.sleep(0.01)
+        assert manager.cancel(job.job_id)
+        await asyncio.wait({job.task})
+        assert not manager.cancel(job.job_id)
+        return job.to_status()
+    
+    status = asyncio.run(scenario())
+    
+    assert status.status == "cancelled"
+    assert status.output_vcf is None
+
+
+def test_job_manager_reads_concurrency_setting_on_first_use(monkeypatch):
+    monkeypatch.setenv("TECH_FILTER_MAX_CONCURRENT_JOBS", "5")
+    get_settings.cache_clear()
+    get_filter_jobs.cache_clear()
+    try:
+        assert get_filter_jobs().max_concurrent == 5
+        assert get_filter_jobs() is get_filter_jobs()
+    finally:
+        get_settings.cache_clear()
+        get_filter_jobs.cache_clear()
+
+
+def test_endpoints_run_jobs_on_the_injected_manager(tmp_path, monkeypatch):
+    input_vcf = tmp_path / "in.vcf"
+    input_vcf.write_text(
+        "##fileformat=VCFv4.2\n"
+        "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tTumor\n"
+        "chr7\t140453136\t.\tA\tT\t100\tPASS\tDP=100\tGT\t0/1\n"
+    )
+    monkeypatch.setattr(BCFtoolsFilterBuilder, "run", _SlowBuilder(delay=0).run)
+    monkeypatch.chdir(tmp_path)
+    
+    manager = FilterJobManager(max_concurrent=1)
+    app = FastAPI()
+    app.include_router(tech_filtering.router)
+    app.dependency_overrides[get_filter_jobs] = lambda: manager
+    request = {
+        "mode": "tumor-only",
+        "input_vcf": str(input_vcf),
+        "filters": {"MIN_QUAL": 50},
+        "metadata": {"case_id": "CASE_001", "cancer_type": "SKCM"}
+    }
+    
+    with TestClient(app) as client:
+        applied = client.post("/api/v1/tech-filtering/apply", json=request).json()
+        submitted = client.post("/api/v1/tech-filtering/jobs", json=request)
+        job_id = submitted.json()["job_id"]
+        status = client.get(f"/api/v1/tech-filtering/jobs/{job_id}")
+        missing = client.get("/api/v1/tech-filtering/jobs/unknown")
+    
+    assert applied["success"] and applied["step_counts"] == {"MIN_QUAL": 2}
+    assert submitted.status_code == 202
+    assert status.status_code == 200 and job_id in manager.jobs
+    assert len(manager.jobs) == 2
+    assert missing.status_code == 404
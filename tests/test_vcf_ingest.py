@@ -0,0 +1,261 @@
+"""
+Tests for single-pass VCF ingestion
+"""
+
+import gzip
+import os
+import sys
+import warnings
+import numpy as np
+import pytest
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine.vcf_ingest import clear_ingest_cache, ingest_vcf, open_vcf_stream, read_vcf
+from annotation_engine.vcf_filtering import TumorNormalFilter, _NormalCursor
+from annotation_engine.vcf_parser import VCFFieldExtractor
+from annotation_engine.vcf_utils import VCFFileHandler
+from annotation_engine.input_validator_v2 import InputValidatorV2
+from annotation_engine.interfaces.validation_interfaces import SampleType
+from annotation_engine.validation.error_handler import ValidationError
+
+EXAMPLE_INPUT = Path(__file__).parent.parent / "example_input"
+
+HEADER = """##fileformat=VCFv4.2
+##reference=GRCh38
+##INFO=<ID=DP,Number=1,Type=Integer,Description="Total Depth">
+##INFO=<ID=AF,Number=A,Type=Float,Description="Allele Frequency">
+##INFO=<ID=DB,Number=0,Type=Flag,Description="dbSNP membership">
+##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+##FORMAT=<ID=AD,Number=R,Type=Integer,Description="Allelic depths">
+##FORMAT=<ID=DP,Number=1,Type=Integer,Description="Sample depth">
+#CHROM	POS	ID	REF	ALT	QUAL	FILTER	INFO	FORMAT	TUMOR
+"""
+
+
+def _write_vcf(path: Path, records: str, gzipped: bool = False) -> Path:
+    opener = gzip.open if gzipped else open
+    with opener(path, "wt") as f:
+        f.write(HEADER + records)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_ingest_cache()
+    yield
+    clear_ingest_cache()
+
+
+@pytest.mark.parametrize("name", ["proper_test.vcf", "lung_tumor_normal_50vars.vcf", "T001-BRCA.grch38.vcf.gz"])
+def test_variant_bundles_match_vcfpy_handler(name):
+    vcf_path = EXAMPLE_INPUT / name
+    if not vcf_path.exists():
+        pytest.skip(f"Test VCF not found: {vcf_path}")
+
+    extractor = VCFFieldExtractor()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = [extractor._standardize_variant_dict(v) for v in VCFFileHandler(vcf_path).iterate_variants()]
+    bundles = read_vcf(vcf_path).variant_bundles()
+
+    assert len(bundles) == len(expected)
+    for bundle, old in zip(bundles, expected):
+        # vcfpy rendered ALT as e.g. "Substitution(type_='SNV', value='T')"
+        assert repr(bundle["alternate"].strip("<>")) in old["alternate"]
+        for key in ("alternate", "variant_type"):
+            bundle.pop(key)
+            old.pop(key)
+        assert bundle == old
+
+
+def test_columns_and_gzip_input(tmp_path):
+    records = ("chr7\t140453136\trs1;rs2\tA\tT,G\t60\tPASS\tDP=100;AF=0.45,0.01;DB\tGT:AD:DP\t0/1:55,45,0:100\n"
+               "chr17\t41234567\t.\tGA\tG\t.\tq10;LowDP\t.\tGT:AD:DP\t./.:.:12\n")
+    batch = read_vcf(_write_vcf(tmp_path / "t.vcf.gz", records, gzipped=True))
+
+    assert len(batch) == 2
+    assert batch.sample_names == ["TUMOR"]
+    assert batch.header.reference == "GRCh38"
+    assert batch.header.info["DB"]["Type"] == "Flag"
+    assert batch.variant_keys() == [("chr7", 140453136, "A", "T"), ("chr17", 41234567, "GA", "G")]
+    np.testing.assert_allclose(batch.qual, [60, np.nan])
+    np.testing.assert_allclose(batch.info_dp, [100, np.nan])
+    np.testing.assert_allclose(batch.sample_vaf[:, 0], [0.45, np.nan])
+    np.testing.assert_allclose(batch.depth(), [100, 12])
+
+    first, second = batch.variant_bundles()
+    assert first["id"] == "rs1"
+    assert first["info"] == {"DP": 100, "AF": [0.45, 0.01], "DB": True}
+    assert first["samples"][0]["genotype"] == [0, 1]
+    assert second["filter_status"] == ["q10", "LowDP"]
+    assert second["quality_score"] is None
+    assert second["variant_type"] == "deletion"
+    assert second["samples"][0] == {"name": "TUMOR", "genotype": [None, None], "data": {"GT": "./.", "AD": [], "DP": 12}}
+
+
+def test_bundles_are_independent_of_cached_batch(tmp_path):
+    vcf_path = _write_vcf(tmp_path / "t.vcf", "1\t100\t.\tA\tC\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:20,10:30\n")
+    ingest_vcf(vcf_path).variant_bundles()[0]["info"]["DP"] = 0
+    assert ingest_vcf(vcf_path).variant_bundles()[0]["info"]["DP"] == 30
+
+
+def test_ingest_cache_reuses_decode_until_file_changes(tmp_path):
+    vcf_path = _write_vcf(tmp_path / "t.vcf", "1\t100\t.\tA\tC\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:20,10:30\n")
+    batch = ingest_vcf(vcf_path)
+    assert ingest_vcf(vcf_path) is batch
+
+    _write_vcf(vcf_path, "1\t100\t.\tA\tC\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:20,10:30\n"
+                         "1\t200\t.\tG\tT\t50\tPASS\tDP=40\tGT:AD:DP\t0/1:30,10:40\n")
+    stat = vcf_path.stat()
+    os.utime(vcf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert len(ingest_vcf(vcf_path)) == 2
+
+
+def test_malformed_record_raises_validation_error(tmp_path):
+    vcf_path = _write_vcf(tmp_path / "bad.vcf", "1\tNOT_A_POS\t.\tA\tC\t50\tPASS\tDP=30\tGT\t0/1\n")
+    with pytest.raises(ValidationError, match="line 10"):
+        read_vcf(vcf_path)
+    with pytest.raises(ValidationError):
+        read_vcf(tmp_path / "missing.vcf")
+
+
+def test_validator_statistics_cover_every_record(tmp_path):
+    depths = [5] * 600 + [50] * 900
+    records = "".join(f"chr1\t{1000 + i}\t.\tA\tC\t{30 + i % 7}\tPASS\tDP={dp}\tGT:AD:DP\t0/1:{dp - 2},2:{dp}\n"
+                      for i, dp in enumerate(depths))
+    vcf_path = _write_vcf(tmp_path / "t.vcf", records)
+
+    validated, errors, _ = InputValidatorV2()._validate_vcf_with_errors(vcf_path, SampleType.TUMOR)
+
+    assert not errors
+    assert validated.variant_count == 1500
+    assert validated.normalized_chromosomes is True
+    assert validated.has_allele_frequencies is False
+    assert validated.quality_summary["median_depth"] == 50
+    assert validated.quality_summary["low_depth_fraction"] == pytest.approx(0.4)
+
+
+def test_tumor_normal_filter_uses_normal_vaf_column(tmp_path):
+    tumor = _write_vcf(tmp_path / "tumor.vcf",
+                       "1\t100\t.\tA\tC\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:20,10:30\n"
+                       "1\t200\t.\tG\tT\t50\tPASS\tDP=40\tGT:AD:DP\t0/1:30,10:40\n")
+    normal = _write_vcf(tmp_path / "normal.vcf",
+                        "1\t100\t.\tA\tC\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:15,15:30\n"
+                        "1\t200\t.\tG\tT\t50\tPASS\tDP=40\tGT:AD:DP\t0/0:40,0:40\n")
+
+    somatic = TumorNormalFilter().filter_variants(tumor, normal)
+
+    assert [v["position"] for v in somatic] == [200]
+    assert somatic[0]["alternate"] == "T"
+
+
+def _tumor_normal_pair(tmp_path):
+    # Contigs in lexicographic order, unlike the declared karyotypic order
+    tumor = _write_vcf(tmp_path / "tumor.vcf",
+                       "1\t100\t.\tA\tC\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:20,10:30\n"
+                       "1\t100\t.\tA\tG\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:20,10:30\n"
+                       "10\t50\t.\tC\tT\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:20,10:30\n"
+                       "2\t300\t.\tG\tT\t50\tPASS\tDP=40\tGT:AD:DP\t0/1:30,10:40\n"
+                       "2\t400\t.\tG\tA\t50\tPASS\tDP=40\tGT:AD:DP\t0/1:30,10:40\n")
+    # Normal lists chr2 before chr10, and carries a contig the tumor lacks
+    normal = _write_vcf(tmp_path / "normal.vcf",
+                        "1\t100\t.\tA\tG\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:15,15:30\n"
+                        "2\t400\t.\tG\tA\t50\tPASS\tDP=40\tGT:AD:DP\t0/1:20,20:40\n"
+                        "3\t10\t.\tT\tC\t50\tPASS\tDP=40\tGT:AD:DP\t0/1:20,20:40\n"
+                        "10\t50\t.\tC\tT\t50\tPASS\tDP=30\tGT:AD:DP\t0/0:30,0:30\n")
+    return tumor, normal
+
+
+def test_streaming_merge_join_matches_batch_subtraction(tmp_path):
+    tumor, normal = _tumor_normal_pair(tmp_path)
+    batch_filter = TumorNormalFilter()
+    expected = batch_filter.filter_variants(tumor, normal)
+
+    streaming_filter = TumorNormalFilter(streaming=True)
+    somatic = streaming_filter.iter_somatic_variants(tumor, normal)
+    assert not isinstance(somatic, list)
+    somatic = list(somatic)
+
+    assert [(v["chromosome"], v["position"], v["alternate"]) for v in somatic] == \
+        [("1", 100, "C"), ("10", 50, "T"), ("2", 300, "T")]
+    assert somatic == expected
+    assert streaming_filter.get_filter_summary() == batch_filter.get_filter_summary()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_streaming_uses_tabix_regions_when_indexed(tmp_path, workers):
+    pysam = pytest.importorskip("pysam")
+    tumor, normal = _tumor_normal_pair(tmp_path)
+    expected = TumorNormalFilter().filter_variants(tumor, normal)
+    indexed = [Path(pysam.tabix_index(str(p), preset="vcf", keep_original=True, force=True))
+               for p in (tumor, normal)]
+
+    somatic = TumorNormalFilter(streaming=True, workers=workers).filter_variants(*indexed)
+
+    assert sorted(somatic, key=lambda v: (v["chromosome"], v["position"])) == expected
+
+
+def test_streaming_rejects_unsorted_input(tmp_path):
+    tumor = _write_vcf(tmp_path / "tumor.vcf",
+                       "1\t200\t.\tA\tC\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:20,10:30\n"
+                       "1\t100\t.\tG\tT\t50\tPASS\tDP=40\tGT:AD:DP\t0/1:30,10:40\n")
+    normal = _write_vcf(tmp_path / "normal.vcf", "")
+
+    with pytest.raises(ValidationError, match="not coordinate-sorted"):
+        list(TumorNormalFilter(streaming=True).iter_somatic_variants(tumor, normal))
+
+
+def test_region_on_absent_contig_yields_nothing(tmp_path):
+    pysam = pytest.importorskip("pysam")
+    tumor, _ = _tumor_normal_pair(tmp_path)
+    indexed = pysam.tabix_index(str(tumor), preset="vcf", keep_original=True, force=True)
+
+    for region in ("7", "7:1-1000"):
+        _, records = open_vcf_stream(indexed, region)
+        assert list(records) == []
+    _, records = open_vcf_stream(indexed, "2:350-450")
+    assert [r.position for r in records] == [400]
+
+
+def test_tumor_only_contig_does_not_drain_the_normal(tmp_path):
+    tumor = _write_vcf(tmp_path / "tumor.vcf",
+                       "7\t10\t.\tA\tC\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:20,10:30\n"
+                       "1\t100\t.\tA\tC\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:20,10:30\n")
+    normal = _write_vcf(tmp_path / "normal.vcf",
+                        "1\t100\t.\tA\tC\t50\tPASS\tDP=30\tGT:AD:DP\t0/1:15,15:30\n"
+                        "2\t400\t.\tG\tA\t50\tPASS\tDP=40\tGT:AD:DP\t0/1:20,20:40\n")
+
+    cursor = _NormalCursor(normal, lambda record: True)
+    assert cursor.enter_contig("7") == set()
+    assert cursor.current.chromosome == "1" and cursor.read_ahead_size == 0
+
+    somatic = TumorNormalFilter(streaming=True).filter_variants(tumor, normal)
+    assert [(v["chromosome"], v["position"]) for v in somatic] == [("7", 10)]
+
+
+def test_read_ahead_overflow_rereads_the_normal(tmp_path, monkeypatch):
+    monkeypatch.setattr("annotation_engine.vcf_filtering.NORMAL_READ_AHEAD_LIMIT", 0)
+    tumor, normal = _tumor_normal_pair(tmp_path)
+    batch_filter = TumorNormalFilter(streaming=False)
+    expected = batch_filter.filter_variants(tumor, normal)
+
+    streaming_filter = TumorNormalFilter(streaming=True)
+    # Tumor 1, 10, 2 against normal 1, 2, 3, 10: chr2 cannot be read ahead, so it is re-read
+    assert streaming_filter.filter_variants(tumor, normal) == expected
+    assert streaming_filter.get_filter_summary() == batch_filter.get_filter_summary()
+
+
+def test_indexed_inputs_stream_by_default(tmp_path, monkeypatch):
+    pysam = pytest.importorskip("pysam")
+    tumor, normal = _tumor_normal_pair(tmp_path)
+    indexed = [Path(pysam.tabix_index(str(p), preset="vcf", keep_original=True, force=True))
+               for p in (tumor, normal)]
+    monkeypatch.setattr("annotation_engine.vcf_filtering.ingest_vcf",
+                        lambda path: pytest.fail("normal VCF loaded into memory"))
+
+    somatic = TumorNormalFilter().filter_variants(*indexed)
+
+    assert sorted((v["chromosome"], v["position"]) for v in somatic) == [("1", 100), ("10", 50), ("2", 300)]
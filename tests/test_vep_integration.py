@@ -14,7 +14,8 @@ import json
 # Add the annotation_engine package to the path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from annotation_engine.vep_runner import VEPConfiguration, VEPRunner, get_vep_version
+from annotation_engine import vep_runner
+from annotation_engine.vep_runner import VEPConfiguration, VEPRunner, get_vep_version, iter_vep_json_records
 from annotation_engine.variant_processor import VariantProcessor, create_variant_annotations_from_vcf
 from annotation_engine.models import AnalysisType
 from annotation_engine.validation.error_handler import ValidationError
@@ -266,6 +267,177 @@ class TestVEPRunner:
                     runner.annotate_vcf(input_vcf, output_format="annotations")
                 
                 assert exc_info.value.error_type == "vep_execution_error"
+    
+    def _fake_vep(self, fail_regions=()):
+        """Stand-in for one VEP process: echoes each input record as a JSON line"""
+        calls = []
+        
+        def execute(vep_cmd, show_progress=True):
+            input_vcf = Path(vep_cmd[vep_cmd.index("--input_file") + 1])
+            output_file = Path(vep_cmd[vep_cmd.index("--output_file") + 1])
+            records = [line.split("\t") for line in input_vcf.read_text().splitlines()
+                       if line and not line.startswith("#")]
+            calls.append([f"{r[0]}:{r[1]}" for r in records])
+            if records[0][0] in fail_regions:
+                raise ValidationError(error_type="vep_execution_error", message="VEP crashed")
+            with open(output_file, "w") as f:
+                for r in records:
+                    f.write(json.dumps({**self.mock_vep_output[0], "id": f"{r[0]}_{r[1]}_{r[3]}/{r[4]}",
+                                        "input": "\t".join(r[:8])}) + "\n")
+            return 0.0
+        
+        return execute, calls
+    
+    def test_annotate_vcf_sharded_preserves_order(self):
+        """Shards split on chromosome and size; merged output keeps input order"""
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            input_vcf = temp_path / "multi.vcf"
+            header = "".join(line + "\n" for line in self.test_vcf_content.splitlines() if line.startswith("#"))
+            body = "".join(f"{chrom}\t{pos}\t.\tG\tA\t100\tPASS\tDP=50\tGT\t0/1\n"
+                           for chrom, pos in [("1", 100), ("1", 200), ("1", 300), ("2", 50), ("7", 10)])
+            input_vcf.write_text(header + body)
+            
+            with patch.object(VEPConfiguration, 'validate', return_value=True):
+                config = VEPConfiguration(use_docker=False, vep_command="mock_vep", shard_size=2)
+                runner = VEPRunner(config)
+            
+            execute, calls = self._fake_vep()
+            with patch.object(runner, "_execute_vep", side_effect=execute):
+                result = runner.annotate_vcf(input_vcf, output_format="annotations", shard_workers=3)
+            
+            assert sorted(calls) == [["1:100", "1:200"], ["1:300"], ["2:50"], ["7:10"]]
+            assert [(v.chromosome, v.position) for v in result] == [
+                ("1", 100), ("1", 200), ("1", 300), ("2", 50), ("7", 10)
+            ]
+    
+    def test_iter_annotations_streams_sharded_output(self):
+        """Sharded runs feed the streaming parser with the merged, ordered output"""
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            input_vcf = temp_path / "multi.vcf"
+            header = "".join(line + "\n" for line in self.test_vcf_content.splitlines() if line.startswith("#"))
+            body = "".join(f"{chrom}\t{pos}\t.\tG\tA\t100\tPASS\tDP=50\tGT\t0/1\n"
+                           for chrom, pos in [("1", 100), ("1", 200), ("2", 50)])
+            input_vcf.write_text(header + body)
+            
+            with patch.object(VEPConfiguration, 'validate', return_value=True):
+                config = VEPConfiguration(use_docker=False, vep_command="mock_vep",
+                                          shard_size=1, shard_workers=2)
+                runner = VEPRunner(config)
+            
+            execute, calls = self._fake_vep()
+            with patch.object(runner, "_execute_vep", side_effect=execute), \
+                 patch.object(runner, "_parse_vep_json_to_annotations",
+                              side_effect=AssertionError("whole-file parse")):
+                stream = runner.iter_annotations(input_vcf)
+                assert [(v.chromosome, v.position) for v in stream] == [("1", 100), ("1", 200), ("2", 50)]
+            
+            assert len(calls) == 3
+    
+    def test_annotate_vcf_sharded_retries_then_fails(self):
+        """A shard that keeps failing is retried, then reported by region"""
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            input_vcf = self._create_test_vcf(temp_path)
+            
+            with patch.object(VEPConfiguration, 'validate', return_value=True):
+                config = VEPConfiguration(use_docker=False, vep_command="mock_vep", shard_retries=1)
+                runner = VEPRunner(config)
+            
+            execute, calls = self._fake_vep(fail_regions=("7",))
+            with patch.object(runner, "_execute_vep", side_effect=execute):
+                with pytest.raises(ValidationError) as exc_info:
+                    runner.annotate_vcf(input_vcf, output_format="annotations", shard_workers=2)
+            
+            assert exc_info.value.error_type == "vep_shard_failed"
+            assert exc_info.value.details["shard"] == "7:140753336-140753336"
+            assert calls.count(["7:140753336"]) == 2
+
+
+class TestVEPJSONStreaming:
+    """Test incremental parsing of VEP JSON output"""
+    
+    RECORDS = [
+        {"id": f"1_{pos}_G/A", "input": f"1\t{pos}\t.\tG\tA\t100\tPASS\tDP=50",
+         "most_severe_consequence": "missense_variant",
+         "transcript_consequences": [{"gene_symbol": "GENE1", "consequence_terms": ["missense_variant"],
+                                      "impact": "MODERATE", "canonical": 1}]}
+        for pos in (100, 200, 300)
+    ]
+    
+    def _runner(self):
+        with patch.object(VEPConfiguration, 'validate', return_value=True):
+            return VEPRunner(VEPConfiguration(use_docker=False, vep_command="mock_vep"))
+    
+    def test_iter_records_line_delimited_and_array(self, tmp_path, monkeypatch):
+        """Both VEP's line-delimited output and JSON arrays decode record by record"""
+        monkeypatch.setattr(vep_runner, "JSON_STREAM_CHUNK_SIZE", 16)
+        
+        ndjson = tmp_path / "out.json"
+        ndjson.write_text("".join(json.dumps(r) + "\n" for r in self.RECORDS))
+        array = tmp_path / "array.json"
+        array.write_text(json.dumps(self.RECORDS, indent=2))
+        
+        for path in (ndjson, array):
+            with open(path) as f:
+                assert list(iter_vep_json_records(f)) == self.RECORDS
+        
+        positions = [v.position for v in self._runner().iter_vep_json_annotations(ndjson)]
+        assert positions == [100, 200, 300]
+    
+    def test_annotate_vcf_stream_yields_before_vep_exits(self, tmp_path):
+        """Annotations are yielded as VEP writes them, not after it exits"""
+        input_vcf = tmp_path / "in.vcf"
+        input_vcf.write_text("##fileformat=VCFv4.2\n")
+        release = tmp_path / "release"
+        
+        # Fake VEP: writes one record, waits for the consumer, then writes the rest
+        script = (
+            "import json, os, sys, time\n"
+            "out, release, records = sys.argv[1], sys.argv[2], json.loads(sys.argv[3])\n"
+            "f = open(out, 'w')\n"
+            "f.write(json.dumps(records[0]) + '\\n'); f.flush()\n"
+            "while not os.path.exists(release): time.sleep(0.01)\n"
+            "for r in records[1:]: f.write(json.dumps(r) + '\\n')\n"
+        )
+        runner = self._runner()
+        
+        def fake_command(input_vcf, output_file, output_format, plugins):
+            return [sys.executable, "-c", script, str(output_file), str(release), json.dumps(self.RECORDS)]
+        
+        with patch.object(runner, "_build_vep_command", side_effect=fake_command):
+            stream = runner.annotate_vcf_stream(input_vcf, poll_interval=0.01)
+            first = next(stream)
+            assert first.position == 100
+            release.touch()
+            assert [v.position for v in stream] == [200, 300]
+    
+    def test_iter_annotations_unsharded_follows_vep(self, tmp_path):
+        """Single-process runs go through annotate_vcf_stream"""
+        input_vcf = tmp_path / "in.vcf"
+        input_vcf.write_text("##fileformat=VCFv4.2\n")
+        runner = self._runner()
+        
+        with patch.object(runner, "annotate_vcf_stream", return_value=iter(["streamed"])) as stream:
+            assert list(runner.iter_annotations(input_vcf)) == ["streamed"]
+        stream.assert_called_once_with(input_vcf, None)
+    
+    def test_annotate_vcf_stream_reports_failure(self, tmp_path):
+        input_vcf = tmp_path / "in.vcf"
+        input_vcf.write_text("##fileformat=VCFv4.2\n")
+        runner = self._runner()
+        
+        failing = [sys.executable, "-c", "import sys; sys.stderr.write('boom'); sys.exit(3)"]
+        with patch.object(runner, "_build_vep_command", return_value=failing):
+            with pytest.raises(ValidationError) as exc_info:
+                list(runner.annotate_vcf_stream(input_vcf, poll_interval=0.01))
+        
+        assert exc_info.value.error_type == "vep_execution_error"
+        assert exc_info.value.details["stderr"] == "boom"
 
 
 class TestVariantProcessorIntegration:
@@ -0,0 +1,133 @@
+"""
+Tests for DAG scheduling in WorkflowExecutor
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from annotation_engine.interfaces.execution_interfaces import ExecutionStatus, StepSpec
+from annotation_engine.workflow_executor import WorkflowExecutor
+
+ROUTE = ["vep", "evidence_aggregation", "tiering", "canned_text_generation",
+         "phenopacket_export", "va_export", "vrs_normalization"]
+
+
+def _context(steps, execution_id="exec-dag"):
+    context = Mock()
+    context.execution_id = execution_id
+    context.route.processing_steps = steps
+    context.route.output_formats = ["json"]
+    context.validated_input.tumor_vcf.variant_count = 1
+    return context
+
+
+def _recording_step(name, log, delay=0.0):
+    def step(workflow_context, previous_results):
+        log.append((name, "start", sorted(previous_results), time.monotonic()))
+        time.sleep(delay)
+        log.append((name, "end", None, time.monotonic()))
+        return {"step": name}
+    return step
+
+
+def _executor(log, delays=None, **kwargs):
+    executor = WorkflowExecutor(enable_caching=False, **kwargs)
+    for name in ROUTE:
+        executor.step_executors[name] = _recording_step(name, log, (delays or {}).get(name, 0.0))
+    return executor
+
+
+def test_step_graph_follows_declared_inputs():
+    executor = WorkflowExecutor(enable_caching=False, step_specs={"custom": StepSpec("custom")})
+
+    graph = executor.build_step_graph(ROUTE + ["custom", "unknown"])
+
+    assert graph["evidence_aggregation"] == ["vep"]  # somatic_calling not in route
+    assert graph["tiering"] == ["evidence_aggregation"]
+    assert graph["phenopacket_export"] == ["tiering", "vep"]
+    assert graph["vrs_normalization"] == ["vep"]
+    assert graph["custom"] == []
+    assert graph["unknown"] == ROUTE + ["custom"]
+
+
+def test_independent_steps_overlap():
+    log = []
+    executor = _executor(log, delays={name: 0.2 for name in ROUTE[3:]}, max_parallel_workers=4)
+
+    started = time.monotonic()
+    result = executor.execute(_context(ROUTE))
+    elapsed = time.monotonic() - started
+
+    assert result.status == ExecutionStatus.COMPLETED
+    assert elapsed < 0.6  # four 0.2s exports run together
+    starts = {name: (inputs, at) for name, event, inputs, at in log if event == "start"}
+    ends = {name: at for name, event, _, at in log if event == "end"}
+    assert starts["phenopacket_export"][0] == ["tiering", "vep"]
+    assert starts["vrs_normalization"][1] >= ends["vep"]
+    for name in ROUTE[3:]:
+        if name != "vrs_normalization":
+            assert starts[name][1] >= ends["tiering"]
+    assert len(result.performance_metrics.step_metrics) == len(ROUTE)
+
+
+def test_exclusive_step_runs_alone():
+    log = []
+    executor = _executor(log, delays={"vrs_normalization": 0.2}, max_parallel_workers=4)
+
+    executor.execute(_context(ROUTE))
+
+    events = [(name, event) for name, event, _, _ in log]
+    tiering_start = events.index(("tiering", "start"))
+    tiering_end = events.index(("tiering", "end"))
+    assert tiering_end == tiering_start + 1
+
+
+def test_critical_path_metrics():
+    log = []
+    executor = _executor(log, delays={"vep": 0.05, "va_export": 0.3, "vrs_normalization": 0.05},
+                         max_parallel_workers=4)
+
+    metrics = executor.execute(_context(ROUTE)).performance_metrics
+
+    assert metrics.critical_path == ["vep", "evidence_aggregation", "tiering", "va_export"]
+    assert metrics.critical_path_seconds >= 0.35
+    assert metrics.critical_path_seconds <= metrics.total_step_seconds
+
+
+def test_failure_stops_downstream_steps():
+    log = []
+    executor = _executor(log, max_parallel_workers=2)
+
+    def broken(workflow_context, previous_results):
+        raise RuntimeError("boom")
+    executor.step_executors["tiering"] = broken
+
+    result = executor.execute(_context(ROUTE))
+
+    assert result.status == ExecutionStatus.FAILED
+    assert result.error_message.startswith("Step tiering failed")
+    assert "phenopacket_export" not in {name for name, *_ in log}
+
+
+def test_cancel_skips_pending_steps():
+    log = []
+    executor = _executor(log, delays={"vep": 0.3}, max_parallel_workers=2)
+    context = _context(ROUTE, execution_id="exec-cancel")
+
+    def cancel_soon():
+        time.sleep(0.1)
+        assert executor.cancel("exec-cancel")
+    canceller = threading.Thread(target=cancel_soon)
+    canceller.start()
+    result = executor.execute(context)
+    canceller.join()
+
+    assert result.status == ExecutionStatus.CANCELLED
+    assert {name for name, *_ in log} == {"vep"}
+    assert not executor.cancel("exec-cancel")